@@ -0,0 +1,25 @@
+# app/api/health.py
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from typing import Any, Dict
+from app.core.startup import get_readiness
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+
+@router.get("/live", summary="생존 확인")
+async def live() -> Dict[str, Any]:
+    """프로세스가 요청에 응답할 수 있으면 항상 200입니다 (예열 중에도)."""
+    return {"status": "alive"}
+
+
+@router.get(
+    "/ready",
+    summary="준비 상태 확인",
+    responses={503: {"description": "Warming up, warm-up failed or draining"}}
+)
+async def ready() -> JSONResponse:
+    """예열이 끝나 요청을 받을 수 있으면 200, 예열 중이거나 필수 단계가 실패했거나 종료(드레인) 중이면 503과 단계별 결과를 반환합니다."""
+    readiness = get_readiness()
+    return JSONResponse(status_code=200 if readiness.accepting else 503, content=readiness.to_dict())
@@ -0,0 +1,167 @@
+# app/api/v1/admin.py
+
+import hmac
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+from loguru import logger
+from app.config.rag_config import RAGConfig
+from app.core.profiling import collapsed_stacks, get_loop_monitor, sample_profile
+from app.core.startup import get_startup_report
+from app.core.tracing import get_flight_recorder
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.services.common import vectorstore_snapshots
+from app.services.common.rag_service import get_rag_service
+from app.services.common.web_page_fetcher import get_page_fetcher
+from app.services.common.web_search_cache import get_quota_tracker, get_web_search_cache
+from app.services.common.web_search_fanout import get_provider_stats
+
+
+def verify_admin_token(x_admin_token: Optional[str] = Header(None)) -> None:
+    """관리자 토큰을 검증합니다. RAG_ADMIN_TOKEN이 없으면 관리자 API를 쓸 수 없습니다."""
+    if not RAGConfig.ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="관리자 API가 비활성화되어 있습니다 (RAG_ADMIN_TOKEN 미설정).")
+    if not hmac.compare_digest(x_admin_token or "", RAGConfig.ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="관리자 토큰이 올바르지 않습니다.")
+
+
+router = APIRouter(
+    prefix="/admin",
+    tags=["Admin"],
+    dependencies=[Depends(verify_admin_token)],
+    responses={
+        401: {"description": "Invalid admin token"},
+        403: {"description": "Admin API disabled"}
+    }
+)
+
+
+class ReloadRequest(BaseModel):
+    """스냅샷 교체 요청 모델"""
+    version: Optional[int] = None  # 지정하면 이 버전을 활성화한 뒤 교체
+    force: bool = False
+
+
+def _rag_type(domain: str) -> RAGType:
+    try:
+        rag_type = RAGType(domain)
+    except ValueError:
+        raise HTTPException(status_code=404, detail=f"알 수 없는 도메인입니다: {domain}")
+    if rag_type == RAGType.NONE:
+        raise HTTPException(status_code=404, detail=f"알 수 없는 도메인입니다: {domain}")
+    return rag_type
+
+
+@router.get(
+    "/vectorstores",
+    summary="벡터 스토어 스냅샷 상태",
+    description="도메인별 사용 중인 스냅샷, 활성 스냅샷(CURRENT), 보관된 스냅샷 목록을 반환합니다."
+)
+async def list_vectorstores() -> List[Dict[str, Any]]:
+    rag_service = get_rag_service()
+    return [
+        {
+            "domain": rag_type.value,
+            "loaded_version": snapshot.version,
+            "active_version": RAGConfig.active_snapshot_version(rag_type),
+            "snapshots": vectorstore_snapshots.list_snapshots(rag_type),
+            "in_flight": snapshot.active,
+        }
+        for rag_type, snapshot in rag_service.snapshots.items()
+    ]
+
+
+@router.post(
+    "/vectorstores/{domain}/reload",
+    summary="벡터 스토어 스냅샷 교체",
+    description="새 스냅샷을 로드/예열한 뒤 교체합니다. 진행 중인 요청은 이전 스냅샷으로 끝납니다. "
+                "이 워커(또는 사이드카)만 즉시 교체하며, 다른 워커는 CURRENT 감시로 따라옵니다."
+)
+async def reload_vectorstore(domain: str, request: ReloadRequest) -> Dict[str, Any]:
+    rag_type = _rag_type(domain)
+    try:
+        # 로드/예열은 블로킹 작업이므로 이벤트 루프 밖에서 실행 (교체 중에도 요청 처리)
+        return await run_in_threadpool(
+            vectorstore_snapshots.reload_domain, get_rag_service(), rag_type, request.version, request.force
+        )
+    except ValueError as e:
+        logger.error(f"[스냅샷] {rag_type.value} 스냅샷 교체 실패: {str(e)}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get(
+    "/retrieval/stats",
+    summary="검색 실행기 통계",
+    description="도메인별 검색 스레드 풀의 진행 중/대기 중 검색 수와 대기 시간, 검색 시간(평균, 최근 p50/p95)을 반환합니다."
+)
+async def retrieval_stats() -> Dict[str, Dict[str, Any]]:
+    # 사이드카 모드에서는 소켓 호출이므로 이벤트 루프 밖에서 실행
+    return await run_in_threadpool(get_rag_service().retrieval_stats)
+
+
+@router.get(
+    "/web-search/stats",
+    summary="웹 검색 캐시/할당량/제공자 통계",
+    description=(
+        "이 워커의 웹 검색 캐시 적중률, 제공자별 오늘 API 사용량과 남은 할당량, 429/403 횟수, "
+        "API 지연 시간과 동시 검색 기여도, 페이지 본문 캐시 통계를 반환합니다."
+    )
+)
+async def web_search_stats() -> Dict[str, Any]:
+    return {
+        "cache": get_web_search_cache().stats(),
+        "quota": get_quota_tracker().stats(),
+        "providers": get_provider_stats().stats(),
+        "pages": get_page_fetcher().cache.stats()
+    }
+
+
+@router.get(
+    "/traces/slow",
+    summary="느린 요청 기록",
+    description="처리 시간이 TRACE_SLOW_REQUEST_SECONDS 이상이었던 요청의 단계별 구간을 최신순으로 반환합니다 (모든 워커 공용 파일)."
+)
+async def slow_traces(limit: int = 20) -> List[Dict[str, Any]]:
+    return await run_in_threadpool(get_flight_recorder().recent, max(1, min(limit, 200)))
+
+
+@router.get(
+    "/startup",
+    summary="시작 시간 기록",
+    description="이 워커의 구성 요소별 시작 시간(모듈 import, 로깅 설정, 시작 작업)과 프로세스 시작부터 준비 완료까지의 시간을 반환합니다."
+)
+async def startup_timing() -> Dict[str, Any]:
+    return get_startup_report().to_dict()
+
+
+@router.get(
+    "/loop/blocks",
+    summary="이벤트 루프 멈춤 기록",
+    description="이 워커의 이벤트 루프가 LOOP_BLOCK_THRESHOLD_MS 이상 멈췄을 때 찍은 루프 스레드 스택을 최신순으로 반환합니다."
+)
+async def loop_blocks(limit: int = 20) -> List[Dict[str, Any]]:
+    return get_loop_monitor().recent_blocks(max(1, min(limit, 200)))
+
+
+@router.post(
+    "/profile",
+    summary="샘플링 프로파일",
+    description=(
+        "이 워커의 스레드 스택을 seconds 동안 interval_ms마다 찍어 접힌 스택(flamegraph.pl, speedscope 입력) 형식으로 반환합니다. "
+        "loop_only이면 이벤트 루프 스레드만 샘플링합니다. 한 번에 하나만 실행할 수 있습니다."
+    ),
+    response_class=PlainTextResponse
+)
+async def profile(seconds: float = 10.0, interval_ms: Optional[float] = None, loop_only: bool = False) -> PlainTextResponse:
+    if seconds <= 0 or (interval_ms is not None and interval_ms <= 0):
+        raise HTTPException(status_code=400, detail="seconds와 interval_ms는 0보다 커야 합니다.")
+    thread_ids = [get_loop_monitor().loop_thread_id] if loop_only else None
+    logger.info(f"[루프] 샘플링 프로파일 시작: {seconds}초")
+    try:
+        # 샘플링은 스레드 풀에서 실행하므로 프로파일 중에도 요청을 처리함
+        samples = await run_in_threadpool(sample_profile, seconds, interval_ms / 1000 if interval_ms else None, thread_ids)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PlainTextResponse(collapsed_stacks(samples))
@@ -1,9 +1,11 @@
 # app/api/v1/chatbot.py
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException, Response
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from loguru import logger
+from app.config.tracing_config import TracingConfig
+from app.core.tracing import log_usage, start_trace
 from app.services.chatbot.chatbot_classifier import ChatbotClassifier, QueryType, RAGType
 from app.services.chatbot.chatbot_response_generator import ChatbotResponseGenerator
 from app.services.common.preprocessor import translate_query
@@ -33,12 +35,18 @@ class ChatbotResponse(BaseModel):
     summary="챗봇 응답 생성",
     description="사용자 질의에 대한 챗봇 응답을 생성합니다."
 )
-async def chatbot_handler(request: ChatbotRequest) -> ChatbotResponse:
+async def chatbot_handler(
+    request: ChatbotRequest,
+    response: Response,
+    x_request_id: Optional[str] = Header(None)
+) -> ChatbotResponse:
     """
     챗봇 핸들러
     
     Args:
         request: 챗봇 요청
+        response: 응답 (X-Request-ID 헤더 설정용)
+        x_request_id: 호출 측이 넘긴 요청 ID (없으면 새로 만듦)
         
     Returns:
         ChatbotResponse: 챗봇 응답
@@ -46,40 +54,50 @@ async def chatbot_handler(request: ChatbotRequest) -> ChatbotResponse:
     Raises:
         HTTPException: 처리 중 오류가 발생한 경우
     """
-    try:
-        # 분류기와 응답 생성기 초기화
-        classifier = ChatbotClassifier()
-        response_generator = ChatbotResponseGenerator()
-        
-        # 언어 감지 및 번역
-        logger.info(f"[API] 언어 감지 및 번역 시작: {request.query}")
-        translation_result = await translate_query(request.query)
-        source_lang = translation_result["lang_code"]
-        english_query = translation_result["translated_query"]
-        logger.info(f"[API] 언어 감지 및 번역 완료 - 소스 언어: {source_lang}, 영어 번역: {english_query}")
-        
-        # 질의 분류
-        query_type, rag_type = await classifier.classify(english_query)
-        logger.info(f"[API] 질의 분류 결과 - 유형: {query_type.value}, RAG: {rag_type.value}")
-        
-        # 응답 생성
-        response = await response_generator.generate_response(english_query, query_type, rag_type, source_lang)
-        logger.info(f"[API] 응답 생성 완료: {len(response)}자")
-        
-        # 응답 반환
-        return ChatbotResponse(
-            response=response,
-            metadata={
-                "query_type": query_type.value,
-                "rag_type": rag_type.value,
-                "uid": request.uid,
-                "source_lang": source_lang,
-                "english_query": english_query
-            }
-        )
-    except Exception as e:
-        logger.error(f"챗봇 처리 중 오류 발생: {str(e)}")
-        raise HTTPException(
-            status_code=500,
-            detail=f"챗봇 처리 중 오류가 발생했습니다: {str(e)}"
-        )
+    # 요청 ID는 이 요청의 로그와 단계별 구간, 느린 요청 기록에 공통으로 붙음
+    with start_trace("POST /api/v1/chatbot", request_id=x_request_id, uid=request.uid, query_chars=len(request.query)) as trace:
+        response.headers[TracingConfig.REQUEST_ID_HEADER] = trace.request_id
+        try:
+            # 분류기와 응답 생성기 초기화
+            classifier = ChatbotClassifier()
+            response_generator = ChatbotResponseGenerator()
+            
+            # 언어 감지 및 번역
+            logger.info(f"[API] 언어 감지 및 번역 시작: {request.query}")
+            translation_result = await translate_query(request.query)
+            source_lang = translation_result["lang_code"]
+            english_query = translation_result["translated_query"]
+            logger.info(f"[API] 언어 감지 및 번역 완료 - 소스 언어: {source_lang}, 영어 번역: {english_query}")
+            
+            # 질의 분류
+            query_type, rag_type = await classifier.classify(english_query)
+            logger.info(f"[API] 질의 분류 결과 - 유형: {query_type.value}, RAG: {rag_type.value}")
+            trace.attrs.update(source_lang=source_lang, query_type=query_type.value, rag_type=rag_type.value)
+            
+            # 응답 생성
+            answer = await response_generator.generate_response(english_query, query_type, rag_type, source_lang)
+            logger.info(f"[API] 응답 생성 완료: {len(answer)}자")
+            trace.attrs["response_chars"] = len(answer)
+            usage = trace.usage_summary()
+            log_usage(request.uid, usage)
+            
+            # 응답 반환
+            return ChatbotResponse(
+                response=answer,
+                metadata={
+                    "query_type": query_type.value,
+                    "rag_type": rag_type.value,
+                    "uid": request.uid,
+                    "source_lang": source_lang,
+                    "english_query": english_query,
+                    "request_id": trace.request_id,
+                    "usage": usage
+                }
+            )
+        except Exception as e:
+            logger.error(f"챗봇 처리 중 오류 발생: {str(e)}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"챗봇 처리 중 오류가 발생했습니다: {str(e)}",
+                headers={TracingConfig.REQUEST_ID_HEADER: trace.request_id}
+            )
@@ -12,6 +12,7 @@ class LLMProvider(str, Enum):
     OLLAMA = "ollama"
     OPENAI = "openai"
     GROQ = "groq"
+    REPLAY = "replay"  # 기록 재생/가짜 응답 대역 (app.config.replay_config)
 
 
 class Settings(BaseModel):
@@ -111,6 +112,3 @@ settings = Settings(
     GROQ_LIGHTWEIGHT_MODEL=get_env_var("GROQ_LIGHTWEIGHT_MODEL", "llama-3.1-8b-instant"),
     GROQ_HIGHPERFORMANCE_MODEL=get_env_var("GROQ_HIGHPERFORMANCE_MODEL", "llama-3.3-70b-versatile"),
 )
-
-# 디버깅을 위한 설정 로그 출력
-print(f"Loaded settings from .env: LIGHTWEIGHT_LLM_PROVIDER={settings.LIGHTWEIGHT_LLM_PROVIDER}") 
\ No newline at end of file
@@ -1,9 +1,13 @@
+import json
 import logging
 import os
 import sys
+import traceback
 from pathlib import Path
+from typing import Callable, ClassVar, Dict, Optional
 
 from loguru import logger
+from pydantic import BaseModel
 
 # 로그 디렉토리 생성
 LOG_DIR = Path("logs")
@@ -15,9 +19,35 @@ LOG_FILE_SERVER = LOG_DIR / "server.log"
 LOG_FILE_ERROR = LOG_DIR / "error.log"
 LOG_FILE_ACCESS = LOG_DIR / "access.log"
 
+
+def _parse_module_levels(value: str) -> Dict[str, str]:
+    """LOG_MODULE_LEVELS 값(예: app.services.common.rag_service=WARNING,httpx=ERROR)을 {모듈: 레벨}로 바꿉니다."""
+    levels = {}
+    for item in value.split(","):
+        if "=" in item:
+            module, level = item.split("=", 1)
+            levels[module.strip()] = level.strip().upper()
+    return levels
+
+
+class LoggingConfig(BaseModel):
+    """
+    로그 출력 설정
+
+    ENQUEUE이면 포맷한 로그를 큐에 넣고 백그라운드 스레드가 파일/콘솔에 쓰므로 요청 처리 경로가 파일 I/O를 기다리지 않습니다.
+    MODULE_LEVELS로 모듈(접두사)별 최소 레벨을 따로 지정합니다.
+    """
+    LEVEL: ClassVar[str] = os.getenv("LOG_LEVEL", "INFO").upper()
+    MODULE_LEVELS: ClassVar[Dict[str, str]] = _parse_module_levels(os.getenv("LOG_MODULE_LEVELS", ""))
+    JSON: ClassVar[bool] = os.getenv("LOG_FORMAT", "text").lower() == "json"  # 한 줄에 JSON 객체 하나
+    ENQUEUE: ClassVar[bool] = os.getenv("LOG_ENQUEUE", "true").lower() == "true"
+    # 예외 로그에 변수 값을 펼쳐 보여 줌 (느리고 민감 정보가 남을 수 있으므로 개발 환경에서만)
+    DIAGNOSE: ClassVar[bool] = os.getenv("LOG_DIAGNOSE", "false").lower() == "true"
+
+
 # 로그 포맷
-LOG_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
-LOG_FORMAT_ERROR = "<red>{time:YYYY-MM-DD HH:mm:ss.SSS}</red> | <level>{level: <8}</level> | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>\n{exception}"
+LOG_FORMAT = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | {extra[request_id]} | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>"
+LOG_FORMAT_ERROR = "<red>{time:YYYY-MM-DD HH:mm:ss.SSS}</red> | <level>{level: <8}</level> | {extra[request_id]} | <cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - <level>{message}</level>\n{exception}"
 LOG_FORMAT_ACCESS = "<green>{time:YYYY-MM-DD HH:mm:ss.SSS}</green> | <level>{level: <8}</level> | {extra[client_ip]} | {extra[method]} | {extra[endpoint]} | {extra[status_code]} | {message}"
 
 
@@ -48,76 +78,146 @@ class InterceptHandler(logging.Handler):
         logger.opt(depth=depth, exception=record.exc_info).log(level, record.getMessage())
 
 
+def _level_filter(
+    default_level: str,
+    module_levels: Dict[str, str],
+    predicate: Optional[Callable[[dict], bool]] = None
+) -> Callable[[dict], bool]:
+    """모듈 이름 접두사가 가장 길게 일치하는 레벨로 거르는 필터를 만듭니다."""
+    default_no = logger.level(default_level).no
+    levels = sorted(
+        ((module, logger.level(level).no) for module, level in module_levels.items()),
+        key=lambda item: len(item[0]),
+        reverse=True
+    )
+
+    def accept(record: dict) -> bool:
+        if predicate is not None and not predicate(record):
+            return False
+        name = record["name"] or ""
+        for module, level_no in levels:
+            if name == module or name.startswith(module + "."):
+                return record["level"].no >= level_no
+        return record["level"].no >= default_no
+
+    return accept
+
+
+def _json_format(record: dict) -> str:
+    """로그 한 건을 JSON 한 줄로 만듭니다 (request_id와 extra 값 포함)."""
+    extra = {key: value for key, value in record["extra"].items() if not key.startswith("_")}
+    entry = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "request_id": extra.pop("request_id", "-"),
+        "module": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+        "message": record["message"],
+    }
+    if extra:
+        entry["extra"] = extra
+    if record["exception"] is not None:
+        entry["exception"] = "".join(traceback.format_exception(*record["exception"]))
+    record["extra"]["_json"] = json.dumps(entry, ensure_ascii=False, default=str)
+    return "{extra[_json]}\n"
+
+
+# 기본으로 WARNING 이상만 남길 라이브러리 로거 (LOG_MODULE_LEVELS로 지정하면 그 값을 따름)
+# httpx는 요청마다 쿼리 문자열을 포함한 전체 URL을 INFO로 남기므로 API 키가 로그 파일에 남을 수 있음
+QUIET_LIBRARIES = ("httpx",)
+
+
+def _limit_library_levels(module_levels: Dict[str, str]) -> None:
+    """LOG_MODULE_LEVELS에 없는 QUIET_LIBRARIES 로거의 표준 로깅 레벨을 WARNING으로 올립니다."""
+    for name in QUIET_LIBRARIES:
+        if not any(module == name or module.startswith(f"{name}.") for module in module_levels):
+            logging.getLogger(name).setLevel(logging.WARNING)
+
+
 def setup_logging():
     """
     애플리케이션 로깅 설정
     """
     # 로구루 설정 초기화
     logger.remove()
+    # 요청 밖에서 남긴 로그의 request_id 자리 (요청 안에서는 app.core.tracing.start_trace가 채움)
+    logger.configure(extra={"request_id": "-"})
+
+    config = LoggingConfig
+    level_filter = _level_filter(config.LEVEL, config.MODULE_LEVELS)
+    # 모듈별 레벨이 더 낮을 수 있으므로 싱크 레벨은 가장 낮은 값으로 두고 필터에서 거름
+    min_level = min([logger.level(config.LEVEL).no] + [logger.level(level).no for level in config.MODULE_LEVELS.values()])
+
+    def fmt(text_format: str):
+        return _json_format if config.JSON else text_format
+
+    file_options = dict(
+        rotation="10 MB",
+        retention="30 days",
+        compression="gz",
+        enqueue=config.ENQUEUE,
+    )
 
-    # 콘솔 로거 추가 (에러만)
+    # 콘솔 로거
     logger.add(
         sys.stderr,
-        format=LOG_FORMAT,
-        level="INFO",
-        colorize=True,
-        backtrace=True,
-        diagnose=True,
+        format=fmt(LOG_FORMAT),
+        level=min_level,
+        filter=level_filter,
+        colorize=not config.JSON,
+        backtrace=False,
+        diagnose=config.DIAGNOSE,
+        enqueue=config.ENQUEUE,
     )
 
     # 애플리케이션 로그 파일
     logger.add(
         LOG_FILE_APP,
-        format=LOG_FORMAT,
-        level="DEBUG",
-        rotation="10 MB",
-        retention="30 days",
-        compression="gz",
-        backtrace=True,
-        diagnose=True,
+        format=fmt(LOG_FORMAT),
+        level=min_level,
+        filter=level_filter,
+        backtrace=False,
+        diagnose=config.DIAGNOSE,
+        **file_options,
     )
 
     # 에러 로그 파일
     logger.add(
         LOG_FILE_ERROR,
-        format=LOG_FORMAT_ERROR,
+        format=fmt(LOG_FORMAT_ERROR),
         level="ERROR",
-        rotation="10 MB",
-        retention="30 days",
-        compression="gz",
         backtrace=True,
-        diagnose=True,
+        diagnose=config.DIAGNOSE,
+        **file_options,
     )
 
     # 서버 로그 파일
     logger.add(
         LOG_FILE_SERVER,
-        format=LOG_FORMAT,
-        level="DEBUG",
-        filter=lambda record: "uvicorn" in record["name"],
-        rotation="10 MB",
-        retention="30 days",
-        compression="gz",
+        format=fmt(LOG_FORMAT),
+        level=min_level,
+        filter=_level_filter(config.LEVEL, config.MODULE_LEVELS, lambda record: "uvicorn" in record["name"]),
+        **file_options,
     )
 
     # 액세스 로그 파일
     logger.add(
         LOG_FILE_ACCESS,
-        format=LOG_FORMAT_ACCESS,
+        format=fmt(LOG_FORMAT_ACCESS),
         level="INFO",
         filter=lambda record: record["extra"].get("access") is True,
-        rotation="10 MB",
-        retention="30 days",
-        compression="gz",
+        **file_options,
     )
 
-    # 표준 로깅 모듈을 로구루로 리디렉션
-    logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
+    # 표준 로깅 모듈을 로구루로 리디렉션 (어느 싱크도 받지 않을 레벨은 표준 로깅 단계에서 버림)
+    logging.basicConfig(handlers=[InterceptHandler()], level=min_level, force=True)
 
     # 다양한 라이브러리를 로구루로 리디렉션
     for log_name in ["uvicorn", "uvicorn.error", "fastapi"]:
         logging.getLogger(log_name).handlers = [InterceptHandler()]
         logging.getLogger(log_name).propagate = False
+    _limit_library_levels(config.MODULE_LEVELS)
 
     # 로거 객체 반환
-    return logger 
\ No newline at end of file
+    return logger
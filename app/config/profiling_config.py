@@ -0,0 +1,21 @@
+from typing import ClassVar
+from pydantic import BaseModel
+import os
+
+
+class ProfilingConfig(BaseModel):
+    """
+    이벤트 루프 감시와 샘플링 프로파일러 설정
+
+    루프 감시는 LOOP_CHECK_INTERVAL_MS마다 루프 지연을 재고, 루프가 LOOP_BLOCK_THRESHOLD_MS 이상 응답하지 않으면
+    그 순간 루프 스레드의 스택을 로그와 최근 기록(관리자 API)에 남깁니다.
+    """
+    LOOP_MONITOR_ENABLED: ClassVar[bool] = os.getenv("LOOP_MONITOR_ENABLED", "true").lower() == "true"
+    LOOP_CHECK_INTERVAL_SECONDS: ClassVar[float] = float(os.getenv("LOOP_CHECK_INTERVAL_MS", "100")) / 1000
+    LOOP_BLOCK_THRESHOLD_SECONDS: ClassVar[float] = float(os.getenv("LOOP_BLOCK_THRESHOLD_MS", "250")) / 1000
+    MAX_BLOCKS: ClassVar[int] = 50  # 보관할 최근 멈춤 기록 수
+    MAX_STACK_DEPTH: ClassVar[int] = 64  # 스택 하나에 남길 최대 프레임 수
+
+    # 관리자 API로 실행하는 샘플링 프로파일 (한 번에 하나만 실행)
+    PROFILE_MAX_SECONDS: ClassVar[float] = float(os.getenv("PROFILE_MAX_SECONDS", "60"))
+    PROFILE_INTERVAL_MS: ClassVar[float] = float(os.getenv("PROFILE_INTERVAL_MS", "10"))  # 기본 샘플 간격
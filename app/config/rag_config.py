@@ -1,6 +1,7 @@
-from typing import ClassVar, Dict, Any
+from typing import ClassVar, Dict, Any, Iterable, List, Optional
 from enum import Enum
 from pydantic import BaseModel
+import json
 import os
 from pathlib import Path
 
@@ -19,9 +20,60 @@ class RAGConfig(BaseModel):
     BASE_DIR: ClassVar[str] = os.getenv("BASE_DIR", str(Path(__file__).parent.parent.parent))
     CHROMA_DB_PATH: ClassVar[str] = os.path.join(BASE_DIR, "data", "chroma")
     EMBEDDING_MODEL: ClassVar[str] = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"  # 768차원 모델로 변경
-    SEARCH_K: ClassVar[int] = 5  # 검색 결과 수
+    SEARCH_K: ClassVar[int] = 3  # 검색 결과 수 (하이브리드 검색으로 정밀도가 올라 5 → 3)
     SEARCH_THRESHOLD: ClassVar[float] = 0.3  # 임계값 낮춤
     
+    # 하이브리드 검색 (BM25 + 벡터) 설정
+    HYBRID_SEARCH: ClassVar[bool] = os.getenv("RAG_HYBRID_SEARCH", "true").lower() == "true"
+    SEARCH_CANDIDATES: ClassVar[int] = 10  # 결합 전 검색기별 후보 수
+    RRF_K: ClassVar[int] = 60  # Reciprocal Rank Fusion 상수
+    BM25_K1: ClassVar[float] = 1.5
+    BM25_B: ClassVar[float] = 0.75
+    LEXICAL_INDEX_FILE: ClassVar[str] = "bm25_index.json"  # 벡터 스토어 디렉토리에 저장
+    
+    # 양자화 벡터 검색 설정 (app.tools.quantize_vectorstores로 색인 생성)
+    QUANTIZED_SEARCH: ClassVar[bool] = os.getenv("RAG_QUANTIZED_SEARCH", "false").lower() == "true"
+    QUANTIZED_RESCORE: ClassVar[bool] = os.getenv("RAG_QUANTIZED_RESCORE", "true").lower() == "true"  # 최종 top-k를 원본 정밀도로 재정렬
+    QUANTIZED_RESCORE_FACTOR: ClassVar[int] = 4  # 재정렬 후보 배수
+    QUANTIZED_INDEX_FILE: ClassVar[str] = "quantized_index.npz"
+    FULL_VECTORS_FILE: ClassVar[str] = "full_vectors.npy"  # 재정렬용 원본 벡터 (메모리 매핑)
+    
+    # HNSW 색인 설정 (app.tools.hnsw_sweep으로 도메인별 값을 골라 HNSW_PARAMS_FILE에 저장)
+    HNSW_DEFAULTS: ClassVar[Dict[str, int]] = {"M": 16, "construction_ef": 100, "search_ef": 10}  # ChromaDB 기본값
+    HNSW_PARAMS_FILE: ClassVar[str] = os.path.join(BASE_DIR, "data", "hnsw_params.json")  # 시작 시 DOMAIN_CONFIGS["hnsw"]에 반영
+    
+    # 검색 실행기 설정 (ChromaDB/SQLite 검색을 이벤트 루프 밖의 도메인별 스레드에서 실행)
+    RETRIEVAL_READERS: ClassVar[int] = int(os.getenv("RAG_RETRIEVAL_READERS", "2"))  # 도메인별 동시 검색 스레드 수
+    RETRIEVAL_STATS_WINDOW: ClassVar[int] = 1000  # 대기/검색 시간 백분위를 계산할 최근 검색 수
+    
+    # 멀티 워커 서빙 설정 (app.tools.retrieval_sidecar)
+    SIDECAR_SOCKET: ClassVar[str] = os.getenv("RAG_SIDECAR_SOCKET", "")  # 설정하면 임베딩/검색을 사이드카 프로세스에 위임
+    SIDECAR_TIMEOUT: ClassVar[float] = float(os.getenv("RAG_SIDECAR_TIMEOUT", "10"))  # 사이드카 요청 타임아웃(초)
+    
+    # 벡터 스토어 스냅샷 설정 (app.tools.vectorstore_snapshot으로 생성/활성화)
+    SNAPSHOT_DIR: ClassVar[str] = "snapshots"  # 벡터 스토어 디렉토리 아래 버전별 스냅샷(v0001, ...)
+    SNAPSHOT_POINTER_FILE: ClassVar[str] = "CURRENT"  # 활성 스냅샷 버전 (없으면 벡터 스토어 디렉토리를 직접 사용)
+    SNAPSHOT_WATCH_INTERVAL: ClassVar[float] = float(os.getenv("RAG_SNAPSHOT_WATCH_INTERVAL", "30"))  # CURRENT 확인 주기(초), 0이면 끔
+    SNAPSHOT_WARMUP_QUERIES: ClassVar[int] = 5  # 교체 전 새 스냅샷에 미리 실행할 질의 수
+    WARMUP_QUERIES_DIR: ClassVar[str] = os.path.join(BASE_DIR, "data", "benchmarks", "queries", "v1")  # 예열 질의 (라벨 질의 세트 재사용)
+    SNAPSHOT_DRAIN_TIMEOUT: ClassVar[float] = 60.0  # 이전 스냅샷을 닫기 전 진행 중인 검색을 기다리는 최대 시간(초)
+    ADMIN_TOKEN: ClassVar[str] = os.getenv("RAG_ADMIN_TOKEN", "")  # 관리자 API 토큰 (없으면 관리자 API 비활성화)
+    
+    # 컨텍스트 조립 설정 (질의 유형별 프롬프트 컨텍스트 토큰 예산)
+    CONTEXT_TOKEN_BUDGETS: ClassVar[Dict[str, int]] = {
+        "general": 1200,
+        "reasoning": 2000,
+        "web_search": 1500,
+    }
+    CONTEXT_DUPLICATE_THRESHOLD: ClassVar[float] = 0.8  # 근사 중복 판정 shingle Jaccard 유사도
+    CONTEXT_MMR_LAMBDA: ClassVar[float] = 0.7  # MMR 관련도 가중치 (1에 가까울수록 관련도 우선)
+    
+    # FAQ 사전 답변 설정 (app.tools.build_faq로 생성/검토/게시)
+    FAQ_ENABLED: ClassVar[bool] = os.getenv("RAG_FAQ_ENABLED", "true").lower() == "true"
+    FAQ_DIR: ClassVar[str] = os.path.join(BASE_DIR, "data", "faq")
+    FAQ_SIMILARITY_THRESHOLD: ClassVar[float] = 0.9  # 잘못된 답변을 피하기 위해 높게 설정
+    FAQ_LANGUAGES: ClassVar[List[str]] = ["ko", "en", "ja", "zh", "es", "fr", "de", "ru"]  # 후처리 지원 언어
+    
     # 도메인별 설정
     DOMAIN_CONFIGS: ClassVar[Dict[RAGDomain, Dict[str, Any]]] = {
         RAGDomain.VISA_LAW: {
@@ -63,10 +115,54 @@ class RAGConfig(BaseModel):
     }
     
     @classmethod
-    def validate_paths(cls) -> None:
-        """벡터 스토어 경로를 검증합니다."""
-        for domain, config in cls.DOMAIN_CONFIGS.items():
-            path = config["vectorstore_path"]
+    def hnsw_params(cls, domain: str) -> Dict[str, int]:
+        """도메인의 HNSW 파라미터 (M, construction_ef, search_ef)를 반환합니다."""
+        return {**cls.HNSW_DEFAULTS, **cls.DOMAIN_CONFIGS[domain].get("hnsw", {})}
+    
+    @classmethod
+    def load_hnsw_params(cls, path: Optional[str] = None) -> None:
+        """HNSW 파라미터 파일(app.tools.hnsw_sweep --write)이 있으면 도메인 설정에 반영합니다."""
+        path = path or cls.HNSW_PARAMS_FILE
+        if not os.path.exists(path):
+            return
+        with open(path, encoding="utf-8") as f:
+            params = json.load(f)
+        for domain, domain_params in params.get("domains", {}).items():
+            if domain in cls.DOMAIN_CONFIGS:
+                cls.DOMAIN_CONFIGS[RAGDomain(domain)]["hnsw"] = {
+                    key: int(value) for key, value in domain_params.items() if key in cls.HNSW_DEFAULTS
+                }
+    
+    @classmethod
+    def snapshot_path(cls, domain: str, version: int) -> str:
+        """도메인 벡터 스토어의 스냅샷 디렉토리 경로를 반환합니다."""
+        return os.path.join(cls.DOMAIN_CONFIGS[domain]["vectorstore_path"], cls.SNAPSHOT_DIR, f"v{version:04d}")
+    
+    @classmethod
+    def active_snapshot_version(cls, domain: str) -> Optional[int]:
+        """CURRENT 포인터가 가리키는 스냅샷 버전을 반환합니다. 스냅샷을 쓰지 않으면 None입니다."""
+        pointer = os.path.join(cls.DOMAIN_CONFIGS[domain]["vectorstore_path"], cls.SNAPSHOT_POINTER_FILE)
+        if not os.path.exists(pointer):
+            return None
+        with open(pointer, encoding="utf-8") as f:
+            return int(f.read().strip())
+    
+    @classmethod
+    def active_vectorstore_path(cls, domain: str) -> str:
+        """검색에 사용할 벡터 스토어 경로 (활성 스냅샷 또는 벡터 스토어 디렉토리)를 반환합니다."""
+        version = cls.active_snapshot_version(domain)
+        if version is None:
+            return cls.DOMAIN_CONFIGS[domain]["vectorstore_path"]
+        return cls.snapshot_path(domain, version)
+    
+    @classmethod
+    def validate_paths(cls, domains: Optional[Iterable[str]] = None) -> None:
+        """벡터 스토어 경로를 검증합니다. domains를 지정하면 해당 도메인만 검증합니다."""
+        domains = set(domains) if domains is not None else None
+        for domain in cls.DOMAIN_CONFIGS:
+            if domains is not None and domain not in domains:
+                continue
+            path = cls.active_vectorstore_path(domain)
             if not os.path.exists(path):
                 raise ValueError(f"벡터 스토어 경로가 존재하지 않습니다: {path}")
             if not os.path.exists(os.path.join(path, "chroma.sqlite3")):
@@ -74,4 +170,7 @@ class RAGConfig(BaseModel):
     
     class Config:
         env_file = ".env"
-        env_file_encoding = "utf-8" 
\ No newline at end of file
+        env_file_encoding = "utf-8"
+
+
+RAGConfig.load_hnsw_params()
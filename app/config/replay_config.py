@@ -0,0 +1,38 @@
+from typing import ClassVar
+from pydantic import BaseModel
+import os
+from app.config.rag_config import RAGConfig
+
+
+class ReplayConfig(BaseModel):
+    """
+    LLM/웹 검색 대역(replay) 설정
+
+    LIGHTWEIGHT_LLM_PROVIDER/HIGH_PERFORMANCE_LLM_PROVIDER=replay, WEB_SEARCH_PROVIDER=replay일 때 사용합니다.
+    - record: 실제 제공자(UPSTREAM)를 호출하고 요청→응답 쌍을 파일에 기록
+    - replay: 기록한 응답을 네트워크 없이 돌려줌 (기록 당시 지연 시간 재현)
+    - synthetic: 기록 없이 설정한 지연 분포/토큰 속도/오류율로 가짜 응답 생성
+    """
+    MODE: ClassVar[str] = os.getenv("REPLAY_MODE", "replay").strip().lower()
+    DIR: ClassVar[str] = os.getenv("REPLAY_DIR", os.path.join(RAGConfig.BASE_DIR, "data", "replay"))
+    ON_MISS: ClassVar[str] = os.getenv("REPLAY_ON_MISS", "error").strip().lower()  # 기록에 없는 요청: error | synthetic
+    LATENCY_SCALE: ClassVar[float] = float(os.getenv("REPLAY_LATENCY_SCALE", "1"))  # 기록한 지연 시간 배율 (0이면 지연 없음)
+
+    # record 모드에서 실제로 호출할 제공자
+    LLM_UPSTREAM: ClassVar[str] = os.getenv("REPLAY_LLM_UPSTREAM", "groq")
+    SEARCH_UPSTREAM: ClassVar[str] = os.getenv("REPLAY_SEARCH_UPSTREAM", "google")
+
+    # synthetic 모드 LLM: 첫 토큰 지연(로그정규 분포 중앙값/산포) + 출력 토큰 수 / 토큰 속도
+    LLM_TTFT_MS: ClassVar[float] = float(os.getenv("REPLAY_LLM_TTFT_MS", "300"))
+    LLM_LATENCY_SIGMA: ClassVar[float] = float(os.getenv("REPLAY_LLM_LATENCY_SIGMA", "0.5"))
+    LLM_TOKENS_PER_SECOND: ClassVar[float] = float(os.getenv("REPLAY_LLM_TOKENS_PER_SECOND", "80"))
+    LLM_OUTPUT_TOKENS: ClassVar[int] = int(os.getenv("REPLAY_LLM_OUTPUT_TOKENS", "200"))  # 평균 출력 토큰 수
+
+    # synthetic 모드 웹 검색: 지연(로그정규 분포 중앙값/산포)과 결과 수
+    SEARCH_LATENCY_MS: ClassVar[float] = float(os.getenv("REPLAY_SEARCH_LATENCY_MS", "400"))
+    SEARCH_LATENCY_SIGMA: ClassVar[float] = float(os.getenv("REPLAY_SEARCH_LATENCY_SIGMA", "0.6"))
+
+    # 오류 주입 (요청마다 확률적으로 발생)
+    ERROR_RATE: ClassVar[float] = float(os.getenv("REPLAY_ERROR_RATE", "0"))  # 연결 오류(LLM) / 429 응답(웹 검색)
+    TIMEOUT_RATE: ClassVar[float] = float(os.getenv("REPLAY_TIMEOUT_RATE", "0"))  # 타임아웃
+    SEED: ClassVar[int] = int(os.getenv("REPLAY_SEED", "0"))  # 0이면 매번 다른 난수
@@ -0,0 +1,16 @@
+from typing import ClassVar
+from pydantic import BaseModel
+import os
+
+
+class ShutdownConfig(BaseModel):
+    """
+    종료(SIGTERM) 시 드레인 설정
+
+    Eureka에서 먼저 등록을 해제하고 DEREGISTER_DELAY_SECONDS 동안은 계속 요청을 받아 게이트웨이의 인스턴스 목록이
+    갱신되게 한 뒤, 새 요청을 503으로 거절하고 진행 중인 요청이 끝나기를 DRAIN_TIMEOUT_SECONDS까지 기다립니다.
+    gunicorn graceful_timeout과 쿠버네티스 terminationGracePeriodSeconds는 두 값의 합보다 길어야 합니다.
+    """
+    DEREGISTER_DELAY_SECONDS: ClassVar[float] = float(os.getenv("SHUTDOWN_DEREGISTER_DELAY_SECONDS", "5"))
+    DRAIN_TIMEOUT_SECONDS: ClassVar[float] = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT_SECONDS", "30"))
+    RETRY_AFTER_SECONDS: ClassVar[int] = 1  # 드레인 중 거절 응답의 Retry-After
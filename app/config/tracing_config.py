@@ -0,0 +1,27 @@
+from typing import ClassVar
+from pydantic import BaseModel
+import os
+from app.config.rag_config import RAGConfig
+
+
+class TracingConfig(BaseModel):
+    """
+    요청 추적 설정
+
+    요청마다 request_id와 단계별 구간(span)을 모으고, 처리 시간이 SLOW_REQUEST_SECONDS 이상인 요청은
+    DIR/slow_requests.jsonl에 기록합니다 (파일이 MAX_BYTES를 넘으면 .1로 넘기고 새로 시작, 최대 두 파일 유지).
+    """
+    ENABLED: ClassVar[bool] = os.getenv("TRACE_ENABLED", "true").lower() == "true"
+    SLOW_REQUEST_SECONDS: ClassVar[float] = float(os.getenv("TRACE_SLOW_REQUEST_SECONDS", "10"))
+    DIR: ClassVar[str] = os.getenv("TRACE_DIR", os.path.join(RAGConfig.BASE_DIR, "data", "traces"))
+    MAX_BYTES: ClassVar[int] = int(os.getenv("TRACE_MAX_BYTES", str(10 * 1024 * 1024)))
+    MAX_SPANS: ClassVar[int] = 200  # 요청 하나에 남길 최대 구간 수
+    REQUEST_ID_HEADER: ClassVar[str] = "X-Request-ID"
+
+    # 프롬프트/컨텍스트/응답 본문 (app.core.tracing.log_payload)
+    # 로그에는 LOG_PAYLOADS=true이거나 표본으로 뽑힌 요청만 남기고, 느린 요청 기록에는 잘라서 항상 담음
+    LOG_PAYLOADS: ClassVar[bool] = os.getenv("LOG_PAYLOADS", "false").lower() == "true"
+    PAYLOAD_SAMPLE_RATE: ClassVar[float] = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0"))  # 본문을 로그에 남길 요청 비율
+    CAPTURE_PAYLOADS: ClassVar[bool] = os.getenv("TRACE_CAPTURE_PAYLOADS", "true").lower() == "true"
+    PAYLOAD_MAX_CHARS: ClassVar[int] = int(os.getenv("TRACE_PAYLOAD_MAX_CHARS", "4000"))  # 본문 하나당 최대 글자 수
+    MAX_PAYLOADS: ClassVar[int] = 20  # 요청 하나에 담을 최대 본문 수
@@ -0,0 +1,17 @@
+from typing import ClassVar
+from pydantic import BaseModel
+import os
+
+
+class WarmupConfig(BaseModel):
+    """
+    서버 시작 시 예열 설정
+
+    예열(임베딩 모델/벡터 스토어 로드, 도메인별 합성 검색, FAQ 색인, LLM 연결 확인, 합성 질의의 번역/분류)이 끝나야
+    준비 상태(/health/ready)가 되고 Eureka에 등록합니다. 필수 단계(임베딩, 검색)가 실패하면 등록하지 않습니다.
+    """
+    ENABLED: ClassVar[bool] = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    STEP_TIMEOUT_SECONDS: ClassVar[float] = float(os.getenv("WARMUP_STEP_TIMEOUT_SECONDS", "180"))  # 단계별 제한 시간
+    QUERY: ClassVar[str] = os.getenv("WARMUP_QUERY", "How can I extend my visa and register for health insurance?")
+    PIPELINE: ClassVar[bool] = os.getenv("WARMUP_PIPELINE", "true").lower() == "true"  # 합성 질의로 번역/분류 실행 (경량 LLM 호출)
+    GENERATE: ClassVar[bool] = os.getenv("WARMUP_GENERATE", "false").lower() == "true"  # 응답 생성까지 실행 (고성능 LLM 호출)
@@ -0,0 +1,116 @@
+from typing import ClassVar, Dict, List, Optional
+import json
+from pydantic import BaseModel
+import os
+from app.config.rag_config import RAGConfig
+
+class WebSearchConfig(BaseModel):
+    """웹 검색 설정"""
+    # 검색 API 엔드포인트 (REST 직접 호출)
+    GOOGLE_CSE_URL: ClassVar[str] = "https://www.googleapis.com/customsearch/v1"
+    GOOGLE_CSE_MAX_RESULTS: ClassVar[int] = 10  # Custom Search API가 한 번에 돌려주는 최대 결과 수
+    DUCKDUCKGO_URL: ClassVar[str] = "https://api.duckduckgo.com/"
+
+    # 공유 HTTP 클라이언트 설정 (app.core.http_client)
+    TIMEOUT: ClassVar[float] = float(os.getenv("WEB_SEARCH_TIMEOUT", "5"))  # 요청 전체 타임아웃(초)
+    CONNECT_TIMEOUT: ClassVar[float] = float(os.getenv("WEB_SEARCH_CONNECT_TIMEOUT", "2"))  # 연결 타임아웃(초)
+    MAX_CONNECTIONS: ClassVar[int] = int(os.getenv("WEB_SEARCH_MAX_CONNECTIONS", "50"))  # 워커당 최대 동시 연결 수
+    MAX_KEEPALIVE_CONNECTIONS: ClassVar[int] = 20  # 재사용을 위해 열어 둘 유휴 연결 수
+    KEEPALIVE_EXPIRY: ClassVar[float] = 30.0  # 유휴 연결 유지 시간(초)
+    USER_AGENT: ClassVar[str] = "eum-chatbot/0.1"
+
+    # 검색 결과 캐시 설정 (질의 정규화 + 제공자 단위, 워커 프로세스별)
+    CACHE_ENABLED: ClassVar[bool] = os.getenv("WEB_SEARCH_CACHE_ENABLED", "true").lower() == "true"
+    CACHE_TTL: ClassVar[float] = float(os.getenv("WEB_SEARCH_CACHE_TTL", "900"))  # 이 시간(초) 동안은 API를 호출하지 않음
+    CACHE_STALE_TTL: ClassVar[float] = float(os.getenv("WEB_SEARCH_CACHE_STALE_TTL", "3600"))  # 이 시간(초)까지는 이전 결과를 주고 백그라운드에서 갱신
+    CACHE_FALLBACK_MAX_AGE: ClassVar[float] = 86400.0  # API 할당량/권한 오류 시 대신 제공할 결과의 최대 나이(초)
+    CACHE_MAX_ENTRIES: ClassVar[int] = 2000
+
+    # API 할당량 설정 (0이면 제한 없음, Google CSE 할당량은 태평양 시간 자정에 초기화)
+    DAILY_QUOTAS: ClassVar[Dict[str, int]] = {
+        "google": int(os.getenv("WEB_SEARCH_GOOGLE_DAILY_QUOTA", "100")),
+        "duckduckgo": int(os.getenv("WEB_SEARCH_DUCKDUCKGO_DAILY_QUOTA", "0")),
+    }
+    QUOTA_TIMEZONE: ClassVar[str] = "America/Los_Angeles"
+    QUOTA_COOLDOWN: ClassVar[float] = float(os.getenv("WEB_SEARCH_QUOTA_COOLDOWN", "300"))  # 429/403 후 API 호출을 쉬는 시간(초)
+    # 종료 시 검색 결과 캐시와 오늘 할당량 사용량을 저장해 두고 다음 시작 때 불러올 파일 (빈 값이면 저장하지 않음)
+    STATE_FILE: ClassVar[str] = os.getenv("WEB_SEARCH_STATE_FILE", os.path.join(RAGConfig.BASE_DIR, "data", "state", "web_search.json"))
+
+    # 다중 제공자 동시 검색 설정 (WEB_SEARCH_PROVIDERS에 제공자를 둘 이상 지정하면 사용)
+    FANOUT_DEADLINE: ClassVar[float] = float(os.getenv("WEB_SEARCH_FANOUT_DEADLINE", "3"))  # 이 시간(초)이 지나면 도착한 결과만으로 응답
+    FANOUT_MIN_PROVIDERS: ClassVar[int] = int(os.getenv("WEB_SEARCH_FANOUT_MIN_PROVIDERS", "1"))  # 조기 종료 전에 응답해야 하는 제공자 수
+    RRF_K: ClassVar[int] = 60  # 순위 융합(Reciprocal Rank Fusion) 상수
+    PROVIDER_STATS_WINDOW: ClassVar[int] = 500  # 지연 시간 백분위를 계산할 최근 호출 수
+
+    # 검색 결과 페이지 본문 발췌 설정 (WEB_SEARCH_PAGE_FETCH=true일 때 상위 결과 페이지를 받아 질의와 가까운 구간만 사용)
+    PAGE_FETCH_ENABLED: ClassVar[bool] = os.getenv("WEB_SEARCH_PAGE_FETCH", "false").lower() == "true"
+    PAGE_FETCH_TOP_N: ClassVar[int] = int(os.getenv("WEB_SEARCH_PAGE_FETCH_TOP_N", "3"))  # 본문을 받을 상위 결과 수
+    PAGE_FETCH_CONCURRENCY: ClassVar[int] = 3  # 요청당 동시에 받을 페이지 수
+    PAGE_TIMEOUT: ClassVar[float] = float(os.getenv("WEB_SEARCH_PAGE_TIMEOUT", "3"))  # 페이지 하나를 받는 전체 시간 제한(초)
+    PAGE_MAX_REDIRECTS: ClassVar[int] = 5  # 페이지당 따라갈 최대 리디렉션 수 (단계마다 내부망 주소인지 다시 확인)
+    PAGE_MAX_BYTES: ClassVar[int] = 512 * 1024  # 페이지당 최대 수신 바이트 (넘으면 받은 부분까지만 사용)
+    PAGE_MAX_CHARS: ClassVar[int] = 50000  # 페이지당 최대 추출 글자 수
+    PAGE_CACHE_TTL: ClassVar[float] = float(os.getenv("WEB_SEARCH_PAGE_CACHE_TTL", "3600"))
+    PAGE_CACHE_MAX_ENTRIES: ClassVar[int] = 500
+    PASSAGE_CHARS: ClassVar[int] = 400  # 발췌 구간 길이 (문자 수)
+    PASSAGE_OVERLAP: ClassVar[int] = 50
+    PASSAGES_PER_PAGE: ClassVar[int] = 2  # 페이지당 최대 발췌 구간 수
+    PASSAGE_TOP_K: ClassVar[int] = 6  # 요청당 최대 발췌 구간 수
+    PASSAGE_MIN_SCORE: ClassVar[float] = 0.2  # 질의와의 최소 코사인 유사도
+
+    # 웹 검색 결과 분류 사전 (RAGType 값 → 분류 → 키워드, 대소문자 무시 부분 일치)
+    # 결과마다 일치한 분류를 태그로 붙이며, 도메인 사전이 없으면 "none"(일반) 사전을 사용
+    CATEGORY_KEYWORDS: ClassVar[Dict[str, Dict[str, List[str]]]] = {
+        "visa_law": {
+            "비자/체류": ["비자", "사증", "체류", "외국인등록", "출입국", "visa", "residence permit", "immigration"],
+            "신청 절차": ["신청", "접수", "제출", "구비서류", "하이코리아", "apply", "application", "required documents"],
+            "수수료": ["수수료", "인지대", "fee"],
+            "기간/만료": ["기간", "만료", "연장", "기한", "expir", "extension", "deadline"],
+            "법령": ["법률", "시행령", "시행규칙", "조항", "규정", "law", "regulation"],
+        },
+        "social_security": {
+            "사회보험": ["건강보험", "국민연금", "고용보험", "산재보험", "4대보험", "health insurance", "pension"],
+            "지원/급여": ["지원금", "수당", "급여", "혜택", "바우처", "benefit", "allowance", "subsidy"],
+            "자격 요건": ["자격", "대상자", "요건", "가입 대상", "eligib"],
+            "신청 절차": ["신청", "접수", "구비서류", "apply", "application"],
+        },
+        "tax_finance": {
+            "세금": ["세금", "소득세", "부가가치세", "연말정산", "세율", "공제", "환급", "tax", "refund"],
+            "신고/납부": ["신고", "납부", "기한", "홈택스", "filing", "deadline"],
+            "은행/금융": ["은행", "계좌", "송금", "대출", "신용카드", "bank", "account", "remittance", "loan"],
+        },
+        "medical_health": {
+            "의료기관": ["병원", "의원", "응급실", "보건소", "약국", "hospital", "clinic", "pharmacy", "emergency"],
+            "진료비/보험": ["진료비", "본인부담", "건강보험", "의료비", "medical cost", "insurance"],
+            "예약/접수": ["예약", "접수", "진료 시간", "appointment"],
+            "통역/외국인 진료": ["통역", "외국인 진료", "국제진료", "interpret"],
+        },
+        "employment": {
+            "채용/구직": ["채용", "구인", "구직", "일자리", "워크넷", "job", "hiring", "recruit"],
+            "근로 조건": ["최저임금", "임금", "근로시간", "근로계약", "퇴직금", "휴가", "minimum wage", "contract", "severance"],
+            "취업 자격": ["고용허가", "취업비자", "e-9", "e-7", "h-2", "work permit"],
+            "노동 분쟁": ["체불", "부당해고", "노동청", "신고", "unpaid wage", "dismissal"],
+        },
+        "daily_life": {
+            "교통": ["지하철", "버스", "교통카드", "택시", "운전면허", "subway", "bus", "driver's license"],
+            "주거": ["전세", "월세", "보증금", "부동산", "임대차", "housing", "rent", "deposit"],
+            "통신/생활": ["휴대폰", "통신사", "인터넷", "공과금", "분리수거", "mobile", "utility"],
+            "가격/요금": ["가격", "요금", "비용", "price", "cost"],
+        },
+        "none": {
+            "가격/요금": ["가격", "요금", "비용", "price", "fee"],
+            "날짜/일정": ["날짜", "기간", "일정", "date", "schedule"],
+            "예약/예매": ["예약", "예매", "booking", "reservation"],
+        },
+    }
+    # 분류 사전 교체/추가 파일 (위와 같은 형태의 JSON, 도메인 단위로 덮어씀)
+    CATEGORY_KEYWORDS_FILE: ClassVar[Optional[str]] = os.getenv("WEB_SEARCH_CATEGORIES_FILE")
+
+    @classmethod
+    def category_keywords(cls, domain: str) -> Dict[str, List[str]]:
+        """도메인(RAGType 값)의 분류 사전을 반환합니다. 분류 사전 파일이 있으면 그 내용을 우선합니다."""
+        keywords = dict(cls.CATEGORY_KEYWORDS)
+        if cls.CATEGORY_KEYWORDS_FILE and os.path.exists(cls.CATEGORY_KEYWORDS_FILE):
+            with open(cls.CATEGORY_KEYWORDS_FILE, encoding="utf-8") as f:
+                keywords.update(json.load(f))
+        return keywords.get(domain) or keywords["none"]
@@ -0,0 +1,35 @@
+from typing import TYPE_CHECKING, Any, Dict
+
+if TYPE_CHECKING:
+    from chromadb.api import ClientAPI
+
+# chromadb는 불러오는 데만 1초 가까이 걸리므로 서버 시작 시점이 아닌 처음 벡터 스토어를 열 때 import
+
+
+def open_client(path: str) -> "ClientAPI":
+    """
+    벡터 스토어 경로의 ChromaDB 클라이언트를 엽니다.
+
+    Args:
+        path: 벡터 스토어 디렉토리
+
+    Returns:
+        ClientAPI: PersistentClient (같은 경로는 프로세스 안에서 System을 공유)
+    """
+    import chromadb
+    from chromadb.config import Settings
+
+    return chromadb.PersistentClient(path=path, settings=Settings(allow_reset=True))
+
+
+def system_cache() -> Dict[str, Any]:
+    """경로별로 캐시된 ChromaDB System을 반환합니다 (같은 경로를 다시 열면 이 캐시의 System을 재사용)."""
+    from chromadb.api.client import SharedSystemClient
+
+    return SharedSystemClient._identifer_to_system
+
+
+def clear_system_cache() -> None:
+    from chromadb.api.client import SharedSystemClient
+
+    SharedSystemClient.clear_system_cache()
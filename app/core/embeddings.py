@@ -0,0 +1,27 @@
+from typing import TYPE_CHECKING
+from functools import lru_cache
+from loguru import logger
+from app.config.rag_config import RAGConfig
+
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+
+@lru_cache(maxsize=None)
+def get_embedding_model(model_name: str = RAGConfig.EMBEDDING_MODEL) -> "SentenceTransformer":
+    """
+    임베딩 모델을 프로세스당 한 번만 로드하여 반환합니다.
+    sentence_transformers(torch 포함)는 불러오는 데만 수 초가 걸리므로 처음 로드할 때 import합니다.
+
+    Args:
+        model_name: sentence-transformers 모델 이름
+
+    Returns:
+        SentenceTransformer: 공유 임베딩 모델
+    """
+    logger.info(f"[임베딩] 모델 로드 시작: {model_name}")
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name)
+    logger.info(f"[임베딩] 모델 로드 완료: {model_name}")
+    return model
@@ -0,0 +1,190 @@
+from typing import Awaitable, Callable, Iterable, List, Optional
+import asyncio
+import ipaddress
+import socket
+import weakref
+import httpcore
+import httpx
+from loguru import logger
+from app.config.web_search_config import WebSearchConfig
+
+# 이벤트 루프별 공유 클라이언트 (httpx 연결 풀은 만든 루프에서만 쓸 수 있음)
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+# LLM 제공자 호출용 공유 클라이언트 (웹 검색과 연결 수 상한/타임아웃이 달라 따로 둠)
+_llm_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+# 검색 결과 페이지 수집용 공유 클라이언트 (공인 IP로만 연결)
+_page_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+LLM_MAX_CONNECTIONS = 100  # 워커당 LLM 제공자 최대 동시 연결 수
+LLM_KEEPALIVE_EXPIRY = 60.0  # 유휴 연결 유지 시간(초), 예열 때 연 연결을 첫 요청까지 유지
+
+
+def _create_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(WebSearchConfig.TIMEOUT, connect=WebSearchConfig.CONNECT_TIMEOUT),
+        limits=httpx.Limits(
+            max_connections=WebSearchConfig.MAX_CONNECTIONS,
+            max_keepalive_connections=WebSearchConfig.MAX_KEEPALIVE_CONNECTIONS,
+            keepalive_expiry=WebSearchConfig.KEEPALIVE_EXPIRY
+        ),
+        headers={"User-Agent": WebSearchConfig.USER_AGENT},
+        follow_redirects=True
+    )
+
+
+async def resolve_host(host: str) -> List[str]:
+    """호스트 이름을 IP 주소 목록으로 풉니다."""
+    infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    return [info[4][0] for info in infos]
+
+
+class PublicAddressBackend(httpcore.AsyncNetworkBackend):
+    """
+    연결할 때 호스트를 직접 풀어, 모든 주소가 공인 IP일 때만 확인한 IP로 연결하는 네트워크 백엔드
+
+    확인과 연결이 같은 주소를 쓰므로, 확인 뒤 내부망 주소를 돌려주는 DNS(리바인딩)로도 내부망에 연결할 수 없습니다.
+    TLS SNI와 Host 헤더는 httpcore가 원래 호스트 이름으로 보냅니다.
+    """
+
+    def __init__(
+        self,
+        resolver: Optional[Callable[[str], Awaitable[List[str]]]] = None,
+        backend: Optional[httpcore.AsyncNetworkBackend] = None
+    ):
+        self.resolver = resolver
+        self.backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Optional[Iterable] = None
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            addresses = [host] if _is_ip(host) else await (self.resolver or resolve_host)(host)
+        except OSError as e:
+            raise httpcore.ConnectError(f"{host} 주소 조회 실패: {e}") from e
+        if not addresses or not all(ipaddress.ip_address(address).is_global for address in addresses):
+            raise httpcore.ConnectError(f"{host}이(가) 내부망 주소로 풀려 연결하지 않습니다: {addresses}")
+        return await self.backend.connect_tcp(addresses[0], port, timeout, local_address, socket_options)
+
+    async def connect_unix_socket(self, path: str, timeout: Optional[float] = None, socket_options: Optional[Iterable] = None) -> httpcore.AsyncNetworkStream:
+        raise httpcore.ConnectError("유닉스 소켓에는 연결하지 않습니다.")
+
+    async def sleep(self, seconds: float) -> None:
+        await self.backend.sleep(seconds)
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+class PublicAddressTransport(httpx.AsyncHTTPTransport):
+    """PublicAddressBackend로 연결하는 httpx 전송 계층 (httpx에 네트워크 백엔드 옵션이 없어 연결 풀을 직접 만듦)"""
+
+    def __init__(self, limits: httpx.Limits, backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        super().__init__(limits=limits)
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=backend or PublicAddressBackend()
+        )
+
+
+def _create_page_client() -> httpx.AsyncClient:
+    # 리디렉션은 수집기가 단계마다 확인하며 따라가고, 환경 변수 프록시는 쓰지 않음 (프록시가 주소를 풀면 확인을 우회함)
+    limits = httpx.Limits(
+        max_connections=WebSearchConfig.MAX_CONNECTIONS,
+        max_keepalive_connections=WebSearchConfig.MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=WebSearchConfig.KEEPALIVE_EXPIRY
+    )
+    return httpx.AsyncClient(
+        transport=PublicAddressTransport(limits),
+        timeout=httpx.Timeout(WebSearchConfig.TIMEOUT, connect=WebSearchConfig.CONNECT_TIMEOUT),
+        headers={"User-Agent": WebSearchConfig.USER_AGENT},
+        follow_redirects=False,
+        trust_env=False
+    )
+
+
+def _create_llm_client() -> httpx.AsyncClient:
+    # 타임아웃은 요청마다 각 LLM 클라이언트(경량/고성능)의 값을 넘김
+    return httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=LLM_MAX_CONNECTIONS,
+            max_keepalive_connections=LLM_MAX_CONNECTIONS,
+            keepalive_expiry=LLM_KEEPALIVE_EXPIRY
+        )
+    )
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """
+    현재 이벤트 루프의 공유 HTTP 클라이언트를 반환합니다.
+    요청마다 세션을 만들지 않고 연결 풀(keep-alive)을 재사용합니다. 이벤트 루프 안에서만 호출합니다.
+
+    Returns:
+        httpx.AsyncClient: 공유 비동기 HTTP 클라이언트
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _create_client()
+        _clients[loop] = client
+        logger.info(
+            f"[HTTP] 공유 클라이언트 생성 (최대 연결 {WebSearchConfig.MAX_CONNECTIONS}, "
+            f"타임아웃 {WebSearchConfig.TIMEOUT}초/연결 {WebSearchConfig.CONNECT_TIMEOUT}초)"
+        )
+    return client
+
+
+def get_llm_http_client() -> httpx.AsyncClient:
+    """
+    현재 이벤트 루프의 LLM 제공자 호출용 공유 HTTP 클라이언트를 반환합니다.
+    예열 때 연 연결(DNS 조회, TLS 핸드셰이크)을 이후 요청이 재사용합니다. 이벤트 루프 안에서만 호출합니다.
+
+    Returns:
+        httpx.AsyncClient: 공유 비동기 HTTP 클라이언트 (요청마다 timeout을 지정)
+    """
+    loop = asyncio.get_running_loop()
+    client = _llm_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _create_llm_client()
+        _llm_clients[loop] = client
+        logger.info(f"[HTTP] LLM 공유 클라이언트 생성 (최대 연결 {LLM_MAX_CONNECTIONS}, 유휴 연결 {LLM_KEEPALIVE_EXPIRY:.0f}초 유지)")
+    return client
+
+
+def get_page_http_client() -> httpx.AsyncClient:
+    """
+    현재 이벤트 루프의 검색 결과 페이지 수집용 공유 HTTP 클라이언트를 반환합니다.
+    호스트가 공인 IP로만 풀릴 때 그 IP로 연결하고(PublicAddressBackend), 리디렉션은 따라가지 않습니다. 이벤트 루프 안에서만 호출합니다.
+
+    Returns:
+        httpx.AsyncClient: 공유 비동기 HTTP 클라이언트
+    """
+    loop = asyncio.get_running_loop()
+    client = _page_clients.get(loop)
+    if client is None or client.is_closed:
+        client = _create_page_client()
+        _page_clients[loop] = client
+        logger.info("[HTTP] 페이지 수집 공유 클라이언트 생성 (공인 IP로만 연결)")
+    return client
+
+
+async def close_http_client() -> None:
+    """현재 이벤트 루프의 공유 HTTP 클라이언트(웹 검색, 페이지 수집, LLM)를 닫습니다 (서버 종료 시 호출)."""
+    loop = asyncio.get_running_loop()
+    for label, clients in (("", _clients), ("페이지 수집 ", _page_clients), ("LLM ", _llm_clients)):
+        client: Optional[httpx.AsyncClient] = clients.pop(loop, None)
+        if client is not None and not client.is_closed:
+            await client.aclose()
+            logger.info(f"[HTTP] {label}공유 클라이언트 종료")
@@ -1,13 +1,31 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
+import asyncio
 import httpx
 import time
 from loguru import logger
 from app.config.app_config import settings, LLMProvider
+from app.config.replay_config import ReplayConfig
+from app.core.http_client import get_llm_http_client
+from app.core.replay import get_replay_store, get_synthetic_profile, replay_mode, request_key
+from app.core.metrics import record_llm_usage
 
 class BaseLLMClient(ABC):
     """LLM 클라이언트의 기본 추상 클래스"""
     
+    provider: str = "unknown"  # 지표/로그에 쓰는 제공자 이름
+    model: Optional[str] = None
+    
+    def _record_usage(
+        self,
+        prompt: str,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None,
+        seconds: float = 0.0
+    ) -> None:
+        """응답의 토큰 사용량을 현재 단계/요청과 지표에 기록합니다."""
+        record_llm_usage(self.provider, self.model, len(prompt), prompt_tokens, completion_tokens, seconds)
+    
     @abstractmethod
     async def generate(self, prompt: str, **kwargs) -> str:
         """프롬프트를 기반으로 텍스트를 생성합니다."""
@@ -21,6 +39,8 @@ class BaseLLMClient(ABC):
 class GroqClient(BaseLLMClient):
     """Groq API 클라이언트"""
     
+    provider = "groq"
+    
     def __init__(self, is_lightweight: bool = True):
         self.is_lightweight = is_lightweight
         self.api_key = settings.GROQ_API_KEY
@@ -43,14 +63,14 @@ class GroqClient(BaseLLMClient):
         """Groq 서버 연결 상태를 확인합니다."""
         start_time = time.time()
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                headers = {"Authorization": f"Bearer {self.api_key}"}
-                response = await client.get(f"{self.base_url}/models", headers=headers)
-                response.raise_for_status()
-                elapsed = time.time() - start_time
-                model_type = "경량" if self.is_lightweight else "고성능"
-                logger.info(f"[Groq {model_type}] 연결 확인 시간: {elapsed:.2f}초")
-                return True
+            client = get_llm_http_client()
+            headers = {"Authorization": f"Bearer {self.api_key}"}
+            response = await client.get(f"{self.base_url}/models", headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            elapsed = time.time() - start_time
+            model_type = "경량" if self.is_lightweight else "고성능"
+            logger.info(f"[Groq {model_type}] 연결 확인 시간: {elapsed:.2f}초")
+            return True
         except Exception as e:
             elapsed = time.time() - start_time
             model_type = "경량" if self.is_lightweight else "고성능"
@@ -73,23 +93,31 @@ class GroqClient(BaseLLMClient):
         }
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                request_start = time.time()
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=headers,
-                    json=payload
-                )
-                request_time = time.time() - request_start
-                model_type = "경량" if self.is_lightweight else "고성능"
-                logger.info(f"[Groq {model_type}] API 요청 시간: {request_time:.2f}초")
-                
-                response.raise_for_status()
-                result = response.json()["choices"][0]["message"]["content"]
-                
-                total_time = time.time() - start_time
-                logger.info(f"[Groq {model_type}] 전체 생성 시간: {total_time:.2f}초")
-                return result
+            client = get_llm_http_client()
+            request_start = time.time()
+            response = await client.post(
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=self.timeout
+            )
+            request_time = time.time() - request_start
+            model_type = "경량" if self.is_lightweight else "고성능"
+            logger.info(f"[Groq {model_type}] API 요청 시간: {request_time:.2f}초")
+            
+            response.raise_for_status()
+            data = response.json()
+            result = data["choices"][0]["message"]["content"]
+            usage = data.get("usage") or {}
+            # Groq는 출력 생성 시간(completion_time)을 따로 알려 줌
+            self._record_usage(
+                prompt, usage.get("prompt_tokens"), usage.get("completion_tokens"),
+                usage.get("completion_time") or request_time
+            )
+            
+            total_time = time.time() - start_time
+            logger.info(f"[Groq {model_type}] 전체 생성 시간: {total_time:.2f}초")
+            return result
         except httpx.TimeoutException as e:
             elapsed = time.time() - start_time
             model_type = "경량" if self.is_lightweight else "고성능"
@@ -109,6 +137,8 @@ class GroqClient(BaseLLMClient):
 class OllamaClient(BaseLLMClient):
     """Ollama API 클라이언트"""
     
+    provider = "ollama"
+    
     def __init__(self, is_lightweight: bool = True):
         self.is_lightweight = is_lightweight
         if is_lightweight:
@@ -128,13 +158,13 @@ class OllamaClient(BaseLLMClient):
         """Ollama 서버 연결 상태를 확인합니다."""
         start_time = time.time()
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(self.tags_url)
-                response.raise_for_status()
-                elapsed = time.time() - start_time
-                model_type = "경량" if self.is_lightweight else "고성능"
-                logger.info(f"[Ollama {model_type}] 연결 확인 시간: {elapsed:.2f}초")
-                return True
+            client = get_llm_http_client()
+            response = await client.get(self.tags_url, timeout=self.timeout)
+            response.raise_for_status()
+            elapsed = time.time() - start_time
+            model_type = "경량" if self.is_lightweight else "고성능"
+            logger.info(f"[Ollama {model_type}] 연결 확인 시간: {elapsed:.2f}초")
+            return True
         except Exception as e:
             elapsed = time.time() - start_time
             model_type = "경량" if self.is_lightweight else "고성능"
@@ -152,19 +182,23 @@ class OllamaClient(BaseLLMClient):
         }
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                request_start = time.time()
-                response = await client.post(self.generate_url, json=payload)
-                request_time = time.time() - request_start
-                model_type = "경량" if self.is_lightweight else "고성능"
-                logger.info(f"[Ollama {model_type}] API 요청 시간: {request_time:.2f}초")
-                
-                response.raise_for_status()
-                result = response.json()["response"]
-                
-                total_time = time.time() - start_time
-                logger.info(f"[Ollama {model_type}] 전체 생성 시간: {total_time:.2f}초")
-                return result
+            client = get_llm_http_client()
+            request_start = time.time()
+            response = await client.post(self.generate_url, json=payload, timeout=self.timeout)
+            request_time = time.time() - request_start
+            model_type = "경량" if self.is_lightweight else "고성능"
+            logger.info(f"[Ollama {model_type}] API 요청 시간: {request_time:.2f}초")
+            
+            response.raise_for_status()
+            data = response.json()
+            result = data["response"]
+            # eval_duration(ns)은 출력 토큰 생성에 걸린 시간 (모델 로드/프롬프트 처리 제외)
+            eval_seconds = (data.get("eval_duration") or 0) / 1e9
+            self._record_usage(prompt, data.get("prompt_eval_count"), data.get("eval_count"), eval_seconds or request_time)
+            
+            total_time = time.time() - start_time
+            logger.info(f"[Ollama {model_type}] 전체 생성 시간: {total_time:.2f}초")
+            return result
         except httpx.TimeoutException as e:
             elapsed = time.time() - start_time
             model_type = "경량" if self.is_lightweight else "고성능"
@@ -184,6 +218,8 @@ class OllamaClient(BaseLLMClient):
 class OpenAIClient(BaseLLMClient):
     """OpenAI API 클라이언트"""
     
+    provider = "openai"
+    
     def __init__(self, is_lightweight: bool = True):
         self.is_lightweight = is_lightweight
         if is_lightweight:
@@ -203,14 +239,14 @@ class OpenAIClient(BaseLLMClient):
         """OpenAI 서버 연결 상태를 확인합니다."""
         start_time = time.time()
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                headers = {"Authorization": f"Bearer {self.api_key}"}
-                response = await client.get(f"{self.base_url}/models", headers=headers)
-                response.raise_for_status()
-                elapsed = time.time() - start_time
-                model_type = "경량" if self.is_lightweight else "고성능"
-                logger.info(f"[OpenAI {model_type}] 연결 확인 시간: {elapsed:.2f}초")
-                return True
+            client = get_llm_http_client()
+            headers = {"Authorization": f"Bearer {self.api_key}"}
+            response = await client.get(f"{self.base_url}/models", headers=headers, timeout=self.timeout)
+            response.raise_for_status()
+            elapsed = time.time() - start_time
+            model_type = "경량" if self.is_lightweight else "고성능"
+            logger.info(f"[OpenAI {model_type}] 연결 확인 시간: {elapsed:.2f}초")
+            return True
         except Exception as e:
             elapsed = time.time() - start_time
             model_type = "경량" if self.is_lightweight else "고성능"
@@ -232,23 +268,27 @@ class OpenAIClient(BaseLLMClient):
         }
         
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                request_start = time.time()
-                response = await client.post(
-                    f"{self.base_url}/chat/completions",
-                    headers=headers,
-                    json=payload
-                )
-                request_time = time.time() - request_start
-                model_type = "경량" if self.is_lightweight else "고성능"
-                logger.info(f"[OpenAI {model_type}] API 요청 시간: {request_time:.2f}초")
-                
-                response.raise_for_status()
-                result = response.json()["choices"][0]["message"]["content"]
-                
-                total_time = time.time() - start_time
-                logger.info(f"[OpenAI {model_type}] 전체 생성 시간: {total_time:.2f}초")
-                return result
+            client = get_llm_http_client()
+            request_start = time.time()
+            response = await client.post(
+                f"{self.base_url}/chat/completions",
+                headers=headers,
+                json=payload,
+                timeout=self.timeout
+            )
+            request_time = time.time() - request_start
+            model_type = "경량" if self.is_lightweight else "고성능"
+            logger.info(f"[OpenAI {model_type}] API 요청 시간: {request_time:.2f}초")
+            
+            response.raise_for_status()
+            data = response.json()
+            result = data["choices"][0]["message"]["content"]
+            usage = data.get("usage") or {}
+            self._record_usage(prompt, usage.get("prompt_tokens"), usage.get("completion_tokens"), request_time)
+            
+            total_time = time.time() - start_time
+            logger.info(f"[OpenAI {model_type}] 전체 생성 시간: {total_time:.2f}초")
+            return result
         except httpx.TimeoutException as e:
             elapsed = time.time() - start_time
             model_type = "경량" if self.is_lightweight else "고성능"
@@ -265,20 +305,97 @@ class OpenAIClient(BaseLLMClient):
             logger.error(f"[OpenAI {model_type}] 예상치 못한 오류: {str(e)} (소요 시간: {elapsed:.2f}초)")
             raise ValueError(f"OpenAI 처리 중 오류 발생: {str(e)}")
 
-def get_llm_client(is_lightweight: bool = True) -> BaseLLMClient:
+class ReplayLLMClient(BaseLLMClient):
     """
-    설정된 LLM 프로바이더에 따라 적절한 클라이언트를 반환합니다.
+    LLM 대역 클라이언트 (부하 테스트/벤치마크용)
     
-    Args:
-        is_lightweight (bool): 경량 모델 사용 여부 (기본값: True)
+    record 모드는 실제 제공자를 호출하며 프롬프트→응답을 기록하고, replay 모드는 기록을 네트워크 없이 돌려주며,
+    synthetic 모드는 설정한 지연 분포/토큰 속도/오류율로 가짜 응답을 만듭니다.
     """
-    provider = settings.LIGHTWEIGHT_LLM_PROVIDER if is_lightweight else settings.HIGH_PERFORMANCE_LLM_PROVIDER
     
+    provider = "replay"
+    
+    def __init__(self, is_lightweight: bool = True, mode: Optional[str] = None, upstream: Optional[BaseLLMClient] = None):
+        self.is_lightweight = is_lightweight
+        self.tier = "lightweight" if is_lightweight else "high_performance"
+        self.mode = mode or replay_mode()
+        self.upstream = None
+        if self.mode == "record":
+            self.upstream = upstream or _create_client(LLMProvider(ReplayConfig.LLM_UPSTREAM), is_lightweight)
+        self.model = self.upstream.model if self.upstream else f"replay-{self.mode}"
+        self.timeout = getattr(self.upstream, "timeout", 30 if is_lightweight else 60)
+        self.store = get_replay_store("llm")
+        self.profile = get_synthetic_profile()
+        model_type = "경량" if is_lightweight else "고성능"
+        logger.info(f"[ReplayClient] {model_type} 모델 초기화 완료: MODE={self.mode}, MODEL={self.model}")
+    
+    async def check_connection(self) -> bool:
+        """record 모드에서는 실제 제공자 연결을 확인하고, 그 외에는 항상 연결된 것으로 봅니다."""
+        if self.upstream is not None:
+            return await self.upstream.check_connection()
+        return True
+    
+    async def generate(self, prompt: str, **kwargs) -> str:
+        """모드에 따라 실제 호출+기록, 기록 재생, 가짜 응답 생성 중 하나로 텍스트를 생성합니다."""
+        key = request_key("llm", self.tier, {"prompt": prompt, **kwargs})
+        model_type = "경량" if self.is_lightweight else "고성능"
+        
+        if self.mode == "record":
+            start_time = time.time()
+            result = await self.upstream.generate(prompt, **kwargs)
+            latency_ms = (time.time() - start_time) * 1000
+            self.store.put(key, {"tier": self.tier, "model": self.model, "prompt": prompt, "completion": result, "latency_ms": round(latency_ms, 1)})
+            logger.info(f"[Replay {model_type}] 응답 기록 ({latency_ms:.0f}ms)")
+            return result
+        
+        if self.mode == "replay":
+            record = self.store.get(key)
+            if record is not None:
+                await asyncio.sleep(record.get("latency_ms", 0) / 1000 * ReplayConfig.LATENCY_SCALE)
+                logger.info(f"[Replay {model_type}] 기록 재생 ({record.get('latency_ms', 0):.0f}ms)")
+                self._record_usage(prompt, seconds=record.get("latency_ms", 0) / 1000 * ReplayConfig.LATENCY_SCALE)
+                return record["completion"]
+            if ReplayConfig.ON_MISS != "synthetic":
+                logger.error(f"[Replay {model_type}] 기록에 없는 프롬프트입니다 (key={key[:12]})")
+                raise ValueError(f"Replay 기록에 없는 프롬프트입니다 (key={key[:12]})")
+        
+        return await self._synthetic(prompt, model_type)
+    
+    async def _synthetic(self, prompt: str, model_type: str) -> str:
+        failure = self.profile.failure()
+        if failure == "timeout":
+            await asyncio.sleep(self.timeout)
+            logger.error(f"[Replay {model_type}] 주입한 타임아웃 ({self.timeout}초)")
+            raise TimeoutError(f"Replay 서버 응답 시간 초과 (타임아웃: {self.timeout}초)")
+        
+        tokens = self.profile.output_tokens()
+        elapsed = self.profile.llm_seconds(tokens)
+        await asyncio.sleep(elapsed)
+        if failure == "error":
+            logger.error(f"[Replay {model_type}] 주입한 연결 오류 (소요 시간: {elapsed:.2f}초)")
+            raise ConnectionError("Replay 서버 요청 실패: 주입한 오류")
+        logger.info(f"[Replay {model_type}] 가짜 응답 생성: {tokens}토큰, {elapsed:.2f}초")
+        self._record_usage(prompt, completion_tokens=tokens, seconds=elapsed)
+        return self.profile.text(prompt, tokens)
+
+def _create_client(provider: LLMProvider, is_lightweight: bool) -> BaseLLMClient:
     if provider == LLMProvider.OLLAMA:
         return OllamaClient(is_lightweight=is_lightweight)
     elif provider == LLMProvider.OPENAI:
         return OpenAIClient(is_lightweight=is_lightweight)
     elif provider == LLMProvider.GROQ:
         return GroqClient(is_lightweight=is_lightweight)
+    elif provider == LLMProvider.REPLAY:
+        return ReplayLLMClient(is_lightweight=is_lightweight)
     else:
-        raise ValueError(f"지원하지 않는 LLM 프로바이더: {provider}") 
\ No newline at end of file
+        raise ValueError(f"지원하지 않는 LLM 프로바이더: {provider}")
+
+def get_llm_client(is_lightweight: bool = True) -> BaseLLMClient:
+    """
+    설정된 LLM 프로바이더에 따라 적절한 클라이언트를 반환합니다.
+    
+    Args:
+        is_lightweight (bool): 경량 모델 사용 여부 (기본값: True)
+    """
+    provider = settings.LIGHTWEIGHT_LLM_PROVIDER if is_lightweight else settings.HIGH_PERFORMANCE_LLM_PROVIDER
+    return _create_client(provider, is_lightweight)
@@ -0,0 +1,232 @@
+from typing import Dict, Iterator, Optional, Tuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+import asyncio
+import os
+import time
+import httpx
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from app.core.tracing import add_counts, add_usage, annotate, span
+
+# LLM 호출(수 초~수십 초)과 검색(수 ms)을 함께 담는 구간
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+_TIMEOUT_ERRORS = (TimeoutError, asyncio.TimeoutError, httpx.TimeoutException)
+
+STAGE_DURATION = Histogram(
+    "eum_stage_duration_seconds",
+    "파이프라인 단계별 처리 시간 (translate, classify, retrieve, web_search, generate, postprocess)",
+    ["stage", "provider", "model", "query_type", "rag_type", "outcome"],
+    buckets=STAGE_BUCKETS,
+)
+CACHE_EVENTS = Counter("eum_cache_events_total", "캐시 조회 결과 (fresh_hits, stale_hits, misses, fallback_hits / FAQ는 hits, misses)", ["cache", "event"])
+FALLBACKS = Counter("eum_fallbacks_total", "단계가 실패해 기본값/대체 결과로 응답한 횟수", ["stage", "reason", "provider"])
+TIMEOUTS = Counter("eum_timeouts_total", "단계별 외부 호출 타임아웃 횟수", ["stage", "provider"])
+INFLIGHT_REQUESTS = Gauge("eum_inflight_requests", "처리 중인 HTTP 요청 수", ["endpoint"], multiprocess_mode="livesum")
+PROVIDER_QUEUE_DEPTH = Gauge(
+    "eum_provider_queue_depth",
+    "제공자별 응답을 기다리는 호출 수 (검색 스레드 풀은 rag-<도메인>: 대기 중인 검색 수)",
+    ["provider"],
+    multiprocess_mode="livesum",
+)
+LLM_TOKENS = Counter("eum_llm_tokens_total", "단계/제공자/모델별 LLM 토큰 수 (kind: prompt, completion)", ["stage", "provider", "model", "kind"])
+LLM_PROMPT_TOKENS = Histogram(
+    "eum_llm_prompt_tokens",
+    "LLM 호출 하나의 프롬프트 토큰 수 (줄일 만한 프롬프트 찾기용)",
+    ["stage", "provider"],
+    buckets=(64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768),
+)
+LLM_TOKENS_PER_SECOND = Histogram(
+    "eum_llm_tokens_per_second",
+    "LLM 호출 하나의 출력 토큰 생성 속도",
+    ["stage", "provider", "model"],
+    buckets=(5, 10, 25, 50, 100, 200, 400, 800, 1600),
+)
+
+# 이벤트 루프 지연 (app.core.profiling.LoopMonitor가 주기적으로 잼)
+LOOP_LAG = Histogram(
+    "eum_event_loop_lag_seconds",
+    "이벤트 루프가 예정보다 늦게 깨어난 시간",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_BLOCKS = Counter("eum_event_loop_blocks_total", "이벤트 루프가 LOOP_BLOCK_THRESHOLD_MS 이상 멈춘 횟수")
+
+# 요청 단위 라벨 (분류 후 query_type/rag_type을 설정하면 이후 단계가 이어받음)
+_request_labels: ContextVar[Optional[Dict[str, str]]] = ContextVar("metrics_request_labels", default=None)
+# 현재 측정 중인 단계 (단계 안에서 대체 응답/타임아웃을 표시할 때 사용)
+_current_stage: ContextVar[Optional["StageTimer"]] = ContextVar("metrics_current_stage", default=None)
+
+
+class StageTimer:
+    """측정 중인 단계의 라벨과 결과 (outcome을 바꾸면 기록되는 결과가 바뀜)"""
+
+    def __init__(self, stage: str, provider: str):
+        self.stage = stage
+        self.provider = provider
+        self.outcome = "success"
+
+
+def _label(value: object) -> str:
+    return str(getattr(value, "value", value)) if value not in (None, "") else "unknown"
+
+
+def set_request_labels(**labels: object) -> None:
+    """현재 요청의 공통 라벨(query_type, rag_type)을 설정합니다."""
+    current = dict(_request_labels.get() or {})
+    current.update({key: _label(value) for key, value in labels.items()})
+    _request_labels.set(current)
+
+
+def timeout_reason(error: BaseException) -> str:
+    """예외를 대체 응답 사유(timeout/error)로 바꿉니다."""
+    return "timeout" if isinstance(error, _TIMEOUT_ERRORS) or "타임아웃" in str(error) else "error"
+
+
+def record_fallback(stage: str, reason: str, provider: Optional[str] = None) -> None:
+    """
+    단계가 실패해 대체 결과로 응답했음을 기록합니다.
+    같은 단계를 측정 중이면(예외를 단계 안에서 삼킨 경우) 그 단계의 결과를 fallback/timeout으로 바꾸고
+    타임아웃도 여기서 셉니다. 단계 밖이면 예외가 observe_stage를 지나며 이미 세었으므로 다시 세지 않습니다.
+
+    Args:
+        stage: 단계 이름
+        reason: 사유 (timeout, error, quota 등)
+        provider: 실패한 제공자 (없으면 측정 중인 단계의 제공자)
+    """
+    timer = _current_stage.get()
+    if timer is not None and timer.stage != stage:
+        timer = None
+    provider = _label(provider or (timer.provider if timer is not None else None))
+    FALLBACKS.labels(stage=stage, reason=reason, provider=provider).inc()
+    annotate(fallback=reason)
+    if timer is None:
+        return
+    if reason == "timeout":
+        timer.outcome = "timeout"
+        TIMEOUTS.labels(stage=stage, provider=provider).inc()
+    elif timer.outcome == "success":
+        timer.outcome = "fallback"
+
+
+def record_llm_usage(
+    provider: str,
+    model: Optional[str],
+    prompt_chars: int,
+    prompt_tokens: Optional[int] = None,
+    completion_tokens: Optional[int] = None,
+    seconds: float = 0.0
+) -> None:
+    """
+    LLM 호출 하나의 사용량을 측정 중인 단계 기준으로 기록합니다.
+    지표(단계/제공자/모델별 토큰 수, 프롬프트 크기, 생성 속도), 현재 구간의 속성, 요청의 단계별 사용량에 함께 더합니다.
+
+    Args:
+        provider: 제공자
+        model: 모델 이름
+        prompt_chars: 프롬프트 길이(글자 수)
+        prompt_tokens: 프롬프트 토큰 수 (제공자가 알려 주지 않으면 None)
+        completion_tokens: 출력 토큰 수 (제공자가 알려 주지 않으면 None)
+        seconds: 생성에 걸린 시간(초)
+    """
+    timer = _current_stage.get()
+    stage = timer.stage if timer is not None else "unknown"
+    add_counts(llm_calls=1, prompt_chars=prompt_chars, prompt_tokens=prompt_tokens, completion_tokens=completion_tokens)
+    add_usage(stage, prompt_tokens, completion_tokens, seconds)
+    model = _label(model)
+    if prompt_tokens is not None:
+        LLM_TOKENS.labels(stage=stage, provider=provider, model=model, kind="prompt").inc(prompt_tokens)
+        LLM_PROMPT_TOKENS.labels(stage=stage, provider=provider).observe(prompt_tokens)
+    if completion_tokens is not None:
+        LLM_TOKENS.labels(stage=stage, provider=provider, model=model, kind="completion").inc(completion_tokens)
+        if seconds > 0:
+            LLM_TOKENS_PER_SECOND.labels(stage=stage, provider=provider, model=model).observe(completion_tokens / seconds)
+
+
+def record_cache(cache: str, event: str) -> None:
+    CACHE_EVENTS.labels(cache=cache, event=event).inc()
+
+
+@contextmanager
+def track_provider(provider: str) -> Iterator[None]:
+    """제공자 호출이 끝날 때까지 제공자 대기 수에 포함합니다."""
+    gauge = PROVIDER_QUEUE_DEPTH.labels(provider=provider)
+    gauge.inc()
+    try:
+        yield
+    finally:
+        gauge.dec()
+
+
+@contextmanager
+def observe_stage(
+    stage: str,
+    provider: Optional[str] = None,
+    model: Optional[str] = None,
+    track_queue: bool = True,
+    **labels: object
+) -> Iterator[StageTimer]:
+    """
+    파이프라인 단계 하나의 처리 시간을 히스토그램에 기록하고, 요청을 추적 중이면 같은 이름의 구간(span)을 만듭니다.
+    예외가 나면 결과를 error(타임아웃이면 timeout)로 기록하고 예외는 그대로 전달합니다.
+    예외를 단계 안에서 처리하고 기본값으로 응답하면 record_fallback으로 표시합니다.
+
+    Args:
+        stage: 단계 이름
+        provider: 제공자 (groq, google, chroma 등)
+        model: 모델 이름
+        track_queue: 단계 동안 제공자 대기 수에 포함할지 여부
+        labels: query_type/rag_type 직접 지정 (없으면 요청 라벨)
+    """
+    timer = StageTimer(stage, _label(provider))
+    gauge = PROVIDER_QUEUE_DEPTH.labels(provider=timer.provider) if provider and track_queue else None
+    with span(stage, provider=provider, model=model) as stage_span:
+        token = _current_stage.set(timer)
+        if gauge is not None:
+            gauge.inc()
+        started_at = time.perf_counter()
+        try:
+            yield timer
+        except asyncio.CancelledError:
+            timer.outcome = "cancelled"
+            raise
+        except Exception as e:
+            timer.outcome = timeout_reason(e)
+            if timer.outcome == "timeout":
+                TIMEOUTS.labels(stage=stage, provider=timer.provider).inc()
+            raise
+        finally:
+            if gauge is not None:
+                gauge.dec()
+            _current_stage.reset(token)
+            if timer.outcome != "success":
+                stage_span.set(outcome=timer.outcome)
+            request_labels = _request_labels.get() or {}
+            STAGE_DURATION.labels(
+                stage=stage,
+                provider=timer.provider,
+                model=_label(model),
+                query_type=_label(labels.get("query_type") or request_labels.get("query_type")),
+                rag_type=_label(labels.get("rag_type") or request_labels.get("rag_type")),
+                outcome=timer.outcome,
+            ).observe(time.perf_counter() - started_at)
+
+
+def metrics_payload() -> Tuple[bytes, str]:
+    """
+    Prometheus 텍스트 형식의 지표와 Content-Type을 반환합니다.
+    PROMETHEUS_MULTIPROC_DIR이 설정되어 있으면(gunicorn 멀티 워커) 모든 워커의 지표를 합칩니다.
+    """
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
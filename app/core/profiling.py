@@ -0,0 +1,180 @@
+from typing import Any, Counter as CounterType, Dict, List, Optional
+from collections import Counter, deque
+from functools import lru_cache
+from types import FrameType
+import asyncio
+import os
+import sys
+import threading
+import time
+from loguru import logger
+from app.config.profiling_config import ProfilingConfig
+from app.core.metrics import LOOP_BLOCKS, LOOP_LAG
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _short_path(filename: str) -> str:
+    """프레임 파일 경로를 저장소 기준 또는 site-packages 기준 경로로 줄입니다."""
+    if filename.startswith(_REPO_ROOT + os.sep):
+        return os.path.relpath(filename, _REPO_ROOT)
+    marker = "site-packages" + os.sep
+    index = filename.rfind(marker)
+    return filename[index + len(marker):] if index >= 0 else os.path.basename(filename)
+
+
+def format_stack(frame: Optional[FrameType], limit: Optional[int] = None) -> List[str]:
+    """
+    프레임의 호출 스택을 바깥쪽(루트)부터 "파일:함수:줄" 목록으로 만듭니다.
+
+    Args:
+        frame: 가장 안쪽 프레임
+        limit: 남길 최대 프레임 수 (안쪽 프레임 우선)
+    """
+    limit = limit or ProfilingConfig.MAX_STACK_DEPTH
+    stack = []
+    while frame is not None and len(stack) < limit:
+        stack.append(f"{_short_path(frame.f_code.co_filename)}:{frame.f_code.co_name}:{frame.f_lineno}")
+        frame = frame.f_back
+    stack.reverse()
+    return stack
+
+
+class LoopMonitor:
+    """
+    이벤트 루프 지연 측정과 멈춤 감지
+
+    루프 안의 태스크가 interval마다 깨어나며 지연(예정보다 늦게 깨어난 시간)을 히스토그램에 기록하고 심장 박동 시각을 남깁니다.
+    별도 감시 스레드는 심장 박동이 threshold 이상 끊기면 그 순간 루프 스레드의 스택을 찍습니다.
+    루프를 막고 있는 동기 호출(임베딩, Chroma 질의, 파일 I/O 등)이 스택의 가장 안쪽에 보입니다.
+    """
+
+    def __init__(self, threshold: Optional[float] = None, interval: Optional[float] = None, max_blocks: Optional[int] = None):
+        self.threshold = threshold or ProfilingConfig.LOOP_BLOCK_THRESHOLD_SECONDS
+        self.interval = interval or ProfilingConfig.LOOP_CHECK_INTERVAL_SECONDS
+        self.blocks: deque = deque(maxlen=max_blocks or ProfilingConfig.MAX_BLOCKS)
+        self._beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """실행 중인 이벤트 루프에서 감시를 시작합니다."""
+        if self._task is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._thread = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._thread.start()
+        logger.info(f"[루프] 이벤트 루프 감시 시작 (멈춤 기준 {self.threshold * 1000:.0f}ms)")
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    async def _heartbeat(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            LOOP_LAG.observe(max(0.0, loop.time() - expected))
+            self._beat = time.monotonic()
+
+    def _watch(self) -> None:
+        blocked_since: Optional[float] = None
+        block: Optional[Dict[str, Any]] = None
+        while not self._stop.wait(self.interval / 2):
+            beat = self._beat
+            if block is not None:
+                if beat == blocked_since:
+                    continue
+                # 루프가 다시 돌기 시작함: 멈춘 전체 시간을 기록
+                block["blocked_ms"] = round(max(0.0, beat - blocked_since - self.interval) * 1000, 1)
+                logger.warning(f"[루프] 이벤트 루프가 {block['blocked_ms']:.0f}ms 동안 멈췄습니다: {block['stack'][-1] if block['stack'] else '-'}")
+                block = blocked_since = None
+                continue
+            # 심장 박동 사이의 sleep 시간을 빼면 루프가 멈춘 시간
+            stalled = time.monotonic() - beat - self.interval
+            if stalled < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = format_stack(frame)
+            blocked_since = beat
+            block = {
+                "detected_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "blocked_ms": round(stalled * 1000, 1),  # 다시 돌기 시작하면 전체 시간으로 갱신
+                "stack": stack,
+            }
+            with self._lock:
+                self.blocks.append(block)
+            LOOP_BLOCKS.inc()
+            logger.warning("[루프] 이벤트 루프가 {:.0f}ms 이상 응답하지 않습니다. 루프 스레드 스택:\n{}", stalled * 1000, "\n".join(stack))
+
+    @property
+    def loop_thread_id(self) -> int:
+        """감시 중인 루프의 스레드 (시작 전이면 메인 스레드)"""
+        return self._loop_thread_id or threading.main_thread().ident
+
+    def recent_blocks(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """최근 멈춤 기록을 최신순으로 반환합니다."""
+        with self._lock:
+            return list(reversed(self.blocks))[:limit]
+
+
+@lru_cache(maxsize=1)
+def get_loop_monitor() -> LoopMonitor:
+    """프로세스 전역 이벤트 루프 감시기를 반환합니다."""
+    return LoopMonitor()
+
+
+_profile_lock = threading.Lock()
+
+
+def sample_profile(seconds: float, interval: Optional[float] = None, thread_ids: Optional[List[int]] = None) -> CounterType[str]:
+    """
+    모든 스레드(또는 thread_ids)의 스택을 interval마다 찍어 접힌 스택(스레드;프레임;...)별 샘플 수를 셉니다.
+    호출한 스레드에서 seconds 동안 실행되므로 이벤트 루프 밖(스레드 풀)에서 호출해야 합니다.
+
+    Args:
+        seconds: 프로파일 시간(초, 최대 PROFILE_MAX_SECONDS)
+        interval: 샘플 간격(초)
+        thread_ids: 샘플링할 스레드 (None이면 전체)
+
+    Raises:
+        RuntimeError: 다른 프로파일이 실행 중인 경우
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise RuntimeError("다른 프로파일이 실행 중입니다.")
+    try:
+        interval = interval or ProfilingConfig.PROFILE_INTERVAL_MS / 1000
+        deadline = time.monotonic() + min(seconds, ProfilingConfig.PROFILE_MAX_SECONDS)
+        own_id = threading.get_ident()
+        samples: CounterType[str] = Counter()
+        while time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id or (thread_ids is not None and thread_id not in thread_ids):
+                    continue
+                samples[";".join([names.get(thread_id, str(thread_id))] + format_stack(frame))] += 1
+            time.sleep(interval)
+        return samples
+    finally:
+        _profile_lock.release()
+
+
+def collapsed_stacks(samples: CounterType[str]) -> str:
+    """샘플을 flamegraph.pl/speedscope가 읽는 접힌 스택 형식("프레임;프레임 개수" 줄)으로 만듭니다."""
+    return "".join(f"{stack} {count}\n" for stack, count in samples.most_common())
@@ -0,0 +1,138 @@
+from typing import Any, Dict, List, Optional
+from functools import lru_cache
+import hashlib
+import json
+import math
+import os
+import random
+import threading
+import time
+from loguru import logger
+from app.config.replay_config import ReplayConfig
+
+REPLAY_MODES = ("record", "replay", "synthetic")
+
+_SYNTHETIC_WORDS = (
+    "안내", "신청", "절차", "서류", "기간", "비용", "확인", "필요", "가능", "기관",
+    "information", "service", "office", "required", "please", "check", "online", "document",
+)
+
+
+def request_key(kind: str, tier: str, payload: Dict[str, Any]) -> str:
+    """요청 종류/등급과 요청 내용으로 기록 조회 키(SHA-256)를 만듭니다."""
+    body = json.dumps({"kind": kind, "tier": tier, **payload}, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(body.encode("utf-8")).hexdigest()
+
+
+class ReplayStore:
+    """
+    요청→응답 기록 파일 (JSONL, 한 줄에 기록 하나)
+
+    처음 조회할 때 파일 전체를 메모리에 읽고, 같은 키를 여러 번 기록하면 마지막 기록을 사용합니다.
+    기록은 줄 단위로 덧붙이므로 여러 워커가 같은 파일에 기록해도 줄이 섞이지 않습니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._records: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self._records is None:
+            records: Dict[str, Dict[str, Any]] = {}
+            if os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as f:
+                    for line in f:
+                        if line.strip():
+                            record = json.loads(line)
+                            records[record["key"]] = record
+            self._records = records
+            logger.info(f"[대역] 기록 로드: {self.path} ({len(records)}개)")
+        return self._records
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            return self._load().get(key)
+
+    def put(self, key: str, record: Dict[str, Any]) -> None:
+        record = {"key": key, "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"), **record}
+        with self._lock:
+            self._load()[key] = record
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load())
+
+
+class SyntheticProfile:
+    """
+    synthetic 모드의 지연 시간/출력 길이/오류 주입 모델
+
+    지연 시간은 로그정규 분포(중앙값, 산포 sigma)를 따르고, LLM은 첫 토큰 지연에 출력 토큰 수 / 토큰 속도를 더합니다.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        seed = ReplayConfig.SEED if seed is None else seed
+        self.rng = random.Random(seed or None)
+        self._lock = threading.Lock()
+
+    def lognormal_seconds(self, median_ms: float, sigma: float) -> float:
+        with self._lock:
+            return max(median_ms, 0.0) / 1000 * math.exp(sigma * self.rng.gauss(0.0, 1.0))
+
+    def output_tokens(self, mean: Optional[int] = None) -> int:
+        mean = mean or ReplayConfig.LLM_OUTPUT_TOKENS
+        with self._lock:
+            return max(1, self.rng.randint(mean // 2, mean * 3 // 2))
+
+    def llm_seconds(self, tokens: int) -> float:
+        ttft = self.lognormal_seconds(ReplayConfig.LLM_TTFT_MS, ReplayConfig.LLM_LATENCY_SIGMA)
+        return ttft + tokens / max(ReplayConfig.LLM_TOKENS_PER_SECOND, 1e-6)
+
+    def failure(self) -> Optional[str]:
+        """주입할 오류 종류를 반환합니다 ("timeout", "error", 없으면 None)."""
+        with self._lock:
+            draw = self.rng.random()
+        if draw < ReplayConfig.TIMEOUT_RATE:
+            return "timeout"
+        if draw < ReplayConfig.TIMEOUT_RATE + ReplayConfig.ERROR_RATE:
+            return "error"
+        return None
+
+    def text(self, prompt: str, tokens: int) -> str:
+        """프롬프트에 대해 결정적인 가짜 텍스트를 만듭니다 (단어 하나 ≈ 토큰 하나)."""
+        words = random.Random(request_key("text", "", {"prompt": prompt})).choices(_SYNTHETIC_WORDS, k=tokens)
+        return " ".join(words)
+
+    def search_results(self, query: str, max_results: int) -> List[Dict[str, str]]:
+        digest = request_key("search", "", {"query": query})[:12]
+        return [
+            {
+                "title": f"{query} - 결과 {rank}",
+                "url": f"https://synthetic.invalid/{digest}/{rank}",
+                "snippet": self.text(f"{query}:{rank}", 30),
+            }
+            for rank in range(1, max_results + 1)
+        ]
+
+
+@lru_cache(maxsize=None)
+def get_replay_store(kind: str) -> ReplayStore:
+    """종류(llm, web_search)별 기록 파일을 반환합니다."""
+    return ReplayStore(os.path.join(ReplayConfig.DIR, f"{kind}.jsonl"))
+
+
+@lru_cache(maxsize=None)
+def get_synthetic_profile() -> SyntheticProfile:
+    """프로세스 전역 synthetic 모델을 반환합니다 (REPLAY_SEED를 지정하면 재현 가능)."""
+    return SyntheticProfile()
+
+
+def replay_mode() -> str:
+    """현재 대역 모드를 확인해 반환합니다."""
+    if ReplayConfig.MODE not in REPLAY_MODES:
+        raise ValueError(f"지원하지 않는 REPLAY_MODE: {ReplayConfig.MODE} ({', '.join(REPLAY_MODES)})")
+    return ReplayConfig.MODE
@@ -0,0 +1,50 @@
+from typing import Callable, List
+import asyncio
+import signal
+import threading
+from loguru import logger
+
+
+def drain_before_exit(begin_drain: Callable[[], "asyncio.Future"], signals=(signal.SIGTERM,)) -> None:
+    """
+    서버(uvicorn)가 설치한 종료 신호 처리기를 감싸, 리스너를 닫기 전에 드레인을 먼저 실행합니다.
+    uvicorn은 SIGTERM을 받으면 바로 새 연결을 끊고 진행 중인 요청을 기다린 뒤 shutdown 이벤트를 보내므로,
+    그 전에 Eureka 등록 해제와 드레인을 하려면 신호를 먼저 받아야 합니다.
+    드레인이 끝나면 원래 처리기를 호출해 평소처럼 종료합니다. 드레인 중 같은 신호를 다시 받으면 바로 넘깁니다.
+    이벤트 루프가 도는 메인 스레드의 시작 이벤트에서 호출합니다.
+    uvicorn 0.29 이상(signal.signal로 처리기 설치)이 필요합니다. 이전 버전처럼 loop.add_signal_handler로 설치한 처리기는
+    감쌀 수 없으므로 경고만 남기고 넘어갑니다 (드레인은 shutdown 이벤트에서만 실행).
+
+    Args:
+        begin_drain: 드레인 태스크를 시작(이미 시작했으면 그 태스크를 반환)하는 함수
+        signals: 가로챌 신호
+    """
+    if threading.current_thread() is not threading.main_thread():
+        logger.warning("[종료] 메인 스레드가 아니어서 종료 신호를 가로채지 않습니다 (드레인은 shutdown 이벤트에서만 실행).")
+        return
+    loop = asyncio.get_running_loop()
+    received: List[int] = []
+
+    def start(signum, frame, original) -> None:
+        logger.info(f"[종료] {signal.Signals(signum).name} 수신, 드레인을 시작합니다.")
+        begin_drain().add_done_callback(lambda _: original(signum, frame))
+    for sig in signals:
+        original = signal.getsignal(sig)
+        if not callable(original):
+            continue
+        if getattr(original, "__module__", None) == "asyncio.unix_events":
+            logger.warning(
+                f"[종료] {signal.Signals(sig).name} 처리기가 이벤트 루프에 등록되어 있어 가로채지 않습니다 "
+                "(uvicorn 0.29 이상 필요, 드레인은 shutdown 이벤트에서만 실행)."
+            )
+            continue
+
+        def handler(signum, frame, original=original):
+            if received:
+                original(signum, frame)
+                return
+            received.append(signum)
+            # 신호 처리기 안에서는 로그(잠금)를 쓰지 않고 루프에 넘김
+            loop.call_soon_threadsafe(start, signum, frame, original)
+
+        signal.signal(sig, handler)
@@ -0,0 +1,123 @@
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from contextlib import contextmanager
+from functools import lru_cache
+import asyncio
+import threading
+import time
+import psutil
+from loguru import logger
+
+
+class StartupReport:
+    """
+    서버 시작 단계별 소요 시간 (모듈 import, 로깅 설정, 시작 이벤트 작업 등)
+
+    프로세스 시작부터 준비 완료까지의 전체 시간과 함께 남기므로, 단계에 잡히지 않은 시간(인터프리터 시작 등)도 알 수 있습니다.
+    """
+
+    def __init__(self):
+        self.process_started = psutil.Process().create_time()
+        self.phases: List[Tuple[str, float]] = []
+        self.ready_seconds: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        블록 실행 시간을 단계 하나로 기록합니다.
+
+        Args:
+            name: 단계 이름 (import.api, startup.eureka 등)
+        """
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases.append((name, time.perf_counter() - started))
+
+    def finish(self) -> None:
+        """시작이 끝났음을 표시하고 단계별 시간을 로그로 남깁니다."""
+        self.ready_seconds = time.time() - self.process_started
+        breakdown = ", ".join(f"{name} {seconds:.2f}초" for name, seconds in self.phases)
+        logger.info(f"[시작] 준비 완료: 프로세스 시작 후 {self.ready_seconds:.2f}초 ({breakdown})")
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            phases = [{"name": name, "seconds": round(seconds, 3)} for name, seconds in self.phases]
+        return {
+            "ready_seconds": round(self.ready_seconds, 3) if self.ready_seconds is not None else None,
+            "phases": phases,
+        }
+
+
+class Readiness:
+    """
+    요청을 받을 준비 상태 (/health/ready)
+
+    예열 단계별 결과(checks)를 모아 두고, 필수 단계가 모두 성공하면 준비 상태가 됩니다.
+    종료 중(draining)에는 다시 준비되지 않은 상태가 되고, 진행 중인 요청 수(inflight)로 드레인 완료를 판단합니다.
+    프로세스가 살아 있는지(/health/live)와는 별개입니다.
+    """
+
+    def __init__(self):
+        self.ready = False
+        self.draining = False
+        self.inflight = 0  # 이벤트 루프에서만 바꿈 (요청 미들웨어)
+        self.checks: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def accepting(self) -> bool:
+        """새 요청을 받을 수 있는지 여부 (준비 완료이고 종료 중이 아님)"""
+        return self.ready and not self.draining
+
+    def record(self, name: str, status: str, seconds: float, critical: bool, detail: Optional[Any] = None) -> None:
+        """
+        예열 단계 결과를 기록합니다.
+
+        Args:
+            name: 단계 이름 (embeddings, retrieval, llm 등)
+            status: ok 또는 failed
+            seconds: 소요 시간(초)
+            critical: 실패하면 준비 상태가 될 수 없는 단계인지 여부
+            detail: 단계별 세부 정보 또는 오류 메시지
+        """
+        with self._lock:
+            self.checks[name] = {"status": status, "seconds": round(seconds, 3), "critical": critical, "detail": detail}
+
+    def set_ready(self, ready: bool) -> None:
+        self.ready = ready
+
+    def start_draining(self) -> None:
+        """새 요청을 더 받지 않도록 표시합니다."""
+        self.draining = True
+
+    async def wait_idle(self, timeout: float) -> int:
+        """
+        진행 중인 요청이 모두 끝나기를 timeout(초)까지 기다립니다.
+
+        Returns:
+            int: 제한 시간이 지나도 끝나지 않은 요청 수 (모두 끝났으면 0)
+        """
+        deadline = time.monotonic() + timeout
+        while self.inflight > 0 and time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+        return self.inflight
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            checks = {name: dict(check) for name, check in self.checks.items()}
+        return {"ready": self.accepting, "draining": self.draining, "inflight": self.inflight, "checks": checks}
+
+
+@lru_cache(maxsize=1)
+def get_startup_report() -> StartupReport:
+    """프로세스 전역 시작 시간 기록을 반환합니다."""
+    return StartupReport()
+
+
+@lru_cache(maxsize=1)
+def get_readiness() -> Readiness:
+    """프로세스 전역 준비 상태를 반환합니다."""
+    return Readiness()
@@ -0,0 +1,316 @@
+from typing import Any, Dict, Iterator, List, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import lru_cache
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from loguru import logger
+from app.config.tracing_config import TracingConfig
+
+
+class Span:
+    """요청 안의 구간 하나 (단계, 외부 호출 등)"""
+
+    def __init__(self, name: str, span_id: int, parent_id: Optional[int], offset_ms: float, attrs: Dict[str, Any]):
+        self.name = name
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.offset_ms = offset_ms  # 요청 시작부터 구간 시작까지
+        self.duration_ms: Optional[float] = None
+        self.status = "ok"
+        self.attrs = {key: value for key, value in attrs.items() if value is not None}
+
+    def set(self, **attrs: Any) -> None:
+        """속성을 설정합니다 (None은 무시)."""
+        self.attrs.update({key: value for key, value in attrs.items() if value is not None})
+
+    def add(self, **counts: float) -> None:
+        """숫자 속성에 더합니다 (한 구간 안에서 여러 번 호출한 LLM의 토큰 수 등)."""
+        for key, value in counts.items():
+            if value is not None:
+                self.attrs[key] = self.attrs.get(key, 0) + value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "id": self.span_id,
+            "parent": self.parent_id,
+            "start_ms": round(self.offset_ms, 1),
+            "duration_ms": round(self.duration_ms, 1) if self.duration_ms is not None else None,
+            "status": self.status,
+            **({"attrs": self.attrs} if self.attrs else {}),
+        }
+
+
+class Trace:
+    """요청 하나의 추적 정보 (request_id와 구간 목록)"""
+
+    def __init__(self, name: str, request_id: str, attrs: Dict[str, Any]):
+        self.name = name
+        self.request_id = request_id
+        self.attrs = {key: value for key, value in attrs.items() if value is not None}
+        self.started_at = time.time()
+        self.started = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.status = "ok"
+        self.error: Optional[str] = None
+        self.spans: List[Span] = []
+        self.dropped_spans = 0
+        self.payloads: List[Dict[str, Any]] = []
+        self.usage: Dict[str, Dict[str, float]] = {}  # 단계별 LLM 사용량
+        # 이 요청의 본문을 로그에도 남길지 (요청 단위 표본)
+        self.log_payloads = TracingConfig.LOG_PAYLOADS or random.random() < TracingConfig.PAYLOAD_SAMPLE_RATE
+        # 검색 스레드 풀에서도 구간을 추가하므로 잠금
+        self._lock = threading.Lock()
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def open_span(self, name: str, parent: Optional[Span], attrs: Dict[str, Any]) -> Span:
+        with self._lock:
+            span = Span(name, len(self.spans) + self.dropped_spans + 1, parent.span_id if parent else None, self.elapsed_ms(), attrs)
+            if len(self.spans) < TracingConfig.MAX_SPANS:
+                self.spans.append(span)
+            else:
+                self.dropped_spans += 1
+        return span
+
+    def add_payload(self, label: str, text: str, span_id: Optional[int]) -> None:
+        with self._lock:
+            if len(self.payloads) < TracingConfig.MAX_PAYLOADS:
+                # 자르는 것은 기록할 때 (대부분의 요청은 기록되지 않음)
+                self.payloads.append({"label": label, "span": span_id, "text": text})
+
+    def add_usage(self, stage: str, prompt_tokens: Optional[int], completion_tokens: Optional[int], seconds: float) -> None:
+        with self._lock:
+            entry = self.usage.setdefault(stage, {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "seconds": 0.0})
+            entry["calls"] += 1
+            entry["prompt_tokens"] += prompt_tokens or 0
+            entry["completion_tokens"] += completion_tokens or 0
+            entry["seconds"] += seconds
+
+    def usage_summary(self) -> Dict[str, Any]:
+        """
+        단계별 LLM 호출 수, 토큰 수, 생성 속도(tokens/sec)와 합계를 반환합니다.
+        제공자가 토큰 수를 알려 주지 않은 호출(replay 재생 등)은 호출 수만 셉니다.
+        """
+        with self._lock:
+            stages = {stage: dict(entry) for stage, entry in self.usage.items()}
+        total = {"calls": 0, "prompt_tokens": 0, "completion_tokens": 0, "seconds": 0.0}
+        for entry in stages.values():
+            for key in total:
+                total[key] += entry[key]
+        for entry in list(stages.values()) + [total]:
+            entry["tokens_per_second"] = round(entry["completion_tokens"] / entry["seconds"], 1) if entry["seconds"] > 0 else None
+            entry["seconds"] = round(entry["seconds"], 3)
+        return {"stages": stages, "total": total}
+
+    def to_dict(self) -> Dict[str, Any]:
+        usage = self.usage_summary() if self.usage else None
+        with self._lock:
+            spans = [span.to_dict() for span in self.spans]
+            payloads = [
+                {**payload, "chars": len(payload["text"]), "text": payload["text"][:TracingConfig.PAYLOAD_MAX_CHARS]}
+                for payload in self.payloads
+            ]
+        return {
+            "request_id": self.request_id,
+            "name": self.name,
+            "started_at": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(self.started_at)),
+            "duration_ms": round(self.duration_ms, 1) if self.duration_ms is not None else round(self.elapsed_ms(), 1),
+            "status": self.status,
+            **({"error": self.error} if self.error else {}),
+            **({"attrs": self.attrs} if self.attrs else {}),
+            **({"usage": usage} if usage else {}),
+            "spans": spans,
+            **({"dropped_spans": self.dropped_spans} if self.dropped_spans else {}),
+            **({"payloads": payloads} if payloads else {}),
+        }
+
+
+class FlightRecorder:
+    """
+    느린 요청 기록 파일 (JSONL, 디스크 사용량 제한)
+
+    파일이 max_bytes를 넘으면 <파일>.1로 넘기고(이전 .1은 삭제) 새로 쓰므로 최대 두 파일, 약 2×max_bytes만 사용합니다.
+    워커마다 한 줄씩 덧붙여 쓰므로 여러 워커가 같은 파일에 기록해도 줄이 섞이지 않습니다.
+    """
+
+    def __init__(self, path: str, max_bytes: Optional[int] = None):
+        self.path = path
+        self.max_bytes = max_bytes or TracingConfig.MAX_BYTES
+        self._lock = threading.Lock()
+
+    def write(self, record: Dict[str, Any]) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            try:
+                if os.path.getsize(self.path) + len(line) > self.max_bytes:
+                    os.replace(self.path, f"{self.path}.1")
+            except FileNotFoundError:
+                pass
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """최근 기록을 최신순으로 반환합니다."""
+        records: List[Dict[str, Any]] = []
+        with self._lock:
+            for path in (self.path, f"{self.path}.1"):
+                if not os.path.exists(path):
+                    continue
+                with open(path, encoding="utf-8") as f:
+                    lines = f.readlines()
+                records.extend(json.loads(line) for line in reversed(lines) if line.strip())
+                if len(records) >= limit:
+                    break
+        return records[:limit]
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("current_trace", default=None)
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+@lru_cache(maxsize=1)
+def get_flight_recorder() -> FlightRecorder:
+    """프로세스 전역 느린 요청 기록기를 반환합니다."""
+    return FlightRecorder(os.path.join(TracingConfig.DIR, "slow_requests.jsonl"))
+
+
+def new_request_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def current_request_id() -> Optional[str]:
+    trace = _current_trace.get()
+    return trace.request_id if trace is not None else None
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+def annotate(**attrs: Any) -> None:
+    """현재 구간에 속성을 설정합니다 (추적 중이 아니면 무시)."""
+    span = _current_span.get()
+    if span is not None:
+        span.set(**attrs)
+
+
+def add_counts(**counts: float) -> None:
+    """현재 구간의 숫자 속성에 더합니다 (추적 중이 아니면 무시)."""
+    span = _current_span.get()
+    if span is not None:
+        span.add(**counts)
+
+
+def add_usage(stage: str, prompt_tokens: Optional[int], completion_tokens: Optional[int], seconds: float) -> None:
+    """현재 요청의 단계별 LLM 사용량에 더합니다 (추적 중이 아니면 무시)."""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add_usage(stage, prompt_tokens, completion_tokens, seconds)
+
+
+def log_usage(uid: str, usage: Dict[str, Any]) -> None:
+    """
+    요청의 LLM 사용량을 uid와 함께 남깁니다 (JSON 로그에서는 extra.uid, extra.usage로 사용자별 집계).
+    uid는 값의 종류가 많아 지표 라벨로 쓰지 않습니다.
+    """
+    total = usage["total"]
+    logger.opt(depth=1).bind(uid=uid, usage=usage).info(
+        "[사용량] LLM {}회, 토큰 {}+{}, {} tokens/s",
+        total["calls"], total["prompt_tokens"], total["completion_tokens"], total["tokens_per_second"] or "-"
+    )
+
+
+def log_payload(label: str, text: Optional[str]) -> None:
+    """
+    프롬프트/컨텍스트/응답 같은 큰 본문을 남깁니다.
+    요청을 추적 중이면 요청에 참조만 담아 두고(느린 요청으로 기록될 때만 잘라서 파일에 씀),
+    로그에는 LOG_PAYLOADS=true이거나 표본으로 뽑힌 요청일 때만 씁니다. 그 외에는 문자열을 만들지 않습니다.
+
+    Args:
+        label: 본문 이름 (generate.prompt 등)
+        text: 본문
+    """
+    if not text:
+        return
+    trace = _current_trace.get()
+    if trace is not None and TracingConfig.CAPTURE_PAYLOADS:
+        span = _current_span.get()
+        trace.add_payload(label, text, span.span_id if span is not None else None)
+    if trace.log_payloads if trace is not None else TracingConfig.LOG_PAYLOADS:
+        logger.opt(depth=1).info("[본문] {} ({}자): {}", label, len(text), text)
+
+
+@contextmanager
+def start_trace(name: str, request_id: Optional[str] = None, **attrs: Any) -> Iterator[Trace]:
+    """
+    요청 추적을 시작합니다. 안에서 남기는 로그에는 request_id가 붙고, 안에서 만든 태스크도 같은 추적을 이어받습니다.
+    처리 시간이 TRACE_SLOW_REQUEST_SECONDS 이상이면 구간 목록을 느린 요청 기록 파일에 씁니다.
+
+    Args:
+        name: 요청 이름 (경로 등)
+        request_id: 요청 ID (없으면 새로 만듦)
+        attrs: 요청 속성 (uid 등)
+    """
+    trace = Trace(name, request_id or new_request_id(), attrs)
+    trace_token = _current_trace.set(trace)
+    span_token = _current_span.set(None)
+    try:
+        with logger.contextualize(request_id=trace.request_id):
+            yield trace
+    except asyncio.CancelledError:
+        trace.status = "cancelled"
+        raise
+    except Exception as e:
+        trace.status = "error"
+        trace.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(span_token)
+        _current_trace.reset(trace_token)
+        trace.duration_ms = trace.elapsed_ms()
+        if TracingConfig.ENABLED and trace.duration_ms >= TracingConfig.SLOW_REQUEST_SECONDS * 1000:
+            try:
+                get_flight_recorder().write(trace.to_dict())
+                logger.warning(f"[추적] 느린 요청 기록: {trace.request_id} ({trace.duration_ms / 1000:.1f}초)")
+            except OSError as e:
+                logger.error(f"[추적] 느린 요청 기록 실패: {str(e)}")
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Span]:
+    """
+    현재 요청 안에 구간을 만듭니다. 추적 중이 아니면 기록하지 않는 구간을 돌려줍니다.
+
+    Args:
+        name: 구간 이름
+        attrs: 구간 속성 (제공자, 모델 등)
+    """
+    trace = _current_trace.get()
+    parent = _current_span.get()
+    if trace is None:
+        current = Span(name, 0, None, 0.0, attrs)
+    else:
+        current = trace.open_span(name, parent, attrs)
+    token = _current_span.set(current)
+    started = time.perf_counter()
+    try:
+        yield current
+    except asyncio.CancelledError:
+        current.status = "cancelled"
+        raise
+    except Exception as e:
+        current.status = "error"
+        current.set(error=f"{type(e).__name__}: {e}")
+        raise
+    finally:
+        current.duration_ms = (time.perf_counter() - started) * 1000
+        _current_span.reset(token)
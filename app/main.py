@@ -1,20 +1,46 @@
 # app/main.py
 
-from fastapi import FastAPI, Request
-from app.api.v1 import chatbot
-from app.config.logging_config import setup_logging
-from fastapi.middleware.cors import CORSMiddleware
-from loguru import logger
-import os
-from dotenv import load_dotenv
-from py_eureka_client import eureka_client
-from app.config.settings import settings
+from app.core.startup import get_startup_report
+
+# 구성 요소별 시작 시간 (import 비용이 늘면 여기서 드러남, GET /api/v1/admin/startup)
+startup_report = get_startup_report()
+
+with startup_report.phase("import.framework"):
+    from fastapi import FastAPI, Request, Response
+    from fastapi.middleware.cors import CORSMiddleware
+    from fastapi.responses import JSONResponse
+    from loguru import logger
+    from typing import Optional
+    import asyncio
+    import os
+    from dotenv import load_dotenv
+    from py_eureka_client import eureka_client
+with startup_report.phase("import.config"):
+    from app.config.logging_config import setup_logging
+    from app.config.settings import settings
+    from app.config.profiling_config import ProfilingConfig
+    from app.config.rag_config import RAGConfig
+    from app.config.shutdown_config import ShutdownConfig
+with startup_report.phase("import.core"):
+    from app.core.http_client import close_http_client
+    from app.core.metrics import INFLIGHT_REQUESTS, metrics_payload
+    from app.core.profiling import get_loop_monitor
+    from app.core.shutdown import drain_before_exit
+    from app.core.startup import get_readiness
+with startup_report.phase("import.api"):
+    from app.api import health
+    from app.api.v1 import admin, chatbot
+    from app.services.common.rag_service import get_rag_service
+    from app.services.common.vectorstore_snapshots import SnapshotWatcher
+    from app.services.common.web_search_cache import save_state
+    from app.services.common.warmup_service import warm_up
 
 # .env 파일 로드
 load_dotenv()
 
 # Setup logging
-logger = setup_logging()
+with startup_report.phase("logging"):
+    logger = setup_logging()
 logger.info("Application starting up...")
 
 app = FastAPI(
@@ -37,21 +63,133 @@ app = FastAPI(
 
 # API 라우터 등록
 app.include_router(chatbot.router, prefix="/api/v1")
+app.include_router(admin.router, prefix="/api/v1")
+app.include_router(health.router)
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 지표 (단계별 처리 시간, 캐시/대체 응답/타임아웃, 진행 중 요청, 제공자 대기 수)"""
+    payload, content_type = metrics_payload()
+    return Response(content=payload, media_type=content_type)
+
+# 지표 라벨로 쓸 경로 (경로 변수가 있는 관리 API 등은 "other"로 묶어 라벨 수를 제한)
+_METRIC_ENDPOINTS = {route.path for route in app.routes if "{" not in route.path}
+# 드레인 중에도 응답하는 경로 (상태 확인과 지표 수집)
+_DRAIN_EXEMPT_ENDPOINTS = {"/health/live", "/health/ready", "/metrics"}
+
+readiness = get_readiness()
+
+@app.middleware("http")
+async def track_inflight_requests(request: Request, call_next):
+    path = request.url.path
+    # 드레인은 상태 확인/지표 수집이 아닌 요청만 기다림
+    drained = path not in _DRAIN_EXEMPT_ENDPOINTS
+    if readiness.draining and drained:
+        # 게이트웨이가 다른 인스턴스로 재시도하도록 거절하고 연결도 닫음
+        return JSONResponse(
+            status_code=503,
+            content={"detail": "서버가 종료 중입니다."},
+            headers={"Retry-After": str(ShutdownConfig.RETRY_AFTER_SECONDS), "Connection": "close"}
+        )
+    inflight = INFLIGHT_REQUESTS.labels(endpoint=path if path in _METRIC_ENDPOINTS else "other")
+    inflight.inc()
+    readiness.inflight += int(drained)
+    try:
+        return await call_next(request)
+    finally:
+        inflight.dec()
+        readiness.inflight -= int(drained)
+
+# 벡터 스토어 스냅샷 감시 (RAG 서비스가 로드된 뒤부터 CURRENT 변경을 따라감, 사이드카 모드에서는 사이드카가 감시)
+snapshot_watcher = SnapshotWatcher(lambda: get_rag_service() if get_rag_service.cache_info().currsize else None)
+
+# 예열 후 Eureka 등록 태스크 (예열 중에도 /health/live는 응답해야 하므로 시작 이벤트를 막지 않음)
+warmup_task: Optional[asyncio.Task] = None
+eureka_registered = False
+# 종료 시 드레인 태스크 (SIGTERM 처리기와 shutdown 이벤트가 같은 태스크를 기다림)
+drain_task: Optional[asyncio.Task] = None
+
+async def warm_up_and_register():
+    """예열을 마친 뒤에만 Eureka에 등록합니다. 필수 예열 단계가 실패하면 등록하지 않습니다."""
+    global eureka_registered
+    if not await warm_up():
+        logger.error("[시작] 예열에 실패해 Eureka에 등록하지 않습니다. GET /health/ready에서 단계별 결과를 확인하세요.")
+        return
+    instance_url = f"http://{settings.EUREKA_INSTANCE_HOST}:{settings.EUREKA_INSTANCE_PORT}"
+    try:
+        with startup_report.phase("startup.eureka"):
+            await eureka_client.init_async(
+                eureka_server=settings.EUREKA_IP,
+                app_name=settings.EUREKA_APP_NAME,
+                instance_host=settings.EUREKA_INSTANCE_HOST,
+                instance_port=settings.EUREKA_INSTANCE_PORT,
+                health_check_url=f"{instance_url}/health/ready",
+                status_page_url=f"{instance_url}/health/live"
+            )
+    except Exception as e:
+        logger.error(f"[시작] Eureka 등록 실패: {str(e)}")
+        return
+    eureka_registered = True
+    startup_report.finish()
+
+async def drain():
+    """Eureka 등록을 해제하고, 새 요청을 거절한 뒤 진행 중인 요청이 끝나기를 기다립니다 (ShutdownConfig)."""
+    if warmup_task is not None and not warmup_task.done():
+        warmup_task.cancel()
+    # /health/ready는 바로 503 (헬스 체크로 라우팅하는 쪽도 빼도록), 요청은 아래 지연 동안 계속 받음
+    readiness.set_ready(False)
+    if eureka_registered:
+        try:
+            await eureka_client.stop_async()
+            logger.info(f"[종료] Eureka 등록 해제, {ShutdownConfig.DEREGISTER_DELAY_SECONDS:.0f}초 동안 계속 요청을 받습니다.")
+        except Exception as e:
+            logger.error(f"[종료] Eureka 등록 해제 실패: {str(e)}")
+        # 게이트웨이가 인스턴스 목록을 갱신하기 전까지 들어오는 요청은 처리
+        await asyncio.sleep(ShutdownConfig.DEREGISTER_DELAY_SECONDS)
+    readiness.start_draining()
+    logger.info(f"[종료] 새 요청 거절, 진행 중인 요청 {readiness.inflight}개 완료 대기 (최대 {ShutdownConfig.DRAIN_TIMEOUT_SECONDS:.0f}초)")
+    remaining = await readiness.wait_idle(ShutdownConfig.DRAIN_TIMEOUT_SECONDS)
+    if remaining:
+        logger.warning(f"[종료] 드레인 제한 시간이 지나 진행 중인 요청 {remaining}개를 남기고 종료합니다.")
+    else:
+        logger.info("[종료] 진행 중인 요청 모두 완료")
+
+def begin_drain() -> asyncio.Task:
+    """드레인을 시작합니다. 이미 시작했으면 진행 중인 드레인 태스크를 반환합니다."""
+    global drain_task
+    if drain_task is None:
+        drain_task = asyncio.get_running_loop().create_task(drain())
+    return drain_task
 
 @app.on_event("startup")
 async def startup_event():
+    global warmup_task
     logger.info("[WORKFLOW] Server started successfully")
-    await eureka_client.init_async(
-        eureka_server=settings.EUREKA_IP,
-        app_name=settings.EUREKA_APP_NAME,
-        instance_host=settings.EUREKA_INSTANCE_HOST,
-        instance_port=settings.EUREKA_INSTANCE_PORT
-    )
+    if ProfilingConfig.LOOP_MONITOR_ENABLED:
+        get_loop_monitor().start()
+    if not RAGConfig.SIDECAR_SOCKET:
+        snapshot_watcher.start()
+    warmup_task = asyncio.get_running_loop().create_task(warm_up_and_register())
+    drain_before_exit(begin_drain)
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("[WORKFLOW] Server shutting down")
-    await eureka_client.stop_async()
+    # SIGTERM이면 이미 끝난 드레인을, 신호 없이 종료하면(개발 서버 재시작 등) 여기서 같은 순서로 드레인
+    await begin_drain()
+    try:
+        saved = await asyncio.to_thread(save_state)
+        if saved:
+            logger.info(f"[종료] 웹 검색 캐시 {saved['entries']}개와 할당량 사용량 저장")
+    except Exception as e:
+        logger.error(f"[종료] 웹 검색 상태 저장 실패: {str(e)}")
+    snapshot_watcher.stop()
+    await get_loop_monitor().stop()
+    await close_http_client()
+    if get_rag_service.cache_info().currsize:
+        get_rag_service().close()
+    # 큐에 남은 로그를 모두 쓴 뒤 종료
+    await logger.complete()
 
 if __name__ == "__main__":
     import uvicorn
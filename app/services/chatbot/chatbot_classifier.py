@@ -2,6 +2,7 @@ from typing import Dict, Any, Tuple
 from enum import Enum
 from loguru import logger
 from app.core.llm_client import get_llm_client
+from app.core.metrics import observe_stage, record_fallback, set_request_labels, timeout_reason
 
 class QueryType(str, Enum):
     """질의 유형"""
@@ -40,13 +41,17 @@ class ChatbotClassifier:
         try:
             logger.info(f"[분류] 질의 분류 시작: {query}")
             
-            # 질의 유형 분류
-            query_type = await self._classify_query_type(query)
-            logger.info(f"[분류] 질의 유형: {query_type.value}")
-            
-            # RAG 유형 분류
-            rag_type = await self._classify_rag_type(query)
-            logger.info(f"[분류] RAG 유형: {rag_type.value}")
+            with observe_stage("classify", provider=self.llm_client.provider, model=self.llm_client.model):
+                # 질의 유형 분류
+                query_type = await self._classify_query_type(query)
+                logger.info(f"[분류] 질의 유형: {query_type.value}")
+                
+                # RAG 유형 분류
+                rag_type = await self._classify_rag_type(query)
+                logger.info(f"[분류] RAG 유형: {rag_type.value}")
+                
+                # 이후 단계 지표에 분류 결과를 라벨로 붙임
+                set_request_labels(query_type=query_type, rag_type=rag_type)
             
             return query_type, rag_type
             
@@ -101,6 +106,7 @@ class ChatbotClassifier:
                 return QueryType.GENERAL
         except Exception as e:
             logger.error(f"질의 유형 분류 중 오류 발생: {str(e)}")
+            record_fallback("classify", timeout_reason(e))
             return QueryType.GENERAL
     
     async def _classify_rag_type(self, query: str) -> RAGType:
@@ -132,4 +138,5 @@ class ChatbotClassifier:
                 return RAGType.NONE
         except Exception as e:
             logger.error(f"RAG 유형 분류 중 오류 발생: {str(e)}")
+            record_fallback("classify", timeout_reason(e))
             return RAGType.NONE 
\ No newline at end of file
@@ -1,25 +1,27 @@
 from typing import Dict, Any, Optional
 import os
 from loguru import logger
-import torch
 from app.core.llm_client import get_llm_client
+from app.core.metrics import observe_stage, record_cache, record_fallback, timeout_reason
+from app.core.tracing import log_payload
 from app.services.chatbot.chatbot_classifier import QueryType, RAGType
-from app.services.common.rag_service import RAGService
+from app.services.common.rag_service import get_rag_service
+from app.services.common.faq_service import get_faq_service
 from app.services.common.web_search_service import WebSearchService
 from app.services.common.postprocessor import Postprocessor
+from app.services.common.context_assembler import estimate_tokens, start_savings_report
 
 class ChatbotResponseGenerator:
     """챗봇 응답 생성기"""
     
     def __init__(self):
-        self.rag_service = RAGService()
+        self.rag_service = get_rag_service()
+        self.faq_service = get_faq_service()
         self.web_search_service = WebSearchService()
         self.postprocessor = Postprocessor()
         # 고성능 모델로 Groq API 사용
         self.high_performance_llm = get_llm_client(is_lightweight=False)
         logger.info(f"[응답 생성기] Groq 고성능 모델 사용: {self.high_performance_llm.model}, 타임아웃: {self.high_performance_llm.timeout}초")
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        logger.info(f"[응답 생성기] 디바이스: {self.device}")
     
     async def generate_response(self, query: str, query_type: QueryType, rag_type: RAGType, lang_code: str) -> str:
         """
@@ -40,14 +42,30 @@ class ChatbotResponseGenerator:
             logger.info(f"[RESPONSE] RAG type: {rag_type.value}")
             logger.info(f"[RESPONSE] Language code: {lang_code}")
             
+            # 자주 묻는 질문은 검토를 거친 사전 답변으로 바로 응답 (LLM 호출 없음, 웹 검색 질의 제외)
+            if query_type != QueryType.WEB_SEARCH:
+                faq_match = await self.faq_service.alookup(rag_type, query, lang_code)
+                record_cache("faq", "hits" if faq_match else "misses")
+                if faq_match:
+                    return faq_match["answer"]
+            
+            # 요청 단위 컨텍스트 토큰 절감 집계
+            savings = start_savings_report()
+            
             if query_type == QueryType.REASONING:
-                return await self._generate_reasoning_response(query, rag_type, lang_code)
+                response = await self._generate_reasoning_response(query, rag_type, lang_code)
             elif query_type == QueryType.WEB_SEARCH:
-                return await self._generate_web_search_response(query, rag_type, lang_code)
+                response = await self._generate_web_search_response(query, rag_type, lang_code)
             elif query_type == QueryType.GENERAL:
-                return await self._generate_general_response(query, rag_type, lang_code)
+                response = await self._generate_general_response(query, rag_type, lang_code)
             else:
                 return "Sorry, currently only general conversation, reasoning, and web search type questions can be processed."
+            
+            logger.info(
+                f"[응답 생성기] 컨텍스트 토큰: {savings['input_tokens']} → {savings['output_tokens']} "
+                f"(절감 {savings['saved_tokens']})"
+            )
+            return response
                 
         except Exception as e:
             logger.error(f"응답 생성 중 오류 발생: {str(e)}")
@@ -59,10 +77,9 @@ class ChatbotResponseGenerator:
             # RAG 컨텍스트 생성
             context = ""
             if rag_type != RAGType.NONE:
-                context = await self.rag_service.get_context(rag_type, query)
+                context = await self.rag_service.get_context(rag_type, query, QueryType.GENERAL)
                 if context:
                     logger.info(f"[응답 생성기] RAG 컨텍스트 생성 완료: {len(context)}자")
-                    logger.debug(f"[RESPONSE] RAG context: {context[:200]}...")
                 else:
                     logger.info("[RESPONSE] No RAG context available")
             
@@ -77,11 +94,10 @@ Please provide a helpful response based on your general knowledge about life in
                 prompt = self._generate_prompt(query, context)
             
             logger.info("[응답 생성기] 프롬프트 생성 완료")
-            logger.debug(f"[RESPONSE] Generated prompt: {prompt}")
             
             # 응답 생성 (Groq 고성능 모델 사용)
             logger.info(f"[응답 생성기] 응답 생성 시작 (타임아웃: {self.high_performance_llm.timeout}초)")
-            response = await self.high_performance_llm.generate(prompt)
+            response = await self._generate_llm(prompt)
             
             # 후처리 적용
             if response:
@@ -93,11 +109,11 @@ Please provide a helpful response based on your general knowledge about life in
                 response = postprocessed["response"]
             
             logger.info(f"[응답 생성기] 응답 생성 완료: {len(response)}자")
-            logger.info(f"[RESPONSE] Generated response: {response}")
             
             return response.strip()
         except Exception as e:
             logger.error(f"일반 응답 생성 중 오류 발생: {str(e)}")
+            record_fallback("generate", timeout_reason(e))
             # 타임아웃 오류일 경우 실제 타임아웃 값을 포함한 메시지 반환
             if "타임아웃" in str(e):
                 return f"Sorry, the response generation timed out after {self.high_performance_llm.timeout} seconds. Please try again later."
@@ -111,7 +127,7 @@ Please provide a helpful response based on your general knowledge about life in
             # RAG 컨텍스트 가져오기
             context = ""
             if rag_type != RAGType.NONE:
-                context = await self.rag_service.get_context(rag_type, query)
+                context = await self.rag_service.get_context(rag_type, query, QueryType.REASONING)
                 if not context:
                     logger.warning("[응답 생성기] RAG 컨텍스트가 없습니다.")
                     logger.info("[RESPONSE] No RAG context available for reasoning")
@@ -125,7 +141,6 @@ Using chain-of-thought reasoning in your response.
 
 """
                 else:
-                    logger.debug(f"[RESPONSE] RAG context for reasoning: {context[:200]}...")
                     prompt = f"""The following is information about life in Korea for foreigners:
 
 {context}
@@ -144,11 +159,9 @@ Using chain-of-thought reasoning in your response.
 
 """
             
-            logger.debug(f"[RESPONSE] Reasoning prompt: {prompt[:200]}...")
-            
             # 응답 생성 (Groq 고성능 모델 사용)
             logger.info(f"[응답 생성기] 추론 응답 생성 시작 (타임아웃: {self.high_performance_llm.timeout}초)")
-            response = await self.high_performance_llm.generate(prompt)
+            response = await self._generate_llm(prompt)
             if not response:
                 logger.error("[응답 생성기] LLM 응답 생성 실패")
                 return "Sorry, an error occurred while generating the response."
@@ -162,13 +175,13 @@ Using chain-of-thought reasoning in your response.
                 )
                 response = postprocessed["response"]
             
-            logger.info("[응답 생성기] 추론 응답 생성 완료")
-            logger.info(f"[RESPONSE] Generated reasoning response: {response}")
+            logger.info(f"[응답 생성기] 추론 응답 생성 완료: {len(response)}자")
             
             return response.strip()
             
         except Exception as e:
             logger.error(f"추론 응답 생성 중 오류 발생: {str(e)}")
+            record_fallback("generate", timeout_reason(e))
             # 타임아웃 오류일 경우 실제 타임아웃 값을 포함한 메시지 반환
             if "타임아웃" in str(e):
                 return f"Sorry, the response generation timed out after {self.high_performance_llm.timeout} seconds. Please try again later."
@@ -182,13 +195,14 @@ Using chain-of-thought reasoning in your response.
             logger.info(f"[응답 생성기] 언어 코드: {lang_code}")
             
             # 웹 검색 실행
-            web_context = await self.web_search_service.get_context(query)
+            web_context = await self.web_search_service.get_context(query, rag_type=rag_type)
             logger.info(f"[응답 생성기] 웹 검색 컨텍스트 생성 완료: {len(web_context) if web_context else 0}자")
             
-            # RAG 컨텍스트도 함께 사용 (있는 경우)
+            # RAG 컨텍스트도 함께 사용 (있는 경우, 웹 검색 컨텍스트가 쓰고 남은 예산 안에서)
             rag_context = ""
-            if rag_type != RAGType.NONE:
-                rag_context = await self.rag_service.get_context(rag_type, query)
+            remaining_tokens = self.rag_service.context_assembler.budget_for(QueryType.WEB_SEARCH) - estimate_tokens(web_context)
+            if rag_type != RAGType.NONE and remaining_tokens > self.rag_service.context_assembler.min_chunk_tokens:
+                rag_context = await self.rag_service.get_context(rag_type, query, QueryType.WEB_SEARCH, max_tokens=remaining_tokens)
                 if rag_context:
                     logger.info(f"[응답 생성기] RAG 컨텍스트 생성 완료: {len(rag_context)}자")
             
@@ -213,7 +227,7 @@ query: {query}"""
             
             # 응답 생성 (Groq 고성능 모델 사용)
             logger.info(f"[응답 생성기] 웹 검색 응답 생성 시작 (타임아웃: {self.high_performance_llm.timeout}초)")
-            response = await self.high_performance_llm.generate(prompt)
+            response = await self._generate_llm(prompt)
             
             # 후처리 적용 (언어 코드와 RAG 타입 전달)
             if response:
@@ -224,14 +238,22 @@ query: {query}"""
                 )
                 response = postprocessed["response"]
             
-            logger.info("[응답 생성기] 웹 검색 응답 생성 완료")
-            logger.info(f"[응답 생성기] 생성된 응답: {response[:200]}...")
+            logger.info(f"[응답 생성기] 웹 검색 응답 생성 완료: {len(response)}자")
             
             return response.strip()
         except Exception as e:
             logger.error(f"웹 검색 응답 생성 중 오류 발생: {str(e)}")
+            record_fallback("generate", timeout_reason(e))
             return "죄송합니다. 응답 생성 중 오류가 발생했습니다."
     
+    async def _generate_llm(self, prompt: str) -> str:
+        """고성능 모델로 응답을 생성합니다 (generate 단계 지표 기록)."""
+        with observe_stage("generate", provider=self.high_performance_llm.provider, model=self.high_performance_llm.model):
+            log_payload("generate.prompt", prompt)
+            response = await self.high_performance_llm.generate(prompt)
+            log_payload("generate.response", response)
+            return response
+    
     def _generate_prompt(self, query: str, context: str = "") -> str:
         """프롬프트를 생성합니다."""
         base_prompt = f"""
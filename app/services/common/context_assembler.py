@@ -0,0 +1,209 @@
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+import re
+from contextvars import ContextVar
+from loguru import logger
+from app.config.rag_config import RAGConfig
+from app.services.common.text_chunker import normalize_text
+
+_WORD_PATTERN = re.compile(r"[A-Za-z0-9]+")
+_CJK_PATTERN = re.compile(r"[ᄀ-ᇿ぀-ヿ㄰-㆏一-鿿가-힣]")
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?。])\s+|\n+")
+
+# 요청 단위 토큰 절감 집계 (생성기에서 start_savings_report로 시작)
+_savings_report: ContextVar[Optional[Dict[str, int]]] = ContextVar("context_savings_report", default=None)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    프롬프트 토큰 수를 추정합니다.
+    영문/숫자 단어는 약 1.3토큰, 한글/한자/가나는 글자당 1토큰, 그 외 기호는 4글자당 1토큰으로 계산합니다.
+    """
+    if not text:
+        return 0
+    words = _WORD_PATTERN.findall(text)
+    cjk_chars = len(_CJK_PATTERN.findall(text))
+    word_chars = sum(len(word) for word in words)
+    other_chars = len(text) - word_chars - cjk_chars - text.count(" ")
+    return int(len(words) * 1.3 + cjk_chars + max(other_chars, 0) / 4) + 1
+
+
+def shingles(text: str, size: int = 5) -> Set[str]:
+    """정규화한 텍스트의 문자 n-gram 집합을 반환합니다."""
+    normalized = normalize_text(text).lower()
+    if len(normalized) <= size:
+        return {normalized}
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """문장 경계에서 잘라 max_tokens 이내로 맞춥니다. 첫 문장도 넘치면 글자 단위로 자릅니다."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    kept: List[str] = []
+    used = 0
+    for sentence in _SENTENCE_PATTERN.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        tokens = estimate_tokens(sentence)
+        if used + tokens > max_tokens:
+            break
+        kept.append(sentence)
+        used += tokens
+    if kept:
+        return " ".join(kept)
+    # 문장 하나가 예산보다 길면 비율로 자름
+    ratio = max_tokens / max(estimate_tokens(text), 1)
+    return text[:max(int(len(text) * ratio), 1)].rstrip()
+
+
+def start_savings_report() -> Dict[str, int]:
+    """현재 요청의 토큰 절감 집계를 시작합니다."""
+    report = {"input_tokens": 0, "output_tokens": 0, "saved_tokens": 0}
+    _savings_report.set(report)
+    return report
+
+
+def get_savings_report() -> Optional[Dict[str, int]]:
+    """현재 요청의 토큰 절감 집계를 반환합니다."""
+    return _savings_report.get()
+
+
+class ContextAssembler:
+    """토큰 예산 기반 컨텍스트 조립기"""
+
+    def __init__(
+        self,
+        budgets: Optional[Dict[str, int]] = None,
+        duplicate_threshold: float = RAGConfig.CONTEXT_DUPLICATE_THRESHOLD,
+        mmr_lambda: float = RAGConfig.CONTEXT_MMR_LAMBDA,
+        min_chunk_tokens: int = 32
+    ):
+        self.budgets = budgets or RAGConfig.CONTEXT_TOKEN_BUDGETS
+        self.duplicate_threshold = duplicate_threshold
+        self.mmr_lambda = mmr_lambda
+        self.min_chunk_tokens = min_chunk_tokens
+
+    def budget_for(self, query_type: Any) -> int:
+        """질의 유형별 토큰 예산을 반환합니다."""
+        key = getattr(query_type, "value", query_type)
+        return self.budgets.get(key, self.budgets["general"])
+
+    def assemble(
+        self,
+        chunks: Sequence[str],
+        query_type: Any = "general",
+        max_tokens: Optional[int] = None,
+        separator: str = "\n\n",
+        diversify: bool = True,
+        tag: str = "CONTEXT"
+    ) -> Tuple[str, Dict[str, int]]:
+        """
+        검색 순위대로 정렬된 청크를 예산 이내의 컨텍스트로 조립합니다.
+
+        1. 근사 중복 청크 제거 (문자 shingle Jaccard 유사도)
+        2. MMR로 관련도(검색 순위)와 다양성을 함께 고려해 순서 결정
+        3. 토큰 예산까지 채우고, 마지막 청크는 문장 경계에서 자름
+
+        Args:
+            chunks: 검색 순위 순서의 청크 리스트
+            query_type: 질의 유형 (예산 선택 기준)
+            max_tokens: 예산 직접 지정 (없으면 질의 유형별 예산)
+            separator: 청크 구분자
+            diversify: False일 경우 MMR 재정렬 없이 입력 순서 유지
+            tag: 로그 태그
+
+        Returns:
+            Tuple[str, Dict[str, int]]: 조립된 컨텍스트와 통계
+        """
+        budget = max_tokens if max_tokens is not None else self.budget_for(query_type)
+        chunks = [chunk for chunk in chunks if chunk and chunk.strip()]
+        input_tokens = estimate_tokens(separator.join(chunks))
+
+        candidates, duplicates = self._remove_near_duplicates(chunks)
+        ordered = self._mmr_order(candidates) if diversify else candidates
+
+        packed: List[str] = []
+        used = 0
+        truncated = 0
+        separator_tokens = estimate_tokens(separator) if separator.strip() else 0
+        for text, _ in ordered:
+            remaining = budget - used - (separator_tokens if packed else 0)
+            if remaining <= 0:
+                break
+            tokens = estimate_tokens(text)
+            if tokens > remaining:
+                if remaining < self.min_chunk_tokens:
+                    break
+                text = truncate_to_tokens(text, remaining)
+                tokens = estimate_tokens(text)
+                truncated += 1
+            packed.append(text)
+            used += tokens + (separator_tokens if len(packed) > 1 else 0)
+
+        context = separator.join(packed)
+        output_tokens = estimate_tokens(context) if context else 0
+        stats = {
+            "budget": budget,
+            "input_chunks": len(chunks),
+            "output_chunks": len(packed),
+            "duplicates_removed": duplicates,
+            "truncated": truncated,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "saved_tokens": max(input_tokens - output_tokens, 0),
+        }
+
+        report = _savings_report.get()
+        if report is not None:
+            report["input_tokens"] += stats["input_tokens"]
+            report["output_tokens"] += stats["output_tokens"]
+            report["saved_tokens"] += stats["saved_tokens"]
+
+        logger.info(
+            f"[{tag}] 컨텍스트 조립 완료: 청크 {stats['input_chunks']} → {stats['output_chunks']}개 "
+            f"(중복 {duplicates}, 잘림 {truncated}), 토큰 {input_tokens} → {output_tokens} "
+            f"(예산 {budget}, 절감 {stats['saved_tokens']})"
+        )
+        return context, stats
+
+    def _remove_near_duplicates(self, chunks: Sequence[str]) -> Tuple[List[Tuple[str, Set[str]]], int]:
+        """앞선(상위) 청크와 근사 중복인 청크를 제거합니다."""
+        kept: List[Tuple[str, Set[str]]] = []
+        duplicates = 0
+        for chunk in chunks:
+            chunk_shingles = shingles(chunk)
+            if any(jaccard(chunk_shingles, other) >= self.duplicate_threshold for _, other in kept):
+                duplicates += 1
+                continue
+            kept.append((chunk, chunk_shingles))
+        return kept, duplicates
+
+    def _mmr_order(self, candidates: List[Tuple[str, Set[str]]]) -> List[Tuple[str, Set[str]]]:
+        """
+        Maximal Marginal Relevance 순서로 정렬합니다.
+        관련도는 검색 순위에서 구하고(1위 = 1.0), 이미 선택된 청크와의 최대 유사도를 감점합니다.
+        """
+        count = len(candidates)
+        if count <= 2:
+            return candidates
+        relevance = [1.0 - index / count for index in range(count)]
+        remaining = list(range(count))
+        selected: List[int] = []
+        while remaining:
+            best_index = max(
+                remaining,
+                key=lambda i: self.mmr_lambda * relevance[i] - (1 - self.mmr_lambda) * max(
+                    (jaccard(candidates[i][1], candidates[j][1]) for j in selected),
+                    default=0.0
+                )
+            )
+            selected.append(best_index)
+            remaining.remove(best_index)
+        return [candidates[i] for i in selected]
@@ -0,0 +1,243 @@
+from typing import Any, Dict, List, Optional
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+import numpy as np
+from loguru import logger
+from app.config.rag_config import RAGConfig
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.services.common.rag_service import get_rag_service
+
+FAQ_FORMAT_VERSION = 1
+CURRENT_FILE = "CURRENT"
+DRAFT_FILE = "draft.json"
+_VERSION_FILE_PATTERN = re.compile(r"^v(\d+)\.json$")
+
+# 항목 검토 상태
+STATUS_PENDING = "pending"
+STATUS_APPROVED = "approved"
+STATUS_REJECTED = "rejected"
+
+
+def normalize_lang(lang_code: str) -> str:
+    """언어 코드를 기본 언어 코드로 정규화합니다 (예: zh-CN → zh)."""
+    return re.split(r"[-_]", (lang_code or "").strip().lower())[0]
+
+
+def snapshot_fingerprint(collection) -> str:
+    """
+    컬렉션 스냅샷 지문을 계산합니다.
+    문서 ID와 본문 해시로 만들기 때문에, 문서가 추가/삭제/수정되면 값이 바뀝니다.
+    """
+    data = collection.get(include=["documents"])
+    digest = hashlib.sha256()
+    for doc_id, document in sorted(zip(data["ids"], data["documents"])):
+        digest.update(doc_id.encode("utf-8"))
+        digest.update(hashlib.sha256((document or "").encode("utf-8")).digest())
+    return digest.hexdigest()[:16]
+
+
+def faq_domain_dir(rag_type: RAGType) -> str:
+    return os.path.join(RAGConfig.FAQ_DIR, rag_type.value)
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    """JSON 파일을 원자적으로 저장합니다."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, path)
+
+
+def _read_json(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def list_versions(rag_type: RAGType) -> List[int]:
+    """게시된 FAQ 버전 목록을 오름차순으로 반환합니다."""
+    domain_dir = faq_domain_dir(rag_type)
+    if not os.path.isdir(domain_dir):
+        return []
+    versions = []
+    for name in os.listdir(domain_dir):
+        match = _VERSION_FILE_PATTERN.match(name)
+        if match:
+            versions.append(int(match.group(1)))
+    return sorted(versions)
+
+
+def current_version(rag_type: RAGType) -> Optional[int]:
+    """CURRENT 포인터가 가리키는 게시 버전을 반환합니다."""
+    pointer = os.path.join(faq_domain_dir(rag_type), CURRENT_FILE)
+    if not os.path.exists(pointer):
+        return None
+    with open(pointer, encoding="utf-8") as f:
+        return int(f.read().strip())
+
+
+def load_published(rag_type: RAGType, version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """게시된 FAQ 스토어를 불러옵니다. version이 없으면 CURRENT 버전을 사용합니다."""
+    version = version if version is not None else current_version(rag_type)
+    if version is None:
+        return None
+    return _read_json(os.path.join(faq_domain_dir(rag_type), f"v{version:04d}.json"))
+
+
+def publish(rag_type: RAGType, store: Dict[str, Any]) -> int:
+    """
+    검토가 끝난 FAQ 스토어를 새 버전으로 게시하고 CURRENT 포인터를 옮깁니다.
+    이전 버전 파일은 남겨 두므로 CURRENT만 되돌려 롤백할 수 있습니다.
+
+    Returns:
+        int: 게시된 버전
+    """
+    versions = list_versions(rag_type)
+    version = versions[-1] + 1 if versions else 1
+    domain_dir = faq_domain_dir(rag_type)
+    _write_json(os.path.join(domain_dir, f"v{version:04d}.json"), {**store, "version": version})
+
+    pointer = os.path.join(domain_dir, CURRENT_FILE)
+    with open(f"{pointer}.tmp", "w", encoding="utf-8") as f:
+        f.write(f"{version}\n")
+    os.replace(f"{pointer}.tmp", pointer)
+    logger.info(f"[FAQ] {rag_type.value} FAQ v{version} 게시: {len(store['entries'])}개 항목")
+    return version
+
+
+def draft_path(rag_type: RAGType) -> str:
+    return os.path.join(faq_domain_dir(rag_type), DRAFT_FILE)
+
+
+def load_draft(rag_type: RAGType) -> Optional[Dict[str, Any]]:
+    path = draft_path(rag_type)
+    return _read_json(path) if os.path.exists(path) else None
+
+
+def save_draft(rag_type: RAGType, store: Dict[str, Any]) -> None:
+    _write_json(draft_path(rag_type), store)
+
+
+class FAQService:
+    """사전 생성된 FAQ 답변 서비스"""
+
+    def __init__(self, rag_service=None, threshold: float = RAGConfig.FAQ_SIMILARITY_THRESHOLD):
+        self.rag_service = rag_service or get_rag_service()
+        self.threshold = threshold
+        # 도메인별 질문 임베딩 색인 (None이면 사용할 FAQ가 없는 도메인)
+        self.indexes: Dict[RAGType, Optional[Dict[str, Any]]] = {}
+
+    def _load_index(self, rag_type: RAGType) -> Optional[Dict[str, Any]]:
+        """게시된 FAQ를 불러와 질문 임베딩 색인을 만듭니다. 스냅샷이 다르면 사용하지 않습니다."""
+        store = load_published(rag_type)
+        if store is None:
+            logger.info(f"[FAQ] {rag_type.value} 도메인에 게시된 FAQ가 없습니다.")
+            return None
+
+        collection = self.rag_service.collections.get(rag_type)
+        if collection is None:
+            logger.warning(f"[FAQ] {rag_type.value} 도메인 컬렉션이 없어 FAQ를 사용하지 않습니다.")
+            return None
+        fingerprint = snapshot_fingerprint(collection)
+        if store.get("snapshot") != fingerprint:
+            logger.warning(
+                f"[FAQ] {rag_type.value} FAQ v{store.get('version')}의 스냅샷({store.get('snapshot')})이 "
+                f"현재 벡터 스토어({fingerprint})와 달라 사용하지 않습니다. FAQ를 다시 생성하세요."
+            )
+            return None
+        if store.get("embedding_model") != RAGConfig.EMBEDDING_MODEL:
+            logger.warning(f"[FAQ] {rag_type.value} FAQ의 임베딩 모델이 현재 설정과 다릅니다: {store.get('embedding_model')}")
+
+        entries = [entry for entry in store["entries"] if entry.get("status") == STATUS_APPROVED]
+        questions: List[str] = []
+        owners: List[int] = []
+        for position, entry in enumerate(entries):
+            for question in [entry["question"], *entry.get("paraphrases", [])]:
+                questions.append(question)
+                owners.append(position)
+        if not questions:
+            return None
+
+        embeddings = np.asarray(
+            self.rag_service.embeddings.encode(questions, show_progress_bar=False),
+            dtype=np.float32
+        )
+        embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12
+        logger.info(f"[FAQ] {rag_type.value} FAQ v{store['version']} 로드 완료: {len(entries)}개 항목, 질문 {len(questions)}개")
+        return {"version": store["version"], "entries": entries, "owners": owners, "embeddings": embeddings}
+
+    def lookup(self, rag_type: RAGType, query: str, lang_code: str) -> Optional[Dict[str, Any]]:
+        """
+        질의와 충분히 유사한 FAQ 질문이 있으면 해당 언어의 사전 답변을 반환합니다.
+
+        Args:
+            rag_type: RAG 유형
+            query: 영어로 번역된 사용자 질의
+            lang_code: 응답 언어 코드
+
+        Returns:
+            Optional[Dict[str, Any]]: id, answer, score, version을 담은 결과 (없으면 None)
+        """
+        if not RAGConfig.FAQ_ENABLED or rag_type == RAGType.NONE:
+            return None
+
+        if rag_type not in self.indexes:
+            try:
+                self.indexes[rag_type] = self._load_index(rag_type)
+            except Exception as e:
+                logger.error(f"[FAQ] {rag_type.value} FAQ 로드 중 오류 발생: {str(e)}")
+                self.indexes[rag_type] = None
+        index = self.indexes[rag_type]
+        if index is None:
+            return None
+
+        query_embedding = np.asarray(self.rag_service.embeddings.encode([query])[0], dtype=np.float32)
+        query_embedding /= np.linalg.norm(query_embedding) + 1e-12
+        scores = index["embeddings"] @ query_embedding
+        best = int(np.argmax(scores))
+        score = float(scores[best])
+        entry = index["entries"][index["owners"][best]]
+        if score < self.threshold:
+            logger.info(f"[FAQ] 일치 항목 없음 (최고 유사도 {score:.3f}: {entry['id']})")
+            return None
+
+        answer = entry["answers"].get(normalize_lang(lang_code))
+        if not answer:
+            logger.info(f"[FAQ] {entry['id']} 항목에 {lang_code} 답변이 없습니다.")
+            return None
+
+        logger.info(f"[FAQ] 사전 답변 사용: {entry['id']} (유사도 {score:.3f}, v{index['version']}, 언어 {lang_code})")
+        return {"id": entry["id"], "answer": answer, "score": score, "version": index["version"]}
+
+    async def alookup(self, rag_type: RAGType, query: str, lang_code: str) -> Optional[Dict[str, Any]]:
+        """
+        lookup을 도메인 검색 스레드 풀에서 실행합니다. 비동기 코드에서는 이 메서드를 사용합니다.
+        질의 임베딩과 첫 조회 시 색인 생성(스냅샷 지문 계산, 사이드카 호출 포함)이 이벤트 루프를 막지 않도록 합니다.
+
+        Args:
+            rag_type: RAG 유형
+            query: 영어로 번역된 사용자 질의
+            lang_code: 응답 언어 코드
+
+        Returns:
+            Optional[Dict[str, Any]]: id, answer, score, version을 담은 결과 (없으면 None)
+        """
+        if not RAGConfig.FAQ_ENABLED or rag_type == RAGType.NONE:
+            return None
+        return await self.rag_service.executor.run(rag_type, self.lookup, rag_type, query, lang_code)
+
+    def invalidate(self, rag_type: Optional[RAGType] = None) -> None:
+        """불러온 FAQ 색인을 버립니다. 다음 조회 시 CURRENT 버전을 다시 읽습니다."""
+        if rag_type is None:
+            self.indexes.clear()
+        else:
+            self.indexes.pop(rag_type, None)
+
+
+@lru_cache(maxsize=None)
+def get_faq_service() -> FAQService:
+    """프로세스 전역 FAQ 서비스를 반환합니다."""
+    return FAQService()
@@ -0,0 +1,125 @@
+from typing import TYPE_CHECKING, Any, Dict
+from loguru import logger
+from app.config.rag_config import RAGConfig
+
+if TYPE_CHECKING:
+    # 런타임에 불러오면 chatbot 패키지 → rag_service → hnsw_tuning 순환 임포트가 생김
+    from app.services.chatbot.chatbot_classifier import RAGType
+
+# 색인을 만들 때 정해져서 다시 만들어야 바뀌는 파라미터
+BUILD_PARAMS = ("M", "construction_ef")
+
+
+def hnsw_metadata(rag_type: "RAGType") -> Dict[str, Any]:
+    """
+    컬렉션을 새로 만들 때 쓸 HNSW 메타데이터를 반환합니다.
+
+    Args:
+        rag_type: RAG 유형
+
+    Returns:
+        Dict[str, Any]: hnsw:space, hnsw:M, hnsw:construction_ef, hnsw:search_ef
+    """
+    params = RAGConfig.hnsw_params(rag_type)
+    return {"hnsw:space": "cosine", **{f"hnsw:{key}": value for key, value in params.items()}}
+
+
+def built_params(collection) -> Dict[str, int]:
+    """컬렉션이 만들어질 때 사용된 HNSW 파라미터를 반환합니다 (메타데이터에 없으면 ChromaDB 기본값)."""
+    metadata = collection.metadata or {}
+    return {key: int(metadata.get(f"hnsw:{key}", default)) for key, default in RAGConfig.HNSW_DEFAULTS.items()}
+
+
+def apply_search_ef(client, collection, search_ef: int) -> bool:
+    """
+    열려 있는 컬렉션의 HNSW 검색 ef를 바꿉니다.
+    ChromaDB는 컬렉션을 만들 때의 값만 사용하므로, 로드된 벡터 세그먼트의 파라미터를 직접 바꿉니다.
+    색인을 아직 올리지 않았으면 처음 검색할 때 이 값으로 올라갑니다.
+    ChromaDB 내부 구조(0.4.x 세그먼트 매니저)에 의존하므로, 구조가 달라 적용할 수 없으면 경고만 남기고
+    컬렉션을 만들 때의 search_ef를 그대로 씁니다.
+
+    Returns:
+        bool: 적용 여부
+    """
+    try:
+        from chromadb.segment import VectorReader
+    except ImportError:
+        VectorReader = None
+    manager = getattr(getattr(client, "_server", None), "_manager", None)
+    get_segment = getattr(manager, "get_segment", None)
+    segment = None
+    if VectorReader is not None and get_segment is not None:
+        try:
+            segment = get_segment(collection.id, VectorReader)
+        except Exception as e:
+            logger.warning(f"[RAG] HNSW 벡터 세그먼트를 가져오지 못했습니다: {str(e)}")
+    params = getattr(segment, "_params", None)
+    if params is None or not hasattr(params, "search_ef"):
+        logger.warning(
+            f"[RAG] 이 ChromaDB 버전에서는 search_ef를 바꿀 수 없어 컬렉션 생성 시 값을 사용합니다 "
+            f"(요청 {search_ef}). app.tools.hnsw_sweep --rebuild로 스냅샷을 다시 만드세요."
+        )
+        return False
+    params.search_ef = search_ef
+    index = getattr(segment, "_index", None)
+    if index is not None and hasattr(index, "set_ef"):
+        index.set_ef(search_ef)
+    return True
+
+
+def configure_collection(rag_type: "RAGType", client, collection) -> Dict[str, int]:
+    """
+    로드한 컬렉션에 도메인 HNSW 설정을 적용합니다.
+    search_ef는 바로 적용하고, M/construction_ef가 설정과 다르면 경고만 남깁니다.
+
+    Args:
+        rag_type: RAG 유형
+        client: ChromaDB 클라이언트
+        collection: 도메인 컬렉션
+
+    Returns:
+        Dict[str, int]: 적용된 파라미터 (M/construction_ef는 색인에 실제로 쓰인 값)
+    """
+    params = RAGConfig.hnsw_params(rag_type)
+    built = built_params(collection)
+    stale = {key: built[key] for key in BUILD_PARAMS if built[key] != params[key]}
+    if stale:
+        logger.warning(
+            f"[RAG] {rag_type.value} 도메인 HNSW 색인이 설정과 다른 값으로 만들어졌습니다: {stale} "
+            f"(설정 {({key: params[key] for key in stale})}). app.tools.hnsw_sweep --rebuild로 스냅샷을 다시 만드세요."
+        )
+    if params["search_ef"] != built["search_ef"]:
+        if not apply_search_ef(client, collection, params["search_ef"]):
+            return built
+        logger.info(f"[RAG] {rag_type.value} 도메인 HNSW search_ef 적용: {built['search_ef']} → {params['search_ef']}")
+    return {**built, "search_ef": params["search_ef"]}
+
+
+def copy_collection(source, target_client, rag_type: "RAGType", batch_size: int = 500):
+    """
+    컬렉션을 도메인 HNSW 설정으로 새로 만들어 복사합니다 (임베딩은 다시 계산하지 않음).
+
+    Args:
+        source: 원본 컬렉션
+        target_client: 새 벡터 스토어의 ChromaDB 클라이언트
+        rag_type: RAG 유형
+        batch_size: 한 번에 복사할 문서 수
+
+    Returns:
+        새 컬렉션
+    """
+    metadata = {key: value for key, value in (source.metadata or {}).items() if not key.startswith("hnsw:")}
+    target = target_client.create_collection(name=source.name, metadata={**metadata, **hnsw_metadata(rag_type)})
+    total = source.count()
+    for offset in range(0, total, batch_size):
+        data = source.get(include=["embeddings", "documents", "metadatas"], limit=batch_size, offset=offset)
+        if not data["ids"]:
+            break
+        target.add(
+            ids=data["ids"],
+            embeddings=data["embeddings"],
+            documents=data["documents"],
+            metadatas=data["metadatas"]
+        )
+    logger.info(f"[RAG] {rag_type.value} 도메인 컬렉션 복사 완료: {target.count()}개 문서, {hnsw_metadata(rag_type)}")
+    return target
@@ -0,0 +1,306 @@
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+import hashlib
+import os
+import time
+from pathlib import Path
+from loguru import logger
+from app.config.rag_config import RAGConfig
+from app.core import chroma
+from app.core.embeddings import get_embedding_model
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.services.common.hnsw_tuning import hnsw_metadata
+from app.services.common.lexical_index import LexicalIndex, lexical_index_path
+from app.services.common.text_chunker import chunk_text, content_hash
+
+SUPPORTED_EXTENSIONS = {".pdf", ".txt", ".md"}
+
+# (source_path, 메타데이터, 텍스트)
+SourceSegment = Tuple[str, Dict[str, Any], str]
+
+
+def iter_source_files(paths: Iterable[str]) -> Iterator[Path]:
+    """입력 경로(파일 또는 디렉토리)에서 지원하는 원본 파일을 순회합니다."""
+    for raw_path in paths:
+        path = Path(raw_path)
+        if path.is_dir():
+            for child in sorted(path.rglob("*")):
+                if child.is_file() and child.suffix.lower() in SUPPORTED_EXTENSIONS:
+                    yield child
+        elif path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS:
+            yield path
+        else:
+            logger.warning(f"[INGEST] 지원하지 않거나 존재하지 않는 경로입니다: {raw_path}")
+
+
+def source_path_of(path: Path, root: Optional[str] = None) -> str:
+    """
+    원본 파일의 적재 기준 경로(root, 기본 현재 디렉토리) 기준 상대 경로를 반환합니다.
+    청크 ID와 정리(prune) 기준이 되므로, 이름이 같은 다른 디렉토리의 파일과 구분됩니다. root 밖의 파일은 절대 경로를 씁니다.
+    """
+    resolved = path.resolve()
+    try:
+        return resolved.relative_to(Path(root or os.getcwd()).resolve()).as_posix()
+    except ValueError:
+        return resolved.as_posix()
+
+
+def iter_file_segments(path: Path, source_path: Optional[str] = None) -> Iterator[SourceSegment]:
+    """
+    원본 파일을 페이지(PDF) 또는 문단(텍스트) 단위로 스트리밍합니다.
+    파일 전체를 메모리에 올리지 않습니다.
+    메타데이터의 source는 파일명(검색 벤치마크 라벨 기준), source_path는 적재 기준 상대 경로입니다.
+    """
+    source = path.name
+    source_path = source_path or source
+    suffix = path.suffix.lower()
+    if suffix == ".pdf":
+        from PyPDF2 import PdfReader
+
+        reader = PdfReader(str(path))
+        for page_number, page in enumerate(reader.pages, 1):
+            text = page.extract_text() or ""
+            if text.strip():
+                yield source_path, {"source": source, "source_path": source_path, "type": "pdf", "page": page_number}, text
+    else:
+        buffer: List[str] = []
+        with open(path, encoding="utf-8", errors="ignore") as f:
+            for line in f:
+                if line.strip():
+                    buffer.append(line)
+                    continue
+                if buffer:
+                    yield source_path, {"source": source, "source_path": source_path, "type": "text"}, "".join(buffer)
+                    buffer = []
+        if buffer:
+            yield source_path, {"source": source, "source_path": source_path, "type": "text"}, "".join(buffer)
+
+
+def chunk_id(collection_name: str, source_path: str, chunk_hash: str) -> str:
+    """
+    원본 경로와 청크 내용 기반의 안정적인 ID를 생성합니다.
+    여러 원본에 같은 청크가 있어도 원본마다 따로 저장하므로, 한 원본을 정리(prune)해도 다른 원본의 청크는 남습니다.
+    """
+    digest = hashlib.sha256(f"{source_path}\0{chunk_hash}".encode("utf-8")).hexdigest()
+    return f"{collection_name}-{digest[:32]}"
+
+
+class IngestionService:
+    """벡터 스토어 적재 서비스"""
+
+    def __init__(self, batch_size: int = 64, encoder=None, vectorstore_path: Optional[str] = None):
+        """
+        Args:
+            batch_size: 임베딩 배치 크기
+            encoder: 임베딩 모델 (없으면 공유 모델)
+            vectorstore_path: 적재할 벡터 스토어 경로 (없으면 도메인의 활성 스냅샷)
+        """
+        self.config = RAGConfig()
+        self.batch_size = batch_size
+        self.encoder = encoder or get_embedding_model(self.config.EMBEDDING_MODEL)
+        self.vectorstore_path = vectorstore_path
+
+    def target_path(self, rag_type: RAGType) -> str:
+        return self.vectorstore_path or self.config.active_vectorstore_path(rag_type)
+
+    def open_collection(self, rag_type: RAGType):
+        """도메인 컬렉션을 열거나, 없으면 생성합니다."""
+        domain_config = self.config.DOMAIN_CONFIGS[rag_type]
+        vectorstore_path = self.target_path(rag_type)
+        os.makedirs(vectorstore_path, exist_ok=True)
+        client = chroma.open_client(vectorstore_path)
+        return client.get_or_create_collection(
+            name=domain_config["collection_name"],
+            metadata={
+                **hnsw_metadata(rag_type),
+                "domain": rag_type.value,
+                "embedding_dimension": 768,
+                "embedding_model": self.config.EMBEDDING_MODEL
+            }
+        )
+
+    def open_lexical_index(self, rag_type: RAGType, collection) -> Optional[LexicalIndex]:
+        """도메인의 BM25 색인을 불러옵니다. 하이브리드 검색이 꺼져 있으면 None을 반환합니다."""
+        if not self.config.HYBRID_SEARCH:
+            return None
+        return LexicalIndex.load_or_build(
+            lexical_index_path(self.target_path(rag_type)),
+            collection,
+            k1=self.config.BM25_K1,
+            b=self.config.BM25_B
+        )
+
+    def ingest_paths(
+        self,
+        rag_type: RAGType,
+        paths: Iterable[str],
+        collection=None,
+        prune: bool = False,
+        root: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        원본 파일을 청크로 나누어 도메인 컬렉션에 적재합니다.
+
+        Args:
+            rag_type: RAG 유형
+            paths: 원본 파일 또는 디렉토리 경로
+            collection: 대상 컬렉션 (없으면 도메인 설정으로 엶)
+            prune: True일 경우 이번에 적재한 원본 파일에서 더 이상 나오지 않는 청크를 삭제
+            root: 원본 경로(source_path)의 기준 디렉토리 (기본값: 현재 디렉토리)
+
+        Returns:
+            Dict[str, Any]: 적재 결과 리포트
+        """
+        segments = (
+            segment
+            for path in iter_source_files(paths)
+            for segment in iter_file_segments(path, source_path_of(path, root))
+        )
+        return self.ingest_segments(rag_type, segments, collection=collection, prune=prune)
+
+    def ingest_texts(self, rag_type: RAGType, documents: List[str], source: str = "inline", collection=None, lexical_index: Optional[LexicalIndex] = None) -> Dict[str, Any]:
+        """메모리에 있는 텍스트 리스트를 적재합니다."""
+        segments = ((source, {"source": source, "source_path": source, "type": "text"}, document) for document in documents)
+        return self.ingest_segments(rag_type, segments, collection=collection, lexical_index=lexical_index)
+
+    def ingest_segments(
+        self,
+        rag_type: RAGType,
+        segments: Iterable[SourceSegment],
+        collection=None,
+        prune: bool = False,
+        lexical_index: Optional[LexicalIndex] = None
+    ) -> Dict[str, Any]:
+        """
+        세그먼트 스트림을 청크 → 중복 제거 → 배치 임베딩 → upsert 순으로 처리합니다.
+        한 번에 batch_size개의 청크만 메모리에 유지하며, BM25 색인도 함께 갱신하여 저장합니다.
+        """
+        domain_config = self.config.DOMAIN_CONFIGS[rag_type]
+        collection_name = domain_config["collection_name"]
+        chunk_size = domain_config["chunk_size"]
+        chunk_overlap = domain_config["chunk_overlap"]
+        collection = collection if collection is not None else self.open_collection(rag_type)
+        if lexical_index is None:
+            lexical_index = self.open_lexical_index(rag_type, collection)
+
+        report: Dict[str, Any] = {
+            "domain": rag_type.value,
+            "sources": 0,
+            "chunks": 0,
+            "duplicates": 0,
+            "unchanged": 0,
+            "embedded": 0,
+            "deleted": 0,
+        }
+        seen_ids: Set[str] = set()
+        sources: Set[str] = set()
+        pending: List[Tuple[str, str, Dict[str, Any]]] = []
+        embed_time = 0.0
+        start_time = time.time()
+
+        logger.info(f"[INGEST] {rag_type.value} 도메인 적재 시작 (chunk_size={chunk_size}, chunk_overlap={chunk_overlap}, batch_size={self.batch_size})")
+
+        for source, metadata, text in segments:
+            sources.add(source)
+            for index, chunk in enumerate(chunk_text(text, chunk_size, chunk_overlap)):
+                report["chunks"] += 1
+                chunk_hash = content_hash(chunk)
+                doc_id = chunk_id(collection_name, source, chunk_hash)
+                if doc_id in seen_ids:
+                    report["duplicates"] += 1
+                    continue
+                seen_ids.add(doc_id)
+                pending.append((doc_id, chunk, {**metadata, "chunk_index": index, "content_hash": chunk_hash}))
+                if len(pending) >= self.batch_size:
+                    embed_time += self._flush(collection, pending, report, lexical_index)
+                    pending = []
+
+        if pending:
+            embed_time += self._flush(collection, pending, report, lexical_index)
+
+        report["sources"] = len(sources)
+        if prune and sources:
+            report["deleted"] = self._prune(collection, sources, seen_ids, lexical_index)
+
+        if lexical_index is not None:
+            lexical_index.save(lexical_index_path(self.target_path(rag_type)))
+
+        elapsed = time.time() - start_time
+        report["elapsed_seconds"] = round(elapsed, 3)
+        report["chunks_per_second"] = round(report["chunks"] / elapsed, 2) if elapsed > 0 else 0.0
+        report["embedded_per_second"] = round(report["embedded"] / embed_time, 2) if embed_time > 0 else 0.0
+        report["collection_count"] = collection.count()
+
+        logger.info(
+            f"[INGEST] {rag_type.value} 도메인 적재 완료: 청크 {report['chunks']}개 "
+            f"(중복 {report['duplicates']}, 변경 없음 {report['unchanged']}, 임베딩 {report['embedded']}, 삭제 {report['deleted']}), "
+            f"{report['chunks_per_second']} chunks/sec, {elapsed:.2f}초"
+        )
+        return report
+
+    def _flush(
+        self,
+        collection,
+        pending: List[Tuple[str, str, Dict[str, Any]]],
+        report: Dict[str, Any],
+        lexical_index: Optional[LexicalIndex] = None
+    ) -> float:
+        """
+        배치 하나를 처리합니다. 이미 컬렉션에 있는 ID는 임베딩하지 않고 메타데이터(chunk_index, page 등)만 갱신합니다.
+
+        Returns:
+            float: 임베딩에 걸린 시간 (초)
+        """
+        ids = [doc_id for doc_id, _, _ in pending]
+        existing = set(collection.get(ids=ids, include=[])["ids"])
+        new_items = [item for item in pending if item[0] not in existing]
+        report["unchanged"] += len(pending) - len(new_items)
+        if existing:
+            unchanged = [item for item in pending if item[0] in existing]
+            collection.update(
+                ids=[doc_id for doc_id, _, _ in unchanged],
+                metadatas=[metadata for _, _, metadata in unchanged]
+            )
+        if not new_items:
+            return 0.0
+
+        documents = [chunk for _, chunk, _ in new_items]
+        embed_start = time.time()
+        embeddings = self.encoder.encode(documents, batch_size=self.batch_size, show_progress_bar=False)
+        embed_elapsed = time.time() - embed_start
+
+        collection.upsert(
+            ids=[doc_id for doc_id, _, _ in new_items],
+            embeddings=embeddings.tolist(),
+            documents=documents,
+            metadatas=[metadata for _, _, metadata in new_items]
+        )
+        if lexical_index is not None:
+            lexical_index.add_many((doc_id, chunk) for doc_id, chunk, _ in new_items)
+        report["embedded"] += len(new_items)
+        logger.debug(f"[INGEST] 배치 upsert 완료: {len(new_items)}개 (기존 {len(existing)}개 건너뜀)")
+        return embed_elapsed
+
+    def _prune(self, collection, sources: Set[str], keep_ids: Set[str], lexical_index: Optional[LexicalIndex] = None) -> int:
+        """
+        적재한 원본 파일의 청크 중 이번 실행에서 나오지 않은 청크를 삭제합니다.
+        source_path가 없는 이전 형식의 청크(파일명만 기록, ID에 원본 경로 없음)도 같은 파일명이면 함께 정리합니다.
+        """
+        deleted = 0
+        for source_path in sources:
+            stale_ids = [
+                doc_id for doc_id in collection.get(where={"source_path": source_path}, include=[])["ids"]
+                if doc_id not in keep_ids
+            ]
+            legacy = collection.get(where={"source": Path(source_path).name}, include=["metadatas"])
+            stale_ids += [
+                doc_id for doc_id, metadata in zip(legacy["ids"], legacy["metadatas"])
+                if "source_path" not in (metadata or {}) and doc_id not in keep_ids
+            ]
+            if stale_ids:
+                collection.delete(ids=stale_ids)
+                if lexical_index is not None:
+                    for doc_id in stale_ids:
+                        lexical_index.remove(doc_id)
+                deleted += len(stale_ids)
+                logger.info(f"[INGEST] {source_path}: 오래된 청크 {len(stale_ids)}개 삭제")
+        return deleted
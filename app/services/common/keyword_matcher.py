@@ -0,0 +1,81 @@
+from typing import Dict, Iterable, List, Mapping, Tuple
+from collections import deque
+from functools import lru_cache
+from app.config.web_search_config import WebSearchConfig
+
+
+class KeywordMatcher:
+    """
+    다중 키워드 분류기 (Aho-Corasick)
+
+    분류별 키워드를 하나의 오토마톤으로 컴파일해 텍스트를 한 번만 훑어 일치하는 분류를 찾습니다.
+    키워드 수가 늘어도 분류 비용은 텍스트 길이에만 비례합니다. 대소문자는 구분하지 않습니다.
+    """
+
+    def __init__(self, keywords: Mapping[str, Iterable[str]]):
+        """
+        Args:
+            keywords: 분류 이름 → 키워드 목록 (분류 순서가 결과 정렬의 동점 기준)
+        """
+        self.categories = list(keywords)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Tuple[int, ...]] = [()]
+
+        for category_index, category in enumerate(self.categories):
+            for keyword in keywords[category]:
+                keyword = keyword.casefold()
+                if not keyword:
+                    continue
+                state = 0
+                for char in keyword:
+                    next_state = self._goto[state].get(char)
+                    if next_state is None:
+                        next_state = len(self._goto)
+                        self._goto[state][char] = next_state
+                        self._goto.append({})
+                        self._fail.append(0)
+                        self._output.append(())
+                    state = next_state
+                if category_index not in self._output[state]:
+                    self._output[state] += (category_index,)
+
+        # 실패 링크: 현재 상태 문자열의 가장 긴 접미사 상태 (BFS 순서로 계산)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] += tuple(
+                    index for index in self._output[self._fail[next_state]] if index not in self._output[next_state]
+                )
+
+    def match(self, text: str) -> List[str]:
+        """
+        텍스트에 키워드가 나타나는 분류를 처음 나타난 위치 순서로 반환합니다.
+
+        Args:
+            text: 분류할 텍스트
+
+        Returns:
+            List[str]: 일치한 분류 이름 목록 (중복 없음)
+        """
+        found: Dict[int, int] = {}
+        state = 0
+        for position, char in enumerate((text or "").casefold()):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for category_index in self._output[state]:
+                found.setdefault(category_index, position)
+        return [self.categories[index] for index in sorted(found, key=lambda index: (found[index], index))]
+
+
+@lru_cache(maxsize=None)
+def get_category_matcher(domain: str) -> KeywordMatcher:
+    """도메인(RAGType 값)의 웹 검색 결과 분류기를 반환합니다 (도메인별로 한 번만 컴파일)."""
+    return KeywordMatcher(WebSearchConfig.category_keywords(domain))
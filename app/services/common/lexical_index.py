@@ -0,0 +1,187 @@
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+import json
+import math
+import os
+import re
+from collections import Counter
+from loguru import logger
+from app.config.rag_config import RAGConfig
+
+INDEX_FORMAT_VERSION = 1
+
+# 비자 코드(E-9, D-10, F-2-7 등), 영문/숫자 단어, 한글 어절
+_VISA_CODE_PATTERN = re.compile(r"\b[a-z]-?\d{1,2}(?:-\d{1,2})?\b")
+_WORD_PATTERN = re.compile(r"[a-z0-9]+|[가-힣]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    한국어/영어 혼합 텍스트를 BM25용 토큰으로 나눕니다.
+
+    - 비자 코드는 하이픈 유무와 관계없이 같은 토큰("e9")으로 정규화합니다.
+    - 영문/숫자 단어는 소문자로 그대로 사용합니다.
+    - 한글 어절은 조사/어미가 붙어도 매칭되도록 어절 전체와 글자 바이그램을 함께 사용합니다.
+    """
+    text = text.lower()
+    tokens = [code.replace("-", "") for code in _VISA_CODE_PATTERN.findall(text)]
+    for word in _WORD_PATTERN.findall(text):
+        tokens.append(word)
+        if "가" <= word[0] <= "힣" and len(word) > 2:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class LexicalIndex:
+    """BM25 역색인"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.doc_lengths: Dict[str, int] = {}
+        self.postings: Dict[str, Dict[str, int]] = {}
+        self.total_length = 0
+
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self.doc_lengths
+
+    def add(self, doc_id: str, text: str) -> None:
+        """문서를 색인합니다. 이미 있는 ID는 교체합니다."""
+        if doc_id in self.doc_lengths:
+            self.remove(doc_id)
+        term_counts = Counter(tokenize(text))
+        length = sum(term_counts.values())
+        self.doc_lengths[doc_id] = length
+        self.total_length += length
+        for term, count in term_counts.items():
+            self.postings.setdefault(term, {})[doc_id] = count
+
+    def add_many(self, items: Iterable[Tuple[str, str]]) -> None:
+        for doc_id, text in items:
+            self.add(doc_id, text)
+
+    def remove(self, doc_id: str) -> None:
+        """문서를 색인에서 제거합니다."""
+        length = self.doc_lengths.pop(doc_id, None)
+        if length is None:
+            return
+        self.total_length -= length
+        for term in list(self.postings):
+            docs = self.postings[term]
+            if docs.pop(doc_id, None) is not None and not docs:
+                del self.postings[term]
+
+    def search(self, query: str, k: int = 10) -> List[Tuple[str, float]]:
+        """
+        BM25 점수 상위 k개의 문서를 반환합니다.
+
+        Returns:
+            List[Tuple[str, float]]: (문서 ID, 점수) 리스트, 점수 내림차순
+        """
+        if not self.doc_lengths:
+            return []
+        num_docs = len(self.doc_lengths)
+        avg_length = self.total_length / num_docs or 1.0
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            docs = self.postings.get(term)
+            if not docs:
+                continue
+            idf = math.log(1 + (num_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            for doc_id, tf in docs.items():
+                norm = tf + self.k1 * (1 - self.b + self.b * self.doc_lengths[doc_id] / avg_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (self.k1 + 1) / norm
+        return sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": INDEX_FORMAT_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "doc_lengths": self.doc_lengths,
+            "postings": self.postings,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "LexicalIndex":
+        if data.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 색인 버전입니다: {data.get('version')}")
+        index = cls(k1=data["k1"], b=data["b"])
+        index.doc_lengths = data["doc_lengths"]
+        index.postings = data["postings"]
+        index.total_length = sum(index.doc_lengths.values())
+        return index
+
+    def save(self, path: str) -> None:
+        """색인을 원자적으로 파일에 저장합니다."""
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self.to_dict(), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path: str) -> "LexicalIndex":
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+    @classmethod
+    def build_from_collection(cls, collection, batch_size: int = 500, **kwargs) -> "LexicalIndex":
+        """Chroma 컬렉션의 문서 전체로 색인을 만듭니다."""
+        index = cls(**kwargs)
+        total = collection.count()
+        for offset in range(0, total, batch_size):
+            batch = collection.get(include=["documents"], limit=batch_size, offset=offset)
+            index.add_many((doc_id, doc or "") for doc_id, doc in zip(batch["ids"], batch["documents"]))
+        return index
+
+    @classmethod
+    def load_or_build(cls, path: str, collection, **kwargs) -> "LexicalIndex":
+        """
+        저장된 색인을 불러옵니다. 색인이 없거나 문서 ID 집합이 컬렉션과 다르면(외부에서 다시 만든 스토어 등) 다시 만들어 저장합니다.
+        저장하지 못하면(읽기 전용/공유 마운트) 경고만 남기고 메모리의 색인을 사용합니다.
+        """
+        if os.path.exists(path):
+            try:
+                index = cls.load(path)
+                if index.doc_lengths.keys() == set(collection.get(include=[])["ids"]):
+                    return index
+                logger.warning(f"[RAG] 렉시컬 색인의 문서 ID가 컬렉션과 달라 다시 생성합니다: {path}")
+            except Exception as e:
+                logger.warning(f"[RAG] 렉시컬 색인 로드 실패, 다시 생성합니다: {path} ({str(e)})")
+        index = cls.build_from_collection(collection, **kwargs)
+        try:
+            index.save(path)
+        except OSError as e:
+            logger.warning(f"[RAG] 렉시컬 색인을 저장하지 못해 메모리에서만 사용합니다: {path} ({str(e)})")
+        logger.info(f"[RAG] 렉시컬 색인 생성 완료: {len(index)}개 문서 ({path})")
+        return index
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    여러 순위 리스트를 Reciprocal Rank Fusion으로 결합합니다.
+
+    Args:
+        rankings: 문서 ID 순위 리스트들 (앞쪽이 상위)
+        k: RRF 상수
+
+    Returns:
+        List[Tuple[str, float]]: (문서 ID, 결합 점수) 리스트, 점수 내림차순
+    """
+    scores: Dict[str, float] = {}
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+def lexical_index_path(vectorstore_path: str) -> str:
+    """벡터 스토어 디렉토리 옆에 저장되는 렉시컬 색인 경로를 반환합니다."""
+    return os.path.join(vectorstore_path, RAGConfig.LEXICAL_INDEX_FILE)
@@ -1,6 +1,8 @@
 from typing import Dict, Any
 from loguru import logger
 from app.core.llm_client import get_llm_client
+from app.core.metrics import observe_stage, record_fallback, timeout_reason
+from app.core.tracing import log_payload
 
 # Language code to full language name mapping
 LANGUAGE_CODE_MAP = {
@@ -42,7 +44,6 @@ class Postprocessor:
         """
         try:
             logger.info(f"[Postprocess] Starting response post-processing - Source language: {source_lang}, RAG type: {rag_type}")
-            logger.info(f"[POSTPROCESS] Input English response: {response}")
             
             # Translate to original language
             
@@ -59,11 +60,11 @@ class Postprocessor:
             {response}
             """
             
-            logger.debug(f"[POSTPROCESS] Translation prompt: {prompt}")
-            
-            translated_response = await self.llm_client.generate(prompt)
-            logger.info(f"[Postprocess] Translation completed: {translated_response}")
-            logger.info(f"[POSTPROCESS] Translated response ({language_name}): {translated_response}")
+            with observe_stage("postprocess", provider=self.llm_client.provider, model=self.llm_client.model):
+                log_payload("postprocess.prompt", prompt)
+                translated_response = await self.llm_client.generate(prompt)
+                log_payload("postprocess.response", translated_response)
+            logger.info(f"[Postprocess] Translation completed: {len(translated_response)}자")
         
             
             # Check if RAG was used
@@ -78,6 +79,7 @@ class Postprocessor:
         except Exception as e:
             logger.error(f"[Postprocess] Error during post-processing: {str(e)}")
             logger.error(f"[POSTPROCESS] Returning original response due to error")
+            record_fallback("postprocess", timeout_reason(e))
             
             # 에러 메시지도 원래 언어로 번역
             error_message = "Sorry, an error occurred while generating the response."
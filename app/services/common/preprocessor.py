@@ -6,6 +6,7 @@ import time
 import re
 from loguru import logger
 from app.core.llm_client import get_llm_client
+from app.core.metrics import observe_stage, record_fallback
 
 PROMPT_TEMPLATE = """
 Detect the language of the following query, then translate it to English.
@@ -48,20 +49,21 @@ async def translate_query(query: str) -> Dict[str, str]:
         logger.info(f"[Preprocess] Client initialization time: {init_time:.2f} seconds")
         logger.info(f"[Preprocess] Model used: {llm_client.model}")
         
-        # Check server connection
-        conn_start = time.time()
-        if not await llm_client.check_connection():
-            raise ConnectionError("Failed to connect to LLM server")
-        conn_time = time.time() - conn_start
-        logger.info(f"[Preprocess] Server connection check time: {conn_time:.2f} seconds")
-        
-        # Translation request
-        gen_start = time.time()
-        result = await llm_client.generate(
-            prompt=PROMPT_TEMPLATE.format(query=query)
-        )
-        gen_time = time.time() - gen_start
-        logger.info(f"[Preprocess] LLM generation time: {gen_time:.2f} seconds")
+        with observe_stage("translate", provider=llm_client.provider, model=llm_client.model):
+            # Check server connection
+            conn_start = time.time()
+            if not await llm_client.check_connection():
+                raise ConnectionError("Failed to connect to LLM server")
+            conn_time = time.time() - conn_start
+            logger.info(f"[Preprocess] Server connection check time: {conn_time:.2f} seconds")
+            
+            # Translation request
+            gen_start = time.time()
+            result = await llm_client.generate(
+                prompt=PROMPT_TEMPLATE.format(query=query)
+            )
+            gen_time = time.time() - gen_start
+            logger.info(f"[Preprocess] LLM generation time: {gen_time:.2f} seconds")
         
         # Extract and process response
         parse_start = time.time()
@@ -117,6 +119,7 @@ async def translate_query(query: str) -> Dict[str, str]:
         
         # 3. 최후의 수단: 원본 쿼리를 그대로 사용하고 한국어로 가정
         logger.warning("[Preprocess] Falling back to original query")
+        record_fallback("translate", "unparsed")
         return {
             "translated_query": query,
             "lang_code": "ko"
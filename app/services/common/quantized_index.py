@@ -0,0 +1,217 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import json
+import os
+import numpy as np
+from loguru import logger
+from app.config.rag_config import RAGConfig
+
+INDEX_FORMAT_VERSION = 1
+SUPPORTED_DTYPES = ("float16", "int8")
+_INT8_MAX = 127.0
+# 점수 계산 시 한 번에 float32로 풀어 놓는 행 수 (일시 메모리 상한)
+_SCORE_BLOCK_ROWS = 4096
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    if vectors.ndim == 1:
+        return vectors / (np.linalg.norm(vectors) + 1e-12)
+    return vectors / (np.linalg.norm(vectors, axis=1, keepdims=True) + 1e-12)
+
+
+def quantized_index_path(vectorstore_path: str) -> str:
+    return os.path.join(vectorstore_path, RAGConfig.QUANTIZED_INDEX_FILE)
+
+
+def full_vectors_path(vectorstore_path: str) -> str:
+    return os.path.join(vectorstore_path, RAGConfig.FULL_VECTORS_FILE)
+
+
+class QuantizedIndex:
+    """
+    저정밀도(float16/int8) 벡터 색인
+
+    코사인 유사도 검색용으로 정규화된 임베딩을 저장합니다. PCA 차원 축소를 적용한 경우
+    투영 행렬(평균, 주성분)을 색인 파일에 함께 저장하고, 질의도 같은 투영을 거칩니다.
+    full_vectors가 있으면(메모리 매핑된 float32 원본) 최종 top-k를 원본 정밀도로 재계산할 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        codes: np.ndarray,
+        dtype: str,
+        scale: Optional[np.ndarray] = None,
+        mean: Optional[np.ndarray] = None,
+        components: Optional[np.ndarray] = None,
+        source_dimension: int = 768,
+        full_vectors: Optional[np.ndarray] = None
+    ):
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"지원하지 않는 양자화 형식입니다: {dtype}")
+        self.ids = list(ids)
+        self.codes = codes
+        self.dtype = dtype
+        self.scale = scale
+        self.mean = mean
+        self.components = components
+        self.source_dimension = source_dimension
+        self.full_vectors = full_vectors
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dimension(self) -> int:
+        return self.codes.shape[1]
+
+    @property
+    def nbytes(self) -> int:
+        """검색 시 메모리에 상주하는 바이트 수 (메모리 매핑된 원본 벡터 제외)"""
+        return sum(array.nbytes for array in (self.codes, self.scale, self.mean, self.components) if array is not None)
+
+    def project(self, vectors: np.ndarray) -> np.ndarray:
+        """PCA 투영을 적용하고 다시 정규화합니다. PCA가 없으면 정규화만 합니다."""
+        vectors = normalize_rows(vectors)
+        if self.components is None:
+            return vectors
+        return normalize_rows((vectors - self.mean) @ self.components.T)
+
+    @classmethod
+    def build(cls, ids: Sequence[str], embeddings: np.ndarray, dtype: str = "int8", dimensions: Optional[int] = None) -> "QuantizedIndex":
+        """
+        임베딩으로 색인을 만듭니다.
+
+        Args:
+            ids: 문서 ID
+            embeddings: 원본 임베딩 (n, d)
+            dtype: "float16" 또는 "int8" (차원별 대칭 스케일 양자화)
+            dimensions: PCA 축소 차원 (없으면 축소하지 않음, 문서 수보다 클 수 없음)
+        """
+        if dtype not in SUPPORTED_DTYPES:
+            raise ValueError(f"지원하지 않는 양자화 형식입니다: {dtype}")
+        vectors = normalize_rows(embeddings)
+        source_dimension = vectors.shape[1]
+
+        mean = components = None
+        if dimensions and dimensions < source_dimension:
+            if dimensions > len(vectors):
+                logger.warning(f"[양자화] PCA 차원({dimensions})이 문서 수({len(vectors)})보다 커서 {len(vectors)}로 줄입니다.")
+                dimensions = len(vectors)
+            mean = vectors.mean(axis=0)
+            _, _, vt = np.linalg.svd(vectors - mean, full_matrices=False)
+            components = vt[:dimensions].astype(np.float32)
+            mean = mean.astype(np.float32)
+            vectors = normalize_rows((vectors - mean) @ components.T)
+
+        scale = None
+        if dtype == "float16":
+            codes = vectors.astype(np.float16)
+        else:
+            scale = np.maximum(np.abs(vectors).max(axis=0), 1e-12).astype(np.float32) / _INT8_MAX
+            codes = np.clip(np.round(vectors / scale), -_INT8_MAX, _INT8_MAX).astype(np.int8)
+
+        return cls(ids, codes, dtype, scale=scale, mean=mean, components=components, source_dimension=source_dimension)
+
+    def _scores(self, query: np.ndarray) -> np.ndarray:
+        """전체 문서에 대한 근사 코사인 유사도를 블록 단위로 계산합니다."""
+        weights = query * self.scale if self.scale is not None else query
+        scores = np.empty(len(self.ids), dtype=np.float32)
+        for start in range(0, len(self.ids), _SCORE_BLOCK_ROWS):
+            block = self.codes[start:start + _SCORE_BLOCK_ROWS].astype(np.float32)
+            scores[start:start + len(block)] = block @ weights
+        return scores
+
+    def search(self, query_embedding: np.ndarray, k: int, rescore: bool = False, rescore_factor: int = 4) -> List[Tuple[str, float]]:
+        """
+        코사인 유사도 기준 상위 k개 문서를 반환합니다.
+
+        Args:
+            query_embedding: 원본 차원의 질의 임베딩
+            k: 반환할 문서 수
+            rescore: True이고 원본 벡터가 있으면 k * rescore_factor개 후보를 원본 정밀도로 재정렬
+            rescore_factor: 재정렬 후보 배수
+
+        Returns:
+            List[Tuple[str, float]]: (문서 ID, 코사인 유사도) 리스트
+        """
+        if not self.ids:
+            return []
+        query = self.project(query_embedding)
+        scores = self._scores(query)
+
+        rescore = rescore and self.full_vectors is not None
+        candidates = min(len(self.ids), k * rescore_factor if rescore else k)
+        top = np.argpartition(-scores, candidates - 1)[:candidates]
+
+        if rescore:
+            original_query = normalize_rows(query_embedding)
+            rows = np.sort(top)  # 메모리 매핑 파일을 순서대로 읽도록 정렬
+            exact = np.asarray(self.full_vectors[rows], dtype=np.float32) @ original_query
+            order = np.argsort(-exact)[:k]
+            return [(self.ids[rows[i]], float(exact[i])) for i in order]
+
+        top = top[np.argsort(-scores[top])][:k]
+        return [(self.ids[i], float(scores[i])) for i in top]
+
+    def save(self, path: str) -> None:
+        """색인을 원자적으로 저장합니다."""
+        arrays: Dict[str, Any] = {"codes": self.codes}
+        for name in ("scale", "mean", "components"):
+            value = getattr(self, name)
+            if value is not None:
+                arrays[name] = value
+        meta = {
+            "version": INDEX_FORMAT_VERSION,
+            "dtype": self.dtype,
+            "source_dimension": self.source_dimension,
+            "ids": self.ids,
+        }
+        tmp_path = f"{path}.tmp.npz"
+        np.savez(tmp_path, meta=np.array(json.dumps(meta, ensure_ascii=False)), **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str, full_vectors_file: Optional[str] = None) -> "QuantizedIndex":
+        """색인을 불러옵니다. 원본 벡터 파일이 있으면 메모리 매핑으로 엽니다 (워커 간 페이지 캐시 공유)."""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("version") != INDEX_FORMAT_VERSION:
+                raise ValueError(f"지원하지 않는 양자화 색인 버전입니다: {meta.get('version')}")
+            arrays = {name: data[name] for name in ("scale", "mean", "components") if name in data}
+            codes = data["codes"]
+        full_vectors = None
+        if full_vectors_file and os.path.exists(full_vectors_file):
+            full_vectors = np.load(full_vectors_file, mmap_mode="r")
+        return cls(
+            meta["ids"],
+            codes,
+            meta["dtype"],
+            source_dimension=meta["source_dimension"],
+            full_vectors=full_vectors,
+            **arrays
+        )
+
+
+def save_full_vectors(path: str, embeddings: np.ndarray) -> None:
+    """재정렬용 원본 정밀도 벡터를 정규화해 저장합니다."""
+    tmp_path = f"{path}.tmp.npy"
+    np.save(tmp_path, normalize_rows(embeddings))
+    os.replace(tmp_path, path)
+
+
+def load_for_collection(vectorstore_path: str, collection) -> Optional[QuantizedIndex]:
+    """
+    벡터 스토어의 양자화 색인을 불러옵니다.
+    색인이 없거나 컬렉션 문서 수와 맞지 않으면(변환 후 적재됨) None을 반환합니다.
+    """
+    path = quantized_index_path(vectorstore_path)
+    if not os.path.exists(path):
+        logger.warning(f"[양자화] 양자화 색인이 없습니다: {path} (python -m app.tools.quantize_vectorstores로 생성)")
+        return None
+    index = QuantizedIndex.load(path, full_vectors_path(vectorstore_path))
+    count = collection.count()
+    if len(index) != count:
+        logger.warning(f"[양자화] 색인 문서 수({len(index)})가 컬렉션({count})과 달라 사용하지 않습니다. 변환을 다시 실행하세요.")
+        return None
+    return index
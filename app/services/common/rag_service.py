@@ -1,162 +1,519 @@
-from typing import List, Optional, Dict, Union
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, List, Optional, Dict, Union
+from contextlib import contextmanager
+from functools import lru_cache
+import json
+import threading
+import time
 from loguru import logger
-import chromadb
-from chromadb.config import Settings
-from sentence_transformers import SentenceTransformer
 from app.config.rag_config import RAGConfig
-from app.services.chatbot.chatbot_classifier import RAGType
+from app.core import chroma
+from app.core.embeddings import get_embedding_model
+from app.core.metrics import observe_stage
+from app.core.tracing import annotate, span
+from app.services.chatbot.chatbot_classifier import QueryType, RAGType
+from app.services.common.context_assembler import ContextAssembler
+from app.services.common.hnsw_tuning import configure_collection, hnsw_metadata
+from app.services.common.ingestion_service import IngestionService
+from app.services.common.lexical_index import LexicalIndex, lexical_index_path, reciprocal_rank_fusion
+from app.services.common import quantized_index
+from app.services.common.quantized_index import QuantizedIndex
+from app.services.common.retrieval_executor import RetrievalExecutor
 import os
 
+if TYPE_CHECKING:
+    from chromadb.api import ClientAPI
+    from chromadb.api.models.Collection import Collection
+
+
+class DomainSnapshot:
+    """
+    도메인 하나의 검색 상태 (ChromaDB 컬렉션, BM25/양자화 색인)
+    
+    스냅샷 교체는 이 객체 참조 하나를 바꾸는 것으로 이루어지므로, 검색은 시작할 때 잡은
+    스냅샷으로 끝까지 진행됩니다. active는 진행 중인 검색 수이고, document_count는 로드/적재 시점의
+    문서 수입니다 (검색마다 count()를 호출하지 않음).
+    """
+    
+    def __init__(
+        self,
+        rag_type: RAGType,
+        path: str,
+        version: Optional[int],
+        client,
+        collection,
+        lexical_index: Optional[LexicalIndex] = None,
+        vector_index: Optional[QuantizedIndex] = None
+    ):
+        self.rag_type = rag_type
+        self.path = path
+        self.version = version
+        self.client = client
+        # ChromaDB는 경로별 System을 전역 캐시에 두므로, 교체 후 닫을 수 있게 참조를 보관
+        self.system = client._system if client is not None else None
+        self.collection = collection
+        self.lexical_index = lexical_index
+        self.vector_index = vector_index
+        self.document_count = 0
+        self.loaded_at = time.time()
+        self.active = 0
+        self._lock = threading.Lock()
+    
+    def refresh_state(self) -> None:
+        """컬렉션 상태(문서 수)를 다시 읽습니다. 로드/적재 후에만 호출합니다."""
+        self.document_count = self.collection.count()
+    
+    @contextmanager
+    def use(self) -> Iterator["DomainSnapshot"]:
+        with self._lock:
+            self.active += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
 class RAGService:
     """RAG 서비스"""
     
-    def __init__(self):
+    retrieval_provider = "chroma"  # 지표의 검색 제공자 라벨
+    
+    def __init__(self, domains: Optional[Iterable[RAGType]] = None):
+        """
+        Args:
+            domains: 초기화할 도메인 (없으면 전체 도메인)
+        """
         self.config = RAGConfig()
+        self.domains = set(domains) if domains is not None else set(self.config.DOMAIN_CONFIGS)
         # 벡터 스토어 경로 검증
-        self.config.validate_paths()
+        self.config.validate_paths(self.domains)
         
-        self.embeddings = SentenceTransformer(self.config.EMBEDDING_MODEL)
+        self.embeddings = get_embedding_model(self.config.EMBEDDING_MODEL)
         logger.info(f"[RAG] 임베딩 모델 사용: {self.config.EMBEDDING_MODEL}")
         
-        # 도메인별 ChromaDB 클라이언트 초기화
-        self.clients: Dict[RAGType, chromadb.PersistentClient] = {}
-        self.collections: Dict[RAGType, chromadb.Collection] = {}
+        # 도메인별 검색 상태 (핫 리로드 시 스냅샷 단위로 교체)
+        self.snapshots: Dict[RAGType, DomainSnapshot] = {}
+        self._reload_locks: Dict[RAGType, threading.Lock] = {rag_type: threading.Lock() for rag_type in self.domains}
+        self.context_assembler = ContextAssembler()
+        # 검색은 이벤트 루프 밖의 도메인별 스레드 풀에서 실행
+        self.executor = RetrievalExecutor()
         
         # 벡터 스토어 검증 및 초기화
         self._validate_and_initialize_vectorstores()
     
+    @property
+    def clients(self) -> Dict[RAGType, "ClientAPI"]:
+        return {rag_type: snapshot.client for rag_type, snapshot in self.snapshots.items()}
+    
+    @property
+    def collections(self) -> Dict[RAGType, "Collection"]:
+        return {rag_type: snapshot.collection for rag_type, snapshot in self.snapshots.items()}
+    
+    @property
+    def lexical_indexes(self) -> Dict[RAGType, LexicalIndex]:
+        return {rag_type: snapshot.lexical_index for rag_type, snapshot in self.snapshots.items() if snapshot.lexical_index is not None}
+    
+    @property
+    def vector_indexes(self) -> Dict[RAGType, QuantizedIndex]:
+        return {rag_type: snapshot.vector_index for rag_type, snapshot in self.snapshots.items() if snapshot.vector_index is not None}
+    
     def _validate_and_initialize_vectorstores(self) -> None:
         """벡터 스토어를 검증하고 초기화합니다."""
-        for rag_type, config in self.config.DOMAIN_CONFIGS.items():
+        for rag_type in self.config.DOMAIN_CONFIGS:
+            if rag_type not in self.domains:
+                continue
+            self.snapshots[rag_type] = self._load_snapshot(rag_type)
+    
+    def _load_snapshot(self, rag_type: RAGType) -> DomainSnapshot:
+        """도메인의 활성 벡터 스토어(스냅샷)를 열고 색인을 로드합니다."""
+        config = self.config.DOMAIN_CONFIGS[rag_type]
+        version = self.config.active_snapshot_version(rag_type)
+        try:
+            # 벡터 스토어 경로 검증
+            vectorstore_path = self.config.active_vectorstore_path(rag_type)
+            logger.info(f"[RAG] {rag_type.value} 도메인 벡터 스토어 경로: {vectorstore_path}" + (f" (스냅샷 v{version})" if version is not None else ""))
+            
+            if not os.path.exists(vectorstore_path):
+                logger.warning(f"[RAG] {rag_type.value} 도메인의 벡터 스토어 경로가 존재하지 않습니다: {vectorstore_path}")
+                os.makedirs(vectorstore_path, exist_ok=True)
+                logger.info(f"[RAG] {rag_type.value} 도메인의 벡터 스토어 디렉토리를 생성했습니다: {vectorstore_path}")
+            
+            # ChromaDB 파일 확인
+            chroma_db_file = os.path.join(vectorstore_path, "chroma.sqlite3")
+            if os.path.exists(chroma_db_file):
+                logger.info(f"[RAG] {rag_type.value} 도메인의 ChromaDB 파일 크기: {os.path.getsize(chroma_db_file)} bytes")
+            else:
+                logger.warning(f"[RAG] {rag_type.value} 도메인의 ChromaDB 파일이 존재하지 않습니다: {chroma_db_file}")
+            
+            # ChromaDB 클라이언트 생성
+            client = chroma.open_client(vectorstore_path)
+            
+            # 컬렉션 초기화 및 검증
             try:
-                # 벡터 스토어 경로 검증
-                vectorstore_path = config["vectorstore_path"]
-                logger.info(f"[RAG] {rag_type.value} 도메인 벡터 스토어 경로: {vectorstore_path}")
+                collection = client.get_collection(config["collection_name"])
+                count = collection.count()
                 
-                if not os.path.exists(vectorstore_path):
-                    logger.warning(f"[RAG] {rag_type.value} 도메인의 벡터 스토어 경로가 존재하지 않습니다: {vectorstore_path}")
-                    os.makedirs(vectorstore_path, exist_ok=True)
-                    logger.info(f"[RAG] {rag_type.value} 도메인의 벡터 스토어 디렉토리를 생성했습니다: {vectorstore_path}")
+                if count == 0:
+                    logger.warning(f"[RAG] {rag_type.value} 도메인 컬렉션이 비어있습니다.")
+                else:
+                    logger.info(f"[RAG] {rag_type.value} 도메인 컬렉션 로드 완료: {count}개의 문서")
+                    # 컬렉션의 첫 번째 문서 샘플 확인
+                    try:
+                        sample = collection.peek(limit=1)
+                        logger.info(f"[RAG] {rag_type.value} 도메인 컬렉션 샘플: {sample}")
+                    except Exception as e:
+                        logger.error(f"[RAG] {rag_type.value} 도메인 컬렉션 샘플 조회 실패: {str(e)}")
                 
-                # ChromaDB 파일 확인
-                chroma_db_file = os.path.join(vectorstore_path, "chroma.sqlite3")
-                if os.path.exists(chroma_db_file):
-                    logger.info(f"[RAG] {rag_type.value} 도메인의 ChromaDB 파일 크기: {os.path.getsize(chroma_db_file)} bytes")
+                # 컬렉션 메타데이터 검증
+                metadata = collection.metadata
+                if not metadata:
+                    logger.warning(f"[RAG] {rag_type.value} 도메인 컬렉션의 메타데이터가 없습니다.")
                 else:
-                    logger.warning(f"[RAG] {rag_type.value} 도메인의 ChromaDB 파일이 존재하지 않습니다: {chroma_db_file}")
+                    logger.info(f"[RAG] {rag_type.value} 도메인 컬렉션 메타데이터: {metadata}")
                 
-                # ChromaDB 클라이언트 생성
-                client = chromadb.PersistentClient(
-                    path=vectorstore_path,
-                    settings=Settings(allow_reset=True)
+            except ValueError:
+                logger.warning(f"[RAG] {rag_type.value} 도메인 컬렉션이 존재하지 않습니다.")
+                # 임베딩 차원을 명시적으로 지정하여 컬렉션 생성
+                collection = client.create_collection(
+                    name=config["collection_name"],
+                    metadata={
+                        **hnsw_metadata(rag_type),
+                        "domain": rag_type.value,
+                        "embedding_dimension": 768,  # sentence-transformers/paraphrase-multilingual-mpnet-base-v2 모델의 차원
+                        "embedding_model": self.config.EMBEDDING_MODEL
+                    }
                 )
-                self.clients[rag_type] = client
-                
-                # 컬렉션 초기화 및 검증
-                try:
-                    collection = client.get_collection(config["collection_name"])
-                    count = collection.count()
-                    
-                    if count == 0:
-                        logger.warning(f"[RAG] {rag_type.value} 도메인 컬렉션이 비어있습니다.")
-                    else:
-                        logger.info(f"[RAG] {rag_type.value} 도메인 컬렉션 로드 완료: {count}개의 문서")
-                        # 컬렉션의 첫 번째 문서 샘플 확인
-                        try:
-                            sample = collection.peek(limit=1)
-                            logger.info(f"[RAG] {rag_type.value} 도메인 컬렉션 샘플: {sample}")
-                        except Exception as e:
-                            logger.error(f"[RAG] {rag_type.value} 도메인 컬렉션 샘플 조회 실패: {str(e)}")
-                    
-                    # 컬렉션 메타데이터 검증
-                    metadata = collection.metadata
-                    if not metadata:
-                        logger.warning(f"[RAG] {rag_type.value} 도메인 컬렉션의 메타데이터가 없습니다.")
-                    else:
-                        logger.info(f"[RAG] {rag_type.value} 도메인 컬렉션 메타데이터: {metadata}")
-                    
-                    self.collections[rag_type] = collection
-                    
-                except ValueError:
-                    logger.warning(f"[RAG] {rag_type.value} 도메인 컬렉션이 존재하지 않습니다.")
-                    # 임베딩 차원을 명시적으로 지정하여 컬렉션 생성
-                    self.collections[rag_type] = client.create_collection(
-                        name=config["collection_name"],
-                        metadata={
-                            "domain": rag_type.value,
-                            "embedding_dimension": 768,  # sentence-transformers/paraphrase-multilingual-mpnet-base-v2 모델의 차원
-                            "embedding_model": self.config.EMBEDDING_MODEL
-                        }
+                logger.info(f"[RAG] {rag_type.value} 도메인 컬렉션을 생성했습니다.")
+                count = 0
+            
+            # 도메인 HNSW 설정 적용 (search_ef는 로드 시 바로 반영)
+            configure_collection(rag_type, client, collection)
+            
+            snapshot = DomainSnapshot(rag_type, vectorstore_path, version, client, collection)
+            snapshot.document_count = count
+            
+            # BM25 색인 로드 (없거나 동기화되지 않았으면 생성)
+            if self.config.HYBRID_SEARCH:
+                snapshot.lexical_index = LexicalIndex.load_or_build(
+                    lexical_index_path(vectorstore_path),
+                    collection,
+                    k1=self.config.BM25_K1,
+                    b=self.config.BM25_B
+                )
+                logger.info(f"[RAG] {rag_type.value} 도메인 렉시컬 색인 로드 완료: {len(snapshot.lexical_index)}개 문서")
+            
+            # 양자화 벡터 색인 로드 (없거나 동기화되지 않았으면 Chroma 검색 사용)
+            if self.config.QUANTIZED_SEARCH:
+                vector_index = quantized_index.load_for_collection(vectorstore_path, collection)
+                if vector_index is not None:
+                    snapshot.vector_index = vector_index
+                    logger.info(
+                        f"[RAG] {rag_type.value} 도메인 양자화 색인 로드 완료: {vector_index.dtype}, "
+                        f"{vector_index.dimension}차원, {vector_index.nbytes / 1024:.1f}KB"
+                        f"{', 원본 정밀도 재정렬 가능' if vector_index.full_vectors is not None else ''}"
                     )
-                    logger.info(f"[RAG] {rag_type.value} 도메인 컬렉션을 생성했습니다.")
-                
-                logger.info(f"[RAG] {rag_type.value} 도메인 초기화 완료: {vectorstore_path}")
-                
-            except Exception as e:
-                logger.error(f"[RAG] {rag_type.value} 도메인 초기화 중 오류 발생: {str(e)}")
-                raise
+            
+            logger.info(f"[RAG] {rag_type.value} 도메인 초기화 완료: {vectorstore_path}")
+            return snapshot
+            
+        except Exception as e:
+            logger.error(f"[RAG] {rag_type.value} 도메인 초기화 중 오류 발생: {str(e)}")
+            raise
     
-    def _validate_collection(self, rag_type: RAGType) -> bool:
+    def reopen_clients(self) -> None:
+        """
+        ChromaDB 클라이언트와 컬렉션을 새로 엽니다.
+        fork 전에 로드한 서비스를 워커에서 쓸 때 호출합니다. SQLite 연결은 fork 후 공유하면 안 되므로
+        연결만 새로 만들고, 임베딩 모델과 BM25/양자화 색인은 그대로 공유합니다(copy-on-write).
         """
-        특정 도메인의 컬렉션이 유효한지 검증합니다.
+        chroma.clear_system_cache()
+        for rag_type, snapshot in self.snapshots.items():
+            snapshot.client = chroma.open_client(snapshot.path)
+            snapshot.system = snapshot.client._system
+            snapshot.collection = snapshot.client.get_collection(self.config.DOMAIN_CONFIGS[rag_type]["collection_name"])
+            configure_collection(rag_type, snapshot.client, snapshot.collection)
+        # fork한 자식에는 부모의 검색 스레드가 없으므로 스레드 풀도 새로 만듦
+        self.executor.reset()
+        logger.info(f"[RAG] ChromaDB 연결 재생성 완료 (pid {os.getpid()}): {len(self.snapshots)}개 도메인")
+    
+    def close(self) -> None:
+        """검색 스레드 풀을 종료합니다 (서버 종료 시 진행 중인 요청이 끝난 뒤 호출)."""
+        self.executor.shutdown()
+        logger.info("[RAG] 검색 스레드 풀 종료")
+    
+    def _validate_collection(self, snapshot: DomainSnapshot) -> bool:
+        """
+        스냅샷의 컬렉션이 검색 가능한지 검증합니다.
+        로드/적재 시점에 저장한 상태만 확인하므로 검색마다 SQLite를 조회하지 않습니다.
         
         Args:
-            rag_type: RAG 유형
+            snapshot: 도메인 스냅샷
             
         Returns:
             bool: 컬렉션이 유효하면 True, 아니면 False
         """
+        if snapshot.collection is None:
+            logger.error(f"[RAG] {snapshot.rag_type.value} 도메인 컬렉션이 존재하지 않습니다.")
+            return False
+        if snapshot.document_count == 0:
+            logger.warning(f"[RAG] {snapshot.rag_type.value} 도메인 컬렉션이 비어있습니다.")
+            return False
+        return True
+    
+    def add_documents(self, rag_type: RAGType, documents: List[str], source: str = "inline") -> Dict[str, Any]:
+        """
+        특정 도메인의 문서를 청크로 나누어 벡터 DB에 추가합니다.
+        청크 ID는 내용 해시 기반이므로 이미 있는 청크는 다시 임베딩하지 않습니다.
+        
+        Args:
+            rag_type: RAG 유형
+            documents: 추가할 문서 리스트
+            source: 문서 출처 (메타데이터에 기록)
+            
+        Returns:
+            Dict[str, Any]: 적재 결과 리포트
+        """
         try:
-            if rag_type not in self.collections:
-                logger.error(f"[RAG] {rag_type.value} 도메인 컬렉션이 존재하지 않습니다.")
-                return False
+            logger.info(f"[RAG] {rag_type.value} 도메인에 문서 추가 시작: {len(documents)}개")
             
-            collection = self.collections[rag_type]
-            count = collection.count()
+            snapshot = self.snapshots[rag_type]
+            ingestion = IngestionService(encoder=self.embeddings, vectorstore_path=snapshot.path)
+            report = ingestion.ingest_texts(
+                rag_type,
+                documents,
+                source=source,
+                collection=snapshot.collection,
+                lexical_index=snapshot.lexical_index
+            )
             
-            if count == 0:
-                logger.warning(f"[RAG] {rag_type.value} 도메인 컬렉션이 비어있습니다.")
-                return False
+            snapshot.document_count = report["collection_count"]
+            if report["embedded"] and snapshot.vector_index is not None:
+                snapshot.vector_index = None
+                logger.warning(f"[RAG] {rag_type.value} 도메인 문서가 바뀌어 양자화 색인 대신 Chroma 검색을 사용합니다. 변환을 다시 실행하세요.")
             
-            # 컬렉션의 임베딩 차원 검증
-            metadata = collection.metadata
-            if not metadata or "embedding_dimension" not in metadata:
-                logger.warning(f"[RAG] {rag_type.value} 도메인 컬렉션의 임베딩 차원 정보가 없습니다.")
+            logger.info(f"[RAG] {rag_type.value} 도메인에 {report['embedded']}개의 청크가 추가되었습니다.")
+            return report
+        except Exception as e:
+            logger.error(f"문서 추가 중 오류 발생: {str(e)}")
+            raise
+    
+    def retrieve(self, rag_type: RAGType, query: str, k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        특정 도메인에서 질의와 관련된 문서를 순위대로 검색합니다.
+        
+        Args:
+            rag_type: RAG 유형
+            query: 검색 질의
+            k: 반환할 문서 수 (없으면 SEARCH_K)
             
-            return True
+        Returns:
+            List[Dict[str, Any]]: id, document, metadata를 담은 검색 결과 리스트
+        """
+        # 검색 도중 스냅샷이 교체되어도 시작할 때 잡은 스냅샷으로 끝까지 검색
+        snapshot = self.snapshots.get(rag_type)
+        if snapshot is None:
+            logger.error(f"[RAG] {rag_type.value} 도메인 컬렉션이 존재하지 않습니다.")
+            return []
+        with snapshot.use():
+            return self._retrieve(snapshot, query, k)
+    
+    def _retrieve(self, snapshot: DomainSnapshot, query: str, k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """스냅샷 하나에서 검색합니다."""
+        rag_type = snapshot.rag_type
+        k = k or self.config.SEARCH_K
+        
+        # 컬렉션 검증
+        if not self._validate_collection(snapshot):
+            logger.error(f"[RAG] {rag_type.value} 도메인 컬렉션이 유효하지 않습니다.")
+            return []
+        
+        collection = snapshot.collection
+        
+        # 질의 임베딩 생성
+        with span("retrieve.embed"):
+            query_embedding = self.embeddings.encode([query])[0]
+        
+        # 유사도 검색 (하이브리드 검색 시 결합 전 후보를 넉넉히 가져옴)
+        lexical_index = snapshot.lexical_index
+        n_results = max(self.config.SEARCH_CANDIDATES, k) if lexical_index is not None else k
+        vector_index = snapshot.vector_index
+        with span("retrieve.vector_search", candidates=n_results, quantized=vector_index is not None):
+            if vector_index is not None:
+                # 양자화 색인으로 검색하고 본문은 ID로 조회 (Chroma HNSW 색인을 메모리에 올리지 않음)
+                hits = vector_index.search(
+                    query_embedding,
+                    n_results,
+                    rescore=self.config.QUANTIZED_RESCORE,
+                    rescore_factor=self.config.QUANTIZED_RESCORE_FACTOR
+                )
+                dense_ids = [doc_id for doc_id, _ in hits]
+                distances = [1 - score for _, score in hits]
+                fetched = collection.get(ids=dense_ids, include=["documents", "metadatas"])
+                documents = dict(zip(fetched['ids'], fetched['documents']))
+                metadatas = dict(zip(fetched['ids'], fetched['metadatas']))
+            else:
+                results = collection.query(
+                    query_embeddings=[query_embedding.tolist()],
+                    n_results=n_results,
+                    include=["documents", "distances", "metadatas"]
+                )
+                dense_ids = results['ids'][0]
+                distances = results['distances'][0]
+                documents = dict(zip(dense_ids, results['documents'][0]))
+                metadatas = dict(zip(dense_ids, results['metadatas'][0]))
+        
+        # 검색 결과 로깅
+        logger.info(f"[RAG] {rag_type.value} 도메인 검색 결과: {len(dense_ids)}개")
+        for i, (doc_id, score) in enumerate(zip(dense_ids, distances)):
+            # 인자로 넘겨 DEBUG를 받는 싱크가 없으면 문자열을 만들지 않음
+            logger.debug("[RAG] 문서 {} (거리: {:.4f}): {:.100}...", i + 1, score, documents.get(doc_id) or "")
+        
+        # 코사인 거리를 유사도로 바꿔 임계값 이상의 문서만 사용
+        dense_ranking = [
+            doc_id for doc_id, distance in zip(dense_ids, distances)
+            if 1 - distance >= self.config.SEARCH_THRESHOLD
+        ]
+        if not dense_ranking:
+            logger.warning(f"[RAG] {rag_type.value} 도메인에서 임계값({self.config.SEARCH_THRESHOLD}) 이상의 문서가 없습니다.")
+            # 임계값을 만족하는 문서가 없으면 상위 2개 문서 사용
+            dense_ranking = dense_ids[:2]
+        
+        if lexical_index is not None:
+            # BM25 결과와 Reciprocal Rank Fusion으로 결합
+            lexical_ranking = [doc_id for doc_id, _ in lexical_index.search(query, k=max(self.config.SEARCH_CANDIDATES, k))]
+            logger.info(f"[RAG] {rag_type.value} 도메인 렉시컬 검색 결과: {len(lexical_ranking)}개")
+            fused = reciprocal_rank_fusion([dense_ranking, lexical_ranking], k=self.config.RRF_K)
+            ranked_ids = [doc_id for doc_id, _ in fused[:k]]
             
-        except Exception as e:
-            logger.error(f"[RAG] {rag_type.value} 도메인 컬렉션 검증 중 오류 발생: {str(e)}")
-            return False
+            # 렉시컬 검색에서만 나온 문서 본문 조회
+            missing_ids = [doc_id for doc_id in ranked_ids if doc_id not in documents]
+            if missing_ids:
+                fetched = collection.get(ids=missing_ids, include=["documents", "metadatas"])
+                documents.update(zip(fetched['ids'], fetched['documents']))
+                metadatas.update(zip(fetched['ids'], fetched['metadatas']))
+        else:
+            ranked_ids = dense_ranking[:k]
+        
+        return [
+            {"id": doc_id, "document": documents[doc_id], "metadata": metadatas.get(doc_id) or {}}
+            for doc_id in ranked_ids if documents.get(doc_id)
+        ]
     
-    def add_documents(self, rag_type: RAGType, documents: List[str]) -> None:
+    def reload_domain(self, rag_type: RAGType, force: bool = False) -> Dict[str, Any]:
         """
-        특정 도메인의 문서를 벡터 DB에 추가합니다.
+        도메인의 활성 스냅샷(CURRENT)을 새로 로드해 교체합니다.
+        새 스냅샷을 로드하고 샘플 질의로 예열한 뒤 참조를 한 번에 바꿉니다. 진행 중인 검색은
+        이전 스냅샷으로 끝나고, 이전 스냅샷은 검색이 모두 끝난 뒤 백그라운드에서 닫습니다.
+        로드나 예열에 실패하면 이전 스냅샷을 그대로 사용합니다.
         
         Args:
             rag_type: RAG 유형
-            documents: 추가할 문서 리스트
+            force: 같은 버전이어도 다시 로드 (스냅샷 없이 디렉토리를 직접 쓰면 항상 다시 로드)
+            
+        Returns:
+            Dict[str, Any]: 교체 결과 리포트
         """
-        try:
-            logger.info(f"[RAG] {rag_type.value} 도메인에 문서 추가 시작: {len(documents)}개")
+        if rag_type not in self.domains:
+            raise ValueError(f"{rag_type.value} 도메인은 로드되지 않았습니다.")
+        
+        with self._reload_locks[rag_type]:
+            old = self.snapshots.get(rag_type)
+            version = self.config.active_snapshot_version(rag_type)
+            report: Dict[str, Any] = {
+                "domain": rag_type.value,
+                "previous_version": old.version if old is not None else None,
+                "version": version,
+                "reloaded": False,
+            }
+            if old is not None and version is not None and old.version == version and not force:
+                logger.info(f"[RAG] {rag_type.value} 도메인은 이미 스냅샷 v{version}을 사용 중입니다.")
+                return report
             
-            # 문서 임베딩 생성
-            embeddings = self.embeddings.encode(documents)
+            self.config.validate_paths([rag_type])
+            start_time = time.perf_counter()
+            if old is not None and old.path == self.config.active_vectorstore_path(rag_type):
+                # 같은 경로를 다시 열면 ChromaDB가 캐시된 System을 돌려주므로 캐시에서만 뺌 (이전 컬렉션은 계속 동작)
+                chroma.system_cache().pop(old.path, None)
+            snapshot = self._load_snapshot(rag_type)
+            load_seconds = time.perf_counter() - start_time
+            warmup = self._warm_up(snapshot)
             
-            # 문서 ID 생성
-            doc_ids = [f"doc_{i}" for i in range(len(documents))]
+            self.snapshots[rag_type] = snapshot
+            if old is not None:
+                threading.Thread(target=self._retire, args=(old,), name=f"retire-{rag_type.value}", daemon=True).start()
             
-            # 컬렉션에 문서 추가
-            self.collections[rag_type].add(
-                embeddings=embeddings.tolist(),
-                documents=documents,
-                ids=doc_ids
+            report.update({
+                "reloaded": True,
+                "path": snapshot.path,
+                "documents": snapshot.document_count,
+                "load_seconds": round(load_seconds, 3),
+                "warmup": warmup,
+            })
+            logger.info(
+                f"[RAG] {rag_type.value} 도메인 스냅샷 교체 완료: v{report['previous_version']} → v{version} "
+                f"({report['documents']}개 문서, 로드 {load_seconds:.2f}초, 예열 {warmup['queries']}개 질의 {warmup['seconds']:.2f}초)"
             )
-            
-            logger.info(f"[RAG] {rag_type.value} 도메인에 {len(documents)}개의 문서가 추가되었습니다.")
+            return report
+    
+    def _warmup_queries(self, snapshot: DomainSnapshot) -> List[str]:
+        """예열 질의를 반환합니다. 라벨 질의 세트가 있으면 사용하고, 없으면 첫 문서 앞부분을 사용합니다."""
+        query_file = os.path.join(self.config.WARMUP_QUERIES_DIR, f"{snapshot.rag_type.value}.json")
+        if os.path.exists(query_file):
+            with open(query_file, encoding="utf-8") as f:
+                queries = [item["query"] for item in json.load(f)["queries"]]
+            if queries:
+                return queries[:self.config.SNAPSHOT_WARMUP_QUERIES]
+        sample = snapshot.collection.peek(limit=1)
+        return [document[:100] for document in sample["documents"] if document]
+    
+    def _warm_up(self, snapshot: DomainSnapshot) -> Dict[str, Any]:
+        """새 스냅샷에 샘플 질의를 실행해 색인과 페이지 캐시를 미리 올리고, 검색이 되는지 확인합니다."""
+        if snapshot.document_count == 0:
+            raise ValueError(f"{snapshot.rag_type.value} 도메인의 새 스냅샷 컬렉션이 비어 있어 교체하지 않습니다: {snapshot.path}")
+        queries = self._warmup_queries(snapshot)
+        start_time = time.perf_counter()
+        results = [self._retrieve(snapshot, query) for query in queries]
+        if queries and not any(results):
+            raise ValueError(f"{snapshot.rag_type.value} 도메인의 새 스냅샷에서 예열 질의 결과가 없어 교체하지 않습니다: {snapshot.path}")
+        return {"queries": len(queries), "seconds": round(time.perf_counter() - start_time, 3)}
+    
+    def _retire(self, snapshot: DomainSnapshot) -> None:
+        """진행 중인 검색이 끝나기를 기다렸다가 이전 스냅샷의 ChromaDB System을 닫습니다."""
+        deadline = time.monotonic() + self.config.SNAPSHOT_DRAIN_TIMEOUT
+        while snapshot.active and time.monotonic() < deadline:
+            time.sleep(0.05)
+        if snapshot.active:
+            logger.warning(f"[RAG] {snapshot.rag_type.value} 이전 스냅샷에 진행 중인 검색 {snapshot.active}개가 남아 있지만 닫습니다.")
+        if chroma.system_cache().get(snapshot.path) is snapshot.system:
+            chroma.system_cache().pop(snapshot.path, None)
+        try:
+            snapshot.system.stop()
         except Exception as e:
-            logger.error(f"문서 추가 중 오류 발생: {str(e)}")
-            raise
+            logger.error(f"[RAG] {snapshot.rag_type.value} 이전 스냅샷 종료 중 오류 발생: {str(e)}")
+        logger.info(f"[RAG] {snapshot.rag_type.value} 이전 스냅샷 해제: {snapshot.path}")
+    
+    def retrieval_stats(self) -> Dict[str, Dict[str, Any]]:
+        """도메인별 검색 대기/실행 시간 통계를 반환합니다."""
+        return self.executor.stats()
+    
+    async def aretrieve(self, rag_type: RAGType, query: str, k: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        retrieve를 도메인 검색 스레드 풀에서 실행합니다. 비동기 코드에서는 이 메서드를 사용합니다.
+        
+        Args:
+            rag_type: RAG 유형
+            query: 검색 질의
+            k: 반환할 문서 수 (없으면 SEARCH_K)
+            
+        Returns:
+            List[Dict[str, Any]]: id, document, metadata를 담은 검색 결과 리스트
+        """
+        # 대기 수는 검색 스레드 풀(rag-<도메인>)에서 따로 집계
+        with observe_stage("retrieve", provider=self.retrieval_provider, model=self.config.EMBEDDING_MODEL, track_queue=False, rag_type=rag_type):
+            annotate(domain=rag_type.value, k=k or self.config.SEARCH_K)
+            results = await self.executor.run(rag_type, self.retrieve, rag_type, query, k)
+            annotate(results=len(results))
+            return results
     
     async def search(self, rag_type: RAGType, query: str, format_as_context: bool = False) -> Union[List[str], str]:
         """
@@ -173,36 +530,7 @@ class RAGService:
         try:
             logger.info(f"[RAG] {rag_type.value} 도메인에서 문서 검색 시작: {query}")
             
-            # 컬렉션 검증
-            if not self._validate_collection(rag_type):
-                logger.error(f"[RAG] {rag_type.value} 도메인 컬렉션이 유효하지 않습니다.")
-                return [] if not format_as_context else ""
-            
-            # 질의 임베딩 생성
-            query_embedding = self.embeddings.encode([query])[0]
-            
-            # 유사도 검색
-            results = self.collections[rag_type].query(
-                query_embeddings=[query_embedding.tolist()],
-                n_results=self.config.SEARCH_K,
-                include=["documents", "distances", "metadatas"]
-            )
-            
-            # 검색 결과 로깅
-            logger.info(f"[RAG] {rag_type.value} 도메인 검색 결과:")
-            for i, (doc, score) in enumerate(zip(results['documents'][0], results['distances'][0])):
-                logger.info(f"[RAG] 문서 {i+1} (유사도: {score:.4f}): {doc[:100]}...")
-            
-            # 임계값 이상의 문서만 반환 (임계값을 0.2로 낮춤)
-            filtered_docs = []
-            for doc, score in zip(results['documents'][0], results['distances'][0]):
-                if score >= 0.2:  # 임계값을 0.2로 낮춤
-                    filtered_docs.append(doc)
-            
-            if not filtered_docs:
-                logger.warning(f"[RAG] {rag_type.value} 도메인에서 임계값({0.2}) 이상의 문서가 없습니다.")
-                # 임계값을 만족하는 문서가 없으면 상위 2개 문서 반환
-                filtered_docs = results['documents'][0][:2]
+            filtered_docs = [result["document"] for result in await self.aretrieve(rag_type, query)]
             
             logger.info(f"[RAG] {rag_type.value} 도메인에서 {len(filtered_docs)}개의 문서가 검색되었습니다.")
             
@@ -218,15 +546,41 @@ class RAGService:
             logger.error(f"문서 검색 중 오류 발생: {str(e)}")
             return [] if not format_as_context else ""
     
-    async def get_context(self, rag_type: RAGType, query: str) -> str:
+    async def get_context(
+        self,
+        rag_type: RAGType,
+        query: str,
+        query_type: QueryType = QueryType.GENERAL,
+        max_tokens: Optional[int] = None
+    ) -> str:
         """
         특정 RAG 유형에서 질의에 대한 컨텍스트를 생성합니다.
+        근사 중복을 제거하고 질의 유형별 토큰 예산에 맞춰 조립합니다.
         
         Args:
             rag_type: RAG 유형
             query: 질의
+            query_type: 질의 유형 (토큰 예산 선택 기준)
+            max_tokens: 토큰 예산 직접 지정
             
         Returns:
             str: 생성된 컨텍스트
         """
-        return await self.search(rag_type, query, format_as_context=True) 
\ No newline at end of file
+        documents = await self.search(rag_type, query)
+        if not documents:
+            return ""
+        context, _ = self.context_assembler.assemble(documents, query_type, max_tokens=max_tokens, tag="RAG")
+        return context
+
+
+@lru_cache(maxsize=None)
+def get_rag_service() -> RAGService:
+    """
+    프로세스 전역 RAG 서비스를 반환합니다.
+    임베딩 모델, 컬렉션, BM25 색인을 요청마다 다시 로드하지 않도록 공유합니다.
+    RAG_SIDECAR_SOCKET이 설정되어 있으면 모델을 올리지 않고 검색 사이드카에 연결합니다.
+    """
+    if RAGConfig.SIDECAR_SOCKET:
+        from app.services.common.retrieval_sidecar import RemoteRAGService
+        return RemoteRAGService(RAGConfig.SIDECAR_SOCKET)
+    return RAGService()
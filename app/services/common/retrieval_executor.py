@@ -0,0 +1,161 @@
+from typing import Any, Callable, Deque, Dict, Iterable, Optional
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import contextvars
+import threading
+import time
+import numpy as np
+from loguru import logger
+from app.config.rag_config import RAGConfig
+from app.core.metrics import PROVIDER_QUEUE_DEPTH
+from app.services.chatbot.chatbot_classifier import RAGType
+
+
+class _DomainStats:
+    """도메인 하나의 검색 대기/실행 시간 통계"""
+
+    def __init__(self, window: int):
+        self.lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.queue_seconds = 0.0
+        self.search_seconds = 0.0
+        self.recent_queue: Deque[float] = deque(maxlen=window)
+        self.recent_search: Deque[float] = deque(maxlen=window)
+
+
+def _percentile_ms(values: Iterable[float], q: float) -> float:
+    values = list(values)
+    return round(float(np.percentile(values, q)) * 1000, 3) if values else 0.0
+
+
+class RetrievalExecutor:
+    """
+    도메인별 검색 스레드 풀
+
+    ChromaDB 검색(SQLite/HNSW)은 동기 호출이므로 이벤트 루프에서 직접 부르면 다른 요청이 모두 멈춥니다.
+    검색을 도메인별 스레드 풀에서 실행하고, 도메인마다 동시 검색 수를 readers개로 제한합니다.
+    풀에서 기다린 시간(대기)과 실제 검색 시간을 따로 집계합니다.
+    """
+
+    def __init__(self, readers: Optional[int] = None, window: Optional[int] = None):
+        """
+        Args:
+            readers: 도메인별 동시 검색 스레드 수 (없으면 RAG_RETRIEVAL_READERS)
+            window: 백분위를 계산할 최근 검색 수
+        """
+        self.readers = max(1, readers or RAGConfig.RETRIEVAL_READERS)
+        self.window = window or RAGConfig.RETRIEVAL_STATS_WINDOW
+        self._pools: Dict[RAGType, ThreadPoolExecutor] = {}
+        self._stats: Dict[RAGType, _DomainStats] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, rag_type: RAGType) -> ThreadPoolExecutor:
+        # 스레드는 처음 검색할 때 만듦 (fork 전에 스레드를 띄우지 않도록)
+        with self._lock:
+            pool = self._pools.get(rag_type)
+            if pool is None:
+                pool = ThreadPoolExecutor(max_workers=self.readers, thread_name_prefix=f"rag-{rag_type.value}")
+                self._pools[rag_type] = pool
+                self._stats.setdefault(rag_type, _DomainStats(self.window))
+            return pool
+
+    def submit(self, rag_type: RAGType, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        도메인 스레드 풀에 검색을 제출합니다.
+
+        Args:
+            rag_type: RAG 유형 (스레드 풀 선택 기준)
+            fn: 실행할 동기 함수
+
+        Returns:
+            Future: 실행 결과
+        """
+        pool = self._pool(rag_type)
+        stats = self._stats[rag_type]
+        queue_depth = PROVIDER_QUEUE_DEPTH.labels(provider=f"rag-{rag_type.value}")
+        submitted_at = time.perf_counter()
+        with stats.lock:
+            stats.queued += 1
+        queue_depth.inc()
+
+        def timed() -> Any:
+            started_at = time.perf_counter()
+            with stats.lock:
+                stats.queued -= 1
+                stats.running += 1
+            queue_depth.dec()
+            failed = False
+            try:
+                return fn(*args, **kwargs)
+            except BaseException:
+                failed = True
+                raise
+            finally:
+                finished_at = time.perf_counter()
+                with stats.lock:
+                    stats.running -= 1
+                    stats.failed += failed
+                    stats.completed += not failed
+                    stats.queue_seconds += started_at - submitted_at
+                    stats.search_seconds += finished_at - started_at
+                    stats.recent_queue.append(started_at - submitted_at)
+                    stats.recent_search.append(finished_at - started_at)
+
+        # 요청 추적(request_id, 구간)과 로그 컨텍스트를 검색 스레드로 넘김
+        return pool.submit(contextvars.copy_context().run, timed)
+
+    async def run(self, rag_type: RAGType, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """도메인 스레드 풀에서 함수를 실행하고 결과를 기다립니다 (이벤트 루프는 막지 않음)."""
+        return await asyncio.wrap_future(self.submit(rag_type, fn, *args, **kwargs))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        도메인별 대기/검색 시간 통계를 반환합니다.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: 도메인별 진행 중/대기 중 검색 수, 누적 횟수, 평균과 최근 p50/p95(ms)
+        """
+        report: Dict[str, Dict[str, Any]] = {}
+        for rag_type, stats in list(self._stats.items()):
+            with stats.lock:
+                finished = stats.completed + stats.failed
+                recent_queue = list(stats.recent_queue)
+                recent_search = list(stats.recent_search)
+                report[rag_type.value] = {
+                    "readers": self.readers,
+                    "queued": stats.queued,
+                    "running": stats.running,
+                    "completed": stats.completed,
+                    "failed": stats.failed,
+                    "queue_seconds_total": round(stats.queue_seconds, 6),
+                    "search_seconds_total": round(stats.search_seconds, 6),
+                    "queue_ms_avg": round(stats.queue_seconds / finished * 1000, 3) if finished else 0.0,
+                    "search_ms_avg": round(stats.search_seconds / finished * 1000, 3) if finished else 0.0,
+                }
+            report[rag_type.value].update({
+                "queue_ms_p50": _percentile_ms(recent_queue, 50),
+                "queue_ms_p95": _percentile_ms(recent_queue, 95),
+                "search_ms_p50": _percentile_ms(recent_search, 50),
+                "search_ms_p95": _percentile_ms(recent_search, 95),
+            })
+        return report
+
+    def reset(self) -> None:
+        """
+        스레드 풀을 버립니다. fork한 자식 프로세스에는 부모의 스레드가 없으므로
+        워커에서 연결을 새로 열 때 함께 호출합니다. 다음 검색 때 새로 만듭니다.
+        """
+        with self._lock:
+            self._pools = {}
+        logger.info(f"[RAG] 검색 스레드 풀 초기화 (도메인별 {self.readers}개)")
+
+    def shutdown(self, wait: bool = True) -> None:
+        """스레드 풀을 종료합니다."""
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            pool.shutdown(wait=wait)
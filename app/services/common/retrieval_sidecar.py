@@ -0,0 +1,303 @@
+from typing import Any, Dict, List, Optional, Sequence, Union
+import base64
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import numpy as np
+from loguru import logger
+from app.config.rag_config import RAGConfig
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.services.common.context_assembler import ContextAssembler
+from app.services.common.rag_service import DomainSnapshot, RAGService
+from app.services.common.retrieval_executor import RetrievalExecutor
+from app.services.common import vectorstore_snapshots
+
+# 메시지 프레임: 4바이트 길이(big-endian) + UTF-8 JSON
+_HEADER = struct.Struct(">I")
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+# 사이드카에서 꺼내 줄 수 있는 컬렉션 필드 (임베딩은 워커에 보내지 않음)
+_COLLECTION_FIELDS = ("documents", "metadatas")
+
+
+class SidecarError(RuntimeError):
+    """사이드카 호출 실패"""
+
+
+def send_message(sock: socket.socket, payload: Dict[str, Any]) -> None:
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(data)) + data)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1024 * 1024))
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+def recv_message(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """메시지 하나를 읽습니다. 상대가 연결을 닫았으면 None을 반환합니다."""
+    header = _recv_exact(sock, _HEADER.size)
+    if header is None:
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_MESSAGE_BYTES:
+        raise SidecarError(f"메시지가 너무 큽니다: {size} bytes")
+    data = _recv_exact(sock, size)
+    if data is None:
+        return None
+    return json.loads(data.decode("utf-8"))
+
+
+def encode_array(array: np.ndarray) -> Dict[str, Any]:
+    """float32 배열을 JSON으로 보낼 수 있게 base64로 인코딩합니다."""
+    array = np.ascontiguousarray(array, dtype=np.float32)
+    return {"shape": list(array.shape), "data": base64.b64encode(array.tobytes()).decode("ascii")}
+
+
+def decode_array(payload: Dict[str, Any]) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(payload["data"]), dtype=np.float32).reshape(payload["shape"])
+
+
+class _RequestHandler(socketserver.BaseRequestHandler):
+    """연결 하나에서 요청을 순서대로 처리합니다 (워커 스레드별 연결 유지)."""
+
+    def handle(self) -> None:
+        while True:
+            try:
+                request = recv_message(self.request)
+            except (OSError, SidecarError, ValueError) as e:
+                logger.warning(f"[사이드카] 요청 수신 실패: {str(e)}")
+                return
+            if request is None:
+                return
+            try:
+                response = {"ok": True, "result": self.server.dispatch(request)}
+            except Exception as e:
+                logger.error(f"[사이드카] {request.get('op')} 요청 처리 중 오류 발생: {str(e)}")
+                response = {"ok": False, "error": f"{type(e).__name__}: {str(e)}"}
+            try:
+                send_message(self.request, response)
+            except OSError:
+                return
+
+
+class RetrievalSidecarServer(socketserver.ThreadingUnixStreamServer):
+    """
+    임베딩/벡터 검색 사이드카 서버
+
+    임베딩 모델, ChromaDB 클라이언트, BM25/양자화 색인을 한 프로세스에만 올리고
+    같은 호스트의 웹 워커들이 Unix 소켓으로 호출합니다.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, rag_service: RAGService):
+        if os.path.exists(socket_path):
+            # 이전 프로세스가 남긴 소켓 파일
+            os.remove(socket_path)
+        self.rag_service = rag_service
+        super().__init__(socket_path, _RequestHandler)
+        os.chmod(socket_path, 0o660)
+
+    def dispatch(self, request: Dict[str, Any]) -> Any:
+        op = request.get("op")
+        if op == "ping":
+            return {
+                "pid": os.getpid(),
+                "domains": sorted(rag_type.value for rag_type in self.rag_service.snapshots),
+                "versions": {rag_type.value: snapshot.version for rag_type, snapshot in self.rag_service.snapshots.items()},
+            }
+        if op == "encode":
+            embeddings = self.rag_service.embeddings.encode(request["texts"], show_progress_bar=False)
+            return encode_array(np.asarray(embeddings, dtype=np.float32))
+        if op == "retrieve":
+            # 연결마다 스레드가 생기므로 도메인별 동시 검색 수는 검색 스레드 풀로 제한
+            rag_type = RAGType(request["rag_type"])
+            return self.rag_service.executor.submit(
+                rag_type, self.rag_service.retrieve, rag_type, request["query"], request.get("k")
+            ).result()
+        if op == "stats":
+            return self.rag_service.retrieval_stats()
+        if op == "reload":
+            return vectorstore_snapshots.reload_domain(
+                self.rag_service, RAGType(request["rag_type"]), request.get("version"), bool(request.get("force"))
+            )
+
+        collection = self.rag_service.collections[RAGType(request["rag_type"])]
+        if op == "count":
+            return collection.count()
+        if op == "get":
+            include = [field for field in request.get("include") or _COLLECTION_FIELDS if field in _COLLECTION_FIELDS]
+            data = collection.get(
+                ids=request.get("ids"),
+                include=include,
+                limit=request.get("limit"),
+                offset=request.get("offset")
+            )
+            return {"ids": data["ids"], **{field: data[field] for field in include}}
+        raise ValueError(f"알 수 없는 요청입니다: {op}")
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.server_address):
+            os.remove(self.server_address)
+
+
+class SidecarClient:
+    """사이드카 클라이언트. 스레드별로 연결을 하나씩 유지합니다."""
+
+    def __init__(self, socket_path: str, timeout: float = RAGConfig.SIDECAR_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError as e:
+                sock.close()
+                raise SidecarError(f"사이드카에 연결할 수 없습니다 ({self.socket_path}): {str(e)}") from e
+            self._local.sock = sock
+        return sock
+
+    def close(self) -> None:
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def call(self, op: str, timeout: Optional[float] = None, **params: Any) -> Any:
+        """
+        사이드카 요청을 보내고 결과를 반환합니다.
+        사이드카가 재시작되어 기존 연결이 끊겼으면 한 번 다시 연결합니다. 타임아웃은 재시도하지 않습니다.
+        
+        Args:
+            op: 요청 종류
+            timeout: 이 요청에만 쓸 타임아웃(초)
+            params: 요청 인자
+        """
+        timeout = timeout or self.timeout
+        for attempt in range(2):
+            sock = self._connection()
+            try:
+                sock.settimeout(timeout)
+                send_message(sock, {"op": op, **params})
+                response = recv_message(sock)
+            except socket.timeout as e:
+                self.close()
+                raise SidecarError(f"사이드카 {op} 요청이 {timeout}초 안에 끝나지 않았습니다.") from e
+            except OSError as e:
+                self.close()
+                if attempt:
+                    raise SidecarError(f"사이드카 {op} 요청 실패: {str(e)}") from e
+                continue
+            if response is not None:
+                break
+            self.close()
+            if attempt:
+                raise SidecarError(f"사이드카가 {op} 요청 처리 중 연결을 닫았습니다.")
+        if not response["ok"]:
+            raise SidecarError(response["error"])
+        return response["result"]
+
+
+class RemoteEncoder:
+    """SentenceTransformer.encode와 같은 형태로 사이드카의 임베딩 모델을 호출합니다."""
+
+    def __init__(self, client: SidecarClient):
+        self.client = client
+
+    def encode(self, sentences: Union[str, Sequence[str]], **kwargs: Any) -> np.ndarray:
+        single = isinstance(sentences, str)
+        embeddings = decode_array(self.client.call("encode", texts=[sentences] if single else list(sentences)))
+        return embeddings[0] if single else embeddings
+
+
+class RemoteCollection:
+    """FAQ 스냅샷 지문 등 읽기 전용 조회에 쓰는 원격 컬렉션"""
+
+    def __init__(self, client: SidecarClient, rag_type: RAGType):
+        self.client = client
+        self.rag_type = rag_type
+
+    def count(self) -> int:
+        return self.client.call("count", rag_type=self.rag_type.value)
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        include: Optional[List[str]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None
+    ) -> Dict[str, Any]:
+        return self.client.call("get", rag_type=self.rag_type.value, ids=ids, include=include, limit=limit, offset=offset)
+
+
+class RemoteRAGService(RAGService):
+    """
+    사이드카에 임베딩/검색을 위임하는 RAG 서비스
+
+    워커는 임베딩 모델과 ChromaDB를 올리지 않습니다. 컨텍스트 조립(search, get_context)은
+    RAGService 구현을 그대로 사용하고, retrieve만 사이드카에서 수행합니다.
+    """
+
+    retrieval_provider = "sidecar"
+
+    def __init__(self, socket_path: str):
+        self.config = RAGConfig()
+        self.client = SidecarClient(socket_path, timeout=self.config.SIDECAR_TIMEOUT)
+        self.embeddings = RemoteEncoder(self.client)
+        self.context_assembler = ContextAssembler()
+        # 사이드카 호출(블로킹 소켓 I/O)도 이벤트 루프 밖에서 실행
+        self.executor = RetrievalExecutor()
+
+        info = self.client.call("ping")
+        self.domains = {RAGType(domain) for domain in info["domains"]}
+        self.snapshots = {
+            rag_type: DomainSnapshot(rag_type, socket_path, info["versions"].get(rag_type.value), None, RemoteCollection(self.client, rag_type))
+            for rag_type in self.domains
+        }
+        logger.info(f"[RAG] 검색 사이드카 연결: {socket_path} (pid {info['pid']}, 도메인 {info['domains']})")
+
+    def reopen_clients(self) -> None:
+        # 연결은 스레드별로 만들기 때문에 fork 후에는 끊기만 하면 됨
+        self.client.close()
+        self.executor.reset()
+
+    def close(self) -> None:
+        self.executor.shutdown()
+        self.client.close()
+        logger.info("[RAG] 검색 사이드카 연결 종료")
+
+    def retrieval_stats(self) -> Dict[str, Dict[str, Any]]:
+        """실제 검색이 이루어지는 사이드카의 대기/검색 시간 통계를 반환합니다."""
+        return self.client.call("stats")
+
+    def reload_domain(self, rag_type: RAGType, force: bool = False) -> Dict[str, Any]:
+        """사이드카에 스냅샷 교체를 요청합니다 (로드와 예열이 끝날 때까지 기다림)."""
+        report = self.client.call("reload", timeout=self.config.SNAPSHOT_DRAIN_TIMEOUT, rag_type=rag_type.value, force=force)
+        if report["reloaded"]:
+            self.snapshots[rag_type].version = report["version"]
+        return report
+    
+    def add_documents(self, rag_type: RAGType, documents: List[str], source: str = "inline") -> Dict[str, Any]:
+        """워커는 벡터 스토어를 열지 않으므로 적재할 수 없습니다 (app.tools.ingest로 적재한 뒤 스냅샷 교체)."""
+        raise RuntimeError("사이드카 모드에서는 문서를 적재할 수 없습니다. app.tools.ingest를 사용하세요.")
+
+    def retrieve(self, rag_type: RAGType, query: str, k: Optional[int] = None) -> List[Dict[str, Any]]:
+        if rag_type not in self.domains:
+            logger.error(f"[RAG] {rag_type.value} 도메인은 사이드카에 로드되지 않았습니다.")
+            return []
+        return self.client.call("retrieve", rag_type=rag_type.value, query=query, k=k)
@@ -0,0 +1,79 @@
+import hashlib
+import re
+from typing import Iterator, List
+
+# 문장/줄 단위 경계
+_BOUNDARY_PATTERN = re.compile(r"(?<=[.!?。])\s+|\n+")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """공백을 정규화합니다. 콘텐츠 해시 계산 기준이 됩니다."""
+    return _WHITESPACE_PATTERN.sub(" ", text).strip()
+
+
+def content_hash(text: str) -> str:
+    """정규화된 텍스트의 SHA-256 해시를 반환합니다."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def _split_units(text: str, chunk_size: int, chunk_overlap: int) -> Iterator[str]:
+    """텍스트를 문장/줄 단위로 나누고, chunk_size보다 긴 단위는 겹침을 두고 강제로 자릅니다."""
+    step = chunk_size - chunk_overlap
+    for unit in _BOUNDARY_PATTERN.split(text):
+        unit = normalize_text(unit)
+        if not unit:
+            continue
+        if len(unit) <= chunk_size:
+            yield unit
+            continue
+        for start in range(0, len(unit) - chunk_overlap, step):
+            yield unit[start:start + chunk_size]
+
+
+def chunk_text(text: str, chunk_size: int, chunk_overlap: int) -> List[str]:
+    """
+    텍스트를 문장 경계 기준으로 청크로 나눕니다.
+
+    Args:
+        text: 원본 텍스트
+        chunk_size: 청크 최대 길이 (문자 수)
+        chunk_overlap: 인접 청크 간 겹치는 최대 길이 (문자 수)
+
+    Returns:
+        List[str]: 청크 리스트
+    """
+    if chunk_size <= 0:
+        raise ValueError(f"chunk_size는 0보다 커야 합니다: {chunk_size}")
+    if not 0 <= chunk_overlap < chunk_size:
+        raise ValueError(f"chunk_overlap은 0 이상 chunk_size 미만이어야 합니다: {chunk_overlap}")
+
+    chunks: List[str] = []
+    window: List[str] = []
+    window_len = 0
+
+    for unit in _split_units(text, chunk_size, chunk_overlap):
+        # 공백 구분자 포함 길이
+        added = len(unit) + (1 if window else 0)
+        if window and window_len + added > chunk_size:
+            chunks.append(" ".join(window))
+            # 뒤쪽 단위를 chunk_overlap 이내로 유지하여 다음 청크와 겹치게 함
+            overlap: List[str] = []
+            overlap_len = 0
+            for prev in reversed(window):
+                if overlap_len + len(prev) + 1 > chunk_overlap:
+                    break
+                overlap.insert(0, prev)
+                overlap_len += len(prev) + 1
+            # 겹침 + 새 단위가 chunk_size를 넘으면 겹침을 버림
+            if overlap_len + len(unit) > chunk_size:
+                overlap, overlap_len = [], 0
+            window = overlap
+            window_len = max(overlap_len - 1, 0)
+            added = len(unit) + (1 if window else 0)
+        window.append(unit)
+        window_len += added
+
+    if window:
+        chunks.append(" ".join(window))
+    return chunks
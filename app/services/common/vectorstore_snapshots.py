@@ -0,0 +1,143 @@
+from typing import Any, Dict, List, Optional
+import os
+import re
+import shutil
+import threading
+from loguru import logger
+from app.config.rag_config import RAGConfig
+from app.services.chatbot.chatbot_classifier import RAGType
+
+_SNAPSHOT_DIR_PATTERN = re.compile(r"^v(\d+)$")
+
+
+def list_snapshots(rag_type: RAGType) -> List[int]:
+    """도메인의 스냅샷 버전 목록을 오름차순으로 반환합니다."""
+    root = os.path.join(RAGConfig.DOMAIN_CONFIGS[rag_type]["vectorstore_path"], RAGConfig.SNAPSHOT_DIR)
+    if not os.path.isdir(root):
+        return []
+    versions = []
+    for name in os.listdir(root):
+        match = _SNAPSHOT_DIR_PATTERN.match(name)
+        if match and os.path.isdir(os.path.join(root, name)):
+            versions.append(int(match.group(1)))
+    return sorted(versions)
+
+
+def create_snapshot(rag_type: RAGType, empty: bool = False) -> int:
+    """
+    새 스냅샷 디렉토리를 만듭니다. 기본값은 현재 활성 벡터 스토어를 복사하므로,
+    만든 스냅샷에 변경분만 적재(app.tools.ingest --snapshot)한 뒤 활성화하면 됩니다.
+    서버는 읽기만 하므로 실행 중에 복사해도 되지만, 적재 도구가 같은 벡터 스토어에 쓰는 중이면 안 됩니다.
+
+    Args:
+        rag_type: RAG 유형
+        empty: True이면 빈 디렉토리로 만듦 (전체 재적재)
+
+    Returns:
+        int: 새 스냅샷 버전
+    """
+    versions = list_snapshots(rag_type)
+    version = versions[-1] + 1 if versions else 1
+    target = RAGConfig.snapshot_path(rag_type, version)
+    if empty:
+        os.makedirs(target)
+    else:
+        source = RAGConfig.active_vectorstore_path(rag_type)
+        # 스냅샷 없이 쓰던 벡터 스토어 디렉토리를 복사할 때는 스냅샷 디렉토리와 포인터를 제외
+        ignore = shutil.ignore_patterns(RAGConfig.SNAPSHOT_DIR, RAGConfig.SNAPSHOT_POINTER_FILE, "*.tmp*")
+        shutil.copytree(source, target, ignore=ignore)
+    logger.info(f"[스냅샷] {rag_type.value} 스냅샷 v{version} 생성: {target}")
+    return version
+
+
+def activate_snapshot(rag_type: RAGType, version: int) -> None:
+    """CURRENT 포인터를 원자적으로 옮깁니다. 실행 중인 서버는 감시 스레드나 관리자 API로 새 스냅샷을 로드합니다."""
+    path = RAGConfig.snapshot_path(rag_type, version)
+    if not os.path.exists(os.path.join(path, "chroma.sqlite3")):
+        raise ValueError(f"스냅샷에 ChromaDB 파일이 없습니다: {path}/chroma.sqlite3")
+    pointer = os.path.join(RAGConfig.DOMAIN_CONFIGS[rag_type]["vectorstore_path"], RAGConfig.SNAPSHOT_POINTER_FILE)
+    with open(f"{pointer}.tmp", "w", encoding="utf-8") as f:
+        f.write(f"{version}\n")
+    os.replace(f"{pointer}.tmp", pointer)
+    logger.info(f"[스냅샷] {rag_type.value} 활성 스냅샷 변경: v{version}")
+
+
+def reload_domain(rag_service, rag_type: RAGType, version: Optional[int] = None, force: bool = False) -> Dict[str, Any]:
+    """
+    도메인 스냅샷을 교체하고 해당 도메인의 캐시만 무효화합니다.
+
+    Args:
+        rag_service: RAG 서비스
+        rag_type: RAG 유형
+        version: 지정하면 이 버전을 먼저 활성화
+        force: 같은 버전이어도 다시 로드
+
+    Returns:
+        Dict[str, Any]: 교체 결과 리포트
+    """
+    if version is not None:
+        activate_snapshot(rag_type, version)
+    report = rag_service.reload_domain(rag_type, force=force)
+    if report["reloaded"]:
+        from app.services.common.faq_service import get_faq_service
+
+        # FAQ 색인은 스냅샷 지문에 묶여 있으므로 해당 도메인만 다시 읽게 함
+        if get_faq_service.cache_info().currsize:
+            get_faq_service().invalidate(rag_type)
+    return report
+
+
+class SnapshotWatcher:
+    """
+    CURRENT 포인터를 주기적으로 확인해 바뀐 도메인의 스냅샷을 백그라운드에서 교체합니다.
+    워커마다 하나씩 돌기 때문에, 포인터만 옮기면 모든 워커가 새 스냅샷으로 넘어갑니다.
+    """
+
+    def __init__(self, get_service, interval: float = RAGConfig.SNAPSHOT_WATCH_INTERVAL):
+        """
+        Args:
+            get_service: 감시할 RAG 서비스를 반환하는 함수 (아직 로드되지 않았으면 None)
+            interval: 확인 주기(초)
+        """
+        self.get_service = get_service
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        # 교체에 실패한 버전 (포인터가 다시 바뀔 때까지 재시도하지 않음)
+        self._failed: Dict[RAGType, int] = {}
+
+    def start(self) -> None:
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="snapshot-watcher", daemon=True)
+        self._thread.start()
+        logger.info(f"[스냅샷] 스냅샷 감시 시작: {self.interval}초 간격")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def check(self) -> List[Dict[str, Any]]:
+        """활성 버전이 바뀐 도메인을 교체하고 결과 리포트 목록을 반환합니다."""
+        rag_service = self.get_service()
+        if rag_service is None:
+            return []
+        reports = []
+        for rag_type, snapshot in list(rag_service.snapshots.items()):
+            version = None
+            try:
+                version = RAGConfig.active_snapshot_version(rag_type)
+                if version is None or version == snapshot.version or self._failed.get(rag_type) == version:
+                    continue
+                reports.append(reload_domain(rag_service, rag_type))
+                self._failed.pop(rag_type, None)
+            except Exception as e:
+                self._failed[rag_type] = version
+                logger.error(f"[스냅샷] {rag_type.value} 스냅샷 교체 실패 (이전 스냅샷 유지): {str(e)}")
+        return reports
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.check()
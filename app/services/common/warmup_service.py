@@ -0,0 +1,140 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+import asyncio
+import time
+from loguru import logger
+from app.config.rag_config import RAGConfig
+from app.config.warmup_config import WarmupConfig
+from app.core.embeddings import get_embedding_model
+from app.core.llm_client import get_llm_client
+from app.core.startup import Readiness, get_readiness, get_startup_report
+from app.core.tracing import start_trace
+from app.services.chatbot.chatbot_classifier import ChatbotClassifier
+from app.services.chatbot.chatbot_response_generator import ChatbotResponseGenerator
+from app.services.common.faq_service import get_faq_service
+from app.services.common.preprocessor import translate_query
+from app.services.common.rag_service import get_rag_service
+from app.services.common.web_search_cache import load_state
+
+Step = Callable[[], Awaitable[Any]]
+
+
+async def _warm_embeddings() -> Dict[str, Any]:
+    """임베딩 모델을 로드하고 한 번 인코딩해 토크나이저와 연산 커널을 올립니다."""
+    model = await asyncio.to_thread(get_embedding_model, RAGConfig.EMBEDDING_MODEL)
+    await asyncio.to_thread(model.encode, [WarmupConfig.QUERY])
+    return {"model": RAGConfig.EMBEDDING_MODEL}
+
+
+async def _warm_retrieval() -> Dict[str, int]:
+    """벡터 스토어를 열고 도메인마다 합성 질의로 검색해 색인과 페이지 캐시를 올립니다."""
+    rag_service = await asyncio.to_thread(get_rag_service)
+    if not rag_service.snapshots:
+        raise ValueError("로드된 도메인 벡터 스토어가 없습니다.")
+    results = {}
+    for rag_type in sorted(rag_service.snapshots, key=lambda item: item.value):
+        results[rag_type.value] = len(await rag_service.aretrieve(rag_type, WarmupConfig.QUERY))
+    if not any(results.values()):
+        raise ValueError(f"모든 도메인에서 예열 검색 결과가 없습니다: {results}")
+    return results
+
+
+async def _warm_faq() -> Dict[str, Any]:
+    """도메인별 FAQ 질문 임베딩 색인을 미리 만듭니다 (첫 조회 때 만들면 그 요청이 느려짐)."""
+    faq_service = await asyncio.to_thread(get_faq_service)
+    domains = list(get_rag_service().snapshots)
+    for rag_type in domains:
+        await faq_service.alookup(rag_type, WarmupConfig.QUERY, "en")
+    return {"loaded": sorted(rag_type.value for rag_type in domains if faq_service.indexes.get(rag_type) is not None)}
+
+
+async def _restore_web_search() -> Dict[str, int]:
+    """이전 프로세스가 종료 시 저장한 웹 검색 캐시와 할당량 사용량을 불러옵니다."""
+    return await asyncio.to_thread(load_state) or {"entries": 0, "providers": 0}
+
+
+async def _warm_llm() -> Dict[str, str]:
+    """경량/고성능 LLM 제공자 연결을 확인하며 공유 연결 풀(get_llm_http_client)에 DNS 조회와 TLS 연결을 미리 해 둡니다."""
+    providers = {}
+    for label, is_lightweight in (("lightweight", True), ("high_performance", False)):
+        client = get_llm_client(is_lightweight)
+        if not await client.check_connection():
+            raise ConnectionError(f"{label} LLM({client.provider}) 연결 확인 실패")
+        providers[label] = client.provider
+    return providers
+
+
+async def _warm_pipeline() -> Dict[str, Any]:
+    """합성 질의를 번역/분류(설정 시 응답 생성까지) 단계에 통과시켜 프롬프트와 캐시를 준비합니다."""
+    with start_trace("warmup", uid="warmup"):
+        translation = await translate_query(WarmupConfig.QUERY)
+        english_query = translation["translated_query"]
+        query_type, rag_type = await ChatbotClassifier().classify(english_query)
+        detail = {"query_type": query_type.value, "rag_type": rag_type.value}
+        if WarmupConfig.GENERATE:
+            answer = await ChatbotResponseGenerator().generate_response(english_query, query_type, rag_type, translation["lang_code"])
+            detail["response_chars"] = len(answer)
+        return detail
+
+
+def warmup_steps() -> List[Tuple[str, Step, bool]]:
+    """
+    실행할 예열 단계를 (이름, 함수, 필수 여부) 목록으로 반환합니다.
+    사이드카 모드에서는 임베딩 모델을 사이드카가 올리므로 워커에서는 건너뜁니다.
+    """
+    steps: List[Tuple[str, Step, bool]] = []
+    if not RAGConfig.SIDECAR_SOCKET:
+        steps.append(("embeddings", _warm_embeddings, True))
+    steps.append(("retrieval", _warm_retrieval, True))
+    if RAGConfig.FAQ_ENABLED:
+        steps.append(("faq", _warm_faq, False))
+    steps.append(("web_search", _restore_web_search, False))
+    steps.append(("llm", _warm_llm, False))
+    if WarmupConfig.PIPELINE:
+        steps.append(("pipeline", _warm_pipeline, False))
+    return steps
+
+
+async def _run_step(readiness: Readiness, name: str, step: Step, critical: bool) -> bool:
+    started = time.perf_counter()
+    try:
+        with get_startup_report().phase(f"warmup.{name}"):
+            detail = await asyncio.wait_for(step(), WarmupConfig.STEP_TIMEOUT_SECONDS)
+    except Exception as e:
+        seconds = time.perf_counter() - started
+        error = f"{type(e).__name__}: {e}" if str(e) else f"{type(e).__name__} ({WarmupConfig.STEP_TIMEOUT_SECONDS:.0f}초 제한)"
+        readiness.record(name, "failed", seconds, critical, error)
+        (logger.error if critical else logger.warning)(f"[예열] {name} 실패 ({seconds:.2f}초{', 필수 단계' if critical else ''}): {error}")
+        return False
+    seconds = time.perf_counter() - started
+    readiness.record(name, "ok", seconds, critical, detail)
+    logger.info(f"[예열] {name} 완료 ({seconds:.2f}초): {detail}")
+    return True
+
+
+async def warm_up(steps: Optional[List[Tuple[str, Step, bool]]] = None) -> bool:
+    """
+    예열 단계를 차례로 실행하고 준비 상태를 정합니다.
+    필수 단계가 하나라도 실패하면 준비 상태가 되지 않고, 선택 단계 실패는 경고만 남깁니다.
+
+    Args:
+        steps: 실행할 단계 (없으면 warmup_steps())
+
+    Returns:
+        bool: 준비 상태 여부
+    """
+    readiness = get_readiness()
+    if not WarmupConfig.ENABLED:
+        logger.info("[예열] 비활성화되어 바로 준비 상태로 전환합니다 (WARMUP_ENABLED=false).")
+        readiness.set_ready(True)
+        return True
+
+    failed = []
+    for name, step, critical in steps if steps is not None else warmup_steps():
+        if not await _run_step(readiness, name, step, critical) and critical:
+            failed.append(name)
+    readiness.set_ready(not failed)
+    if failed:
+        logger.error(f"[예열] 필수 단계 실패로 준비 상태가 되지 않습니다: {', '.join(failed)}")
+    else:
+        logger.info("[예열] 완료, 준비 상태로 전환합니다.")
+    return not failed
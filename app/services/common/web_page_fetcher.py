@@ -0,0 +1,266 @@
+from typing import Any, Dict, List, Optional, Sequence
+from functools import lru_cache
+from html.parser import HTMLParser
+from urllib.parse import urljoin, urlsplit
+import asyncio
+import codecs
+import ipaddress
+import re
+import httpx
+import numpy as np
+from loguru import logger
+from app.config.web_search_config import WebSearchConfig
+from app.core.http_client import get_page_http_client
+from app.services.common.text_chunker import chunk_text, normalize_text
+from app.services.common.web_search_cache import WebSearchCache
+
+# 본문이 아닌 영역 (내용을 버림)
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "iframe", "nav", "header", "footer", "aside", "form", "select", "button"}
+# 줄을 바꾸는 블록 요소
+_BLOCK_TAGS = {
+    "p", "div", "section", "article", "main", "br", "li", "ul", "ol", "table", "tr", "td", "th",
+    "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "dd", "dt",
+}
+_TEXT_CONTENT_TYPES = ("text/html", "application/xhtml+xml", "text/plain")
+_META_CHARSET_PATTERN = re.compile(rb"""<meta[^>]+charset=["']?([A-Za-z0-9_-]+)""", re.IGNORECASE)
+_BLANK_LINES_PATTERN = re.compile(r"\n\s*\n+")
+
+
+class _TextExtractor(HTMLParser):
+    """HTML을 조각 단위로 받아 본문 텍스트만 모읍니다 (스크립트/내비게이션 등 제외)."""
+
+    def __init__(self, max_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.title = ""
+        self._parts: List[str] = []
+        self._length = 0
+        self._skip_depth = 0
+        self._in_title = False
+
+    @property
+    def full(self) -> bool:
+        return self._length >= self.max_chars
+
+    def handle_starttag(self, tag: str, attrs: Any) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "title":
+            self._in_title = True
+        elif tag in _BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(self._skip_depth - 1, 0)
+        elif tag == "title":
+            self._in_title = False
+        elif tag in _BLOCK_TAGS:
+            self._parts.append("\n")
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data
+            return
+        if self._skip_depth or self.full or not data.strip():
+            return
+        self._parts.append(data)
+        self._length += len(data)
+
+    def text(self) -> str:
+        lines = (normalize_text(line) for line in "".join(self._parts).split("\n"))
+        text = "\n".join(line for line in lines if line)
+        return _BLANK_LINES_PATTERN.sub("\n", text)[:self.max_chars]
+
+
+def is_fetchable_url(url: str) -> bool:
+    """http(s) URL이고 내부망 주소(localhost, 사설/루프백 IP)가 아니면 True를 반환합니다."""
+    parts = urlsplit(url or "")
+    host = (parts.hostname or "").lower()
+    if parts.scheme not in ("http", "https") or not host or host == "localhost" or host.endswith(".local"):
+        return False
+    try:
+        return ipaddress.ip_address(host).is_global
+    except ValueError:
+        return True
+
+
+class WebPageFetcher:
+    """
+    검색 결과 페이지 본문 수집기
+
+    페이지를 스트리밍으로 받아 바이트/시간 상한 안에서 HTML을 텍스트로 바꾸고, 추출한 본문은 URL 단위로 캐시합니다.
+    같은 URL을 동시에 요청하면 한 번만 받습니다.
+    """
+
+    def __init__(
+        self,
+        timeout: Optional[float] = None,
+        max_bytes: Optional[int] = None,
+        max_chars: Optional[int] = None,
+        cache: Optional[WebSearchCache] = None
+    ):
+        self.timeout = timeout or WebSearchConfig.PAGE_TIMEOUT
+        self.max_bytes = max_bytes or WebSearchConfig.PAGE_MAX_BYTES
+        self.max_chars = max_chars or WebSearchConfig.PAGE_MAX_CHARS
+        self.cache = cache or WebSearchCache(
+            ttl=WebSearchConfig.PAGE_CACHE_TTL,
+            stale_ttl=WebSearchConfig.PAGE_CACHE_TTL,
+            fallback_max_age=WebSearchConfig.PAGE_CACHE_TTL,
+            max_entries=WebSearchConfig.PAGE_CACHE_MAX_ENTRIES,
+            name="web_page"
+        )
+
+    async def fetch(self, url: str) -> Optional[Dict[str, Any]]:
+        """
+        페이지 본문을 가져옵니다 (캐시 우선).
+
+        Returns:
+            Optional[Dict[str, Any]]: {"url", "title", "text"}, 받지 못하면 None
+        """
+        if not is_fetchable_url(url):
+            logger.debug(f"[웹 검색] 본문을 받지 않는 URL: {url}")
+            return None
+        key = ("page", url, 0)
+        cached, _ = self.cache.lookup(key)
+        if cached is None:
+            cached = await self.cache.fetch_once(key, lambda: self._download(url, key))
+        return cached[0] if cached and cached[0]["text"] else None
+
+    async def fetch_many(self, urls: Sequence[str], concurrency: Optional[int] = None) -> List[Optional[Dict[str, Any]]]:
+        """여러 페이지를 동시에 가져옵니다 (요청당 동시 수 제한). 순서는 urls와 같습니다."""
+        semaphore = asyncio.Semaphore(max(1, concurrency or WebSearchConfig.PAGE_FETCH_CONCURRENCY))
+
+        async def bounded(url: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                return await self.fetch(url)
+
+        return list(await asyncio.gather(*(bounded(url) for url in urls)))
+
+    async def _download(self, url: str, key: Any) -> List[Dict[str, Any]]:
+        try:
+            page = await asyncio.wait_for(self._stream_text(url), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"[웹 검색] 페이지 수신 시간 초과 ({self.timeout}초): {url}")
+            return []
+        except httpx.HTTPError as e:
+            logger.warning(f"[웹 검색] 페이지 수신 실패: {url} ({type(e).__name__})")
+            return []
+        # 본문이 없는 페이지(HTML 아님, 4xx 등)도 캐시해 TTL 동안 다시 받지 않음
+        self.cache.put(key, [page])
+        return [page]
+
+    async def _stream_text(self, url: str) -> Dict[str, Any]:
+        page = {"url": url, "title": "", "text": ""}
+        # 리디렉션은 직접 따라가며 단계마다 URL을 다시 확인 (호스트가 내부망 주소로 풀리면 클라이언트가 연결하지 않음)
+        target = url
+        for _ in range(WebSearchConfig.PAGE_MAX_REDIRECTS + 1):
+            if not is_fetchable_url(target):
+                logger.debug(f"[웹 검색] 내부망 주소라 본문을 받지 않음: {url} → {target}")
+                return page
+            async with get_page_http_client().stream("GET", target, follow_redirects=False) as response:
+                if response.is_redirect:
+                    target = urljoin(target, response.headers["Location"])
+                    continue
+                return await self._read_text(url, response, page)
+        logger.debug(f"[웹 검색] 리디렉션이 너무 많아 본문을 받지 않음: {url}")
+        return page
+
+    async def _read_text(self, url: str, response: httpx.Response, page: Dict[str, Any]) -> Dict[str, Any]:
+        content_type = response.headers.get("Content-Type", "").lower()
+        if response.status_code != 200 or not content_type.startswith(_TEXT_CONTENT_TYPES):
+            logger.debug(f"[웹 검색] 본문을 사용하지 않는 응답: {url} ({response.status_code}, {content_type})")
+            return page
+
+        extractor = _TextExtractor(self.max_chars)
+        decoder = None
+        received = 0
+        async for chunk in response.aiter_bytes():
+            if decoder is None:
+                # 헤더에 charset이 없으면 <meta charset>을 찾고, 그래도 없으면 UTF-8
+                match = _META_CHARSET_PATTERN.search(chunk[:2048])
+                charset = response.charset_encoding or (match.group(1).decode("ascii") if match else "utf-8")
+                try:
+                    decoder = codecs.getincrementaldecoder(charset)(errors="replace")
+                except LookupError:
+                    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            chunk = chunk[:self.max_bytes - received]
+            received += len(chunk)
+            extractor.feed(decoder.decode(chunk))
+            if received >= self.max_bytes or extractor.full:
+                break
+        if decoder is not None:
+            extractor.feed(decoder.decode(b"", final=True))
+        extractor.close()
+
+        page["title"] = normalize_text(extractor.title)
+        page["text"] = extractor.text()
+        logger.info(f"[웹 검색] 페이지 본문 추출: {url} ({received}바이트 → {len(page['text'])}자)")
+        return page
+
+
+async def select_passages(
+    query: str,
+    pages: Sequence[Optional[Dict[str, Any]]],
+    encoder: Any,
+    top_k: Optional[int] = None,
+    per_page: Optional[int] = None,
+    min_score: Optional[float] = None
+) -> List[List[str]]:
+    """
+    페이지 본문을 구간으로 나누고, 임베딩 유사도로 질의와 가장 가까운 구간을 고릅니다.
+
+    Args:
+        query: 검색 질의
+        pages: 페이지 본문 (받지 못한 페이지는 None)
+        encoder: SentenceTransformer.encode 형태의 임베딩 모델
+        top_k: 전체 최대 구간 수
+        per_page: 페이지당 최대 구간 수
+        min_score: 최소 코사인 유사도
+
+    Returns:
+        List[List[str]]: 페이지별 선택한 구간 (본문 순서 유지)
+    """
+    top_k = top_k or WebSearchConfig.PASSAGE_TOP_K
+    per_page = per_page or WebSearchConfig.PASSAGES_PER_PAGE
+    min_score = WebSearchConfig.PASSAGE_MIN_SCORE if min_score is None else min_score
+
+    passages = [
+        (page_index, passage_index, passage)
+        for page_index, page in enumerate(pages) if page
+        for passage_index, passage in enumerate(
+            chunk_text(page["text"], WebSearchConfig.PASSAGE_CHARS, WebSearchConfig.PASSAGE_OVERLAP)
+        )
+    ]
+    selected: List[List[str]] = [[] for _ in pages]
+    if not passages:
+        return selected
+
+    # 임베딩 계산은 CPU 작업이므로 이벤트 루프 밖에서 실행
+    embeddings = np.asarray(
+        await asyncio.to_thread(encoder.encode, [query] + [passage for _, _, passage in passages], show_progress_bar=False),
+        dtype=np.float32
+    )
+    embeddings /= np.linalg.norm(embeddings, axis=1, keepdims=True) + 1e-12
+    scores = embeddings[1:] @ embeddings[0]
+
+    chosen: Dict[int, List[int]] = {}
+    for index in np.argsort(-scores):
+        if scores[index] < min_score or sum(len(indices) for indices in chosen.values()) >= top_k:
+            break
+        page_index = passages[index][0]
+        if len(chosen.setdefault(page_index, [])) < per_page:
+            chosen[page_index].append(int(index))
+    for page_index, indices in chosen.items():
+        selected[page_index] = [passages[index][2] for index in sorted(indices, key=lambda i: passages[i][1])]
+    logger.info(
+        f"[웹 검색] 본문 발췌: 구간 {len(passages)}개 중 {sum(len(indices) for indices in chosen.values())}개 선택 "
+        f"(최고 유사도 {float(scores.max()):.3f})"
+    )
+    return selected
+
+
+@lru_cache(maxsize=None)
+def get_page_fetcher() -> WebPageFetcher:
+    """프로세스 전역 페이지 수집기를 반환합니다 (본문 캐시 공유)."""
+    return WebPageFetcher()
@@ -0,0 +1,339 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from zoneinfo import ZoneInfo
+import asyncio
+import json
+import os
+import re
+import time
+import unicodedata
+from loguru import logger
+from app.config.web_search_config import WebSearchConfig
+from app.core.metrics import record_cache
+
+# 캐시 조회 결과 상태
+FRESH = "fresh"
+STALE = "stale"
+
+_SPACE_PATTERN = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = " ?!.。？！"
+
+
+def normalize_query(query: str) -> str:
+    """
+    캐시 키용으로 질의를 정규화합니다 (NFKC, 소문자, 공백 정리, 끝 문장부호 제거).
+    같은 질문을 띄어쓰기나 물음표만 다르게 입력해도 같은 키가 됩니다.
+    """
+    normalized = unicodedata.normalize("NFKC", query or "").lower()
+    return _SPACE_PATTERN.sub(" ", normalized).strip().rstrip(_TRAILING_PUNCTUATION)
+
+
+def cache_key(provider: str, query: str, max_results: int) -> Tuple[str, str, int]:
+    return (provider, normalize_query(query), max_results)
+
+
+class _CacheEntry:
+    __slots__ = ("results", "fetched_at")
+
+    def __init__(self, results: List[Dict[str, Any]], fetched_at: float):
+        self.results = results
+        self.fetched_at = fetched_at
+
+
+class WebSearchCache:
+    """
+    웹 검색 결과 캐시 (LRU + TTL + stale-while-revalidate)
+
+    TTL 안의 결과는 그대로 제공하고, TTL이 지났지만 stale_ttl 안이면 이전 결과를 먼저 제공하면서
+    백그라운드에서 한 번만 갱신합니다. 같은 키의 동시 조회는 API를 한 번만 호출합니다.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[float] = None,
+        stale_ttl: Optional[float] = None,
+        fallback_max_age: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+        name: str = "web_search"
+    ):
+        self.name = name  # 지표의 캐시 라벨
+        self.ttl = WebSearchConfig.CACHE_TTL if ttl is None else ttl
+        self.stale_ttl = max(self.ttl, WebSearchConfig.CACHE_STALE_TTL if stale_ttl is None else stale_ttl)
+        self.fallback_max_age = max(
+            self.stale_ttl, WebSearchConfig.CACHE_FALLBACK_MAX_AGE if fallback_max_age is None else fallback_max_age
+        )
+        self.max_entries = max_entries or WebSearchConfig.CACHE_MAX_ENTRIES
+        self.clock = clock
+        self._entries: "OrderedDict[Tuple[str, str, int], _CacheEntry]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, str, int], asyncio.Task] = {}
+        self._counters = {
+            "fresh_hits": 0,
+            "stale_hits": 0,
+            "misses": 0,
+            "fallback_hits": 0,
+            "refreshes": 0,
+            "refresh_failures": 0,
+            "evictions": 0,
+        }
+
+    def _count(self, event: str) -> None:
+        self._counters[event] += 1
+        record_cache(self.name, event)
+
+    def lookup(self, key: Tuple[str, str, int]) -> Tuple[Optional[List[Dict[str, Any]]], Optional[str]]:
+        """
+        캐시를 조회합니다.
+
+        Returns:
+            Tuple[Optional[List[Dict[str, Any]]], Optional[str]]: (결과, FRESH/STALE), 없거나 너무 오래되면 (None, None)
+        """
+        entry = self._entries.get(key)
+        age = self.clock() - entry.fetched_at if entry is not None else None
+        if entry is None or age >= self.stale_ttl:
+            self._count("misses")
+            return None, None
+        self._entries.move_to_end(key)
+        if age < self.ttl:
+            self._count("fresh_hits")
+            return entry.results, FRESH
+        self._count("stale_hits")
+        return entry.results, STALE
+
+    def fallback(self, key: Tuple[str, str, int]) -> Optional[List[Dict[str, Any]]]:
+        """API를 쓸 수 없을 때 대신 제공할 결과를 반환합니다 (fallback_max_age 안의 결과)."""
+        entry = self._entries.get(key)
+        if entry is None or self.clock() - entry.fetched_at >= self.fallback_max_age:
+            return None
+        self._count("fallback_hits")
+        return entry.results
+
+    def put(self, key: Tuple[str, str, int], results: List[Dict[str, Any]]) -> None:
+        self._entries[key] = _CacheEntry(results, self.clock())
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    async def fetch_once(self, key: Tuple[str, str, int], fetch: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+        """같은 키를 이미 가져오는 중이면 그 결과를 기다리고, 아니면 fetch를 실행합니다."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 기다리던 요청이 취소되어도 다른 요청이 기다리는 조회는 계속 진행
+        return await asyncio.shield(task)
+
+    def refresh(self, key: Tuple[str, str, int], fetch: Callable[[], Awaitable[List[Dict[str, Any]]]]) -> None:
+        """백그라운드에서 키를 갱신합니다. 이미 갱신 중이면 아무것도 하지 않습니다."""
+        if key in self._inflight:
+            return
+        self._counters["refreshes"] += 1
+        task = asyncio.ensure_future(fetch())
+        self._inflight[key] = task
+
+        def done(finished: asyncio.Task) -> None:
+            self._inflight.pop(key, None)
+            if finished.cancelled() or finished.exception() is not None:
+                self._counters["refresh_failures"] += 1
+                if not finished.cancelled():
+                    logger.error(f"[웹 검색] 캐시 갱신 실패: {key[1]} ({str(finished.exception())})")
+
+        task.add_done_callback(done)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def export(self) -> List[Dict[str, Any]]:
+        """대체 응답으로 쓸 수 있는 나이(fallback_max_age) 안의 항목을 오래된 순으로 반환합니다."""
+        now = self.clock()
+        return [
+            {"provider": key[0], "query": key[1], "max_results": key[2], "results": entry.results, "fetched_at": entry.fetched_at}
+            for key, entry in self._entries.items()
+            if now - entry.fetched_at < self.fallback_max_age
+        ]
+
+    def restore(self, items: List[Dict[str, Any]]) -> int:
+        """
+        export()로 저장한 항목을 가져온 시각 그대로 다시 넣습니다. 이미 더 새 항목이 있는 키는 건너뜁니다.
+
+        Returns:
+            int: 복원한 항목 수
+        """
+        now = self.clock()
+        restored = 0
+        for item in sorted(items, key=lambda item: item["fetched_at"]):
+            key = (item["provider"], item["query"], int(item["max_results"]))
+            current = self._entries.get(key)
+            if now - item["fetched_at"] >= self.fallback_max_age or (current is not None and current.fetched_at >= item["fetched_at"]):
+                continue
+            self.put(key, item["results"])
+            self._entries[key].fetched_at = item["fetched_at"]
+            restored += 1
+        return restored
+
+    def stats(self) -> Dict[str, Any]:
+        """캐시 적중률과 카운터를 반환합니다."""
+        lookups = self._counters["fresh_hits"] + self._counters["stale_hits"] + self._counters["misses"]
+        hits = self._counters["fresh_hits"] + self._counters["stale_hits"]
+        return {
+            **self._counters,
+            "lookups": lookups,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "entries": len(self._entries),
+            "refreshing": len(self._inflight),
+            "ttl_seconds": self.ttl,
+            "stale_ttl_seconds": self.stale_ttl,
+        }
+
+
+class QuotaTracker:
+    """
+    검색 API 일일 사용량 추적
+
+    제공자별로 오늘(할당량 기준 시간대) 호출 수와 오류 상태 코드를 세고, 일일 한도를 넘었거나
+    429/403을 받은 뒤 쿨다운 중이면 호출하지 않도록 알려줍니다. 워커 프로세스별로 집계합니다.
+    """
+
+    def __init__(
+        self,
+        daily_quotas: Optional[Dict[str, int]] = None,
+        cooldown: Optional[float] = None,
+        timezone: Optional[str] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        self.daily_quotas = dict(WebSearchConfig.DAILY_QUOTAS if daily_quotas is None else daily_quotas)
+        self.cooldown = WebSearchConfig.QUOTA_COOLDOWN if cooldown is None else cooldown
+        self.timezone = ZoneInfo(timezone or WebSearchConfig.QUOTA_TIMEZONE)
+        self.clock = clock
+        self._usage: Dict[str, Dict[str, Any]] = {}
+
+    def _today(self) -> str:
+        return datetime.fromtimestamp(self.clock(), self.timezone).date().isoformat()
+
+    def _provider_usage(self, provider: str) -> Dict[str, Any]:
+        usage = self._usage.get(provider)
+        if usage is None or usage["day"] != self._today():
+            # 할당량 초기화 시각이 지나면 새로 집계 (쿨다운은 유지)
+            usage = {
+                "day": self._today(),
+                "used": 0,
+                "errors": {},
+                "blocked_until": usage["blocked_until"] if usage else 0.0,
+            }
+            self._usage[provider] = usage
+        return usage
+
+    def allow(self, provider: str) -> bool:
+        """지금 API를 호출해도 되는지 반환합니다."""
+        usage = self._provider_usage(provider)
+        limit = self.daily_quotas.get(provider, 0)
+        if limit and usage["used"] >= limit:
+            return False
+        return self.clock() >= usage["blocked_until"]
+
+    def record(self, provider: str) -> None:
+        """API 호출 한 번을 기록합니다."""
+        self._provider_usage(provider)["used"] += 1
+
+    def block(self, provider: str, status: int) -> None:
+        """할당량/권한 오류를 기록하고 쿨다운 동안 호출을 멈춥니다."""
+        usage = self._provider_usage(provider)
+        usage["errors"][str(status)] = usage["errors"].get(str(status), 0) + 1
+        usage["blocked_until"] = self.clock() + self.cooldown
+        logger.warning(f"[웹 검색] {provider} API {status} 응답, {self.cooldown:.0f}초 동안 캐시 결과만 사용합니다.")
+
+    def export(self) -> Dict[str, Dict[str, Any]]:
+        """제공자별 사용량 기록을 반환합니다."""
+        return {provider: {**usage, "errors": dict(usage["errors"])} for provider, usage in self._usage.items()}
+
+    def restore(self, usage: Dict[str, Dict[str, Any]]) -> None:
+        """저장한 사용량 중 오늘 것과 아직 끝나지 않은 쿨다운을 다시 반영합니다 (재시작으로 할당량을 초과하지 않도록)."""
+        for provider, saved in usage.items():
+            current = self._provider_usage(provider)
+            if saved.get("day") == current["day"]:
+                current["used"] = max(current["used"], int(saved.get("used", 0)))
+                for status, count in saved.get("errors", {}).items():
+                    current["errors"][status] = max(current["errors"].get(status, 0), count)
+            current["blocked_until"] = max(current["blocked_until"], float(saved.get("blocked_until", 0.0)))
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """제공자별 오늘 사용량, 남은 할당량, 오류 수, 쿨다운 종료 시각을 반환합니다."""
+        report = {}
+        for provider in sorted(set(self.daily_quotas) | set(self._usage)):
+            usage = self._provider_usage(provider)
+            limit = self.daily_quotas.get(provider, 0)
+            blocked_until = usage["blocked_until"] if usage["blocked_until"] > self.clock() else None
+            report[provider] = {
+                "day": usage["day"],
+                "used": usage["used"],
+                "limit": limit or None,
+                "remaining": max(limit - usage["used"], 0) if limit else None,
+                "errors": dict(usage["errors"]),
+                "blocked_until": (
+                    datetime.fromtimestamp(blocked_until, self.timezone).isoformat(timespec="seconds")
+                    if blocked_until else None
+                ),
+            }
+        return report
+
+
+@lru_cache(maxsize=None)
+def get_web_search_cache() -> WebSearchCache:
+    """프로세스 전역 웹 검색 캐시를 반환합니다 (응답 생성기는 요청마다 만들어지므로 캐시는 전역으로 공유)."""
+    return WebSearchCache()
+
+
+@lru_cache(maxsize=None)
+def get_quota_tracker() -> QuotaTracker:
+    """프로세스 전역 API 할당량 추적기를 반환합니다."""
+    return QuotaTracker()
+
+
+def save_state(path: Optional[str] = None) -> Optional[Dict[str, int]]:
+    """
+    검색 결과 캐시와 할당량 사용량을 파일에 저장합니다 (서버 종료 시 호출, 원자적 교체).
+
+    Args:
+        path: 저장할 파일 (없으면 WEB_SEARCH_STATE_FILE)
+
+    Returns:
+        Optional[Dict[str, int]]: 저장한 캐시 항목 수와 제공자 수 (저장 파일이 설정되지 않았으면 None)
+    """
+    path = WebSearchConfig.STATE_FILE if path is None else path
+    if not path:
+        return None
+    state = {
+        "saved_at": time.time(),
+        "cache": get_web_search_cache().export(),
+        "quota": get_quota_tracker().export(),
+    }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+    return {"entries": len(state["cache"]), "providers": len(state["quota"])}
+
+
+def load_state(path: Optional[str] = None) -> Optional[Dict[str, int]]:
+    """
+    save_state()로 저장한 캐시와 할당량 사용량을 불러옵니다 (서버 시작 시 예열 단계에서 호출).
+
+    Args:
+        path: 불러올 파일 (없으면 WEB_SEARCH_STATE_FILE)
+
+    Returns:
+        Optional[Dict[str, int]]: 복원한 캐시 항목 수와 제공자 수 (파일이 없으면 None)
+    """
+    path = WebSearchConfig.STATE_FILE if path is None else path
+    if not path or not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        state = json.load(f)
+    restored = get_web_search_cache().restore(state.get("cache", []))
+    get_quota_tracker().restore(state.get("quota", {}))
+    return {"entries": restored, "providers": len(state.get("quota", {}))}
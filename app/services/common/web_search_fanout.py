@@ -0,0 +1,163 @@
+from typing import Any, Deque, Dict, Iterable, List, Mapping, Optional
+from collections import deque
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+import threading
+import numpy as np
+from app.config.web_search_config import WebSearchConfig
+
+# 같은 문서를 가리키는 URL에서 무시할 추적용 쿼리 파라미터
+_TRACKING_PARAMS = {"gclid", "fbclid", "ref"}
+
+
+def canonical_url(url: str) -> str:
+    """
+    중복 제거용으로 URL을 정규화합니다.
+    스킴/호스트 소문자, www. 제거, 기본 포트/프래그먼트/끝 슬래시/추적 파라미터 제거, 쿼리 파라미터 정렬.
+    """
+    parts = urlsplit((url or "").strip())
+    host = (parts.hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+    query = sorted(
+        (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not name.lower().startswith("utm_") and name.lower() not in _TRACKING_PARAMS
+    )
+    path = parts.path.rstrip("/")
+    return urlunsplit(("", host, path, urlencode(query), "")).lstrip("/") or (url or "")
+
+
+def merge_results(
+    results_by_provider: Mapping[str, List[Dict[str, Any]]],
+    max_results: int,
+    k: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """
+    제공자별 결과를 URL 기준으로 합치고 순위 융합(RRF)으로 정렬합니다.
+    같은 URL은 한 번만 포함하며, 요약은 가장 긴 것을 쓰고 결과를 준 제공자를 providers에 남깁니다.
+
+    Args:
+        results_by_provider: 제공자별 검색 결과 (제공자 순서가 동점일 때의 우선순위)
+        max_results: 최대 결과 수
+        k: RRF 상수 (없으면 설정값)
+
+    Returns:
+        List[Dict[str, Any]]: 합친 검색 결과
+    """
+    k = WebSearchConfig.RRF_K if k is None else k
+    merged: Dict[str, Dict[str, Any]] = {}
+    scores: Dict[str, float] = {}
+    order: Dict[str, int] = {}
+    for provider, results in results_by_provider.items():
+        for rank, result in enumerate(results, 1):
+            key = canonical_url(result.get("url", "")) or f"{provider}:{rank}"
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            entry = merged.get(key)
+            if entry is None:
+                order[key] = len(order)
+                merged[key] = {**result, "providers": [provider]}
+                continue
+            if provider not in entry["providers"]:
+                entry["providers"].append(provider)
+            if len(result.get("snippet", "")) > len(entry.get("snippet", "")):
+                entry["snippet"] = result["snippet"]
+            if not entry.get("title"):
+                entry["title"] = result.get("title", "")
+    ranked = sorted(merged, key=lambda key: (-scores[key], order[key]))
+    return [merged[key] for key in ranked[:max_results]]
+
+
+def _percentile_ms(values: Iterable[float], q: float) -> float:
+    values = list(values)
+    return round(float(np.percentile(values, q)) * 1000, 3) if values else 0.0
+
+
+class _ProviderCounters:
+    def __init__(self, window: int):
+        self.calls = 0
+        self.failed = 0
+        self.empty = 0
+        self.cancelled = 0
+        self.fanouts = 0
+        self.contributed = 0
+        self.top_results = 0
+        self.seconds = 0.0
+        self.recent: Deque[float] = deque(maxlen=window)
+
+
+class ProviderStats:
+    """
+    검색 제공자별 API 지연 시간과 동시 검색 기여도 통계
+
+    API 호출마다 지연 시간과 실패/빈 결과를 기록하고, 동시 검색에서는 합친 결과에 들어간
+    결과 수(contributed)와 1위 결과 제공 횟수, 마감 시간 전에 끝나지 않아 기다리지 않은 횟수를 셉니다.
+    """
+
+    def __init__(self, window: Optional[int] = None):
+        self.window = window or WebSearchConfig.PROVIDER_STATS_WINDOW
+        self._providers: Dict[str, _ProviderCounters] = {}
+        self._lock = threading.Lock()
+
+    def _counters(self, provider: str) -> _ProviderCounters:
+        counters = self._providers.get(provider)
+        if counters is None:
+            counters = self._providers.setdefault(provider, _ProviderCounters(self.window))
+        return counters
+
+    def record_call(self, provider: str, seconds: float, results: int, failed: bool = False) -> None:
+        """API 호출 한 번의 지연 시간과 결과 수를 기록합니다."""
+        with self._lock:
+            counters = self._counters(provider)
+            counters.calls += 1
+            counters.seconds += seconds
+            counters.recent.append(seconds)
+            if failed:
+                counters.failed += 1
+            elif not results:
+                counters.empty += 1
+
+    def record_fanout(self, merged: List[Dict[str, Any]], queried: Iterable[str], cancelled: Iterable[str]) -> None:
+        """동시 검색 한 번에서 제공자별 기여도와 기다리지 않은 제공자를 기록합니다."""
+        with self._lock:
+            for provider in queried:
+                self._counters(provider).fanouts += 1
+            for provider in cancelled:
+                self._counters(provider).cancelled += 1
+            for position, result in enumerate(merged):
+                for provider in result.get("providers", []):
+                    counters = self._counters(provider)
+                    counters.contributed += 1
+                    if position == 0:
+                        counters.top_results += 1
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """제공자별 호출 수, 실패/빈 결과 수, 지연 시간(평균, 최근 p50/p95), 기여도를 반환합니다."""
+        with self._lock:
+            snapshot = {provider: (counters, list(counters.recent)) for provider, counters in self._providers.items()}
+        report = {}
+        for provider, (counters, recent) in sorted(snapshot.items()):
+            report[provider] = {
+                "calls": counters.calls,
+                "failed": counters.failed,
+                "empty": counters.empty,
+                "latency_ms_avg": round(counters.seconds / counters.calls * 1000, 3) if counters.calls else 0.0,
+                "latency_ms_p50": _percentile_ms(recent, 50),
+                "latency_ms_p95": _percentile_ms(recent, 95),
+                "fanouts": counters.fanouts,
+                "cancelled": counters.cancelled,
+                "contributed": counters.contributed,
+                "top_results": counters.top_results,
+            }
+        return report
+
+    def clear(self) -> None:
+        with self._lock:
+            self._providers.clear()
+
+
+@lru_cache(maxsize=None)
+def get_provider_stats() -> ProviderStats:
+    """프로세스 전역 제공자 통계를 반환합니다."""
+    return ProviderStats()
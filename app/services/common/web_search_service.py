@@ -1,20 +1,70 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 import asyncio
-from functools import partial
+import time
+import httpx
 from loguru import logger
 from app.config.app_config import get_env_var
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+from app.config.web_search_config import WebSearchConfig
+from app.config.replay_config import ReplayConfig
+from app.core.http_client import get_http_client
+from app.core.metrics import observe_stage, record_fallback, track_provider
+from app.core.tracing import annotate, span
+from app.core.replay import get_replay_store, get_synthetic_profile, replay_mode, request_key
+from app.services.common.context_assembler import ContextAssembler
+from app.services.common.keyword_matcher import get_category_matcher
+from app.services.common.web_page_fetcher import get_page_fetcher, select_passages
+from app.services.common.web_search_cache import STALE, cache_key, get_quota_tracker, get_web_search_cache, normalize_query
+from app.services.common.web_search_fanout import get_provider_stats, merge_results
+
+# 할당량 초과/권한 오류 (캐시 결과로 대신 응답)
+QUOTA_ERROR_STATUSES = (403, 429)
+
+
+class WebSearchQuotaError(Exception):
+    """검색 API가 할당량 초과나 권한 오류(429/403)를 돌려준 경우"""
+    
+    def __init__(self, provider: str, status: int):
+        super().__init__(f"{provider} API {status}")
+        self.provider = provider
+        self.status = status
+
 
 class WebSearchService:
     """웹 검색 서비스"""
     
     def __init__(self):
-        # 환경 변수 로드
-        self.search_provider = get_env_var("WEB_SEARCH_PROVIDER", "google").strip().lower()
-        logger.info(f"[웹 검색] 검색 제공자: {self.search_provider}")
+        # 환경 변수 로드 (WEB_SEARCH_PROVIDERS에 둘 이상 지정하면 동시 검색)
+        providers = get_env_var("WEB_SEARCH_PROVIDERS", "").strip().lower()
+        self.search_providers = list(dict.fromkeys(
+            provider.strip() for provider in providers.split(",") if provider.strip()
+        )) or [get_env_var("WEB_SEARCH_PROVIDER", "google").strip().lower()]
+        logger.info(f"[웹 검색] 검색 제공자: {', '.join(self.search_providers)}")
         
-        if self.search_provider == "google":
+        if len(self.search_providers) == 1:
+            self._init_provider(self.search_providers[0])
+        else:
+            # 동시 검색에서는 자격 증명이 없는 제공자만 제외
+            available = []
+            for provider in self.search_providers:
+                try:
+                    self._init_provider(provider)
+                    available.append(provider)
+                except ValueError:
+                    logger.warning(f"[웹 검색] {provider} 제공자를 동시 검색에서 제외합니다.")
+            if not available:
+                raise ValueError("No usable web search provider")
+            self.search_providers = available
+        self.search_provider = self.search_providers[0]
+        
+        self.context_assembler = ContextAssembler()
+        # 응답 생성기는 요청마다 만들어지므로 캐시와 할당량 집계, 제공자 통계는 프로세스 전역 객체를 사용
+        self.cache = get_web_search_cache()
+        self.quota = get_quota_tracker()
+        self.provider_stats = get_provider_stats()
+    
+    def _init_provider(self, provider: str) -> None:
+        """제공자의 자격 증명을 읽고 확인합니다. 없으면 ValueError를 발생시킵니다."""
+        if provider == "google":
             # Google Search API 초기화
             self.google_api_key = get_env_var("GOOGLE_API_KEY", "").strip()
             self.google_cse_id = get_env_var("GOOGLE_CSE_ID", "").strip()
@@ -23,65 +73,58 @@ class WebSearchService:
                 logger.error("[웹 검색] Google Search API를 사용하기 위해서는 GOOGLE_API_KEY와 GOOGLE_CSE_ID가 필요합니다.")
                 raise ValueError("Google Search API credentials are required")
             
-            try:
-                self.google_service = build("customsearch", "v1", developerKey=self.google_api_key)
-                logger.info("[웹 검색] Google Search API 초기화 완료")
-                logger.debug(f"[웹 검색] Google CSE ID: {self.google_cse_id}")
-                logger.debug(f"[웹 검색] Google API 키: {self.google_api_key[:20]}...")
-            except Exception as e:
-                logger.error(f"[웹 검색] Google Search API 초기화 실패: {str(e)}")
-                raise
-        elif self.search_provider == "duckduckgo":
+            # 디스커버리 문서 없이 REST 엔드포인트를 직접 호출하므로 초기화 시 네트워크 요청 없음
+            logger.info("[웹 검색] Google Search API 초기화 완료")
+            logger.debug(f"[웹 검색] Google CSE ID: {self.google_cse_id}")
+        elif provider == "duckduckgo":
             # DuckDuckGo API 초기화
             self.duckduckgo_api_key = get_env_var("DUCKDUCKGO_API_KEY", "").strip()
             if not self.duckduckgo_api_key:
                 logger.error("[웹 검색] DuckDuckGo API를 사용하기 위해서는 DUCKDUCKGO_API_KEY가 필요합니다.")
                 raise ValueError("DuckDuckGo API key is required")
             logger.info("[웹 검색] DuckDuckGo API 초기화 완료")
+        elif provider == "replay":
+            # 대역 제공자 (record 모드에서는 실제 제공자의 자격 증명도 필요)
+            self.replay_mode = replay_mode()
+            if self.replay_mode == "record":
+                self._init_provider(ReplayConfig.SEARCH_UPSTREAM)
+            self.replay_store = get_replay_store("web_search")
+            logger.info(f"[웹 검색] 대역 제공자 초기화 완료: MODE={self.replay_mode}")
         else:
-            logger.error(f"[웹 검색] 지원하지 않는 검색 제공자입니다: {self.search_provider}")
-            raise ValueError(f"Unsupported search provider: {self.search_provider}")
+            logger.error(f"[웹 검색] 지원하지 않는 검색 제공자입니다: {provider}")
+            raise ValueError(f"Unsupported search provider: {provider}")
     
     async def _google_search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
-        """Google Custom Search API를 사용하여 검색을 수행합니다."""
+        """Google Custom Search REST API를 공유 HTTP 클라이언트로 호출해 검색을 수행합니다."""
         try:
             logger.info("[웹 검색] Google 검색 시작")
             logger.info(f"[웹 검색] 검색 질의: {query}")
             logger.debug(f"[웹 검색] 최대 결과 수: {max_results}")
             logger.debug(f"[웹 검색] Google CSE ID: {self.google_cse_id}")
-            logger.debug(f"[웹 검색] Google API 키: {self.google_api_key[:5]}...")
             
-            # 동기 API 호출을 비동기로 실행
-            loop = asyncio.get_event_loop()
-            
-            # API 요청 구성
-            try:
-                request = self.google_service.cse().list(
-                    q=query,
-                    cx=self.google_cse_id,
-                    num=max_results
-                )
-                logger.debug("[웹 검색] Google API 요청 구성 완료")
-            except Exception as e:
-                logger.error(f"[웹 검색] Google API 요청 구성 실패: {str(e)}")
-                raise
+            params = {
+                "cx": self.google_cse_id,
+                "q": query,
+                "num": min(max_results, WebSearchConfig.GOOGLE_CSE_MAX_RESULTS)
+            }
+            # API 키는 헤더로 보냄 (쿼리 문자열에 넣으면 요청 URL 로그에 그대로 남음)
+            headers = {"X-goog-api-key": self.google_api_key}
+            response = await get_http_client().get(WebSearchConfig.GOOGLE_CSE_URL, params=params, headers=headers)
             
-            # 요청 실행
-            try:
-                logger.debug("[웹 검색] Google API 요청 실행 시작")
-                result = await loop.run_in_executor(None, request.execute)
-                logger.debug("[웹 검색] Google API 요청 실행 완료")
-                logger.debug(f"[웹 검색] 응답: {result}")
-            except HttpError as e:
-                logger.error(f"[웹 검색] Google API HTTP 오류: {e.resp.status} - {e.content}")
-                if e.resp.status == 403:
+            if response.status_code != 200:
+                try:
+                    error_info = response.json().get("error", {})
+                except ValueError:
+                    error_info = {}
+                logger.error(f"[웹 검색] Google API HTTP 오류: {response.status_code} - {error_info.get('message', response.text[:200])}")
+                if response.status_code == 403:
                     logger.error("[웹 검색] API 키 또는 권한 문제가 발생했습니다.")
-                elif e.resp.status == 429:
+                elif response.status_code == 429:
                     logger.error("[웹 검색] API 할당량을 초과했습니다.")
-                raise
-            except Exception as e:
-                logger.error(f"[웹 검색] Google API 요청 실행 실패: {str(e)}")
-                raise
+                if response.status_code in QUOTA_ERROR_STATUSES:
+                    raise WebSearchQuotaError("google", response.status_code)
+                return []
+            result = response.json()
             
             # 결과 처리
             formatted_results = []
@@ -99,28 +142,29 @@ class WebSearchService:
                 logger.info(f"[웹 검색] {len(formatted_results)}개의 결과 검색 완료")
             else:
                 logger.warning("[웹 검색] 검색 결과가 없습니다.")
-                if "error" in result:
-                    error_info = result["error"]
-                    logger.error(f"[웹 검색] API 오류: {error_info.get('message', '')}")
-                    logger.error(f"[웹 검색] 오류 코드: {error_info.get('code', '')}")
-                    logger.error(f"[웹 검색] 오류 상태: {error_info.get('status', '')}")
-                elif "searchInformation" in result:
+                if "searchInformation" in result:
                     logger.info(f"[웹 검색] 검색 정보: {result['searchInformation']}")
             
             return formatted_results
             
-        except HttpError as e:
-            logger.error(f"[웹 검색] Google API 오류: {e.resp.status} - {e.content}")
+        except WebSearchQuotaError:
+            raise
+        except httpx.TimeoutException as e:
+            logger.error(f"[웹 검색] Google API 요청 시간 초과: {type(e).__name__}")
+            record_fallback("web_search", "timeout", provider="google")
+            return []
+        except httpx.HTTPError as e:
+            logger.error(f"[웹 검색] Google API 요청 실패: {type(e).__name__} {str(e)}")
             return []
         except Exception as e:
             logger.error(f"[웹 검색] Google 검색 중 오류 발생: {str(e)}")
-            if hasattr(e, '__dict__'):
-                logger.error(f"[웹 검색] 오류 상세 정보: {e.__dict__}")
             return []
     
     async def search_web(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
         """
         웹에서 질의에 대한 정보를 검색합니다.
+        정규화한 질의와 제공자 단위로 캐시하며, TTL이 지난 결과는 먼저 제공하고 백그라운드에서 갱신합니다.
+        제공자가 둘 이상이면 동시에 검색해 URL 기준으로 합칩니다.
         
         Args:
             query: 검색 질의
@@ -132,16 +176,18 @@ class WebSearchService:
         try:
             logger.info("[웹 검색] 검색 시작")
             logger.info(f"[웹 검색] 검색 질의: {query}")
-            logger.debug(f"[웹 검색] 검색 제공자: {self.search_provider}")
+            logger.debug(f"[웹 검색] 검색 제공자: {', '.join(self.search_providers)}")
             logger.debug(f"[웹 검색] 최대 결과 수: {max_results}")
             
-            if self.search_provider == "google":
-                return await self._google_search(query, max_results)
-            elif self.search_provider == "duckduckgo":
-                return await self._duckduckgo_search(query, max_results)
-            else:
-                logger.error(f"[웹 검색] 지원하지 않는 검색 제공자입니다: {self.search_provider}")
-                return []
+            # 제공자 대기 수는 API 호출(_fetch)에서 제공자별로 집계
+            with observe_stage("web_search", provider=",".join(self.search_providers), track_queue=False) as stage:
+                if len(self.search_providers) == 1:
+                    results = await self._cached_search(self.search_provider, query, max_results)
+                else:
+                    results = await self._fanout_search(query, max_results)
+                if not results and stage.outcome == "success":
+                    stage.outcome = "empty"
+            return results
                     
         except Exception as e:
             logger.error(f"[웹 검색] 검색 중 오류 발생: {str(e)}")
@@ -149,11 +195,165 @@ class WebSearchService:
                 logger.error(f"[웹 검색] 오류 상세 정보: {e.__dict__}")
             return []
     
+    async def _fanout_search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """
+        모든 제공자를 동시에 검색하고 결과를 URL 기준으로 합칩니다 (중복 제거 + 순위 융합).
+        마감 시간이 지나거나 충분한 결과가 모이면 남은 제공자를 기다리지 않습니다.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + WebSearchConfig.FANOUT_DEADLINE
+        min_providers = min(max(1, WebSearchConfig.FANOUT_MIN_PROVIDERS), len(self.search_providers))
+        tasks = {
+            asyncio.ensure_future(self._cached_search(provider, query, max_results)): provider
+            for provider in self.search_providers
+        }
+        results_by_provider: Dict[str, List[Dict[str, Any]]] = {}
+        merged: List[Dict[str, Any]] = []
+        pending = set(tasks)
+        try:
+            while pending:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    provider = tasks[task]
+                    if task.exception() is not None:
+                        logger.error(f"[웹 검색] {provider} 검색 실패: {str(task.exception())}")
+                    results_by_provider[provider] = task.result() if task.exception() is None else []
+                
+                # 설정한 제공자 순서를 동점 순위 기준으로 사용
+                merged = merge_results(
+                    {provider: results_by_provider[provider] for provider in self.search_providers if provider in results_by_provider},
+                    max_results
+                )
+                answered = sum(1 for results in results_by_provider.values() if results)
+                if answered >= min_providers and len(merged) >= max_results:
+                    break
+        finally:
+            # 남은 제공자는 기다리지 않음 (캐시를 거치는 API 호출은 끝까지 진행되어 캐시를 채움)
+            for task in pending:
+                task.cancel()
+        
+        cancelled = [tasks[task] for task in pending]
+        if cancelled:
+            logger.info(f"[웹 검색] 기다리지 않은 제공자: {', '.join(cancelled)}")
+        self.provider_stats.record_fanout(merged, self.search_providers, cancelled)
+        logger.info(f"[웹 검색] 동시 검색 완료: {len(merged)}개 (응답 제공자 {len(results_by_provider)}/{len(tasks)})")
+        return merged
+    
+    async def _cached_search(self, provider: str, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """제공자 하나를 캐시를 거쳐 검색합니다."""
+        if not WebSearchConfig.CACHE_ENABLED:
+            return await self._fetch(provider, query, max_results)
+        
+        key = cache_key(provider, query, max_results)
+        results, state = self.cache.lookup(key)
+        annotate(**{f"cache_{provider}": state or "miss"})
+        if results is not None:
+            logger.info(f"[웹 검색] {provider} 캐시 결과 사용 ({state}): {len(results)}개")
+            if state == STALE:
+                self.cache.refresh(key, lambda: self._fetch(provider, query, max_results, key))
+            return results
+        
+        return await self.cache.fetch_once(key, lambda: self._fetch(provider, query, max_results, key))
+    
+    async def _fetch(
+        self,
+        provider: str,
+        query: str,
+        max_results: int,
+        key: Optional[Tuple[str, str, int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        검색 API를 호출하고 결과를 캐시에 저장합니다.
+        할당량이 남아 있지 않거나 429/403을 받으면 API 대신 캐시에 남아 있는 결과를 반환합니다.
+        """
+        if not self.quota.allow(provider):
+            logger.warning(f"[웹 검색] {provider} API 할당량 소진 또는 쿨다운 중, 캐시 결과로 대신합니다.")
+            record_fallback("web_search", "quota", provider=provider)
+            return self._fallback(key)
+        
+        self.quota.record(provider)
+        started_at = time.perf_counter()
+        try:
+            with track_provider(provider), span("web_search.call", provider=provider) as call_span:
+                if provider == "google":
+                    results = await self._google_search(query, max_results)
+                elif provider == "duckduckgo":
+                    results = await self._duckduckgo_search(query, max_results)
+                elif provider == "replay":
+                    results = await self._replay_search(query, max_results)
+                else:
+                    logger.error(f"[웹 검색] 지원하지 않는 검색 제공자입니다: {provider}")
+                    return []
+                call_span.set(results=len(results))
+        except WebSearchQuotaError as e:
+            self.provider_stats.record_call(provider, time.perf_counter() - started_at, 0, failed=True)
+            self.quota.block(provider, e.status)
+            record_fallback("web_search", "quota", provider=provider)
+            return self._fallback(key)
+        self.provider_stats.record_call(provider, time.perf_counter() - started_at, len(results))
+        
+        # 빈 결과는 일시적인 오류일 수 있으므로 캐시하지 않음
+        if results and key is not None:
+            self.cache.put(key, results)
+        return results
+    
+    async def _replay_search(self, query: str, max_results: int) -> List[Dict[str, Any]]:
+        """
+        대역 제공자로 검색합니다 (부하 테스트/벤치마크용).
+        record는 실제 제공자 결과를 기록하고, replay는 기록을 재생하며, synthetic은 가짜 결과를 설정한 지연/오류율로 돌려줍니다.
+        """
+        key = request_key("web_search", "", {"query": normalize_query(query), "max_results": max_results})
+        
+        if self.replay_mode == "record":
+            upstream = ReplayConfig.SEARCH_UPSTREAM
+            started_at = time.perf_counter()
+            if upstream == "google":
+                results = await self._google_search(query, max_results)
+            else:
+                results = await self._duckduckgo_search(query, max_results)
+            latency_ms = (time.perf_counter() - started_at) * 1000
+            if results:
+                self.replay_store.put(key, {"provider": upstream, "query": query, "results": results, "latency_ms": round(latency_ms, 1)})
+                logger.info(f"[웹 검색] 대역 결과 기록: {len(results)}개 ({latency_ms:.0f}ms)")
+            return results
+        
+        if self.replay_mode == "replay":
+            record = self.replay_store.get(key)
+            if record is not None:
+                await asyncio.sleep(record.get("latency_ms", 0) / 1000 * ReplayConfig.LATENCY_SCALE)
+                logger.info(f"[웹 검색] 대역 기록 재생: {len(record['results'])}개")
+                return record["results"]
+            if ReplayConfig.ON_MISS != "synthetic":
+                logger.warning(f"[웹 검색] 대역 기록에 없는 질의입니다: {query}")
+                return []
+        
+        profile = get_synthetic_profile()
+        failure = profile.failure()
+        if failure == "timeout":
+            await asyncio.sleep(WebSearchConfig.TIMEOUT)
+            logger.error("[웹 검색] 대역 API 요청 시간 초과 (주입한 오류)")
+            record_fallback("web_search", "timeout", provider="replay")
+            return []
+        await asyncio.sleep(profile.lognormal_seconds(ReplayConfig.SEARCH_LATENCY_MS, ReplayConfig.SEARCH_LATENCY_SIGMA))
+        if failure == "error":
+            logger.error("[웹 검색] 대역 API 할당량 초과 (주입한 오류)")
+            raise WebSearchQuotaError("replay", 429)
+        return profile.search_results(query, max_results)
+    
+    def _fallback(self, key: Optional[Tuple[str, str, int]]) -> List[Dict[str, Any]]:
+        results = self.cache.fallback(key) if key is not None else None
+        if results is None:
+            logger.warning("[웹 검색] 대신 제공할 캐시 결과가 없습니다.")
+            return []
+        logger.info(f"[웹 검색] 만료된 캐시 결과로 대신 응답: {len(results)}개")
+        return results
+    
     async def _duckduckgo_search(self, query: str, max_results: int = 5) -> List[Dict[str, Any]]:
-        """DuckDuckGo API를 사용하여 검색을 수행합니다."""
+        """DuckDuckGo API를 공유 HTTP 클라이언트로 호출해 검색을 수행합니다."""
         try:
-            import aiohttp
-            
             logger.info("[웹 검색] DuckDuckGo 검색 시작")
             logger.info(f"[웹 검색] 검색 질의: {query}")
             logger.debug(f"[웹 검색] 최대 결과 수: {max_results}")
@@ -167,47 +367,59 @@ class WebSearchService:
                 "api_key": self.duckduckgo_api_key
             }
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get("https://api.duckduckgo.com/", params=params) as response:
-                    if response.status != 200:
-                        logger.error(f"[웹 검색] DuckDuckGo API 요청 실패: {response.status}")
-                        return []
-                    
-                    try:
-                        data = await response.json()
-                    except Exception as e:
-                        logger.error(f"[웹 검색] DuckDuckGo API 응답 파싱 실패: {str(e)}")
-                        return []
-                    
-                    results = []
-                    if "RelatedTopics" in data:
-                        for topic in data["RelatedTopics"][:max_results]:
-                            if "Text" in topic:
-                                result = {
-                                    "title": topic.get("Text", ""),
-                                    "url": topic.get("FirstURL", ""),
-                                    "snippet": topic.get("Text", "")
-                                }
-                                results.append(result)
-                                logger.info(f"[웹 검색] 검색 결과: {result['title']}")
-                                logger.debug(f"[웹 검색] URL: {result['url']}")
-                                logger.debug(f"[웹 검색] 요약: {result['snippet']}")
-                        logger.info(f"[웹 검색] {len(results)}개의 결과 검색 완료")
-                        return results
-                    else:
-                        logger.warning("[웹 검색] 검색 결과가 없습니다.")
-                        return []
+            response = await get_http_client().get(WebSearchConfig.DUCKDUCKGO_URL, params=params)
+            if response.status_code != 200:
+                logger.error(f"[웹 검색] DuckDuckGo API 요청 실패: {response.status_code}")
+                if response.status_code in QUOTA_ERROR_STATUSES:
+                    raise WebSearchQuotaError("duckduckgo", response.status_code)
+                return []
+            
+            try:
+                # 응답 Content-Type이 application/x-javascript여도 본문은 JSON
+                data = response.json()
+            except ValueError as e:
+                logger.error(f"[웹 검색] DuckDuckGo API 응답 파싱 실패: {str(e)}")
+                return []
+            
+            results = []
+            if "RelatedTopics" in data:
+                for topic in data["RelatedTopics"][:max_results]:
+                    if "Text" in topic:
+                        result = {
+                            "title": topic.get("Text", ""),
+                            "url": topic.get("FirstURL", ""),
+                            "snippet": topic.get("Text", "")
+                        }
+                        results.append(result)
+                        logger.info(f"[웹 검색] 검색 결과: {result['title']}")
+                        logger.debug(f"[웹 검색] URL: {result['url']}")
+                        logger.debug(f"[웹 검색] 요약: {result['snippet']}")
+                logger.info(f"[웹 검색] {len(results)}개의 결과 검색 완료")
+                return results
+            else:
+                logger.warning("[웹 검색] 검색 결과가 없습니다.")
+                return []
                     
+        except WebSearchQuotaError:
+            raise
+        except httpx.TimeoutException as e:
+            logger.error(f"[웹 검색] DuckDuckGo API 요청 시간 초과: {type(e).__name__}")
+            record_fallback("web_search", "timeout", provider="duckduckgo")
+            return []
         except Exception as e:
             logger.error(f"[웹 검색] DuckDuckGo 검색 중 오류 발생: {str(e)}")
             return []
     
-    async def get_context(self, query: str) -> str:
+    async def get_context(self, query: str, max_tokens: Optional[int] = None, rag_type: Any = None) -> str:
         """
         웹 검색 결과를 컨텍스트로 변환합니다.
+        각 검색 결과는 한 번만 포함되며 도메인 분류 사전에서 일치한 분류를 태그로 붙입니다.
+        근사 중복을 제거하고 토큰 예산에 맞춰 조립합니다.
         
         Args:
             query: 검색 질의
+            max_tokens: 토큰 예산 (없으면 web_search 질의 유형 예산)
+            rag_type: 질의 도메인 (RAGType, 분류 사전 선택 기준, 없으면 일반 사전)
             
         Returns:
             str: 생성된 컨텍스트
@@ -223,52 +435,35 @@ class WebSearchService:
                 logger.info("[웹 검색] 검색 결과가 없습니다.")
                 return ""
             
-            # 검색 결과 분석 및 요약
-            context_parts = []
-            price_info = []
-            date_info = []
-            airline_info = []
-            booking_info = []
+            # 상위 결과 페이지에서 질의와 가까운 본문 구간 발췌 (선택)
+            passages = []
+            if WebSearchConfig.PAGE_FETCH_ENABLED:
+                with span("web_search.pages", results=len(results)):
+                    passages = await self._page_passages(query, results)
             
+            # 제목과 요약을 한 번 훑어 분류 태그를 붙임 (각 결과는 한 번만 포함)
+            matcher = get_category_matcher(getattr(rag_type, "value", rag_type) or "none")
+            tagged_blocks: List[str] = []
+            other_blocks: List[str] = []
             for i, result in enumerate(results, 1):
-                # 가격 정보 추출
-                if "가격" in result['title'] or "가격" in result['snippet'] or "요금" in result['title'] or "요금" in result['snippet']:
-                    price_info.append(f"검색 결과 {i}:\n제목: {result['title']}\n요약: {result['snippet']}\nURL: {result['url']}")
-                
-                # 날짜 정보 추출
-                if "날짜" in result['title'] or "날짜" in result['snippet'] or "기간" in result['title'] or "기간" in result['snippet']:
-                    date_info.append(f"검색 결과 {i}:\n제목: {result['title']}\n요약: {result['snippet']}\nURL: {result['url']}")
-                
-                # 항공사 정보 추출
-                if "항공사" in result['title'] or "항공사" in result['snippet'] or "항공" in result['title'] or "항공" in result['snippet']:
-                    airline_info.append(f"검색 결과 {i}:\n제목: {result['title']}\n요약: {result['snippet']}\nURL: {result['url']}")
-                
-                # 예약 정보 추출
-                if "예약" in result['title'] or "예약" in result['snippet'] or "예매" in result['title'] or "예매" in result['snippet']:
-                    booking_info.append(f"검색 결과 {i}:\n제목: {result['title']}\n요약: {result['snippet']}\nURL: {result['url']}")
-                
-                # 기타 정보
-                context_parts.append(f"검색 결과 {i}:\n제목: {result['title']}\n요약: {result['snippet']}\nURL: {result['url']}")
-            
-            # 컨텍스트 구성
-            context = []
-            
-            if price_info:
-                context.append("=== 가격 정보 ===\n" + "\n\n".join(price_info))
-            
-            if date_info:
-                context.append("=== 날짜/기간 정보 ===\n" + "\n\n".join(date_info))
+                categories = matcher.match(f"{result['title']}\n{result['snippet']}")
+                header = f"검색 결과 {i} [{', '.join(categories)}]:" if categories else f"검색 결과 {i}:"
+                block = f"{header}\n제목: {result['title']}\n요약: {result['snippet']}\nURL: {result['url']}"
+                if i <= len(passages) and passages[i - 1]:
+                    block += "\n본문 발췌:\n" + "\n".join(passages[i - 1])
+                (tagged_blocks if categories else other_blocks).append(block)
             
-            if airline_info:
-                context.append("=== 항공사 정보 ===\n" + "\n\n".join(airline_info))
+            # 분류된 결과를 먼저(검색 순위 유지), 나머지를 뒤에 배치한 뒤 예산에 맞춰 조립
+            ordered_blocks = tagged_blocks + other_blocks
+            logger.debug(f"[웹 검색] 분류된 결과: {len(tagged_blocks)}/{len(results)}개")
             
-            if booking_info:
-                context.append("=== 예약/예매 정보 ===\n" + "\n\n".join(booking_info))
-            
-            if not context:
-                context.append("=== 검색 결과 ===\n" + "\n\n".join(context_parts))
-            
-            final_context = "\n\n".join(context)
+            final_context, _ = self.context_assembler.assemble(
+                ordered_blocks,
+                "web_search",
+                max_tokens=max_tokens,
+                diversify=False,
+                tag="웹 검색"
+            )
             
             logger.info(f"[웹 검색] 컨텍스트 생성 완료: {len(final_context)}자")
             logger.debug(f"[웹 검색] 생성된 컨텍스트: {final_context[:200]}...")
@@ -276,4 +471,24 @@ class WebSearchService:
             return final_context
         except Exception as e:
             logger.error(f"[웹 검색] 컨텍스트 생성 중 오류 발생: {str(e)}")
-            return "" 
\ No newline at end of file
+            return ""
+    
+    async def _page_passages(self, query: str, results: List[Dict[str, Any]]) -> List[List[str]]:
+        """
+        상위 검색 결과 페이지를 동시에 받아 질의와 가장 가까운 본문 구간을 고릅니다.
+        실패하면 요약만 사용하도록 빈 리스트를 반환합니다.
+        """
+        try:
+            top_results = results[:WebSearchConfig.PAGE_FETCH_TOP_N]
+            pages = await get_page_fetcher().fetch_many([result["url"] for result in top_results])
+            logger.info(f"[웹 검색] 페이지 본문 수집: {sum(1 for page in pages if page)}/{len(top_results)}개")
+            return await select_passages(query, pages, self._page_encoder())
+        except Exception as e:
+            logger.error(f"[웹 검색] 본문 발췌 중 오류 발생, 요약만 사용합니다: {str(e)}")
+            return []
+    
+    def _page_encoder(self) -> Any:
+        """본문 발췌에 쓸 임베딩 모델 (RAG 서비스와 공유, 사이드카 모드에서는 원격 인코더)"""
+        # rag_service → chatbot 패키지 → 응답 생성기 → 이 모듈 순환 import를 피하기 위해 지연 import
+        from app.services.common.rag_service import get_rag_service
+        return get_rag_service().embeddings
@@ -0,0 +1,231 @@
+"""
+FAQ 사전 답변 생성/검토/게시 CLI
+
+1. generate: 질문 목록으로 도메인 벡터 스토어 기반 영어 답변을 만들고 지원 언어로 번역해 초안을 저장합니다.
+2. review: 초안 항목의 자동 점검 결과를 확인하고 승인/반려합니다.
+3. publish: 승인된 항목만 새 버전으로 게시합니다. 게시 시점의 벡터 스토어 스냅샷과 다르면 게시하지 않습니다.
+
+질문 파일은 한 줄에 하나의 질문이며, "|"로 같은 뜻의 다른 표현을 덧붙일 수 있습니다 (# 주석 허용).
+    How do I extend my E-9 visa? | Can I renew an E-9 visa?
+
+사용 예:
+    python -m app.tools.build_faq generate --domain employment --questions faq/employment.txt
+    python -m app.tools.build_faq review --domain employment
+    python -m app.tools.build_faq review --domain employment --approve-all --reject employment-1a2b3c4d
+    python -m app.tools.build_faq publish --domain employment
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+import chromadb
+from chromadb.config import Settings
+from loguru import logger
+from app.config.logging_config import setup_logging
+from app.config.rag_config import RAGConfig
+from app.services.chatbot.chatbot_classifier import QueryType, RAGType
+from app.services.common import faq_service
+from app.services.common.faq_service import STATUS_APPROVED, STATUS_PENDING, STATUS_REJECTED
+
+# 번역 실패 시 후처리기가 돌려주는 안내 문구가 답변으로 저장되지 않도록 점검
+_ERROR_MARKERS = ("Sorry, an error occurred", "timed out after")
+MIN_ANSWER_LENGTH = 20
+
+ANSWER_PROMPT = """You are writing a canonical FAQ answer for foreigners living in Korea.
+Answer the question using only the reference information below. Write a self-contained answer
+that does not depend on any previous conversation. If the information is insufficient, say what
+the reader should check with the responsible agency.
+
+Reference information:
+{context}
+
+Question: {question}
+
+Answer in English."""
+
+
+def read_questions(path: str) -> List[Tuple[str, List[str]]]:
+    """질문 파일을 (대표 질문, 다른 표현 목록) 리스트로 읽습니다."""
+    questions = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            variants = [variant.strip() for variant in line.split("|") if variant.strip()]
+            questions.append((variants[0], variants[1:]))
+    return questions
+
+
+def entry_id(rag_type: RAGType, question: str) -> str:
+    return f"{rag_type.value}-{hashlib.sha1(question.lower().encode('utf-8')).hexdigest()[:8]}"
+
+
+def review_checks(entry: Dict[str, Any], languages: List[str]) -> List[str]:
+    """항목의 자동 점검 결과(문제 목록)를 반환합니다."""
+    problems = []
+    for lang in languages:
+        answer = entry["answers"].get(lang, "")
+        if not answer:
+            problems.append(f"{lang}: 답변 없음")
+        elif len(answer) < MIN_ANSWER_LENGTH:
+            problems.append(f"{lang}: 답변이 너무 짧음")
+        elif any(marker in answer for marker in _ERROR_MARKERS):
+            problems.append(f"{lang}: 오류 안내 문구가 답변으로 저장됨")
+    if not entry.get("sources"):
+        problems.append("근거 문서 없음")
+    return problems
+
+
+def open_collection(rag_type: RAGType):
+    """임베딩 모델을 올리지 않고 도메인 컬렉션만 엽니다."""
+    client = chromadb.PersistentClient(path=RAGConfig.active_vectorstore_path(rag_type), settings=Settings(allow_reset=True))
+    return client.get_collection(RAGConfig.DOMAIN_CONFIGS[rag_type]["collection_name"])
+
+
+async def generate(rag_type: RAGType, questions_path: str, languages: List[str]) -> Dict[str, Any]:
+    """질문 목록으로 FAQ 초안을 생성합니다."""
+    from app.core.llm_client import get_llm_client
+    from app.services.common.postprocessor import Postprocessor
+    from app.services.common.rag_service import RAGService
+
+    rag_service = RAGService(domains=[rag_type])
+    llm_client = get_llm_client(is_lightweight=False)
+    postprocessor = Postprocessor()
+
+    entries = []
+    for question, paraphrases in read_questions(questions_path):
+        results = rag_service.retrieve(rag_type, question)
+        context, _ = rag_service.context_assembler.assemble(
+            [result["document"] for result in results], QueryType.GENERAL, tag="FAQ"
+        )
+        answer = (await llm_client.generate(ANSWER_PROMPT.format(context=context, question=question))).strip()
+
+        answers = {"en": answer}
+        for lang in languages:
+            if lang == "en" or not answer:
+                continue
+            translated = await postprocessor.postprocess(response=answer, source_lang=lang, rag_type=rag_type.value)
+            # 번역에 실패하면 후처리기는 used_rag=False로 오류 안내를 돌려줌
+            if translated["used_rag"]:
+                answers[lang] = translated["response"].strip()
+
+        entry = {
+            "id": entry_id(rag_type, question),
+            "question": question,
+            "paraphrases": paraphrases,
+            "answers": answers,
+            "sources": sorted({result["metadata"].get("source") for result in results if result["metadata"].get("source")}),
+            "status": STATUS_PENDING,
+        }
+        entry["checks"] = review_checks(entry, languages)
+        entries.append(entry)
+        logger.info(f"[FAQ] 초안 생성: {entry['id']} {question} (점검 {len(entry['checks'])}건)")
+
+    store = {
+        "format": faq_service.FAQ_FORMAT_VERSION,
+        "domain": rag_type.value,
+        "snapshot": faq_service.snapshot_fingerprint(rag_service.collections[rag_type]),
+        "embedding_model": RAGConfig.EMBEDDING_MODEL,
+        "generator_model": llm_client.model,
+        "languages": languages,
+        "generated_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "entries": entries,
+    }
+    faq_service.save_draft(rag_type, store)
+    return {"domain": rag_type.value, "draft": faq_service.draft_path(rag_type), "entries": len(entries), "snapshot": store["snapshot"]}
+
+
+def review(rag_type: RAGType, approve: List[str], reject: List[str], approve_all: bool, force: bool) -> Dict[str, Any]:
+    """초안 항목을 승인/반려합니다. 아무 옵션이 없으면 검토 대상 목록만 보여줍니다."""
+    store = faq_service.load_draft(rag_type)
+    if store is None:
+        raise ValueError(f"{rag_type.value} 도메인의 FAQ 초안이 없습니다. generate를 먼저 실행하세요.")
+
+    reviewed_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    skipped = []
+    for entry in store["entries"]:
+        entry["checks"] = review_checks(entry, store["languages"])
+        if entry["id"] in reject:
+            entry["status"] = STATUS_REJECTED
+            entry["reviewed_at"] = reviewed_at
+        elif entry["id"] in approve or (approve_all and entry["status"] == STATUS_PENDING):
+            # 자동 점검에 걸린 항목은 --force 없이 승인하지 않음
+            if entry["checks"] and not force:
+                skipped.append(entry["id"])
+                continue
+            entry["status"] = STATUS_APPROVED
+            entry["reviewed_at"] = reviewed_at
+    faq_service.save_draft(rag_type, store)
+
+    return {
+        "domain": rag_type.value,
+        "skipped_with_checks": skipped,
+        "entries": [
+            {"id": entry["id"], "status": entry["status"], "question": entry["question"], "checks": entry["checks"]}
+            for entry in store["entries"]
+        ],
+    }
+
+
+def publish(rag_type: RAGType) -> Dict[str, Any]:
+    """승인된 초안 항목을 새 버전으로 게시합니다."""
+    store = faq_service.load_draft(rag_type)
+    if store is None:
+        raise ValueError(f"{rag_type.value} 도메인의 FAQ 초안이 없습니다.")
+    approved = [entry for entry in store["entries"] if entry["status"] == STATUS_APPROVED]
+    if not approved:
+        raise ValueError(f"{rag_type.value} 도메인에 승인된 FAQ 항목이 없습니다.")
+
+    fingerprint = faq_service.snapshot_fingerprint(open_collection(rag_type))
+    if fingerprint != store["snapshot"]:
+        raise ValueError(
+            f"초안 생성 후 벡터 스토어가 바뀌었습니다 ({store['snapshot']} → {fingerprint}). generate를 다시 실행하세요."
+        )
+
+    version = faq_service.publish(rag_type, {**store, "entries": approved, "published_at": datetime.now(timezone.utc).isoformat(timespec="seconds")})
+    return {"domain": rag_type.value, "version": version, "entries": len(approved), "snapshot": fingerprint}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="도메인별 FAQ 사전 답변을 생성/검토/게시합니다.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    domains = [rag_type.value for rag_type in RAGType if rag_type != RAGType.NONE]
+
+    generate_parser = subparsers.add_parser("generate", help="질문 목록으로 FAQ 초안 생성")
+    generate_parser.add_argument("--domain", required=True, choices=domains)
+    generate_parser.add_argument("--questions", required=True, help="질문 파일 경로")
+    generate_parser.add_argument("--langs", nargs="+", default=RAGConfig.FAQ_LANGUAGES, help="답변 언어")
+
+    review_parser = subparsers.add_parser("review", help="초안 항목 검토")
+    review_parser.add_argument("--domain", required=True, choices=domains)
+    review_parser.add_argument("--approve", nargs="*", default=[], help="승인할 항목 ID")
+    review_parser.add_argument("--reject", nargs="*", default=[], help="반려할 항목 ID")
+    review_parser.add_argument("--approve-all", action="store_true", help="점검을 통과한 대기 항목 전체 승인")
+    review_parser.add_argument("--force", action="store_true", help="자동 점검에 걸린 항목도 승인")
+
+    publish_parser = subparsers.add_parser("publish", help="승인된 항목을 새 버전으로 게시")
+    publish_parser.add_argument("--domain", required=True, choices=domains)
+
+    args = parser.parse_args()
+    setup_logging()
+    rag_type = RAGType(args.domain)
+
+    if args.command == "generate":
+        report = asyncio.run(generate(rag_type, args.questions, args.langs))
+    elif args.command == "review":
+        report = review(rag_type, args.approve, args.reject, args.approve_all, args.force)
+    else:
+        report = publish(rag_type)
+
+    json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
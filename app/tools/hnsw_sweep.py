@@ -0,0 +1,303 @@
+"""
+HNSW 파라미터 스윕 CLI
+
+도메인 컬렉션의 임베딩으로 HNSW 색인(ChromaDB와 같은 hnswlib, cosine)을 M × construction_ef 격자마다 다시 만들고,
+search_ef별로 완전 탐색 대비 recall@k, 질의 지연(p50/p95), 빌드 시간, 색인 메모리를 측정합니다.
+목표 recall을 만족하는 가장 가벼운 조합(search_ef → M → construction_ef 순으로 작은 값)을 도메인별로 고르고,
+--write를 주면 RAGConfig.HNSW_PARAMS_FILE에 저장해 서버 시작 시 DOMAIN_CONFIGS["hnsw"]로 적용합니다.
+
+search_ef는 로드할 때 바로 적용되지만, M/construction_ef는 색인을 다시 만들어야 적용되므로
+--rebuild로 설정값으로 만든 새 스냅샷을 생성한 뒤 app.tools.vectorstore_snapshot activate로 활성화합니다.
+
+질의는 라벨 질의 세트(data/benchmarks/queries)를 임베딩해서 쓰고, --query-source documents를 주면
+저장된 문서 임베딩 일부를 질의로 씁니다 (임베딩 모델 불필요).
+
+사용 예:
+    python -m app.tools.hnsw_sweep --output hnsw_sweep.json
+    python -m app.tools.hnsw_sweep --domains employment --M 8 16 32 --search-ef 10 20 40 80 --write
+    python -m app.tools.hnsw_sweep --domains employment --query-source documents --write --rebuild
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+import hnswlib
+import chromadb
+from chromadb.config import Settings
+from loguru import logger
+from app.config.logging_config import setup_logging
+from app.config.rag_config import RAGConfig
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.services.common import vectorstore_snapshots
+from app.services.common.hnsw_tuning import BUILD_PARAMS, built_params, copy_collection
+from app.services.common.quantized_index import normalize_rows
+from app.tools.retrieval_bench import load_query_sets, percentile
+
+# 색인과 함께 복사할 보조 파일 (문서 ID가 같으므로 그대로 사용 가능)
+AUXILIARY_FILES = (RAGConfig.LEXICAL_INDEX_FILE, RAGConfig.QUANTIZED_INDEX_FILE, RAGConfig.FULL_VECTORS_FILE)
+
+
+def query_vectors(
+    vectors: np.ndarray,
+    query_set: Optional[Dict[str, Any]],
+    sample: int,
+    seed: int = 0
+) -> Tuple[np.ndarray, str]:
+    """
+    스윕에 쓸 질의 벡터를 만듭니다.
+
+    Args:
+        vectors: 정규화된 문서 임베딩
+        query_set: 라벨 질의 세트 (없으면 문서 임베딩에서 뽑음)
+        sample: 문서 임베딩에서 뽑을 질의 수
+        seed: 난수 시드
+
+    Returns:
+        Tuple[np.ndarray, str]: 정규화된 질의 벡터와 질의 출처
+    """
+    if query_set is not None:
+        from app.core.embeddings import get_embedding_model
+
+        encoder = get_embedding_model(RAGConfig.EMBEDDING_MODEL)
+        queries = [item["query"] for item in query_set["queries"]]
+        return normalize_rows(np.asarray(encoder.encode(queries, show_progress_bar=False), dtype=np.float32)), "benchmark"
+    rng = np.random.default_rng(seed)
+    rows = rng.choice(len(vectors), size=min(sample, len(vectors)), replace=False)
+    return vectors[rows], "documents"
+
+
+def exact_neighbors(vectors: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    """완전 탐색(코사인)으로 질의별 top-k 문서 번호를 구합니다."""
+    return np.argsort(-(queries @ vectors.T), axis=1)[:, :k]
+
+
+def build_index(vectors: np.ndarray, M: int, construction_ef: int) -> Tuple[hnswlib.Index, float]:
+    """ChromaDB와 같은 설정(cosine)으로 HNSW 색인을 만들고 빌드 시간을 반환합니다."""
+    start_time = time.perf_counter()
+    index = hnswlib.Index(space="cosine", dim=vectors.shape[1])
+    index.init_index(max_elements=len(vectors), ef_construction=construction_ef, M=M)
+    index.add_items(vectors, np.arange(len(vectors)))
+    return index, time.perf_counter() - start_time
+
+
+def index_bytes(index: hnswlib.Index) -> int:
+    """색인을 파일로 저장한 크기로 메모리 사용량을 잽니다 (hnswlib는 메모리 구조를 그대로 저장)."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "index.bin")
+        index.save_index(path)
+        return os.path.getsize(path)
+
+
+def evaluate_search(
+    index: hnswlib.Index,
+    queries: np.ndarray,
+    exact: np.ndarray,
+    k: int,
+    search_ef: int,
+    repeat: int
+) -> Dict[str, float]:
+    """search_ef 하나로 질의를 한 건씩 실행해 완전 탐색 대비 recall@k와 지연을 잽니다."""
+    index.set_ef(search_ef)
+    latencies = []
+    recalls = []
+    for query, truth in zip(queries, exact):
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            labels, _ = index.knn_query(query, k=k)
+            latencies.append((time.perf_counter() - start_time) * 1000)
+        recalls.append(len(set(labels[0].tolist()) & set(truth.tolist())) / k)
+    return {
+        "recall": round(float(np.mean(recalls)), 4),
+        "latency_ms_p50": percentile(latencies, 50),
+        "latency_ms_p95": percentile(latencies, 95),
+    }
+
+
+def sweep(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    grid_M: Sequence[int],
+    grid_construction_ef: Sequence[int],
+    grid_search_ef: Sequence[int],
+    k: int,
+    repeat: int
+) -> List[Dict[str, Any]]:
+    """
+    M × construction_ef × search_ef 격자를 측정합니다.
+
+    Returns:
+        List[Dict[str, Any]]: 조합별 파라미터, recall, 지연, 빌드 시간, 색인 크기
+    """
+    k = min(k, len(vectors))
+    exact = exact_neighbors(vectors, queries, k)
+    results = []
+    for M in grid_M:
+        for construction_ef in grid_construction_ef:
+            index, build_seconds = build_index(vectors, M, construction_ef)
+            index.set_num_threads(1)  # 서버처럼 질의 하나를 스레드 하나로 측정
+            memory = index_bytes(index)
+            for search_ef in grid_search_ef:
+                results.append({
+                    "M": M,
+                    "construction_ef": construction_ef,
+                    "search_ef": search_ef,
+                    **evaluate_search(index, queries, exact, k, search_ef, repeat),
+                    "build_seconds": round(build_seconds, 4),
+                    "index_bytes": memory,
+                })
+    return results
+
+
+def choose_params(results: List[Dict[str, Any]], target_recall: float) -> Dict[str, Any]:
+    """
+    목표 recall을 만족하는 가장 가벼운 조합을 고릅니다.
+    질의 지연에 가장 큰 영향을 주는 search_ef, 메모리/지연을 늘리는 M, 빌드 시간만 늘리는 construction_ef 순으로
+    작은 값을 우선합니다 (작은 코퍼스에서는 측정 지연 차이가 잡음 수준이라 지연으로 직접 고르지 않음).
+    만족하는 조합이 없으면 recall이 가장 높은 조합을 고릅니다.
+    """
+    passing = [result for result in results if result["recall"] >= target_recall]
+    if passing:
+        return min(passing, key=lambda result: (result["search_ef"], result["M"], result["construction_ef"]))
+    return max(results, key=lambda result: (result["recall"], -result["search_ef"], -result["M"]))
+
+
+def write_params(path: str, chosen: Dict[str, Dict[str, Any]], target_recall: float, k: int) -> None:
+    """고른 도메인별 파라미터를 HNSW 파라미터 파일에 저장합니다 (다른 도메인 값은 유지)."""
+    params: Dict[str, Any] = {"domains": {}}
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            params = json.load(f)
+    params["updated_at"] = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    params["target_recall"] = target_recall
+    params["k"] = k
+    for domain, result in chosen.items():
+        params["domains"][domain] = {
+            key: result[key]
+            for key in ("M", "construction_ef", "search_ef", "recall", "latency_ms_p95")
+        }
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+        json.dump(params, f, ensure_ascii=False, indent=2)
+    os.replace(f"{path}.tmp", path)
+    logger.info(f"[HNSW] 파라미터 저장: {path} ({sorted(chosen)})")
+
+
+def rebuild_snapshot(rag_type: RAGType, source_path: str, collection) -> int:
+    """
+    현재 도메인 설정(M/construction_ef)으로 색인을 다시 만든 새 스냅샷을 생성합니다.
+    활성화는 하지 않으므로 app.tools.vectorstore_snapshot activate로 교체합니다.
+
+    Returns:
+        int: 새 스냅샷 버전
+    """
+    version = vectorstore_snapshots.create_snapshot(rag_type, empty=True)
+    target_path = RAGConfig.snapshot_path(rag_type, version)
+    client = chromadb.PersistentClient(path=target_path, settings=Settings(allow_reset=True))
+    copy_collection(collection, client, rag_type)
+    for name in AUXILIARY_FILES:
+        if os.path.exists(os.path.join(source_path, name)):
+            shutil.copy2(os.path.join(source_path, name), os.path.join(target_path, name))
+    return version
+
+
+def sweep_domain(rag_type: RAGType, vectorstore_path: str, args, query_set: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """도메인 하나를 스윕하고 리포트를 반환합니다."""
+    client = chromadb.PersistentClient(path=vectorstore_path, settings=Settings(allow_reset=True))
+    collection = client.get_collection(RAGConfig.DOMAIN_CONFIGS[rag_type]["collection_name"])
+    data = collection.get(include=["embeddings"])
+    if not data["ids"]:
+        return {"domain": rag_type.value, "skipped": "빈 컬렉션"}
+
+    vectors = normalize_rows(np.asarray(data["embeddings"], dtype=np.float32))
+    queries, query_source = query_vectors(vectors, query_set, args.sample)
+    results = sweep(vectors, queries, args.M, args.construction_ef, args.search_ef, args.k, args.repeat)
+    chosen = choose_params(results, args.target_recall)
+    report = {
+        "domain": rag_type.value,
+        "documents": len(vectors),
+        "queries": len(queries),
+        "query_source": query_source,
+        "built": built_params(collection),
+        "chosen": chosen,
+        "results": results,
+    }
+    logger.info(
+        f"[HNSW] {rag_type.value}: {len(vectors)}개 문서, {len(results)}개 조합 → "
+        f"M={chosen['M']}, construction_ef={chosen['construction_ef']}, search_ef={chosen['search_ef']} "
+        f"(recall {chosen['recall']}, p95 {chosen['latency_ms_p95']}ms)"
+    )
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="도메인별 HNSW 파라미터를 스윕하고 선택한 값을 저장합니다.")
+    parser.add_argument("--domains", nargs="*", help="스윕할 도메인 (기본값: ChromaDB 파일이 있는 전체 도메인)")
+    parser.add_argument("--M", type=int, nargs="+", default=[8, 16, 32], help="M 후보")
+    parser.add_argument("--construction-ef", type=int, nargs="+", default=[50, 100, 200], help="construction_ef 후보")
+    parser.add_argument("--search-ef", type=int, nargs="+", default=[10, 20, 40, 80], help="search_ef 후보")
+    parser.add_argument("--k", type=int, default=RAGConfig.SEARCH_CANDIDATES, help="recall@k의 k (기본값: 검색 후보 수)")
+    parser.add_argument("--target-recall", type=float, default=0.99, help="완전 탐색 대비 목표 recall@k")
+    parser.add_argument("--query-source", choices=["benchmark", "documents"], default="benchmark", help="질의 출처")
+    parser.add_argument("--queries", default="v1", help="라벨 질의 세트 버전 (--query-source benchmark)")
+    parser.add_argument("--sample", type=int, default=200, help="문서 임베딩에서 뽑을 질의 수 (--query-source documents)")
+    parser.add_argument("--repeat", type=int, default=3, help="지연 측정 반복 횟수")
+    parser.add_argument("--output", help="전체 리포트 저장 경로")
+    parser.add_argument("--write", action="store_true", help="선택한 파라미터를 RAGConfig.HNSW_PARAMS_FILE에 저장")
+    parser.add_argument("--rebuild", action="store_true", help="색인 설정이 바뀐 도메인은 설정값으로 새 스냅샷 생성 (활성화는 따로)")
+    args = parser.parse_args()
+
+    setup_logging()
+    query_sets = load_query_sets(args.queries) if args.query_source == "benchmark" else {}
+    reports = []
+    for rag_type in RAGType:
+        if rag_type == RAGType.NONE or (args.domains and rag_type.value not in args.domains):
+            continue
+        vectorstore_path = RAGConfig.active_vectorstore_path(rag_type)
+        if not os.path.exists(os.path.join(vectorstore_path, "chroma.sqlite3")):
+            logger.warning(f"[HNSW] {rag_type.value}: ChromaDB 파일이 없어 건너뜁니다.")
+            reports.append({"domain": rag_type.value, "skipped": "chroma.sqlite3 없음"})
+            continue
+        if args.query_source == "benchmark" and rag_type.value not in query_sets:
+            logger.warning(f"[HNSW] {rag_type.value}: 라벨 질의 세트가 없어 건너뜁니다 (--query-source documents 사용 가능).")
+            reports.append({"domain": rag_type.value, "skipped": "질의 세트 없음"})
+            continue
+        reports.append(sweep_domain(rag_type, vectorstore_path, args, query_sets.get(rag_type.value)))
+
+    chosen = {report["domain"]: report["chosen"] for report in reports if "chosen" in report}
+    if args.write and chosen:
+        write_params(RAGConfig.HNSW_PARAMS_FILE, chosen, args.target_recall, args.k)
+        RAGConfig.load_hnsw_params()
+
+    if args.rebuild:
+        for report in reports:
+            if "chosen" not in report:
+                continue
+            rag_type = RAGType(report["domain"])
+            params = RAGConfig.hnsw_params(rag_type)
+            if all(report["built"][key] == params[key] for key in BUILD_PARAMS):
+                continue
+            vectorstore_path = RAGConfig.active_vectorstore_path(rag_type)
+            client = chromadb.PersistentClient(path=vectorstore_path, settings=Settings(allow_reset=True))
+            collection = client.get_collection(RAGConfig.DOMAIN_CONFIGS[rag_type]["collection_name"])
+            report["rebuilt_snapshot"] = rebuild_snapshot(rag_type, vectorstore_path, collection)
+
+    output = {"k": args.k, "target_recall": args.target_recall, "domains": reports}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(output, f, ensure_ascii=False, indent=2)
+    # 격자 결과는 --output에만 남기고 표준 출력에는 도메인별 선택 결과만 출력
+    summary = [{key: value for key, value in report.items() if key != "results"} for report in reports]
+    json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+# app/tools/ingest.py
+"""
+도메인 벡터 스토어 적재 CLI
+
+사용 예:
+    python -m app.tools.ingest --domain visa_law ./docs/visa
+    python -m app.tools.ingest --domain tax_finance --batch-size 32 --prune ./docs/tax/*.pdf
+    python -m app.tools.ingest --domain employment --snapshot 2 ./docs/employment   # 활성화 전 스냅샷에 적재
+"""
+
+import argparse
+import json
+import sys
+from app.config.logging_config import setup_logging
+from app.config.rag_config import RAGConfig
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.services.common.ingestion_service import IngestionService
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="원본 문서를 청크로 나누어 도메인 벡터 스토어에 적재합니다.")
+    parser.add_argument("paths", nargs="+", help="원본 파일(.pdf, .txt, .md) 또는 디렉토리")
+    parser.add_argument(
+        "--domain",
+        required=True,
+        choices=[rag_type.value for rag_type in RAGType if rag_type != RAGType.NONE],
+        help="적재할 도메인"
+    )
+    parser.add_argument("--batch-size", type=int, default=64, help="임베딩 배치 크기")
+    parser.add_argument("--prune", action="store_true", help="원본에서 사라진 청크를 삭제")
+    parser.add_argument("--snapshot", type=int, help="적재할 스냅샷 버전 (기본값: 활성 벡터 스토어)")
+    parser.add_argument("--root", default=".", help="원본 경로를 기록할 기준 디렉토리 (같은 파일은 항상 같은 기준으로 적재해야 정리가 맞음)")
+    args = parser.parse_args()
+
+    setup_logging()
+    rag_type = RAGType(args.domain)
+    vectorstore_path = RAGConfig.snapshot_path(rag_type, args.snapshot) if args.snapshot else None
+    service = IngestionService(batch_size=args.batch_size, vectorstore_path=vectorstore_path)
+    report = service.ingest_paths(rag_type, args.paths, prune=args.prune, root=args.root)
+
+    json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
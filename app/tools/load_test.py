@@ -0,0 +1,506 @@
+"""
+챗봇 API 부하 테스트
+
+data/benchmarks/loadtest/queries.json 의 다국어 질의 구성(RAG 유형 전체)으로 /api/v1/chatbot 에
+요청을 보내고 처리량, 응답 지연(p50/p95/p99), 단계별 지연, 이벤트 루프 지연, 메모리 증가량을 측정합니다.
+
+- 기본값은 프로세스 안에서 앱을 띄워(ASGI) LLM/웹 검색을 synthetic 대역으로 바꿔 실행합니다 (네트워크 없음).
+  이벤트 루프 지연은 같은 루프에서 직접 재고, 메모리는 이 프로세스의 RSS입니다.
+- --url 을 주면 실행 중인 서버에 요청합니다. 대역 사용 여부는 서버 환경 변수를 따르고,
+  단계별 지연/메모리/이벤트 루프 지연은 서버의 /metrics 에서 읽습니다.
+- --rate 를 주면 초당 요청 수를 고정한 개방형 부하(포아송 도착)로, 없으면 --concurrency 개의
+  사용자가 응답을 받자마자 다음 요청을 보내는 폐쇄형 부하로 실행합니다.
+
+사용 예:
+    python -m app.tools.load_test --concurrency 16 --duration 60 --output load_base.json
+    python -m app.tools.load_test --rate 20 --duration 60 --compare load_base.json
+    python -m app.tools.load_test --url http://localhost:8000 --concurrency 32
+"""
+
+import os
+
+# 앱 모듈을 불러오기 전에 오프라인 실행을 강제
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import httpx
+import numpy as np
+import psutil
+from loguru import logger
+from prometheus_client.parser import text_string_to_metric_families
+from app.tools.retrieval_bench import git_commit
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+QUERY_MIX_PATH = REPO_ROOT / "data" / "benchmarks" / "loadtest" / "queries.json"
+RESULT_SCHEMA_VERSION = 1
+CHATBOT_PATH = "/api/v1/chatbot"
+
+STAGE_METRIC = "eum_stage_duration_seconds"
+LOOP_LAG_METRIC = "eum_event_loop_lag_seconds"
+RSS_METRIC = "process_resident_memory_bytes"
+
+# 프로세스 안에서 실행할 때 실제 제공자 대신 쓸 대역 (--real-providers 로 끔)
+STUB_ENV = {
+    "LIGHTWEIGHT_LLM_PROVIDER": "replay",
+    "HIGH_PERFORMANCE_LLM_PROVIDER": "replay",
+    "WEB_SEARCH_PROVIDER": "replay",
+    "WEB_SEARCH_PROVIDERS": "",
+    "REPLAY_MODE": "synthetic",
+}
+
+# 비교 시 회귀로 판단할 지표 (점 표기 경로)
+HIGHER_IS_BETTER = ("throughput_rps",)
+LOWER_IS_BETTER = ("latency_ms.p50", "latency_ms.p95", "latency_ms.p99", "error_rate", "loop_lag_ms.p99", "memory_mb.growth")
+ERROR_RATE_TOLERANCE = 0.01  # 오류율은 비율이 아닌 절대 증가폭으로 판단
+
+Histogram = Dict[Tuple[str, ...], Dict[float, float]]
+
+
+def load_query_mix(path: Path = QUERY_MIX_PATH) -> List[Dict[str, Any]]:
+    """부하 테스트 질의 구성을 불러옵니다."""
+    with open(path, encoding="utf-8") as f:
+        queries = json.load(f)["queries"]
+    if not queries:
+        raise ValueError(f"질의가 없습니다: {path}")
+    return queries
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    return round(float(np.percentile(values, q)), 1) if values else 0.0
+
+
+def latency_summary(values: Sequence[float]) -> Dict[str, float]:
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "mean": round(float(np.mean(values)), 1) if values else 0.0,
+        "max": round(float(max(values)), 1) if values else 0.0,
+    }
+
+
+def parse_histogram(text: str, name: str, by: Sequence[str] = ()) -> Histogram:
+    """
+    Prometheus 텍스트에서 히스토그램 하나의 누적 버킷을 by 라벨 단위로 합쳐 읽습니다.
+
+    Returns:
+        Histogram: {(라벨 값, ...): {버킷 상한: 누적 개수}}
+    """
+    buckets: Histogram = defaultdict(lambda: defaultdict(float))
+    for family in text_string_to_metric_families(text):
+        if family.name != name:
+            continue
+        for sample in family.samples:
+            if sample.name != f"{name}_bucket":
+                continue
+            key = tuple(sample.labels.get(label, "") for label in by)
+            buckets[key][float(sample.labels["le"])] += sample.value
+    return {key: dict(value) for key, value in buckets.items()}
+
+
+def read_gauge(text: str, name: str) -> Optional[float]:
+    """Prometheus 텍스트에서 게이지 값을 읽습니다 (여러 시계열이면 합계, 없으면 None)."""
+    values = [
+        sample.value
+        for family in text_string_to_metric_families(text)
+        for sample in family.samples
+        if sample.name == name
+    ]
+    return sum(values) if values else None
+
+
+def histogram_delta(after: Histogram, before: Histogram) -> Histogram:
+    """두 시점 사이에 관측된 버킷 개수를 구합니다."""
+    return {
+        key: {bound: count - before.get(key, {}).get(bound, 0.0) for bound, count in bounds.items()}
+        for key, bounds in after.items()
+    }
+
+
+def histogram_quantile(buckets: Dict[float, float], q: float) -> Optional[float]:
+    """누적 버킷에서 분위수를 구합니다 (Prometheus histogram_quantile과 같은 선형 보간)."""
+    bounds = sorted(buckets)
+    if not bounds or buckets[bounds[-1]] <= 0:
+        return None
+    rank = q * buckets[bounds[-1]]
+    lower, below = 0.0, 0.0
+    for bound in bounds:
+        count = buckets[bound]
+        if count >= rank:
+            if bound == float("inf"):
+                return lower
+            if count == below:
+                return bound
+            return lower + (bound - lower) * (rank - below) / (count - below)
+        lower, below = bound, count
+    return lower
+
+
+def stage_summary(after: str, before: str) -> Dict[str, Dict[str, Any]]:
+    """측정 구간 동안의 단계별 처리 횟수와 지연 분위수(ms)를 구합니다."""
+    delta = histogram_delta(parse_histogram(after, STAGE_METRIC, ("stage",)), parse_histogram(before, STAGE_METRIC, ("stage",)))
+    stages = {}
+    for (stage,), buckets in sorted(delta.items()):
+        count = buckets.get(float("inf"), 0.0)
+        if count <= 0:
+            continue
+        stages[stage] = {"count": int(count)}
+        for name, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99)):
+            value = histogram_quantile(buckets, q)
+            stages[stage][name] = round(value * 1000, 1) if value is not None else None
+    return stages
+
+
+class LoopLagSampler:
+    """같은 이벤트 루프에서 sleep이 늦게 깨어나는 시간으로 루프 지연을 잽니다."""
+
+    def __init__(self, interval: float = 0.05):
+        self.interval = interval
+        self.samples: List[float] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - expected) * 1000)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+
+async def scrape_metrics(client: httpx.AsyncClient) -> str:
+    """대상의 /metrics 를 읽습니다 (없으면 빈 문자열)."""
+    try:
+        response = await client.get("/metrics")
+        return response.text if response.status_code == 200 else ""
+    except httpx.HTTPError:
+        return ""
+
+
+async def send_query(client: httpx.AsyncClient, item: Dict[str, Any], uid: str, scheduled: float) -> Dict[str, Any]:
+    """
+    질의 하나를 보내고 결과를 기록합니다.
+    지연은 예정 시각부터 재므로, 개방형 부하에서 서버가 밀려 늦게 보낸 요청의 대기 시간도 포함됩니다.
+    """
+    record = {"id": item["id"], "lang": item.get("lang"), "rag_type": item.get("rag_type")}
+    try:
+        response = await client.post(CHATBOT_PATH, json={"query": item["query"], "uid": uid})
+        record["status"] = response.status_code
+        if response.status_code == 200:
+            record["classified_as"] = response.json().get("metadata", {}).get("rag_type")
+    except httpx.HTTPError as e:
+        record["status"] = type(e).__name__
+    record["latency_ms"] = (time.perf_counter() - scheduled) * 1000
+    return record
+
+
+async def generate_load(
+    client: httpx.AsyncClient,
+    queries: Sequence[Dict[str, Any]],
+    concurrency: int,
+    rate: Optional[float],
+    duration: float,
+    max_requests: Optional[int],
+    rng: random.Random
+) -> List[Dict[str, Any]]:
+    """
+    부하를 만들고 요청별 기록을 반환합니다.
+
+    Args:
+        concurrency: 폐쇄형이면 동시 사용자 수, 개방형이면 동시에 보낼 수 있는 최대 요청 수
+        rate: 초당 요청 수 (None이면 폐쇄형)
+        duration: 부하 시간(초)
+        max_requests: 최대 요청 수 (None이면 제한 없음)
+    """
+    weights = [item.get("weight", 1) for item in queries]
+    deadline = time.perf_counter() + duration
+    records: List[Dict[str, Any]] = []
+    sent = 0
+
+    def next_query() -> Optional[Tuple[Dict[str, Any], str]]:
+        nonlocal sent
+        if time.perf_counter() >= deadline or (max_requests is not None and sent >= max_requests):
+            return None
+        sent += 1
+        return rng.choices(queries, weights)[0], f"loadtest-{sent % 100}"
+
+    if rate is None:
+        async def user() -> None:
+            while (picked := next_query()) is not None:
+                records.append(await send_query(client, *picked, time.perf_counter()))
+
+        await asyncio.gather(*(user() for _ in range(concurrency)))
+        return records
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def limited(item: Dict[str, Any], uid: str, scheduled: float) -> None:
+        async with semaphore:
+            records.append(await send_query(client, item, uid, scheduled))
+
+    tasks = []
+    scheduled = time.perf_counter()
+    while (picked := next_query()) is not None:
+        tasks.append(asyncio.create_task(limited(*picked, scheduled)))
+        scheduled += rng.expovariate(rate)
+        await asyncio.sleep(max(0.0, scheduled - time.perf_counter()))
+    await asyncio.gather(*tasks)
+    return records
+
+
+async def measure(
+    client: httpx.AsyncClient,
+    queries: Sequence[Dict[str, Any]],
+    concurrency: int = 8,
+    rate: Optional[float] = None,
+    duration: float = 30.0,
+    max_requests: Optional[int] = None,
+    warmup: int = 0,
+    seed: int = 0,
+    in_process: bool = False
+) -> Dict[str, Any]:
+    """
+    예열 후 부하를 걸고 측정 결과를 반환합니다.
+
+    Args:
+        client: 대상 앱/서버에 연결한 클라이언트
+        queries: 질의 구성
+        warmup: 측정 전에 순서대로 보낼 요청 수 (모델/벡터 스토어 로드를 측정에서 제외)
+        seed: 질의 선택/도착 간격 난수 시드
+        in_process: 앱이 같은 프로세스에서 도는지 (루프 지연과 RSS를 직접 잼)
+    """
+    rng = random.Random(seed)
+    for item in list(queries)[:warmup]:
+        await send_query(client, item, "loadtest-warmup", time.perf_counter())
+
+    before = await scrape_metrics(client)
+    rss_before = psutil.Process().memory_info().rss if in_process else read_gauge(before, RSS_METRIC)
+    sampler = LoopLagSampler()
+    if in_process:
+        sampler.start()
+
+    start = time.perf_counter()
+    try:
+        records = await generate_load(client, queries, concurrency, rate, duration, max_requests, rng)
+    finally:
+        await sampler.stop()
+    elapsed = time.perf_counter() - start
+
+    after = await scrape_metrics(client)
+    rss_after = psutil.Process().memory_info().rss if in_process else read_gauge(after, RSS_METRIC)
+
+    ok = [record for record in records if record["status"] == 200]
+    errors = defaultdict(int)
+    for record in records:
+        if record["status"] != 200:
+            errors[str(record["status"])] += 1
+    by_rag_type = defaultdict(list)
+    for record in ok:
+        by_rag_type[record["rag_type"]].append(record["latency_ms"])
+
+    result: Dict[str, Any] = {
+        "elapsed_seconds": round(elapsed, 2),
+        "requests": len(records),
+        "ok": len(ok),
+        "errors": dict(errors),
+        "error_rate": round(1 - len(ok) / len(records), 4) if records else 0.0,
+        "throughput_rps": round(len(ok) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": latency_summary([record["latency_ms"] for record in ok]),
+        "by_rag_type": {
+            rag_type: {"requests": len(values), "p50": percentile(values, 50), "p95": percentile(values, 95)}
+            for rag_type, values in sorted(by_rag_type.items())
+        },
+        "stages": stage_summary(after, before),
+        "loop_lag_ms": None,
+        "memory_mb": None,
+    }
+    if in_process:
+        result["loop_lag_ms"] = latency_summary(sampler.samples)
+    else:
+        lag = histogram_delta(parse_histogram(after, LOOP_LAG_METRIC), parse_histogram(before, LOOP_LAG_METRIC)).get(())
+        if lag:
+            result["loop_lag_ms"] = {
+                name: round(value * 1000, 1) if value is not None else None
+                for name, value in (("p50", histogram_quantile(lag, 0.5)), ("p99", histogram_quantile(lag, 0.99)))
+            }
+    if rss_before is not None and rss_after is not None:
+        result["memory_mb"] = {
+            "start": round(rss_before / 2**20, 1),
+            "end": round(rss_after / 2**20, 1),
+            "growth": round((rss_after - rss_before) / 2**20, 1),
+        }
+    return result
+
+
+def lookup(result: Dict[str, Any], path: str) -> Optional[float]:
+    value: Any = result
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value if isinstance(value, (int, float)) else None
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_delta_ms: float) -> List[str]:
+    """
+    기준 결과와 비교하여 지표 변화를 출력하고, 회귀 목록을 반환합니다.
+    지연/메모리는 tolerance(비율)보다 많이 나빠지고 차이가 min_delta_ms(메모리는 MB) 이상일 때,
+    처리량은 tolerance보다 많이 떨어질 때, 오류율은 ERROR_RATE_TOLERANCE보다 많이 오를 때 회귀로 봅니다.
+    단계별 p95는 표시만 합니다.
+    """
+    regressions = []
+    print(f"[LOAD] 비교 기준: {baseline.get('git_commit')} ({baseline.get('timestamp')})", file=sys.stderr)
+    if current.get("config", {}).get("mode") != baseline.get("config", {}).get("mode"):
+        print("[LOAD] 부하 방식(개방형/폐쇄형)이 달라 지연 비교가 의미 없을 수 있습니다", file=sys.stderr)
+
+    paths = list(HIGHER_IS_BETTER) + list(LOWER_IS_BETTER)
+    paths += [f"stages.{stage}.p95" for stage in current.get("stages", {})]
+    for path in paths:
+        now, before = lookup(current, path), lookup(baseline, path)
+        if now is None or before is None:
+            continue
+        delta = now - before
+        print(f"  {path:<28} {before:>10} → {now:<10} ({delta:+.2f})", file=sys.stderr)
+        if path in HIGHER_IS_BETTER:
+            if before > 0 and now < before * (1 - tolerance):
+                regressions.append(f"{path}: {before} → {now}")
+        elif path == "error_rate":
+            if delta > ERROR_RATE_TOLERANCE:
+                regressions.append(f"{path}: {before} → {now}")
+        elif path in LOWER_IS_BETTER and delta >= min_delta_ms and now > before * (1 + tolerance):
+            regressions.append(f"{path}: {before} → {now}")
+    return regressions
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    """대상(프로세스 안의 앱 또는 서버)에 연결해 측정하고 결과 딕셔너리를 반환합니다."""
+    queries = load_query_mix(Path(args.queries))
+    in_process = not args.url
+    if in_process:
+        if not args.real_providers:
+            os.environ.update(STUB_ENV)
+        # 대역 환경 변수를 지정한 뒤에 앱을 불러와야 설정에 반영됨
+        from app.main import app
+
+        configure_logging(args.verbose)
+        transport = httpx.ASGITransport(app=app)
+        base_url = "http://loadtest"
+    else:
+        transport = None
+        base_url = args.url.rstrip("/")
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(transport=transport, base_url=base_url, timeout=args.timeout, limits=limits) as client:
+        logger.info(
+            f"[LOAD] 부하 시작: {'개방형 ' + str(args.rate) + ' rps' if args.rate else '폐쇄형 동시 ' + str(args.concurrency)}, "
+            f"{args.duration}초, 대상 {base_url}"
+        )
+        metrics = await measure(
+            client, queries,
+            concurrency=args.concurrency,
+            rate=args.rate,
+            duration=args.duration,
+            max_requests=args.requests,
+            warmup=args.warmup,
+            seed=args.seed,
+            in_process=in_process
+        )
+
+    return {
+        "schema_version": RESULT_SCHEMA_VERSION,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "config": {
+            "target": "in-process" if in_process else base_url,
+            "providers": "real" if args.real_providers or not in_process else STUB_ENV["REPLAY_MODE"],
+            "mode": "open" if args.rate else "closed",
+            "concurrency": args.concurrency,
+            "rate": args.rate,
+            "duration": args.duration,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "seed": args.seed,
+            "query_mix": Path(args.queries).name,
+        },
+        **metrics,
+    }
+
+
+def configure_logging(verbose: bool) -> None:
+    # 요청마다 찍히는 서비스 로그는 측정을 방해하므로 기본적으로 부하 테스트 로그와 에러만 출력
+    logger.remove()
+    logger.configure(extra={"request_id": "-"})
+    logger.add(
+        sys.stderr,
+        level="INFO",
+        filter=None if verbose else lambda record: "[LOAD]" in record["message"] or record["level"].no >= 40
+    )
+    logging.getLogger("chromadb").setLevel(logging.INFO if verbose else logging.ERROR)
+    logging.getLogger("chromadb.telemetry").setLevel(logging.CRITICAL)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="챗봇 API에 다국어 질의 부하를 걸고 지연/처리량을 측정합니다.")
+    parser.add_argument("--url", help="실행 중인 서버 주소 (없으면 프로세스 안에서 대역 제공자로 실행)")
+    parser.add_argument("--queries", default=str(QUERY_MIX_PATH), help="질의 구성 JSON 파일")
+    parser.add_argument("--concurrency", type=int, default=8, help="동시 사용자 수 (개방형이면 최대 동시 요청 수)")
+    parser.add_argument("--rate", type=float, help="초당 요청 수 (지정하면 개방형 부하)")
+    parser.add_argument("--duration", type=float, default=30.0, help="부하 시간(초)")
+    parser.add_argument("--requests", type=int, help="최대 요청 수")
+    parser.add_argument("--warmup", type=int, default=5, help="측정 전에 보낼 요청 수")
+    parser.add_argument("--timeout", type=float, default=120.0, help="요청 타임아웃(초)")
+    parser.add_argument("--seed", type=int, default=0, help="질의 선택/도착 간격 난수 시드")
+    parser.add_argument("--real-providers", action="store_true", help="프로세스 안에서 실행할 때도 .env의 실제 제공자 사용")
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (없으면 표준 출력)")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON 파일")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="지연/처리량 회귀 허용 비율")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="회귀로 볼 최소 지연 차이(ms, 메모리는 MB)")
+    parser.add_argument("--verbose", action="store_true", help="서비스 INFO 로그 출력")
+    args = parser.parse_args()
+    args.concurrency = max(args.concurrency, 1)
+
+    configure_logging(args.verbose)
+    results = asyncio.run(run(args))
+
+    payload = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + "\n", encoding="utf-8")
+        logger.info(f"[LOAD] 결과 저장: {args.output}")
+    else:
+        sys.stdout.write(payload + "\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.tolerance, args.min_delta_ms)
+        if regressions:
+            for regression in regressions:
+                logger.error(f"[LOAD] 성능 회귀: {regression}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+도메인 벡터 스토어 양자화 변환 CLI
+
+Chroma 컬렉션의 임베딩을 float16 또는 int8(차원별 스케일)로 양자화하고, 선택적으로 PCA로 차원을 줄여
+각 벡터 스토어 디렉토리에 quantized_index.npz로 저장합니다. 재정렬용 원본 벡터(full_vectors.npy)도 함께 저장합니다.
+라벨 질의 세트(data/benchmarks/queries)가 있으면 원본 대비 recall 손실과 절감 메모리를 리포트합니다.
+
+서버에서는 RAG_QUANTIZED_SEARCH=true로 양자화 색인을 사용합니다.
+
+사용 예:
+    python -m app.tools.quantize_vectorstores --dtype int8
+    python -m app.tools.quantize_vectorstores --dtype float16 --dims 256 --domains employment --dry-run
+    python -m app.tools.quantize_vectorstores --domains employment --snapshot 2   # 활성화 전 스냅샷 변환
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+import chromadb
+from chromadb.config import Settings
+from loguru import logger
+from app.config.logging_config import setup_logging
+from app.config.rag_config import RAGConfig
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.services.common.quantized_index import (
+    SUPPORTED_DTYPES,
+    QuantizedIndex,
+    full_vectors_path,
+    normalize_rows,
+    quantized_index_path,
+    save_full_vectors,
+)
+from app.tools.retrieval_bench import load_query_sets, normalize_source, score_ranking
+
+
+def explained_variance(vectors: np.ndarray, index: QuantizedIndex) -> Optional[float]:
+    """PCA 투영이 보존하는 분산 비율을 계산합니다."""
+    if index.components is None:
+        return None
+    centered = vectors - index.mean
+    total = float((centered ** 2).sum())
+    kept = float(((centered @ index.components.T) ** 2).sum())
+    return round(kept / total, 4) if total > 0 else 1.0
+
+
+def memory_report(vectors: np.ndarray, index: QuantizedIndex) -> Dict[str, Any]:
+    float32_bytes = vectors.shape[0] * vectors.shape[1] * 4
+    return {
+        "float32_bytes": float32_bytes,
+        "quantized_bytes": index.nbytes,
+        "saved_bytes": float32_bytes - index.nbytes,
+        "saved_ratio": round(1 - index.nbytes / float32_bytes, 4) if float32_bytes else 0.0,
+    }
+
+
+def evaluate(
+    ids: List[str],
+    vectors: np.ndarray,
+    sources: Dict[str, str],
+    index: QuantizedIndex,
+    query_set: Dict[str, Any],
+    ks: Sequence[int]
+) -> Dict[str, Any]:
+    """
+    라벨 질의 세트로 원본(float32 완전 탐색), 양자화, 양자화+재정렬 검색을 비교합니다.
+    overlap@k는 원본 top-k 중 양자화 top-k에 남은 비율입니다.
+    """
+    from app.core.embeddings import get_embedding_model
+
+    encoder = get_embedding_model(RAGConfig.EMBEDDING_MODEL)
+    queries = query_set["queries"]
+    query_embeddings = encoder.encode([item["query"] for item in queries], show_progress_bar=False)
+    max_k = max(ks)
+    modes = {"exact": [], "quantized": [], "quantized_rescored": []}
+    overlaps = {"quantized": {k: [] for k in ks}, "quantized_rescored": {k: [] for k in ks}}
+
+    for item, embedding in zip(queries, query_embeddings):
+        exact_scores = vectors @ normalize_rows(embedding)
+        exact_ids = [ids[i] for i in np.argsort(-exact_scores)[:max_k]]
+        rankings = {
+            "exact": exact_ids,
+            "quantized": [doc_id for doc_id, _ in index.search(embedding, max_k)],
+            "quantized_rescored": [doc_id for doc_id, _ in index.search(embedding, max_k, rescore=True)],
+        }
+        for mode, ranked_ids in rankings.items():
+            ranked_sources = [normalize_source(sources.get(doc_id)) for doc_id in ranked_ids]
+            modes[mode].append(score_ranking(ranked_sources, item["relevant_sources"], ks))
+            if mode != "exact":
+                for k in ks:
+                    overlaps[mode][k].append(len(set(ranked_ids[:k]) & set(exact_ids[:k])) / min(k, len(ids)))
+
+    report: Dict[str, Any] = {}
+    for mode, scores in modes.items():
+        report[mode] = {key: round(float(np.mean([score[key] for score in scores])), 4) for key in scores[0]}
+        report[mode]["mrr"] = report[mode].pop("rr")
+        if mode != "exact":
+            report[mode].update({f"overlap@{k}": round(float(np.mean(values)), 4) for k, values in overlaps[mode].items()})
+            report[mode]["recall_lost"] = {
+                key: round(report["exact"][key] - report[mode][key], 4)
+                for key in report["exact"] if key.startswith("recall@")
+            }
+    return report
+
+
+def convert_domain(
+    rag_type: RAGType,
+    vectorstore_path: str,
+    dtype: str,
+    dimensions: Optional[int],
+    keep_full: bool,
+    query_set: Optional[Dict[str, Any]],
+    ks: Sequence[int],
+    dry_run: bool
+) -> Dict[str, Any]:
+    """도메인 하나를 변환하고 리포트를 반환합니다."""
+    client = chromadb.PersistentClient(path=vectorstore_path, settings=Settings(allow_reset=True))
+    collection = client.get_collection(RAGConfig.DOMAIN_CONFIGS[rag_type]["collection_name"])
+    data = collection.get(include=["embeddings", "metadatas"])
+    ids = data["ids"]
+    if not ids:
+        return {"domain": rag_type.value, "skipped": "빈 컬렉션"}
+
+    vectors = normalize_rows(np.asarray(data["embeddings"], dtype=np.float32))
+    sources = {doc_id: (metadata or {}).get("source") for doc_id, metadata in zip(ids, data["metadatas"])}
+    index = QuantizedIndex.build(ids, vectors, dtype=dtype, dimensions=dimensions)
+    index.full_vectors = vectors
+
+    report: Dict[str, Any] = {
+        "domain": rag_type.value,
+        "documents": len(ids),
+        "dtype": dtype,
+        "dimension": index.dimension,
+        "source_dimension": index.source_dimension,
+        "explained_variance": explained_variance(vectors, index),
+        "memory": memory_report(vectors, index),
+    }
+    if query_set is not None:
+        report["recall"] = evaluate(ids, vectors, sources, index, query_set, ks)
+
+    if not dry_run:
+        index.save(quantized_index_path(vectorstore_path))
+        if keep_full:
+            save_full_vectors(full_vectors_path(vectorstore_path), vectors)
+        elif os.path.exists(full_vectors_path(vectorstore_path)):
+            os.remove(full_vectors_path(vectorstore_path))
+        report["index_file"] = quantized_index_path(vectorstore_path)
+
+    logger.info(
+        f"[양자화] {rag_type.value}: {len(ids)}개 문서, {dtype} {index.dimension}차원, "
+        f"메모리 {report['memory']['float32_bytes']} → {report['memory']['quantized_bytes']} bytes"
+    )
+    return report
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="도메인 벡터 스토어의 임베딩을 양자화 색인으로 변환합니다.")
+    parser.add_argument("--domains", nargs="*", help="변환할 도메인 (기본값: ChromaDB 파일이 있는 전체 도메인)")
+    parser.add_argument("--dtype", choices=SUPPORTED_DTYPES, default="int8", help="저장 형식")
+    parser.add_argument("--dims", type=int, default=0, help="PCA 축소 차원 (0이면 축소하지 않음)")
+    parser.add_argument("--no-full-vectors", action="store_true", help="재정렬용 원본 벡터를 저장하지 않음")
+    parser.add_argument("--queries", default="v1", help="recall 평가에 쓸 질의 세트 버전")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5], help="recall@k의 k 값")
+    parser.add_argument("--skip-eval", action="store_true", help="recall 평가 생략 (임베딩 모델 불필요)")
+    parser.add_argument("--dry-run", action="store_true", help="파일을 쓰지 않고 리포트만 출력")
+    parser.add_argument("--snapshot", type=int, help="변환할 스냅샷 버전 (기본값: 활성 벡터 스토어, 도메인 하나만 지정)")
+    args = parser.parse_args()
+    if args.snapshot and (not args.domains or len(args.domains) != 1):
+        parser.error("--snapshot은 --domains로 도메인 하나를 지정할 때만 사용할 수 있습니다.")
+
+    setup_logging()
+    query_sets = {} if args.skip_eval else load_query_sets(args.queries)
+    reports = []
+    for rag_type in RAGType:
+        if rag_type == RAGType.NONE or (args.domains and rag_type.value not in args.domains):
+            continue
+        if args.snapshot:
+            vectorstore_path = RAGConfig.snapshot_path(rag_type, args.snapshot)
+        else:
+            vectorstore_path = RAGConfig.active_vectorstore_path(rag_type)
+        if not os.path.exists(os.path.join(vectorstore_path, "chroma.sqlite3")):
+            logger.warning(f"[양자화] {rag_type.value}: ChromaDB 파일이 없어 건너뜁니다.")
+            reports.append({"domain": rag_type.value, "skipped": "chroma.sqlite3 없음"})
+            continue
+        reports.append(convert_domain(
+            rag_type,
+            vectorstore_path,
+            args.dtype,
+            args.dims or None,
+            not args.no_full_vectors,
+            query_sets.get(rag_type.value),
+            sorted(set(args.k)),
+            args.dry_run
+        ))
+
+    converted = [report for report in reports if "memory" in report]
+    summary = {
+        "float32_bytes": sum(report["memory"]["float32_bytes"] for report in converted),
+        "quantized_bytes": sum(report["memory"]["quantized_bytes"] for report in converted),
+    }
+    summary["saved_bytes"] = summary["float32_bytes"] - summary["quantized_bytes"]
+    json.dump({"domains": reports, "summary": summary}, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,322 @@
+"""
+오프라인 검색 벤치마크
+
+data/benchmarks/queries/<버전>/<도메인>.json 의 라벨(관련 원본 파일명)로 도메인별
+recall@k, MRR, 검색 지연(p50/p95), 콜드/웜 로드 시간과 메모리를 측정합니다.
+배포된 벡터 스토어는 임시 디렉토리에 복사해서 열기 때문에 원본 파일은 바뀌지 않으며,
+임베딩 모델은 로컬 캐시에서만 로드합니다 (네트워크 접근 없음).
+
+사용 예:
+    python -m app.tools.retrieval_bench --output bench_results.json
+    python -m app.tools.retrieval_bench --domains employment --repeat 5 --compare bench_results.json
+"""
+
+import os
+
+# 앱 모듈을 불러오기 전에 오프라인 실행을 강제
+os.environ.setdefault("HF_HUB_OFFLINE", "1")
+os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
+os.environ.setdefault("ANONYMIZED_TELEMETRY", "False")
+
+import argparse
+import json
+import logging
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unicodedata
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+import numpy as np
+import psutil
+from loguru import logger
+
+REPO_ROOT = Path(__file__).resolve().parent.parent.parent
+QUERIES_DIR = REPO_ROOT / "data" / "benchmarks" / "queries"
+RESULT_SCHEMA_VERSION = 1
+
+# 비교 시 회귀로 판단할 지표 (높을수록 좋은 지표, 낮을수록 좋은 지표)
+HIGHER_IS_BETTER = ("mrr",)
+LOWER_IS_BETTER = ("latency_ms_p50", "latency_ms_p95", "cold_load_seconds")
+
+
+def load_query_sets(version: str, domains: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """버전별 라벨 질의 세트를 도메인 단위로 불러옵니다."""
+    version_dir = QUERIES_DIR / version
+    if not version_dir.is_dir():
+        raise ValueError(f"질의 세트가 존재하지 않습니다: {version_dir}")
+    query_sets = {}
+    for path in sorted(version_dir.glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            query_set = json.load(f)
+        domain = query_set.get("domain", path.stem)
+        if domains and domain not in domains:
+            continue
+        query_sets[domain] = query_set
+    return query_sets
+
+
+def normalize_source(source: Optional[str]) -> str:
+    """원본 파일명을 NFC로 정규화합니다 (macOS에서 만든 스토어는 NFD 파일명을 저장함)."""
+    return unicodedata.normalize("NFC", source or "")
+
+
+def score_ranking(ranked_sources: Sequence[str], relevant_sources: Sequence[str], ks: Sequence[int]) -> Dict[str, float]:
+    """
+    검색 결과 하나의 recall@k와 reciprocal rank를 계산합니다.
+    라벨은 청크가 아닌 원본 파일 단위이므로, 재청크화해도 같은 라벨을 쓸 수 있습니다.
+    """
+    relevant = {normalize_source(source) for source in relevant_sources}
+    ranked_sources = [normalize_source(source) for source in ranked_sources]
+    scores: Dict[str, float] = {}
+    for k in ks:
+        found = relevant & set(ranked_sources[:k])
+        scores[f"recall@{k}"] = len(found) / len(relevant) if relevant else 0.0
+    scores["rr"] = next(
+        (1.0 / rank for rank, source in enumerate(ranked_sources, 1) if source in relevant),
+        0.0
+    )
+    return scores
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    return round(float(np.percentile(values, q)), 3) if values else 0.0
+
+
+def rss_mb() -> float:
+    return psutil.Process().memory_info().rss / (1024 * 1024)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def prepare_workspace(data_dir: Path) -> Path:
+    """벡터 스토어를 임시 디렉토리로 복사하고 BASE_DIR로 지정합니다."""
+    workspace = Path(tempfile.mkdtemp(prefix="retrieval_bench_"))
+    (workspace / "data").mkdir()
+    for store in sorted(data_dir.glob("vectorstore*")):
+        shutil.copytree(store, workspace / "data" / store.name)
+    os.environ["BASE_DIR"] = str(workspace)
+    return workspace
+
+
+def bench_domain(rag_type, query_set: Dict[str, Any], ks: Sequence[int], repeat: int) -> Dict[str, Any]:
+    """도메인 하나의 로드 비용, 검색 품질, 검색 지연을 측정합니다."""
+    from app.services.common.rag_service import RAGService
+
+    # 콜드 로드: 프로세스에서 처음 여는 컬렉션 (BM25 색인 생성 포함)
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    service = RAGService(domains=[rag_type])
+    cold_load = time.perf_counter() - start
+    rss_after = rss_mb()
+
+    # 웜 로드: 같은 스토어를 다시 여는 비용 (OS 페이지 캐시, 저장된 BM25 색인 사용)
+    start = time.perf_counter()
+    RAGService(domains=[rag_type])
+    warm_load = time.perf_counter() - start
+
+    collection = service.collections[rag_type]
+    known_sources = {
+        normalize_source((metadata or {}).get("source"))
+        for metadata in collection.get(include=["metadatas"])["metadatas"]
+    }
+
+    max_k = max(ks)
+    queries = query_set["queries"]
+    per_query: List[Dict[str, Any]] = []
+    missing_labels = set()
+    first_query_ms = None
+    latencies: List[float] = []
+
+    for run in range(repeat):
+        for item in queries:
+            start = time.perf_counter()
+            results = service.retrieve(rag_type, item["query"], k=max_k)
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if first_query_ms is None:
+                first_query_ms = elapsed_ms
+            else:
+                latencies.append(elapsed_ms)
+            if run > 0:
+                continue
+
+            ranked_sources = [normalize_source(result["metadata"].get("source")) for result in results]
+            missing_labels.update(
+                source for source in item["relevant_sources"] if normalize_source(source) not in known_sources
+            )
+            per_query.append({
+                "id": item["id"],
+                "ranked_sources": ranked_sources,
+                **score_ranking(ranked_sources, item["relevant_sources"], ks)
+            })
+
+    metrics: Dict[str, Any] = {
+        "queries": len(queries),
+        "collection_count": collection.count(),
+        "cold_load_seconds": round(cold_load, 3),
+        "warm_load_seconds": round(warm_load, 3),
+        "load_rss_mb": round(rss_after - rss_before, 1),
+        "first_query_ms": round(first_query_ms or 0.0, 3),
+        "latency_ms_p50": percentile(latencies, 50),
+        "latency_ms_p95": percentile(latencies, 95),
+        "latency_ms_mean": round(float(np.mean(latencies)), 3) if latencies else 0.0,
+    }
+    for k in ks:
+        metrics[f"recall@{k}"] = round(float(np.mean([q[f"recall@{k}"] for q in per_query])), 4)
+    metrics["mrr"] = round(float(np.mean([q["rr"] for q in per_query])), 4)
+    if missing_labels:
+        logger.warning(f"[BENCH] {rag_type.value}: 컬렉션에 없는 라벨 원본 {sorted(missing_labels)}")
+        metrics["missing_labels"] = sorted(missing_labels)
+    metrics["per_query"] = per_query
+    return metrics
+
+
+def run_benchmark(version: str, domains: Optional[Sequence[str]], ks: Sequence[int], repeat: int, data_dir: Path) -> Dict[str, Any]:
+    """벤치마크 전체를 실행하고 결과 딕셔너리를 반환합니다."""
+    query_sets = load_query_sets(version, domains)
+    workspace = prepare_workspace(data_dir)
+    try:
+        # BASE_DIR 지정 후에 설정을 불러와야 복사본 경로가 사용됨
+        from app.services.chatbot.chatbot_classifier import RAGType
+        from app.config.rag_config import RAGConfig
+        from app.core.embeddings import get_embedding_model
+
+        rss_before = rss_mb()
+        start = time.perf_counter()
+        get_embedding_model(RAGConfig.EMBEDDING_MODEL)
+        model_load = time.perf_counter() - start
+
+        results: Dict[str, Any] = {
+            "schema_version": RESULT_SCHEMA_VERSION,
+            "query_set": version,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "config": {
+                "embedding_model": RAGConfig.EMBEDDING_MODEL,
+                "search_k": RAGConfig.SEARCH_K,
+                "search_threshold": RAGConfig.SEARCH_THRESHOLD,
+                "hybrid_search": RAGConfig.HYBRID_SEARCH,
+                "search_candidates": RAGConfig.SEARCH_CANDIDATES,
+                "quantized_search": RAGConfig.QUANTIZED_SEARCH,
+                "quantized_rescore": RAGConfig.QUANTIZED_RESCORE,
+                "ks": list(ks),
+                "repeat": repeat,
+            },
+            "model_load_seconds": round(model_load, 3),
+            "model_rss_mb": round(rss_mb() - rss_before, 1),
+            "domains": {},
+            "skipped": {},
+        }
+
+        for domain, query_set in query_sets.items():
+            rag_type = RAGType(domain)
+            store_path = Path(RAGConfig.active_vectorstore_path(rag_type))
+            if not (store_path / "chroma.sqlite3").exists():
+                logger.warning(f"[BENCH] {domain}: ChromaDB 파일이 없어 건너뜁니다 ({store_path.name})")
+                results["skipped"][domain] = f"{store_path.name}/chroma.sqlite3 없음"
+                continue
+            logger.info(f"[BENCH] {domain} 벤치마크 시작: 질의 {len(query_set['queries'])}개 x {repeat}회")
+            results["domains"][domain] = bench_domain(rag_type, query_set, ks, repeat)
+
+        results["summary"] = summarize(results["domains"], ks)
+        return results
+    finally:
+        shutil.rmtree(workspace, ignore_errors=True)
+
+
+def summarize(domain_results: Dict[str, Dict[str, Any]], ks: Sequence[int]) -> Dict[str, Any]:
+    """도메인별 결과의 매크로 평균을 계산합니다."""
+    if not domain_results:
+        return {}
+    keys = [f"recall@{k}" for k in ks] + ["mrr", "latency_ms_p50", "latency_ms_p95", "cold_load_seconds"]
+    return {
+        key: round(float(np.mean([metrics[key] for metrics in domain_results.values()])), 4)
+        for key in keys
+    }
+
+
+def compare_results(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    기준 결과와 비교하여 지표 변화를 출력하고, 품질 회귀 목록을 반환합니다.
+    recall/MRR이 tolerance보다 많이 떨어지면 회귀로 봅니다. 지연 시간은 환경 편차가 커서 표시만 합니다.
+    """
+    regressions = []
+    if current.get("query_set") != baseline.get("query_set"):
+        print(f"[BENCH] 질의 세트가 다릅니다: {baseline.get('query_set')} → {current.get('query_set')}", file=sys.stderr)
+
+    print(f"[BENCH] 비교 기준: {baseline.get('git_commit')} ({baseline.get('timestamp')})", file=sys.stderr)
+    scopes = [("summary", current.get("summary", {}), baseline.get("summary", {}))]
+    scopes += [
+        (domain, metrics, baseline.get("domains", {}).get(domain, {}))
+        for domain, metrics in current.get("domains", {}).items()
+    ]
+    for scope, now, before in scopes:
+        for key, value in now.items():
+            if not isinstance(value, (int, float)) or key not in before:
+                continue
+            if not (key.startswith("recall@") or key in HIGHER_IS_BETTER or key in LOWER_IS_BETTER):
+                continue
+            delta = value - before[key]
+            print(f"  {scope:<16} {key:<20} {before[key]:>10} → {value:<10} ({delta:+.4f})", file=sys.stderr)
+            if (key.startswith("recall@") or key in HIGHER_IS_BETTER) and delta < -tolerance:
+                regressions.append(f"{scope} {key}: {before[key]} → {value}")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="배포된 벡터 스토어로 검색 품질과 성능을 오프라인 측정합니다.")
+    parser.add_argument("--queries", default="v1", help="질의 세트 버전 (data/benchmarks/queries/<버전>)")
+    parser.add_argument("--domains", nargs="*", help="측정할 도메인 (기본값: 질의 세트의 전체 도메인)")
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 3, 5], help="recall@k의 k 값")
+    parser.add_argument("--repeat", type=int, default=3, help="지연 측정 반복 횟수")
+    parser.add_argument("--data-dir", default=str(REPO_ROOT / "data"), help="vectorstore* 디렉토리가 있는 경로")
+    parser.add_argument("--output", help="결과 JSON 파일 경로 (없으면 표준 출력)")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON 파일")
+    parser.add_argument("--tolerance", type=float, default=0.02, help="recall/MRR 회귀 허용 폭")
+    parser.add_argument("--verbose", action="store_true", help="서비스 INFO 로그 출력")
+    args = parser.parse_args()
+
+    # 질의마다 찍히는 서비스 로그는 측정을 방해하므로 기본적으로 벤치마크 로그와 에러만 출력
+    logger.remove()
+    logger.add(
+        sys.stderr,
+        level="INFO",
+        filter=None if args.verbose else lambda record: "[BENCH]" in record["message"] or record["level"].no >= 40
+    )
+    logging.getLogger("chromadb").setLevel(logging.INFO if args.verbose else logging.ERROR)
+    # 텔레메트리는 꺼져 있어도 posthog 버전 차이로 전송 실패 에러를 남기므로 숨김
+    logging.getLogger("chromadb.telemetry").setLevel(logging.CRITICAL)
+
+    results = run_benchmark(args.queries, args.domains, sorted(set(args.k)), max(args.repeat, 1), Path(args.data_dir))
+
+    payload = json.dumps(results, ensure_ascii=False, indent=2)
+    if args.output:
+        Path(args.output).write_text(payload + "\n", encoding="utf-8")
+        logger.info(f"[BENCH] 결과 저장: {args.output}")
+    else:
+        sys.stdout.write(payload + "\n")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare_results(results, baseline, args.tolerance)
+        if regressions:
+            for regression in regressions:
+                logger.error(f"[BENCH] 품질 회귀: {regression}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
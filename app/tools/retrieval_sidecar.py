@@ -0,0 +1,60 @@
+"""
+임베딩/벡터 검색 사이드카 실행 CLI
+
+임베딩 모델, ChromaDB, BM25/양자화 색인을 이 프로세스에 한 번만 올리고 Unix 소켓으로 제공합니다.
+웹 워커는 RAG_SIDECAR_SOCKET에 같은 경로를 설정하면 모델을 올리지 않고 사이드카를 호출합니다.
+
+사용 예:
+    python -m app.tools.retrieval_sidecar --socket /tmp/eum-rag.sock
+    RAG_SIDECAR_SOCKET=/tmp/eum-rag.sock gunicorn -c gunicorn.conf.py app.main:app
+"""
+
+import argparse
+import signal
+import sys
+import threading
+from loguru import logger
+from app.config.logging_config import setup_logging
+from app.config.rag_config import RAGConfig
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.services.common.rag_service import RAGService
+from app.services.common.retrieval_sidecar import RetrievalSidecarServer
+from app.services.common.vectorstore_snapshots import SnapshotWatcher
+
+DEFAULT_SOCKET = "/tmp/eum-rag.sock"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="임베딩/벡터 검색 사이드카를 실행합니다.")
+    parser.add_argument("--socket", default=RAGConfig.SIDECAR_SOCKET or DEFAULT_SOCKET, help="Unix 소켓 경로")
+    parser.add_argument("--domains", nargs="*", help="로드할 도메인 (기본값: 전체 도메인)")
+    args = parser.parse_args()
+
+    setup_logging()
+    domains = [RAGType(domain) for domain in args.domains] if args.domains else None
+    rag_service = RAGService(domains=domains)
+    server = RetrievalSidecarServer(args.socket, rag_service)
+    # 웹 워커 대신 사이드카가 CURRENT 포인터를 감시해 스냅샷을 교체
+    watcher = SnapshotWatcher(lambda: rag_service)
+    watcher.start()
+
+    def stop(signum, frame):
+        logger.info(f"[사이드카] 종료 신호 수신: {signal.Signals(signum).name}")
+        # serve_forever를 실행 중인 스레드에서 shutdown을 호출하면 교착되므로 별도 스레드에서 호출
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    logger.info(f"[사이드카] 대기 중: {args.socket} (도메인 {sorted(rag_type.value for rag_type in rag_service.snapshots)})")
+    try:
+        server.serve_forever()
+    finally:
+        watcher.stop()
+        server.server_close()
+        logger.info("[사이드카] 종료")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""
+벡터 스토어 스냅샷 관리 CLI
+
+도메인 코퍼스를 갱신할 때 실행 중인 벡터 스토어를 직접 고치지 않고, 새 스냅샷을 만들어 적재한 뒤
+CURRENT 포인터만 옮깁니다. 실행 중인 서버는 포인터 변경을 감지해(RAG_SNAPSHOT_WATCH_INTERVAL)
+새 스냅샷을 로드/예열한 뒤 재시작 없이 교체합니다.
+
+사용 예:
+    python -m app.tools.vectorstore_snapshot create --domain employment          # 현재 스냅샷 복사 → v0002
+    python -m app.tools.ingest --domain employment --snapshot 2 --prune ./docs/employment
+    python -m app.tools.vectorstore_snapshot activate --domain employment --version 2
+    python -m app.tools.vectorstore_snapshot list
+"""
+
+import argparse
+import json
+import sys
+from app.config.logging_config import setup_logging
+from app.config.rag_config import RAGConfig
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.services.common import vectorstore_snapshots
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="도메인 벡터 스토어 스냅샷을 생성/활성화합니다.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    domains = [rag_type.value for rag_type in RAGType if rag_type != RAGType.NONE]
+
+    list_parser = subparsers.add_parser("list", help="도메인별 스냅샷 목록")
+    list_parser.add_argument("--domains", nargs="*", choices=domains, help="조회할 도메인 (기본값: 전체)")
+
+    create_parser = subparsers.add_parser("create", help="새 스냅샷 생성 (기본값: 현재 활성 벡터 스토어 복사)")
+    create_parser.add_argument("--domain", required=True, choices=domains)
+    create_parser.add_argument("--empty", action="store_true", help="빈 스냅샷으로 생성 (전체 재적재)")
+
+    activate_parser = subparsers.add_parser("activate", help="활성 스냅샷 변경 (롤백도 같은 방식)")
+    activate_parser.add_argument("--domain", required=True, choices=domains)
+    activate_parser.add_argument("--version", required=True, type=int)
+
+    args = parser.parse_args()
+    setup_logging()
+
+    if args.command == "list":
+        report = [
+            {
+                "domain": domain,
+                "active_version": RAGConfig.active_snapshot_version(RAGType(domain)),
+                "active_path": RAGConfig.active_vectorstore_path(RAGType(domain)),
+                "snapshots": vectorstore_snapshots.list_snapshots(RAGType(domain)),
+            }
+            for domain in (args.domains or domains)
+        ]
+    elif args.command == "create":
+        rag_type = RAGType(args.domain)
+        version = vectorstore_snapshots.create_snapshot(rag_type, empty=args.empty)
+        report = {"domain": args.domain, "version": version, "path": RAGConfig.snapshot_path(rag_type, version)}
+    else:
+        rag_type = RAGType(args.domain)
+        previous = RAGConfig.active_snapshot_version(rag_type)
+        vectorstore_snapshots.activate_snapshot(rag_type, args.version)
+        report = {"domain": args.domain, "previous_version": previous, "version": args.version}
+
+    json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
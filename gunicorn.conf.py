@@ -0,0 +1,76 @@
+"""
+gunicorn 멀티 워커 서빙 설정
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+두 가지 방식으로 워커 간 메모리를 공유합니다.
+- 사이드카 모드(RAG_SIDECAR_SOCKET 설정): 임베딩 모델과 검색 색인은 사이드카 프로세스
+  (python -m app.tools.retrieval_sidecar)에만 올라가고, 워커는 Unix 소켓으로 호출합니다.
+- 사전 로드 모드(기본값): 마스터가 fork 전에 RAG 서비스를 로드하고 gc.freeze()로 GC 대상에서 빼서,
+  임베딩 모델과 BM25/양자화 색인을 워커끼리 copy-on-write로 공유합니다. ChromaDB SQLite 연결은
+  fork 후 공유하면 안 되므로 워커마다 다시 엽니다.
+
+/metrics를 워커 전체 합계로 보려면 PROMETHEUS_MULTIPROC_DIR에 빈 디렉터리를 지정합니다
+(워커별 지표 파일을 이 디렉터리에 쓰고, 시작할 때 이전 실행의 파일을 지웁니다).
+"""
+
+import gc
+import glob
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY", "2"))
+worker_class = "uvicorn.workers.UvicornWorker"
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "120"))
+preload_app = True
+
+
+def _graceful_timeout() -> int:
+    """SIGTERM 후 워커를 강제 종료하기까지의 시간 (등록 해제 후 대기 + 드레인 제한 시간 + 종료 작업 여유)"""
+    from app.config.shutdown_config import ShutdownConfig
+
+    return int(ShutdownConfig.DEREGISTER_DELAY_SECONDS + ShutdownConfig.DRAIN_TIMEOUT_SECONDS) + 10
+
+
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "0")) or _graceful_timeout()
+
+
+def _preload_enabled() -> bool:
+    from app.config.rag_config import RAGConfig
+
+    return not RAGConfig.SIDECAR_SOCKET and os.getenv("RAG_PRELOAD", "true").lower() == "true"
+
+
+def when_ready(server):
+    """fork 전에 읽기 전용 데이터를 로드하고 이후 생긴 객체만 GC가 보도록 고정합니다."""
+    if _preload_enabled():
+        from app.services.chatbot.chatbot_classifier import RAGType  # noqa: F401 (순환 임포트 회피)
+        from app.services.common.rag_service import get_rag_service
+
+        get_rag_service()
+        server.log.info("RAG 서비스 사전 로드 완료 (워커 간 copy-on-write 공유)")
+    # 사전 로드한 객체의 GC 헤더를 워커가 건드려 페이지가 복사되지 않도록 함
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    if _preload_enabled():
+        from app.services.common.rag_service import get_rag_service
+
+        get_rag_service().reopen_clients()
+
+
+def on_starting(server):
+    multiproc_dir = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+    if multiproc_dir:
+        os.makedirs(multiproc_dir, exist_ok=True)
+        for path in glob.glob(os.path.join(multiproc_dir, "*.db")):
+            os.remove(path)
+
+
+def child_exit(server, worker):
+    """종료한 워커의 진행 중 요청/대기 수 지표를 합계에서 뺍니다."""
+    if os.getenv("PROMETHEUS_MULTIPROC_DIR"):
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(worker.pid)
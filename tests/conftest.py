@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import chromadb
+from chromadb.config import Settings
+from app.services.chatbot.chatbot_classifier import RAGType  # noqa: F401 (순환 임포트 회피)
+from app.config.rag_config import RAGConfig, RAGDomain
+from app.services.common import rag_service as rag_service_module
+
+
+class WordEncoder:
+    """단어 해시 기반의 결정적 임베딩 (테스트용)"""
+
+    def encode(self, texts, **kwargs):
+        vectors = np.ones((len(texts), 64), dtype=np.float32) * 0.01
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                vectors[row, sum(map(ord, word.strip(".,?!"))) % 64] += 1.0
+        return vectors
+
+
+@pytest.fixture
+def word_encoder():
+    return WordEncoder()
+
+
+@pytest.fixture
+def employment_config(tmp_path, monkeypatch, word_encoder):
+    """고용 도메인을 임시 벡터 스토어(vectorstore5)로 바꾸고, 임베딩 모델을 WordEncoder로 대체합니다."""
+    config = {
+        "collection_name": "employment",
+        "vectorstore_path": str(tmp_path / "vectorstore5"),
+        "chunk_size": 500,
+        "chunk_overlap": 100
+    }
+    monkeypatch.setitem(RAGConfig.DOMAIN_CONFIGS, RAGDomain.EMPLOYMENT, config)
+    monkeypatch.setattr(rag_service_module, "get_embedding_model", lambda model_name: word_encoder)
+    return config
+
+
+@pytest.fixture
+def make_store(word_encoder):
+    """문서 목록으로 고용 도메인 Chroma 스토어를 만드는 함수를 반환합니다."""
+
+    def _make_store(path, documents, source="manual.txt"):
+        client = chromadb.PersistentClient(path=str(path), settings=Settings(allow_reset=True))
+        collection = client.get_or_create_collection("employment", metadata={"hnsw:space": "cosine"})
+        if documents:
+            collection.add(
+                ids=[f"doc_{i}" for i in range(len(documents))],
+                documents=documents,
+                embeddings=word_encoder.encode(documents).tolist(),
+                metadatas=[{"source": source} for _ in documents]
+            )
+        return collection
+
+    return _make_store
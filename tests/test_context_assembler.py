@@ -0,0 +1,61 @@
+from app.services.common.context_assembler import (
+    ContextAssembler,
+    estimate_tokens,
+    get_savings_report,
+    start_savings_report,
+    truncate_to_tokens,
+)
+
+
+def test_estimate_tokens_counts_korean_and_english():
+    """한글은 글자 단위, 영어는 단어 단위로 토큰을 추정하는지 테스트"""
+    assert estimate_tokens("") == 0
+    assert estimate_tokens("비자 연장") > estimate_tokens("비자")
+    assert estimate_tokens("visa extension procedure") < estimate_tokens("비자 연장 절차를 알려주세요")
+
+
+def test_near_duplicates_are_removed():
+    """거의 같은 청크는 한 번만 포함되는지 테스트"""
+    assembler = ContextAssembler(budgets={"general": 1000})
+    base = "외국인 근로자는 입국 후 15일 이내에 건강보험에 가입해야 합니다. 보험료는 매월 부과됩니다."
+    context, stats = assembler.assemble([base, base + " ", "연말정산은 매년 1월에 진행됩니다."])
+
+    assert stats["duplicates_removed"] == 1
+    assert stats["output_chunks"] == 2
+    assert context.count("건강보험") == 1
+
+
+def test_budget_truncates_at_sentence_boundary():
+    """예산을 넘는 청크는 문장 경계에서 잘리는지 테스트"""
+    assembler = ContextAssembler(budgets={"general": 60}, min_chunk_tokens=5)
+    long_chunk = " ".join(f"문장 번호 {i}번은 테스트입니다." for i in range(50))
+    context, stats = assembler.assemble([long_chunk])
+
+    assert stats["truncated"] == 1
+    assert stats["output_tokens"] <= 60
+    assert context.endswith("테스트입니다.")
+    assert stats["saved_tokens"] == stats["input_tokens"] - stats["output_tokens"]
+
+
+def test_budget_per_query_type():
+    """질의 유형별 예산이 적용되고, 없는 유형은 general 예산을 쓰는지 테스트"""
+    assembler = ContextAssembler(budgets={"general": 100, "reasoning": 300})
+    assert assembler.budget_for("reasoning") == 300
+    assert assembler.budget_for("web_search") == 100
+
+
+def test_truncate_keeps_short_text():
+    """예산 이내의 텍스트는 그대로 유지되는지 테스트"""
+    assert truncate_to_tokens("짧은 문장입니다.", 100) == "짧은 문장입니다."
+
+
+def test_savings_report_accumulates():
+    """요청 단위 절감 집계가 여러 번의 조립을 합산하는지 테스트"""
+    assembler = ContextAssembler(budgets={"general": 20}, min_chunk_tokens=5)
+    report = start_savings_report()
+    assembler.assemble(["가" * 100])
+    assembler.assemble(["나" * 100])
+
+    assert get_savings_report() is report
+    assert report["input_tokens"] > report["output_tokens"]
+    assert report["saved_tokens"] == report["input_tokens"] - report["output_tokens"]
@@ -0,0 +1,105 @@
+from types import SimpleNamespace
+import threading
+import pytest
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.config.rag_config import RAGConfig
+from app.services.common import faq_service
+from app.services.common.faq_service import FAQService, STATUS_APPROVED, STATUS_PENDING
+from app.services.common.retrieval_executor import RetrievalExecutor
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def get(self, include=None):
+        return {"ids": [f"doc_{i}" for i in range(len(self.documents))], "documents": list(self.documents)}
+
+
+@pytest.fixture
+def faq_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(RAGConfig, "FAQ_DIR", str(tmp_path))
+    return tmp_path
+
+
+def _store(snapshot, status=STATUS_APPROVED):
+    return {
+        "format": faq_service.FAQ_FORMAT_VERSION,
+        "domain": "employment",
+        "snapshot": snapshot,
+        "embedding_model": RAGConfig.EMBEDDING_MODEL,
+        "languages": ["en", "ko"],
+        "entries": [{
+            "id": "employment-0001",
+            "question": "How do I extend my E-9 visa?",
+            "paraphrases": ["Can I renew an E-9 visa?"],
+            "answers": {"en": "Apply for an extension before your stay expires.", "ko": "체류기간 만료 전에 연장을 신청하세요."},
+            "sources": ["manual.pdf"],
+            "status": status,
+        }],
+    }
+
+
+def test_snapshot_fingerprint_changes_with_content():
+    """문서 내용이 바뀌면 스냅샷 지문도 바뀌는지 테스트"""
+    before = faq_service.snapshot_fingerprint(FakeCollection(["a", "b"]))
+    assert before == faq_service.snapshot_fingerprint(FakeCollection(["a", "b"]))
+    assert before != faq_service.snapshot_fingerprint(FakeCollection(["a", "c"]))
+
+
+def test_publish_increments_version(faq_dir):
+    """게시할 때마다 버전이 올라가고 CURRENT가 최신 버전을 가리키는지 테스트"""
+    assert faq_service.publish(RAGType.EMPLOYMENT, _store("x")) == 1
+    assert faq_service.publish(RAGType.EMPLOYMENT, _store("y")) == 2
+    assert faq_service.current_version(RAGType.EMPLOYMENT) == 2
+    assert faq_service.load_published(RAGType.EMPLOYMENT)["snapshot"] == "y"
+    assert faq_service.load_published(RAGType.EMPLOYMENT, version=1)["snapshot"] == "x"
+
+
+def test_lookup_serves_answer_in_requested_language(faq_dir, word_encoder):
+    """유사한 질문에는 요청 언어의 사전 답변을, 다른 질문에는 None을 반환하는지 테스트"""
+    collection = FakeCollection(["doc"])
+    faq_service.publish(RAGType.EMPLOYMENT, _store(faq_service.snapshot_fingerprint(collection)))
+    service = FAQService(SimpleNamespace(collections={RAGType.EMPLOYMENT: collection}, embeddings=word_encoder))
+
+    match = service.lookup(RAGType.EMPLOYMENT, "Can I renew an E-9 visa?", "ko-KR")
+    assert match["answer"] == "체류기간 만료 전에 연장을 신청하세요."
+    assert match["version"] == 1
+    assert service.lookup(RAGType.EMPLOYMENT, "Where is the nearest pharmacy?", "ko") is None
+    assert service.lookup(RAGType.EMPLOYMENT, "How do I extend my E-9 visa?", "ja") is None
+
+
+def test_lookup_ignores_stale_snapshot_and_unapproved(faq_dir, word_encoder):
+    """벡터 스토어가 바뀌었거나 승인되지 않은 항목은 제공하지 않는지 테스트"""
+    collection = FakeCollection(["doc"])
+    rag_service = SimpleNamespace(collections={RAGType.EMPLOYMENT: collection}, embeddings=word_encoder)
+
+    faq_service.publish(RAGType.EMPLOYMENT, _store("stale-snapshot"))
+    assert FAQService(rag_service).lookup(RAGType.EMPLOYMENT, "How do I extend my E-9 visa?", "en") is None
+
+    faq_service.publish(RAGType.EMPLOYMENT, _store(faq_service.snapshot_fingerprint(collection), status=STATUS_PENDING))
+    assert FAQService(rag_service).lookup(RAGType.EMPLOYMENT, "How do I extend my E-9 visa?", "en") is None
+
+
+@pytest.mark.asyncio
+async def test_alookup_runs_off_event_loop(faq_dir, word_encoder, monkeypatch):
+    """비동기 조회는 색인 생성과 질의 임베딩을 도메인 검색 스레드에서 실행하는지 테스트"""
+    monkeypatch.setattr(RAGConfig, "FAQ_ENABLED", True)
+    collection = FakeCollection(["doc"])
+    faq_service.publish(RAGType.EMPLOYMENT, _store(faq_service.snapshot_fingerprint(collection)))
+    threads = []
+
+    class RecordingEncoder:
+        def encode(self, texts, **kwargs):
+            threads.append(threading.current_thread().name)
+            return word_encoder.encode(texts, **kwargs)
+
+    executor = RetrievalExecutor()
+    service = FAQService(SimpleNamespace(collections={RAGType.EMPLOYMENT: collection}, embeddings=RecordingEncoder(), executor=executor))
+    try:
+        match = await service.alookup(RAGType.EMPLOYMENT, "Can I renew an E-9 visa?", "en")
+        assert match["id"] == "employment-0001"
+        assert await service.alookup(RAGType.NONE, "Can I renew an E-9 visa?", "en") is None
+        assert threads and all(name.startswith("rag-employment") for name in threads)
+    finally:
+        executor.shutdown()
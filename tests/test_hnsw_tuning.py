@@ -0,0 +1,94 @@
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+import numpy as np
+import chromadb
+from chromadb.segment import VectorReader
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.config.rag_config import RAGConfig
+from app.services.common import vectorstore_snapshots
+from app.services.common.hnsw_tuning import apply_search_ef, built_params, configure_collection
+from app.services.common.quantized_index import normalize_rows
+from app.services.common.rag_service import RAGService
+from app.tools.hnsw_sweep import choose_params, rebuild_snapshot, sweep
+
+
+def test_params_file_is_applied_to_domain_config(tmp_path, employment_config):
+    """HNSW 파라미터 파일이 DOMAIN_CONFIGS에 반영되고, 없는 값은 ChromaDB 기본값을 쓰는지 테스트"""
+    assert RAGConfig.hnsw_params(RAGType.EMPLOYMENT) == RAGConfig.HNSW_DEFAULTS
+
+    params_file = tmp_path / "hnsw_params.json"
+    params_file.write_text(json.dumps({
+        "domains": {"employment": {"M": 8, "search_ef": 40, "recall": 0.995}, "unknown": {"M": 4}}
+    }))
+    RAGConfig.load_hnsw_params(str(params_file))
+    assert employment_config["hnsw"] == {"M": 8, "search_ef": 40}
+    assert RAGConfig.hnsw_params(RAGType.EMPLOYMENT) == {"M": 8, "construction_ef": 100, "search_ef": 40}
+
+
+def test_sweep_chooses_lightest_config_meeting_target():
+    """search_ef를 올리면 recall이 오르고, 목표를 만족하는 가장 가벼운 조합을 고르는지 테스트"""
+    rng = np.random.default_rng(0)
+    vectors = normalize_rows(rng.normal(size=(2000, 32)).astype(np.float32))
+    queries = normalize_rows(rng.normal(size=(50, 32)).astype(np.float32))
+
+    results = sweep(vectors, queries, [4, 16], [40], [10, 100], k=10, repeat=1)
+    assert len(results) == 4
+    by_key = {(result["M"], result["search_ef"]): result for result in results}
+    assert by_key[(4, 100)]["recall"] > by_key[(4, 10)]["recall"]
+    assert by_key[(16, 10)]["index_bytes"] > by_key[(4, 10)]["index_bytes"]
+
+    chosen = choose_params(results, target_recall=0.95)
+    assert chosen["recall"] >= 0.95
+    assert chosen == min(
+        (result for result in results if result["recall"] >= 0.95),
+        key=lambda result: (result["search_ef"], result["M"], result["construction_ef"])
+    )
+    # 목표를 만족하는 조합이 없으면 recall이 가장 높은 조합
+    assert choose_params(results, target_recall=1.1)["recall"] == max(result["recall"] for result in results)
+
+
+def test_load_applies_search_ef_and_rebuild_applies_build_params(employment_config, make_store):
+    """로드 시 search_ef가 적용되고, 재생성한 스냅샷은 설정한 M/construction_ef로 만들어지는지 테스트"""
+    make_store(employment_config["vectorstore_path"], ["minimum wage guide", "labor contract basics", "visa extension steps"])
+    employment_config["hnsw"] = {"M": 8, "construction_ef": 50, "search_ef": 64}
+
+    service = RAGService(domains=[RAGType.EMPLOYMENT])
+    snapshot = service.snapshots[RAGType.EMPLOYMENT]
+    segment = snapshot.client._server._manager.get_segment(snapshot.collection.id, VectorReader)
+    assert segment._params.search_ef == 64
+    assert service.retrieve(RAGType.EMPLOYMENT, "visa extension")[0]["document"] == "visa extension steps"
+
+    version = rebuild_snapshot(RAGType.EMPLOYMENT, snapshot.path, snapshot.collection)
+    vectorstore_snapshots.activate_snapshot(RAGType.EMPLOYMENT, version)
+    report = vectorstore_snapshots.reload_domain(service, RAGType.EMPLOYMENT)
+    assert report["documents"] == 3
+    rebuilt = service.snapshots[RAGType.EMPLOYMENT]
+    assert built_params(rebuilt.collection) == {"M": 8, "construction_ef": 50, "search_ef": 64}
+    assert rebuilt.collection.metadata["hnsw:space"] == "cosine"
+    assert service.retrieve(RAGType.EMPLOYMENT, "minimum wage")[0]["document"] == "minimum wage guide"
+
+
+def test_search_ef_override_matches_pinned_chromadb(employment_config):
+    """search_ef 변경은 ChromaDB 내부 구조에 의존하므로, 고정한 버전이 바뀌면 이 테스트로 다시 확인하도록 함"""
+    requirements = (Path(__file__).resolve().parent.parent / "requirements.txt").read_text()
+    pinned = re.search(r"^chromadb==(\S+)$", requirements, re.MULTILINE).group(1)
+    assert chromadb.__version__ == pinned, "chromadb 버전이 바뀌었습니다. apply_search_ef가 쓰는 내부 구조를 확인하고 이 테스트를 갱신하세요."
+
+    # 내부 구조가 없는 클라이언트에서는 경고만 남기고 컬렉션 생성 시 값을 유지
+    employment_config["hnsw"] = {"search_ef": 64}
+    collection = SimpleNamespace(id="x", metadata={"hnsw:space": "cosine"})
+    assert apply_search_ef(SimpleNamespace(), collection, 64) is False
+    assert configure_collection(RAGType.EMPLOYMENT, SimpleNamespace(), collection) == RAGConfig.HNSW_DEFAULTS
+
+
+def test_module_imports_without_chatbot_package():
+    """hnsw_tuning을 단독으로 불러와도 순환 임포트가 생기지 않는지 테스트"""
+    result = subprocess.run(
+        [sys.executable, "-c", "import app.services.common.hnsw_tuning"],
+        cwd=Path(__file__).resolve().parent.parent, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
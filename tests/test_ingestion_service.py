@@ -0,0 +1,43 @@
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.services.common.ingestion_service import IngestionService
+
+
+def _documents_by_path(collection):
+    data = collection.get(include=["documents", "metadatas"])
+    return sorted((metadata["source_path"], document) for document, metadata in zip(data["documents"], data["metadatas"]))
+
+
+def test_prune_keeps_chunks_shared_with_other_sources(tmp_path, employment_config, word_encoder):
+    """여러 원본(이름이 같은 다른 디렉토리 파일 포함)에 같은 청크가 있을 때 한 원본을 정리해도 다른 원본의 청크가 남는지 테스트"""
+    docs = tmp_path / "docs"
+    (docs / "other").mkdir(parents=True)
+    (docs / "a.txt").write_text("Shared visa paragraph.\n\nAlpha only paragraph.\n", encoding="utf-8")
+    (docs / "other" / "a.txt").write_text("Shared visa paragraph.\n\nBeta only paragraph.\n", encoding="utf-8")
+    service = IngestionService(encoder=word_encoder, vectorstore_path=str(tmp_path / "store"))
+    collection = service.open_collection(RAGType.EMPLOYMENT)
+
+    report = service.ingest_paths(RAGType.EMPLOYMENT, [str(docs)], collection=collection, root=str(tmp_path))
+    assert report["embedded"] == 4 and report["duplicates"] == 0
+
+    # a.txt의 공유 문단 위치가 바뀌고 고유 문단은 사라짐
+    (docs / "a.txt").write_text("Alpha new paragraph.\n\nShared visa paragraph.\n", encoding="utf-8")
+    report = service.ingest_paths(RAGType.EMPLOYMENT, [str(docs / "a.txt")], collection=collection, prune=True, root=str(tmp_path))
+    assert (report["embedded"], report["unchanged"], report["deleted"]) == (1, 1, 1)
+    assert _documents_by_path(collection) == [
+        ("docs/a.txt", "Alpha new paragraph."),
+        ("docs/a.txt", "Shared visa paragraph."),
+        ("docs/other/a.txt", "Beta only paragraph."),
+        ("docs/other/a.txt", "Shared visa paragraph."),
+    ]
+
+
+def test_reingest_refreshes_metadata_of_unchanged_chunks(tmp_path, employment_config, word_encoder):
+    """내용이 같은 청크는 다시 임베딩하지 않되, 페이지 등 메타데이터는 새 위치로 갱신하는지 테스트"""
+    service = IngestionService(encoder=word_encoder, vectorstore_path=str(tmp_path / "store"))
+    collection = service.open_collection(RAGType.EMPLOYMENT)
+    metadata = {"source": "manual.pdf", "source_path": "docs/manual.pdf", "type": "pdf"}
+
+    service.ingest_segments(RAGType.EMPLOYMENT, [("docs/manual.pdf", {**metadata, "page": 3}, "Visa fee guide.")], collection=collection)
+    report = service.ingest_segments(RAGType.EMPLOYMENT, [("docs/manual.pdf", {**metadata, "page": 5}, "Visa fee guide.")], collection=collection)
+    assert (report["embedded"], report["unchanged"]) == (0, 1)
+    assert collection.get(include=["metadatas"])["metadatas"][0]["page"] == 5
@@ -0,0 +1,51 @@
+import pytest
+from app.config.web_search_config import WebSearchConfig
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.services.common.keyword_matcher import KeywordMatcher, get_category_matcher
+from app.services.common.web_search_service import WebSearchService
+
+
+def test_matcher_finds_overlapping_keywords_in_one_pass():
+    """겹치는 키워드(접미사 관계 포함)를 모두 찾고, 처음 나타난 위치 순서로 분류를 돌려주는지 테스트"""
+    matcher = KeywordMatcher({"he": ["he", "hers"], "she": ["she"], "his": ["his"], "empty": []})
+    assert matcher.match("ushers") == ["he", "she"]
+    assert matcher.match("this is HIS") == ["his"]
+    assert matcher.match("") == []
+
+    matcher = KeywordMatcher({"수수료": ["수수료", "FEE"], "기간": ["연장", "만료"]})
+    assert matcher.match("체류기간 연장 신청 Fee 안내") == ["기간", "수수료"]
+    assert matcher.match("수수료와 수수료") == ["수수료"]
+
+
+def test_every_domain_has_a_category_dictionary():
+    """모든 RAGType에 분류 사전이 있고, 없는 도메인은 일반 사전을 쓰는지 테스트"""
+    for rag_type in RAGType:
+        keywords = WebSearchConfig.category_keywords(rag_type.value)
+        assert keywords and all(words for words in keywords.values())
+        assert get_category_matcher(rag_type.value).categories == list(keywords)
+    assert WebSearchConfig.category_keywords("unknown") == WebSearchConfig.CATEGORY_KEYWORDS["none"]
+
+
+@pytest.mark.asyncio
+async def test_get_context_tags_each_result_once(monkeypatch):
+    """각 검색 결과를 한 번만 넣고 도메인 분류 태그를 붙이며, 분류된 결과를 먼저 배치하는지 테스트"""
+    monkeypatch.setenv("WEB_SEARCH_PROVIDER", "google")
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("GOOGLE_CSE_ID", "test-cx")
+    service = WebSearchService()
+    results = [
+        {"title": "서울 날씨", "url": "https://example.com/weather", "snippet": "오늘은 맑음"},
+        {"title": "체류기간 연장 안내", "url": "https://example.com/stay", "snippet": "수수료 6만원, 만료 전 신청"},
+    ]
+
+    async def fake_search(query, max_results=5):
+        return results
+
+    monkeypatch.setattr(service, "search_web", fake_search)
+    context = await service.get_context("체류기간 연장", rag_type=RAGType.VISA_LAW)
+    assert context.count("https://example.com/stay") == 1
+    assert context.index("검색 결과 2 [비자/체류, 기간/만료, 수수료, 신청 절차]:") < context.index("검색 결과 1:")
+
+    # 일반 사전에는 체류/비자 분류가 없음
+    context = await service.get_context("체류기간 연장")
+    assert "검색 결과 2 [날짜/일정]:" in context
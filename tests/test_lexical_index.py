@@ -0,0 +1,81 @@
+import os
+from app.services.common.lexical_index import LexicalIndex, reciprocal_rank_fusion, tokenize
+
+
+def _build_index() -> LexicalIndex:
+    index = LexicalIndex()
+    index.add_many([
+        ("visa-e9", "비전문취업(E-9) 비자는 고용허가제로 입국한 외국인근로자에게 발급됩니다."),
+        ("visa-d10", "구직(D-10) 비자 소지자는 체류기간 연장을 신청할 수 있습니다."),
+        ("tax", "외국인 근로자도 연말정산을 통해 소득세를 환급받을 수 있습니다."),
+    ])
+    return index
+
+
+def test_tokenize_normalizes_visa_codes():
+    """비자 코드가 하이픈 유무와 관계없이 같은 토큰이 되는지 테스트"""
+    assert "e9" in tokenize("E-9 visa extension")
+    assert "e9" in tokenize("비전문취업(E9)")
+    assert "f27" in tokenize("F-2-7 점수제")
+
+
+def test_tokenize_korean_bigrams():
+    """조사가 붙은 한글 어절도 바이그램으로 매칭되는지 테스트"""
+    assert "연말" in tokenize("연말정산을")
+    assert "정산" in tokenize("연말정산은")
+
+
+def test_search_ranks_exact_code_first():
+    """정확한 비자 코드가 포함된 문서가 먼저 검색되는지 테스트"""
+    index = _build_index()
+    assert index.search("How do I extend an E-9 visa?", k=1)[0][0] == "visa-e9"
+    assert index.search("D-10 job seeker visa", k=1)[0][0] == "visa-d10"
+
+
+def test_remove_and_roundtrip(tmp_path):
+    """문서 삭제와 저장/로드 후에도 검색 결과가 유지되는지 테스트"""
+    index = _build_index()
+    index.remove("visa-e9")
+    assert "visa-e9" not in index
+    assert all(doc_id != "visa-e9" for doc_id, _ in index.search("E-9"))
+
+    path = str(tmp_path / "bm25_index.json")
+    index.save(path)
+    loaded = LexicalIndex.load(path)
+    assert len(loaded) == 2
+    assert loaded.search("연말정산") == index.search("연말정산")
+
+
+def test_reciprocal_rank_fusion():
+    """두 검색기에서 모두 상위인 문서가 결합 후 1위가 되는지 테스트"""
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["b", "d"]], k=60)
+    assert fused[0][0] == "b"
+    assert {doc_id for doc_id, _ in fused} == {"a", "b", "c", "d"}
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def count(self):
+        return len(self.documents)
+
+    def get(self, include=None, limit=None, offset=0):
+        items = list(self.documents.items())[offset:offset + limit if limit else None]
+        return {"ids": [doc_id for doc_id, _ in items], "documents": [document for _, document in items]}
+
+
+def test_load_or_build_detects_same_count_rebuild_and_unwritable_path(tmp_path):
+    """문서 수가 같아도 ID가 달라졌으면 다시 만들고, 저장할 수 없는 경로에서도 메모리 색인을 돌려주는지 테스트"""
+    path = str(tmp_path / "bm25_index.json")
+    LexicalIndex.load_or_build(path, FakeCollection({"old-1": "E-9 비자 연장", "old-2": "연말정산 환급"}))
+
+    rebuilt = LexicalIndex.load_or_build(path, FakeCollection({"new-1": "E-9 비자 연장", "new-2": "연말정산 환급"}))
+    assert set(rebuilt.doc_lengths) == {"new-1", "new-2"}
+    assert set(LexicalIndex.load(path).doc_lengths) == {"new-1", "new-2"}
+
+    # 쓸 수 없는 경로(읽기 전용 마운트 대신 없는 디렉토리)
+    unwritable = str(tmp_path / "missing" / "bm25_index.json")
+    index = LexicalIndex.load_or_build(unwritable, FakeCollection({"doc": "D-10 구직 비자"}))
+    assert index.search("D-10")[0][0] == "doc"
+    assert not os.path.exists(os.path.dirname(unwritable))
@@ -0,0 +1,64 @@
+import asyncio
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+from prometheus_client import CollectorRegistry, Histogram, generate_latest
+from app.core.metrics import metrics_payload, observe_stage
+from app.tools.load_test import (
+    compare_results, histogram_delta, histogram_quantile, load_query_mix, measure, parse_histogram
+)
+
+
+def test_stage_quantiles_from_histogram_delta_and_compare():
+    """두 시점의 히스토그램 차이로 분위수를 구하고, 기준 대비 지연/처리량 회귀를 잡는지 테스트"""
+    registry = CollectorRegistry()
+    histogram = Histogram("stage_seconds", "test", ["stage"], buckets=(0.1, 0.5, 1.0), registry=registry)
+    for _ in range(10):
+        histogram.labels(stage="generate").observe(2.0)  # 측정 전 관측 (차이에서 빠져야 함)
+    before = generate_latest(registry).decode()
+    for value in [0.05] * 50 + [0.3] * 40 + [0.8] * 10:
+        histogram.labels(stage="generate").observe(value)
+    after = generate_latest(registry).decode()
+
+    buckets = histogram_delta(parse_histogram(after, "stage_seconds", ("stage",)), parse_histogram(before, "stage_seconds", ("stage",)))[("generate",)]
+    assert buckets[float("inf")] == 100
+    assert histogram_quantile(buckets, 0.5) == pytest.approx(0.1)
+    assert histogram_quantile(buckets, 0.95) == pytest.approx(0.75)
+    assert histogram_quantile({float("inf"): 0.0}, 0.5) is None
+
+    baseline = {"config": {"mode": "closed"}, "throughput_rps": 10.0, "error_rate": 0.0, "latency_ms": {"p50": 100.0, "p95": 400.0, "p99": 500.0}}
+    current = {"config": {"mode": "closed"}, "throughput_rps": 9.5, "error_rate": 0.0, "latency_ms": {"p50": 102.0, "p95": 600.0, "p99": 503.0}}
+    assert compare_results(current, baseline, tolerance=0.2, min_delta_ms=5.0) == ["latency_ms.p95: 400.0 → 600.0"]
+    current.update(throughput_rps=7.0, error_rate=0.05)
+    assert len(compare_results(current, baseline, tolerance=0.2, min_delta_ms=5.0)) == 3
+
+
+@pytest.mark.asyncio
+async def test_measure_reports_throughput_stages_and_loop_lag():
+    """ASGI 앱에 폐쇄형 부하를 걸어 처리량, RAG 유형별 지연, 단계별 지연, 루프 지연이 보고되는지 테스트"""
+    app = FastAPI()
+
+    @app.post("/api/v1/chatbot")
+    async def chatbot(request: dict):
+        with observe_stage("loadtest_generate", provider="test-llm", track_queue=False):
+            await asyncio.sleep(0.01)
+        return {"response": "ok", "metadata": {"rag_type": "visa_law"}}
+
+    @app.get("/metrics")
+    async def metrics():
+        payload, content_type = metrics_payload()
+        return Response(content=payload, media_type=content_type)
+
+    queries = load_query_mix()
+    assert {item["rag_type"] for item in queries} >= {"visa_law", "employment", "daily_life", "none"}
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://loadtest") as client:
+        result = await measure(client, queries, concurrency=4, duration=10.0, max_requests=40, warmup=2, in_process=True)
+
+    assert result["requests"] == 40 and result["ok"] == 40 and result["error_rate"] == 0.0
+    assert result["throughput_rps"] > 0 and result["latency_ms"]["p50"] >= 10.0
+    assert sum(item["requests"] for item in result["by_rag_type"].values()) == 40
+    # 예열 요청은 단계 지표에서 제외
+    assert result["stages"]["loadtest_generate"]["count"] == 40
+    assert 0 < result["stages"]["loadtest_generate"]["p50"] <= 100
+    assert result["loop_lag_ms"] is not None and result["memory_mb"]["end"] > 0
@@ -0,0 +1,80 @@
+import json
+import logging
+import pytest
+from loguru import logger
+from app.config.logging_config import _json_format, _level_filter, _limit_library_levels
+from app.config.tracing_config import TracingConfig
+from app.core.tracing import log_payload, start_trace
+
+
+@pytest.fixture
+def captured():
+    lines = []
+    handler_ids = []
+
+    def add(**options):
+        handler_ids.append(logger.add(lines.append, **options))
+
+    yield lines, add
+    for handler_id in handler_ids:
+        logger.remove(handler_id)
+
+
+def emit(module: str, level: str, message: str, **extra):
+    logger.patch(lambda record: record.update(name=module)).bind(**extra).log(level, message)
+
+
+def test_module_levels_and_json_format(captured):
+    """모듈별 레벨(가장 긴 접두사 우선)로 거르고, JSON 한 줄에 request_id와 extra가 담기는지 테스트"""
+    lines, add = captured
+    add(
+        format=_json_format,
+        level="DEBUG",
+        filter=_level_filter("INFO", {"app.services": "WARNING", "app.services.common.rag_service": "DEBUG"})
+    )
+
+    emit("app.services.common.web_search_service", "INFO", "걸러짐")
+    emit("app.services.common.rag_service", "DEBUG", "검색 세부")
+    emit("app.api.v1.chatbot", "DEBUG", "걸러짐")
+    emit("app.api.v1.chatbot", "INFO", "요청 완료", request_id="req-7", uid="u1")
+
+    entries = [json.loads(line) for line in lines]
+    assert [entry["message"] for entry in entries] == ["검색 세부", "요청 완료"]
+    assert entries[0]["level"] == "DEBUG" and entries[0]["request_id"] == "-"
+    assert entries[1]["request_id"] == "req-7" and entries[1]["extra"] == {"uid": "u1"}
+    assert entries[1]["module"] == "app.api.v1.chatbot"
+
+
+def test_payloads_logged_only_when_asked(captured, monkeypatch):
+    """본문은 기본적으로 로그에 남지 않고 요청에만 담기며, 느린 요청 기록에서는 잘려서 나오는지 테스트"""
+    lines, add = captured
+    add(format="{message}", level="INFO")
+    monkeypatch.setattr(TracingConfig, "SLOW_REQUEST_SECONDS", 3600.0)
+    monkeypatch.setattr(TracingConfig, "PAYLOAD_MAX_CHARS", 10)
+    monkeypatch.setattr(TracingConfig, "PAYLOAD_SAMPLE_RATE", 0.0)
+
+    with start_trace("test") as trace:
+        log_payload("generate.prompt", "긴 프롬프트 " * 100)
+    assert not any("[본문]" in line for line in lines)
+    payload = trace.to_dict()["payloads"][0]
+    assert payload["label"] == "generate.prompt"
+    assert payload["chars"] == len("긴 프롬프트 " * 100) and len(payload["text"]) == 10
+
+    monkeypatch.setattr(TracingConfig, "LOG_PAYLOADS", True)
+    with start_trace("test"):
+        log_payload("generate.response", "답변")
+    assert any("[본문] generate.response (2자): 답변" in line for line in lines)
+
+
+def test_httpx_request_urls_not_logged_by_default():
+    """httpx 요청 URL 로그(INFO)는 기본으로 남기지 않고, LOG_MODULE_LEVELS로 지정하면 그 값을 따르는지 테스트"""
+    httpx_logger = logging.getLogger("httpx")
+    previous = httpx_logger.level
+    try:
+        httpx_logger.setLevel(logging.NOTSET)
+        _limit_library_levels({"httpx": "DEBUG"})
+        assert httpx_logger.level == logging.NOTSET
+        _limit_library_levels({"app.services": "DEBUG"})
+        assert not httpx_logger.isEnabledFor(logging.INFO) and httpx_logger.isEnabledFor(logging.WARNING)
+    finally:
+        httpx_logger.setLevel(previous)
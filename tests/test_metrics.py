@@ -0,0 +1,113 @@
+import asyncio
+import pytest
+from prometheus_client import REGISTRY
+from app.core.llm_client import BaseLLMClient
+from app.core.metrics import metrics_payload, observe_stage, record_fallback, set_request_labels
+from app.core.tracing import start_trace
+from app.services.common.web_search_cache import WebSearchCache
+
+
+def stage_count(stage: str, outcome: str, **labels: str) -> float:
+    sample_labels = {"stage": stage, "provider": "unknown", "model": "unknown", "query_type": "unknown", "rag_type": "unknown", "outcome": outcome}
+    sample_labels.update(labels)
+    return REGISTRY.get_sample_value("eum_stage_duration_seconds_count", sample_labels) or 0.0
+
+
+def sample(name: str, **labels: str) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+@pytest.mark.asyncio
+async def test_observe_stage_outcomes_and_request_labels():
+    """단계 결과(success/timeout/fallback)와 분류 후 요청 라벨이 히스토그램에 기록되는지 테스트"""
+    labels = {"provider": "test-llm", "model": "test-model"}
+    before = {outcome: stage_count("metrics_test", outcome, **labels) for outcome in ("success", "timeout", "fallback")}
+    timeouts_before = sample("eum_timeouts_total", stage="metrics_test", provider="test-llm")
+
+    async def run():
+        with observe_stage("metrics_test", **labels):
+            await asyncio.sleep(0)
+        with pytest.raises(TimeoutError):
+            with observe_stage("metrics_test", **labels):
+                raise TimeoutError("응답 시간 초과")
+        # 단계 안에서 처리한 타임아웃
+        with observe_stage("metrics_test", **labels):
+            record_fallback("metrics_test", "timeout")
+        with observe_stage("metrics_test", **labels):
+            record_fallback("metrics_test", "error")
+        set_request_labels(query_type="general", rag_type="visa_law")
+        with observe_stage("metrics_test", **labels):
+            pass
+        assert sample("eum_provider_queue_depth", provider="test-llm") == 0
+
+    # 요청마다 별도 컨텍스트에서 실행 (요청 라벨이 테스트 밖으로 새지 않도록)
+    await asyncio.create_task(run())
+
+    assert stage_count("metrics_test", "success", **labels) == before["success"] + 1
+    assert stage_count("metrics_test", "timeout", **labels) == before["timeout"] + 2
+    assert stage_count("metrics_test", "fallback", **labels) == before["fallback"] + 1
+    assert stage_count("metrics_test", "success", query_type="general", rag_type="visa_law", **labels) >= 1
+    assert sample("eum_timeouts_total", stage="metrics_test", provider="test-llm") == timeouts_before + 2
+    assert sample("eum_fallbacks_total", stage="metrics_test", reason="error", provider="test-llm") >= 1
+
+
+def test_cache_events_and_payload():
+    """캐시 조회 결과가 캐시 이름별 카운터로 기록되고 /metrics 본문에 나타나는지 테스트"""
+    clock = [1000.0]
+    cache = WebSearchCache(ttl=10, stale_ttl=20, fallback_max_age=100, clock=lambda: clock[0], name="metrics_test")
+    key = ("google", "체류기간 연장", 5)
+
+    cache.lookup(key)
+    cache.put(key, [{"title": "연장", "url": "https://a.example", "snippet": ""}])
+    cache.lookup(key)
+    clock[0] += 15
+    cache.lookup(key)
+    clock[0] += 50
+    cache.fallback(key)
+
+    for event in ("misses", "fresh_hits", "stale_hits", "fallback_hits"):
+        assert sample("eum_cache_events_total", cache="metrics_test", event=event) == 1
+    assert cache.stats()["fallback_hits"] == 1
+
+    payload, content_type = metrics_payload()
+    assert content_type.startswith("text/plain")
+    for name in ("eum_stage_duration_seconds", "eum_cache_events_total", "eum_fallbacks_total", "eum_timeouts_total", "eum_inflight_requests", "eum_provider_queue_depth"):
+        assert name.encode() in payload
+
+
+class UsageTestClient(BaseLLMClient):
+    provider = "usage-test"
+    model = "usage-model"
+
+    async def generate(self, prompt: str, **kwargs) -> str:
+        self._record_usage(prompt, prompt_tokens=300, completion_tokens=50, seconds=0.5)
+        return "ok"
+
+    async def check_connection(self) -> bool:
+        return True
+
+
+@pytest.mark.asyncio
+async def test_llm_usage_per_stage_in_request_and_metrics():
+    """LLM 토큰 사용량이 단계별로 요청 사용량(tokens/sec 포함)과 지표에 함께 기록되는지 테스트"""
+    client = UsageTestClient()
+    prompt_before = sample("eum_llm_tokens_total", stage="usage_generate", provider="usage-test", model="usage-model", kind="prompt")
+
+    with start_trace("test") as trace:
+        with observe_stage("usage_classify", provider=client.provider, track_queue=False):
+            await client.generate("분류")
+        with observe_stage("usage_generate", provider=client.provider, track_queue=False):
+            await client.generate("답변 1")
+            await client.generate("답변 2")
+
+    usage = trace.usage_summary()
+    assert usage["stages"]["usage_generate"] == {
+        "calls": 2, "prompt_tokens": 600, "completion_tokens": 100, "seconds": 1.0, "tokens_per_second": 100.0
+    }
+    assert usage["stages"]["usage_classify"]["calls"] == 1
+    assert usage["total"]["calls"] == 3 and usage["total"]["completion_tokens"] == 150
+    assert trace.to_dict()["usage"] == usage
+
+    assert sample("eum_llm_tokens_total", stage="usage_generate", provider="usage-test", model="usage-model", kind="prompt") == prompt_before + 600
+    assert sample("eum_llm_tokens_per_second_count", stage="usage_generate", provider="usage-test", model="usage-model") >= 2
+    assert sample("eum_llm_prompt_tokens_count", stage="usage_classify", provider="usage-test") >= 1
@@ -0,0 +1,60 @@
+import asyncio
+import threading
+import time
+import pytest
+from prometheus_client import REGISTRY
+from app.core.profiling import LoopMonitor, collapsed_stacks, sample_profile
+
+
+def blocking_call(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_records_stack_of_blocking_call():
+    """루프를 막는 동기 호출을 감지해 그 함수가 가장 안쪽에 있는 스택과 멈춘 시간을 남기는지 테스트"""
+    blocks_before = REGISTRY.get_sample_value("eum_event_loop_blocks_total") or 0.0
+    lag_before = REGISTRY.get_sample_value("eum_event_loop_lag_seconds_count") or 0.0
+    monitor = LoopMonitor(threshold=0.1, interval=0.02)
+    monitor.start()
+    try:
+        await asyncio.sleep(0.1)
+        blocking_call(0.4)
+        await asyncio.sleep(0.1)
+    finally:
+        await monitor.stop()
+
+    blocks = monitor.recent_blocks()
+    assert len(blocks) == 1
+    assert blocks[0]["stack"][-1].startswith("tests/test_profiling.py:blocking_call:")
+    assert 250 <= blocks[0]["blocked_ms"] <= 600
+    assert REGISTRY.get_sample_value("eum_event_loop_blocks_total") == blocks_before + 1
+    assert REGISTRY.get_sample_value("eum_event_loop_lag_seconds_count") > lag_before
+
+
+def test_sampling_profile_collapsed_stacks():
+    """스레드별 접힌 스택을 세고, 프로파일이 동시에 두 개 실행되지 않는지 테스트"""
+    stop = threading.Event()
+
+    def busy_worker():
+        while not stop.is_set():
+            sum(range(1000))
+
+    worker = threading.Thread(target=busy_worker, name="busy")
+    worker.start()
+    results = {}
+    profiler = threading.Thread(target=lambda: results.update(samples=sample_profile(0.3, 0.005)))
+    try:
+        profiler.start()
+        time.sleep(0.05)
+        with pytest.raises(RuntimeError):
+            sample_profile(0.1)
+        profiler.join()
+    finally:
+        stop.set()
+        worker.join()
+
+    lines = collapsed_stacks(results["samples"]).splitlines()
+    busy = [line for line in lines if line.startswith("busy;")]
+    assert busy and all(":busy_worker:" in line for line in busy)
+    assert sum(int(line.rsplit(" ", 1)[1]) for line in busy) >= 10
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+from app.services.common.quantized_index import QuantizedIndex, load_for_collection, save_full_vectors
+
+
+def _vectors(count=200, dimension=64, seed=0):
+    return np.random.default_rng(seed).normal(size=(count, dimension)).astype(np.float32)
+
+
+def _exact_top(vectors, query, k):
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    return list(np.argsort(-(vectors @ (query / np.linalg.norm(query))))[:k])
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_quantized_search_matches_exact_top1(dtype):
+    """양자화 후에도 완전 탐색과 같은 1위 문서를 찾는지 테스트"""
+    vectors = _vectors()
+    ids = [f"doc_{i}" for i in range(len(vectors))]
+    index = QuantizedIndex.build(ids, vectors, dtype=dtype)
+
+    assert index.codes.dtype == np.dtype(dtype)
+    for row in (3, 50, 199):
+        query = vectors[row] + 0.01
+        assert index.search(query, k=1)[0][0] == ids[_exact_top(vectors, query, 1)[0]]
+
+
+def test_int8_uses_quarter_memory():
+    """int8 색인이 float32 대비 약 1/4 메모리를 쓰는지 테스트"""
+    vectors = _vectors(count=1000)
+    index = QuantizedIndex.build([str(i) for i in range(1000)], vectors, dtype="int8")
+    assert index.nbytes < vectors.nbytes / 3
+
+
+def test_pca_projection_and_rescore_roundtrip(tmp_path):
+    """PCA 투영이 색인과 함께 저장되고, 재정렬 시 원본 정밀도 순위를 따르는지 테스트"""
+    vectors = _vectors()
+    ids = [f"doc_{i}" for i in range(len(vectors))]
+    index = QuantizedIndex.build(ids, vectors, dtype="int8", dimensions=16)
+    assert index.dimension == 16
+
+    index.save(str(tmp_path / "quantized_index.npz"))
+    save_full_vectors(str(tmp_path / "full_vectors.npy"), vectors)
+    loaded = QuantizedIndex.load(str(tmp_path / "quantized_index.npz"), str(tmp_path / "full_vectors.npy"))
+
+    assert loaded.components.shape == (16, 64)
+    assert isinstance(loaded.full_vectors, np.memmap)
+    query = vectors[10]
+    rescored = [doc_id for doc_id, _ in loaded.search(query, k=5, rescore=True, rescore_factor=8)]
+    exact = [ids[i] for i in _exact_top(vectors, query, 5)]
+    assert rescored[0] == exact[0] == "doc_10"
+
+
+def test_load_for_collection_rejects_stale_index(tmp_path):
+    """컬렉션 문서 수와 다른 색인은 사용하지 않는지 테스트"""
+    class FakeCollection:
+        def __init__(self, count):
+            self._count = count
+
+        def count(self):
+            return self._count
+
+    vectors = _vectors(count=10)
+    QuantizedIndex.build([str(i) for i in range(10)], vectors).save(str(tmp_path / "quantized_index.npz"))
+
+    assert load_for_collection(str(tmp_path), FakeCollection(10)) is not None
+    assert load_for_collection(str(tmp_path), FakeCollection(11)) is None
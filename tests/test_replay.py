@@ -0,0 +1,113 @@
+import asyncio
+import pytest
+from app.config.replay_config import ReplayConfig
+from app.core import replay
+from app.core.llm_client import BaseLLMClient, ReplayLLMClient
+from app.core.replay import ReplayStore, SyntheticProfile, get_replay_store, get_synthetic_profile
+from app.services.common.web_search_cache import get_quota_tracker, get_web_search_cache
+from app.services.common.web_search_service import WebSearchService
+
+
+class FakeUpstream(BaseLLMClient):
+    """호출 횟수를 세는 가짜 실제 제공자 (테스트용)"""
+
+    model = "fake-model"
+    timeout = 5
+
+    def __init__(self):
+        self.calls = 0
+
+    async def check_connection(self) -> bool:
+        return True
+
+    async def generate(self, prompt: str, **kwargs) -> str:
+        self.calls += 1
+        return f"answer to {prompt}"
+
+
+@pytest.fixture
+def replay_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(ReplayConfig, "DIR", str(tmp_path))
+    monkeypatch.setattr(ReplayConfig, "LATENCY_SCALE", 0.0)
+    for cached in (get_replay_store, get_synthetic_profile, get_web_search_cache, get_quota_tracker):
+        cached.cache_clear()
+    yield tmp_path
+    for cached in (get_replay_store, get_synthetic_profile, get_web_search_cache, get_quota_tracker):
+        cached.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_llm_record_then_replay_offline(replay_dir, monkeypatch):
+    """record 모드로 기록한 응답을 replay 모드가 실제 제공자 없이 돌려주는지 테스트"""
+    upstream = FakeUpstream()
+    recorder = ReplayLLMClient(is_lightweight=False, mode="record", upstream=upstream)
+    assert await recorder.generate("비자 연장 방법") == "answer to 비자 연장 방법"
+    assert upstream.calls == 1 and recorder.model == "fake-model"
+
+    # 새 프로세스처럼 파일에서 다시 읽음
+    get_replay_store.cache_clear()
+    player = ReplayLLMClient(is_lightweight=False, mode="replay")
+    assert await player.check_connection()
+    assert await player.generate("비자 연장 방법") == "answer to 비자 연장 방법"
+    assert len(ReplayStore(str(replay_dir / "llm.jsonl"))) == 1
+
+    # 등급이 다르거나 기록에 없는 프롬프트
+    with pytest.raises(ValueError):
+        await ReplayLLMClient(is_lightweight=True, mode="replay").generate("비자 연장 방법")
+    monkeypatch.setattr(ReplayConfig, "ON_MISS", "synthetic")
+    assert await ReplayLLMClient(is_lightweight=True, mode="replay").generate("처음 보는 질문")
+
+
+@pytest.mark.asyncio
+async def test_synthetic_llm_latency_tokens_and_errors(replay_dir, monkeypatch):
+    """synthetic 모드가 토큰 속도에 맞는 지연을 흉내 내고, 설정한 비율로 오류를 주입하는지 테스트"""
+    delays = []
+
+    async def fake_sleep(seconds):
+        delays.append(seconds)
+
+    monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+    monkeypatch.setattr(ReplayConfig, "LLM_TTFT_MS", 200.0)
+    monkeypatch.setattr(ReplayConfig, "LLM_LATENCY_SIGMA", 0.0)
+    monkeypatch.setattr(ReplayConfig, "LLM_TOKENS_PER_SECOND", 100.0)
+    client = ReplayLLMClient(mode="synthetic")
+    client.profile = SyntheticProfile(seed=7)
+
+    text = await client.generate("안녕하세요")
+    tokens = len(text.split())
+    assert ReplayConfig.LLM_OUTPUT_TOKENS // 2 <= tokens <= ReplayConfig.LLM_OUTPUT_TOKENS * 3 // 2
+    assert delays[-1] == pytest.approx(0.2 + tokens / 100)
+
+    monkeypatch.setattr(ReplayConfig, "ERROR_RATE", 1.0)
+    with pytest.raises(ConnectionError):
+        await client.generate("안녕하세요")
+    monkeypatch.setattr(ReplayConfig, "TIMEOUT_RATE", 1.0)
+    with pytest.raises(TimeoutError):
+        await client.generate("안녕하세요")
+    assert delays[-1] == client.timeout
+
+
+@pytest.mark.asyncio
+async def test_web_search_replay_provider(replay_dir, monkeypatch):
+    """웹 검색 대역 제공자가 기록을 재생하고, synthetic 모드에서는 가짜 결과와 429를 만들어 내는지 테스트"""
+    monkeypatch.setenv("WEB_SEARCH_PROVIDER", "replay")
+    monkeypatch.setattr(ReplayConfig, "MODE", "replay")
+    recorded = [{"title": "체류기간 연장", "url": "https://hikorea.go.kr", "snippet": "연장 안내"}]
+    get_replay_store("web_search").put(
+        replay.request_key("web_search", "", {"query": "체류기간 연장", "max_results": 5}),
+        {"query": "체류기간 연장", "results": recorded, "latency_ms": 10.0}
+    )
+
+    service = WebSearchService()
+    assert await service.search_web("체류기간 연장?") == recorded
+    assert await service.search_web("기록 없는 질의") == []
+
+    monkeypatch.setattr(ReplayConfig, "MODE", "synthetic")
+    monkeypatch.setattr(ReplayConfig, "SEARCH_LATENCY_MS", 0.0)
+    service = WebSearchService()
+    results = await service.search_web("건강보험", max_results=3)
+    assert [result["title"] for result in results] == [f"건강보험 - 결과 {rank}" for rank in (1, 2, 3)]
+
+    monkeypatch.setattr(ReplayConfig, "ERROR_RATE", 1.0)
+    assert await service.search_web("국민연금") == []
+    assert get_quota_tracker().stats()["replay"]["errors"] == {"429": 1}
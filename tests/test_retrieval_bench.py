@@ -0,0 +1,36 @@
+import unicodedata
+from app.tools.retrieval_bench import compare_results, load_query_sets, score_ranking
+
+
+def test_score_ranking_recall_and_mrr():
+    """recall@k와 reciprocal rank가 원본 파일 단위로 계산되는지 테스트"""
+    scores = score_ranking(["a.pdf", "b.pdf", "c.pdf"], ["b.pdf", "d.pdf"], ks=[1, 3])
+    assert scores["recall@1"] == 0.0
+    assert scores["recall@3"] == 0.5
+    assert scores["rr"] == 0.5
+
+
+def test_score_ranking_normalizes_unicode():
+    """NFD로 저장된 한글 파일명도 NFC 라벨과 일치하는지 테스트"""
+    stored = unicodedata.normalize("NFD", "근로기준법.pdf")
+    assert score_ranking([stored], ["근로기준법.pdf"], ks=[1])["recall@1"] == 1.0
+
+
+def test_query_sets_are_well_formed():
+    """배포된 질의 세트가 필수 필드를 갖추고 ID가 중복되지 않는지 테스트"""
+    query_sets = load_query_sets("v1")
+    assert query_sets
+    ids = [item["id"] for query_set in query_sets.values() for item in query_set["queries"]]
+    assert len(ids) == len(set(ids))
+    for query_set in query_sets.values():
+        for item in query_set["queries"]:
+            assert item["query"] and item["relevant_sources"]
+
+
+def test_compare_results_flags_quality_regression():
+    """recall/MRR 하락은 회귀로, 지연 시간 변화는 표시만 하는지 테스트"""
+    baseline = {"summary": {"recall@3": 0.8, "mrr": 0.5, "latency_ms_p50": 5.0}, "domains": {}}
+    current = {"summary": {"recall@3": 0.7, "mrr": 0.5, "latency_ms_p50": 9.0}, "domains": {}}
+    regressions = compare_results(current, baseline, tolerance=0.02)
+    assert len(regressions) == 1
+    assert "recall@3" in regressions[0]
@@ -0,0 +1,71 @@
+import asyncio
+import threading
+import time
+import pytest
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.services.common.rag_service import RAGService
+from app.services.common.retrieval_executor import RetrievalExecutor
+
+
+@pytest.mark.asyncio
+async def test_executor_bounds_readers_and_keeps_loop_responsive():
+    """도메인별 동시 검색 수가 readers로 제한되고, 검색 중에도 이벤트 루프가 도는지 테스트"""
+    executor = RetrievalExecutor(readers=2)
+    running = []
+    peak = []
+    lock = threading.Lock()
+
+    def slow_search(i):
+        with lock:
+            running.append(i)
+            peak.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(i)
+        return i
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticker_task = asyncio.create_task(ticker())
+    results = await asyncio.gather(*(executor.run(RAGType.EMPLOYMENT, slow_search, i) for i in range(6)))
+    ticker_task.cancel()
+
+    assert results == list(range(6))
+    assert max(peak) == 2
+    assert ticks >= 5
+
+    stats = executor.stats()["employment"]
+    assert stats["completed"] == 6 and stats["queued"] == 0 and stats["running"] == 0
+    # 앞선 검색을 기다린 대기 시간과 검색 시간을 따로 집계
+    assert stats["queue_ms_p95"] >= 40
+    assert 40 <= stats["search_ms_p50"] < 200
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_search_uses_cached_collection_state(employment_config, make_store, monkeypatch):
+    """검색마다 count()를 호출하지 않고 로드 시점의 컬렉션 상태를 쓰는지 테스트"""
+    make_store(employment_config["vectorstore_path"], ["minimum wage guide", "labor contract basics"])
+
+    service = RAGService(domains=[RAGType.EMPLOYMENT])
+    snapshot = service.snapshots[RAGType.EMPLOYMENT]
+    assert snapshot.document_count == 2
+
+    def count_not_allowed(self):
+        raise AssertionError("검색 중 count() 호출")
+
+    monkeypatch.setattr(type(snapshot.collection), "count", count_not_allowed)
+    results = await service.search(RAGType.EMPLOYMENT, "minimum wage")
+    assert results[0] == "minimum wage guide"
+    assert service.retrieval_stats()["employment"]["completed"] == 1
+
+    # 비어 있는 컬렉션은 SQLite를 조회하지 않고 바로 빈 결과
+    snapshot.document_count = 0
+    assert await service.search(RAGType.EMPLOYMENT, "minimum wage") == []
+    service.executor.shutdown()
@@ -0,0 +1,105 @@
+import threading
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.services.common.retrieval_executor import RetrievalExecutor
+from app.services.common.retrieval_sidecar import RemoteRAGService, RetrievalSidecarServer, SidecarError
+
+
+class FakeCollection:
+    def __init__(self, documents):
+        self.documents = documents
+
+    def count(self):
+        return len(self.documents)
+
+    def get(self, ids=None, include=None, limit=None, offset=None):
+        doc_ids = ids or [f"doc_{i}" for i in range(len(self.documents))]
+        return {
+            "ids": doc_ids,
+            "documents": [self.documents[int(doc_id.split("_")[1])] for doc_id in doc_ids],
+            "metadatas": [{"source": "manual.pdf"} for _ in doc_ids],
+            "embeddings": None,
+        }
+
+
+class FakeEncoder:
+    def encode(self, texts, **kwargs):
+        return np.array([[len(text), 1.0, 0.5] for text in texts], dtype=np.float32)
+
+
+class FakeRAGService:
+    """사이드카 프로세스에서 도는 RAG 서비스 대역 (테스트용)"""
+
+    def __init__(self):
+        self.embeddings = FakeEncoder()
+        self.collections = {RAGType.EMPLOYMENT: FakeCollection(["근로계약서 작성", "최저임금 안내"])}
+        self.snapshots = {RAGType.EMPLOYMENT: SimpleNamespace(version=3)}
+        self.executor = RetrievalExecutor(readers=1)
+
+    def retrieval_stats(self):
+        return self.executor.stats()
+
+    def retrieve(self, rag_type, query, k=None):
+        if query == "boom":
+            raise RuntimeError("검색 실패")
+        return [{"id": "doc_1", "document": "최저임금 안내", "metadata": {"source": "manual.pdf"}}][:k]
+
+
+@pytest.fixture
+def sidecar(tmp_path):
+    server = RetrievalSidecarServer(str(tmp_path / "rag.sock"), FakeRAGService())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_remote_service_round_trip(sidecar):
+    """워커 쪽 서비스가 사이드카를 통해 임베딩/검색/컬렉션 조회를 하는지 테스트"""
+    service = RemoteRAGService(sidecar.server_address)
+    assert service.domains == {RAGType.EMPLOYMENT}
+    assert service.snapshots[RAGType.EMPLOYMENT].version == 3
+
+    embeddings = service.embeddings.encode(["abc", "de"])
+    assert embeddings.dtype == np.float32
+    np.testing.assert_array_equal(embeddings, [[3, 1, 0.5], [2, 1, 0.5]])
+    assert service.embeddings.encode("abcd").shape == (3,)
+
+    results = service.retrieve(RAGType.EMPLOYMENT, "최저임금", k=1)
+    assert results == [{"id": "doc_1", "document": "최저임금 안내", "metadata": {"source": "manual.pdf"}}]
+    assert service.retrieve(RAGType.TAX_FINANCE, "세금") == []
+    assert service.retrieval_stats()["employment"]["completed"] == 1
+
+    collection = service.collections[RAGType.EMPLOYMENT]
+    assert collection.count() == 2
+    data = collection.get(include=["documents", "embeddings"])
+    assert data == {"ids": ["doc_0", "doc_1"], "documents": ["근로계약서 작성", "최저임금 안내"]}
+
+
+@pytest.mark.asyncio
+async def test_remote_service_builds_context(sidecar):
+    """컨텍스트 조립은 워커에서 기존 구현을 그대로 쓰는지 테스트"""
+    service = RemoteRAGService(sidecar.server_address)
+    assert "최저임금 안내" in await service.get_context(RAGType.EMPLOYMENT, "최저임금")
+
+
+def test_remote_errors_and_reconnect(sidecar):
+    """사이드카 오류는 SidecarError로 전달되고, 끊긴 연결은 다시 연결하는지 테스트"""
+    service = RemoteRAGService(sidecar.server_address)
+    with pytest.raises(SidecarError, match="검색 실패"):
+        service.client.call("retrieve", rag_type="employment", query="boom", k=1)
+
+    # fork 후처럼 기존 연결을 버려도 다음 호출에서 새로 연결
+    service.client._local.sock.close()
+    assert service.collections[RAGType.EMPLOYMENT].count() == 2
+    with pytest.raises(RuntimeError, match="app.tools.ingest"):
+        service.add_documents(RAGType.EMPLOYMENT, ["새 문서"])
+
+
+def test_client_reports_missing_sidecar(tmp_path):
+    """사이드카가 떠 있지 않으면 연결 실패를 알려주는지 테스트"""
+    with pytest.raises(SidecarError, match="연결할 수 없습니다"):
+        RemoteRAGService(str(tmp_path / "missing.sock"))
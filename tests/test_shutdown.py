@@ -0,0 +1,87 @@
+import asyncio
+import os
+import signal
+import pytest
+from app.core.shutdown import drain_before_exit
+from app.core.startup import Readiness
+from app.services.common import web_search_cache
+from app.services.common.web_search_cache import QuotaTracker, WebSearchCache, cache_key
+
+
+@pytest.mark.asyncio
+async def test_signal_drains_inflight_requests_before_server_exit():
+    """SIGTERM을 받으면 진행 중인 요청이 끝날 때까지 기다린 뒤에야 원래 종료 처리기가 불리는지 테스트"""
+    readiness = Readiness()
+    readiness.set_ready(True)
+    readiness.inflight = 1
+    events = []
+
+    async def drain():
+        readiness.start_draining()
+        events.append(("draining", readiness.accepting))
+        events.append(("remaining", await readiness.wait_idle(5)))
+
+    task = None
+
+    def begin_drain():
+        nonlocal task
+        task = task or asyncio.get_running_loop().create_task(drain())
+        return task
+
+    previous = signal.signal(signal.SIGUSR2, lambda signum, frame: events.append(("exit", readiness.inflight)))
+    try:
+        drain_before_exit(begin_drain, signals=(signal.SIGUSR2,))
+        os.kill(os.getpid(), signal.SIGUSR2)
+        await asyncio.sleep(0.2)
+        assert events == [("draining", False)]  # 요청이 남아 있어 아직 종료하지 않음
+        readiness.inflight = 0
+        await asyncio.sleep(0.3)
+        assert events == [("draining", False), ("remaining", 0), ("exit", 0)]
+        assert await readiness.wait_idle(0) == 0
+    finally:
+        signal.signal(signal.SIGUSR2, previous)
+
+
+@pytest.mark.asyncio
+async def test_loop_signal_handlers_are_left_alone():
+    """이전 uvicorn처럼 이벤트 루프에 등록한 신호 처리기는 감싸지 않고 그대로 두는지 테스트"""
+    loop = asyncio.get_running_loop()
+    exits = []
+    loop.add_signal_handler(signal.SIGUSR2, exits.append, "exit")
+    try:
+        installed = signal.getsignal(signal.SIGUSR2)
+        drain_before_exit(lambda: pytest.fail("드레인을 시작하면 안 됨"), signals=(signal.SIGUSR2,))
+        assert signal.getsignal(signal.SIGUSR2) is installed
+        os.kill(os.getpid(), signal.SIGUSR2)
+        await asyncio.sleep(0.1)
+        assert exits == ["exit"]
+    finally:
+        loop.remove_signal_handler(signal.SIGUSR2)
+
+
+def test_web_search_state_survives_restart(tmp_path, monkeypatch):
+    """종료 시 저장한 검색 캐시(가져온 시각 유지)와 오늘 할당량 사용량이 다음 프로세스에 복원되는지 테스트"""
+    now = [1_700_000_000.0]
+    cache = WebSearchCache(ttl=100, stale_ttl=200, fallback_max_age=1000, clock=lambda: now[0])
+    tracker = QuotaTracker(daily_quotas={"google": 3}, clock=lambda: now[0])
+    cache.put(cache_key("google", "Visa extension?", 5), [{"title": "visa"}])
+    now[0] += 50
+    cache.put(cache_key("google", "health insurance", 5), [{"title": "nhis"}])
+    for _ in range(3):
+        tracker.record("google")
+    monkeypatch.setattr(web_search_cache, "get_web_search_cache", lambda: cache)
+    monkeypatch.setattr(web_search_cache, "get_quota_tracker", lambda: tracker)
+    path = str(tmp_path / "state" / "web_search.json")
+    assert web_search_cache.save_state(path) == {"entries": 2, "providers": 1}
+
+    now[0] += 60
+    restored_cache = WebSearchCache(ttl=100, stale_ttl=200, fallback_max_age=1000, clock=lambda: now[0])
+    restored_tracker = QuotaTracker(daily_quotas={"google": 3}, clock=lambda: now[0])
+    monkeypatch.setattr(web_search_cache, "get_web_search_cache", lambda: restored_cache)
+    monkeypatch.setattr(web_search_cache, "get_quota_tracker", lambda: restored_tracker)
+    assert web_search_cache.load_state(path) == {"entries": 2, "providers": 1}
+    # 처음 항목은 110초 전에 가져왔으므로 TTL(100초)이 지나 stale로 제공
+    assert restored_cache.lookup(cache_key("google", "visa extension", 5)) == ([{"title": "visa"}], web_search_cache.STALE)
+    assert restored_cache.lookup(cache_key("google", "health insurance", 5))[1] == web_search_cache.FRESH
+    assert not restored_tracker.allow("google")
+    assert web_search_cache.load_state(str(tmp_path / "missing.json")) is None
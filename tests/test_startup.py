@@ -0,0 +1,67 @@
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from app.core.startup import StartupReport
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# 서버 시작 시 불러오면 안 되는 무거운 모듈 (처음 쓰는 구성 요소가 불러옴)
+HEAVY_MODULES = ("torch", "sentence_transformers", "transformers", "sklearn", "chromadb", "googleapiclient")
+IMPORT_BUDGET_SECONDS = float(os.getenv("STARTUP_IMPORT_BUDGET_SECONDS", "3"))
+
+# app.config.settings가 요구하는 값 (실제 연결은 하지 않음)
+SETTINGS_ENV = {
+    "EUREKA_IP": "http://localhost:8761/eureka", "EUREKA_INSTANCE_HOST": "localhost",
+    "LIGHTWEIGHT_LLM_PROVIDER": "groq", "HIGH_PERFORMANCE_LLM_PROVIDER": "groq", "WEB_SEARCH_PROVIDER": "google",
+    "LIGHTWEIGHT_OLLAMA_URL": "http://localhost:11434", "LIGHTWEIGHT_OLLAMA_MODEL": "m", "LIGHTWEIGHT_OLLAMA_TIMEOUT": "20",
+    "HIGH_PERFORMANCE_OLLAMA_URL": "http://localhost:11434", "HIGH_PERFORMANCE_OLLAMA_MODEL": "m", "HIGH_PERFORMANCE_OLLAMA_TIMEOUT": "60",
+    "LIGHTWEIGHT_OPENAI_API_KEY": "k", "LIGHTWEIGHT_OPENAI_MODEL": "m", "LIGHTWEIGHT_OPENAI_TIMEOUT": "30",
+    "HIGH_PERFORMANCE_OPENAI_API_KEY": "k", "HIGH_PERFORMANCE_OPENAI_MODEL": "m", "HIGH_PERFORMANCE_OPENAI_TIMEOUT": "60",
+    "GROQ_API_KEY": "k", "GROQ_LIGHTWEIGHT_MODEL": "m", "GROQ_HIGHPERFORMANCE_MODEL": "m",
+    "DUCKDUCKGO_API_KEY": "k", "GOOGLE_API_KEY": "k", "GOOGLE_CSE_ID": "c",
+    "LOG_LEVEL": "INFO", "LOG_FILE": "app.log", "HOST": "0.0.0.0", "PORT": "8000", "DEBUG": "false",
+    "EMBEDDING_MODEL": "m", "SEARCH_K": "5", "SEARCH_THRESHOLD": "0.7",
+}
+
+IMPORT_SCRIPT = """
+import json, sys, time
+started = time.perf_counter()
+import app.main
+print(json.dumps({
+    "seconds": time.perf_counter() - started,
+    "heavy": [name for name in %r if name in sys.modules],
+    "phases": [phase["name"] for phase in app.main.startup_report.to_dict()["phases"]],
+}))
+""" % (HEAVY_MODULES,)
+
+
+def test_app_import_stays_within_budget(tmp_path):
+    """app.main을 불러올 때 무거운 모듈을 불러오지 않고, 정해진 시간 안에 끝나는지 테스트 (새 프로세스에서 측정)"""
+    env = {**os.environ, **SETTINGS_ENV, "PYTHONPATH": str(REPO_ROOT)}
+    # 로그 디렉토리가 작업 디렉토리에 생기므로 임시 디렉토리에서 실행
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SCRIPT], cwd=tmp_path, env=env, capture_output=True, text=True, timeout=120
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert report["heavy"] == [], f"서버 시작 시 무거운 모듈을 불러옵니다: {report['heavy']}"
+    assert report["seconds"] < IMPORT_BUDGET_SECONDS, f"app.main import {report['seconds']:.2f}초 (예산 {IMPORT_BUDGET_SECONDS}초)"
+    assert report["phases"][:4] == ["import.framework", "import.config", "import.core", "import.api"]
+
+
+def test_startup_report_phases():
+    """시작 단계별 시간과 준비 완료 시간이 기록되는지 테스트"""
+    report = StartupReport()
+    with report.phase("import.api"):
+        pass
+    with report.phase("startup.eureka"):
+        pass
+    assert report.to_dict()["ready_seconds"] is None
+
+    report.finish()
+    data = report.to_dict()
+    assert [phase["name"] for phase in data["phases"]] == ["import.api", "startup.eureka"]
+    assert data["ready_seconds"] > 0
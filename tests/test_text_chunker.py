@@ -0,0 +1,34 @@
+import pytest
+from app.services.common.text_chunker import chunk_text, content_hash
+
+
+def test_chunks_respect_size_and_overlap():
+    """청크 길이가 chunk_size를 넘지 않고, 인접 청크가 겹치는지 테스트"""
+    text = " ".join(f"문장 {i}번입니다." for i in range(200))
+    chunks = chunk_text(text, chunk_size=100, chunk_overlap=30)
+
+    assert len(chunks) > 1
+    assert all(len(chunk) <= 100 for chunk in chunks)
+    for prev, curr in zip(chunks, chunks[1:]):
+        assert curr.split(" ")[0] in prev
+
+
+def test_long_unit_is_split_with_overlap():
+    """문장 경계가 없는 긴 텍스트도 chunk_size 이내로 잘리는지 테스트"""
+    text = "".join(str(i % 10) for i in range(250))
+    chunks = chunk_text(text, chunk_size=100, chunk_overlap=30)
+
+    assert [len(chunk) for chunk in chunks] == [100, 100, 100, 40]
+    assert chunks[1].startswith(chunks[0][70:])
+
+
+def test_content_hash_ignores_whitespace():
+    """공백 차이만 있는 청크는 같은 해시를 갖는지 테스트"""
+    assert content_hash("E-9 비자\n연장 절차") == content_hash("  E-9  비자 연장 절차 ")
+    assert content_hash("E-9 비자") != content_hash("D-10 비자")
+
+
+def test_invalid_overlap_raises():
+    """chunk_overlap이 chunk_size 이상이면 오류가 발생하는지 테스트"""
+    with pytest.raises(ValueError):
+        chunk_text("text", chunk_size=10, chunk_overlap=10)
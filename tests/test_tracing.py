@@ -0,0 +1,80 @@
+import asyncio
+import json
+import pytest
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.config.tracing_config import TracingConfig
+from app.core.metrics import observe_stage, record_fallback
+from app.core.tracing import FlightRecorder, add_counts, current_request_id, get_flight_recorder, span, start_trace
+from app.services.common.retrieval_executor import RetrievalExecutor
+
+
+@pytest.fixture
+def trace_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(TracingConfig, "DIR", str(tmp_path))
+    get_flight_recorder.cache_clear()
+    yield tmp_path
+    get_flight_recorder.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_spans_follow_request_into_tasks_and_threads(trace_dir, monkeypatch):
+    """요청 ID와 구간이 하위 태스크와 검색 스레드 풀까지 이어지고, 단계 구간에 토큰 수가 모이는지 테스트"""
+    monkeypatch.setattr(TracingConfig, "SLOW_REQUEST_SECONDS", 3600.0)
+    executor = RetrievalExecutor(readers=1)
+    seen = {}
+
+    def search():
+        seen["thread_request_id"] = current_request_id()
+        with span("retrieve.vector_search", candidates=10):
+            return ["doc"]
+
+    async def call_llm():
+        with observe_stage("metrics_trace_test", provider="test-llm", model="m"):
+            add_counts(llm_calls=1, prompt_tokens=120, completion_tokens=30)
+            add_counts(llm_calls=1, prompt_tokens=80, completion_tokens=20)
+            record_fallback("metrics_trace_test", "error")
+
+    try:
+        with start_trace("test", request_id="req-1", uid="u1") as trace:
+            with observe_stage("retrieve_trace_test", provider="chroma", track_queue=False):
+                assert await executor.run(RAGType.VISA_LAW, search) == ["doc"]
+            await asyncio.gather(asyncio.create_task(call_llm()))
+    finally:
+        executor.shutdown()
+
+    assert seen["thread_request_id"] == "req-1"
+    assert current_request_id() is None
+    spans = {item["name"]: item for item in trace.to_dict()["spans"]}
+    assert spans["retrieve.vector_search"]["parent"] == spans["retrieve_trace_test"]["id"]
+    assert spans["retrieve.vector_search"]["attrs"] == {"candidates": 10}
+    llm_attrs = spans["metrics_trace_test"]["attrs"]
+    assert llm_attrs["llm_calls"] == 2 and llm_attrs["prompt_tokens"] == 200 and llm_attrs["completion_tokens"] == 50
+    assert llm_attrs["fallback"] == "error" and llm_attrs["outcome"] == "fallback"
+    assert all(item["duration_ms"] is not None for item in spans.values())
+    # 느리지 않은 요청은 기록하지 않음
+    assert not (trace_dir / "slow_requests.jsonl").exists()
+
+
+def test_slow_requests_recorded_with_bounded_ring_buffer(trace_dir, monkeypatch):
+    """기준 시간을 넘긴 요청(실패 포함)이 기록되고, 기록 파일이 두 개를 넘지 않는지 테스트"""
+    monkeypatch.setattr(TracingConfig, "SLOW_REQUEST_SECONDS", 0.0)
+
+    with pytest.raises(ValueError):
+        with start_trace("test", request_id="slow-1", uid="u1"):
+            with span("generate", provider="groq"):
+                raise ValueError("응답 생성 실패")
+
+    record = get_flight_recorder().recent(1)[0]
+    assert record["request_id"] == "slow-1" and record["status"] == "error"
+    assert record["attrs"] == {"uid": "u1"}
+    assert record["spans"][0]["status"] == "error"
+
+    recorder = FlightRecorder(str(trace_dir / "ring.jsonl"), max_bytes=400)
+    for i in range(30):
+        recorder.write({"request_id": f"r{i}", "padding": "x" * 50})
+    files = sorted(path.name for path in trace_dir.iterdir() if path.name.startswith("ring"))
+    assert files == ["ring.jsonl", "ring.jsonl.1"]
+    assert all(path.stat().st_size <= 400 for path in trace_dir.iterdir() if path.name.startswith("ring"))
+    recent = recorder.recent(3)
+    assert [item["request_id"] for item in recent] == ["r29", "r28", "r27"]
+    assert json.loads((trace_dir / "ring.jsonl").read_text().splitlines()[-1])["request_id"] == "r29"
@@ -0,0 +1,77 @@
+import os
+import pytest
+from app.services.chatbot.chatbot_classifier import RAGType
+from app.config.rag_config import RAGConfig
+from app.services.common import vectorstore_snapshots
+from app.services.common.rag_service import RAGService
+from app.services.common.vectorstore_snapshots import SnapshotWatcher
+
+
+@pytest.fixture
+def store_root(employment_config, make_store, tmp_path, monkeypatch):
+    monkeypatch.setattr(RAGConfig, "WARMUP_QUERIES_DIR", str(tmp_path / "no_queries"))
+    make_store(employment_config["vectorstore_path"], ["minimum wage guide", "labor contract basics"])
+    return tmp_path / "vectorstore5"
+
+
+@pytest.fixture
+def new_snapshot(make_store):
+    """문서 목록으로 새 스냅샷을 만들어 활성화하는 함수를 반환합니다."""
+
+    def _new_snapshot(documents):
+        version = vectorstore_snapshots.create_snapshot(RAGType.EMPLOYMENT, empty=True)
+        make_store(RAGConfig.snapshot_path(RAGType.EMPLOYMENT, version), documents)
+        vectorstore_snapshots.activate_snapshot(RAGType.EMPLOYMENT, version)
+        return version
+
+    return _new_snapshot
+
+
+def test_active_path_follows_pointer(store_root):
+    """CURRENT가 없으면 벡터 스토어 디렉토리를, 있으면 가리키는 스냅샷을 쓰는지 테스트"""
+    assert RAGConfig.active_vectorstore_path(RAGType.EMPLOYMENT) == str(store_root)
+
+    version = vectorstore_snapshots.create_snapshot(RAGType.EMPLOYMENT)
+    snapshot_dir = RAGConfig.snapshot_path(RAGType.EMPLOYMENT, version)
+    assert os.path.exists(os.path.join(snapshot_dir, "chroma.sqlite3"))
+    assert not os.path.exists(os.path.join(snapshot_dir, RAGConfig.SNAPSHOT_DIR))
+
+    vectorstore_snapshots.activate_snapshot(RAGType.EMPLOYMENT, version)
+    assert RAGConfig.active_vectorstore_path(RAGType.EMPLOYMENT) == snapshot_dir
+    assert vectorstore_snapshots.list_snapshots(RAGType.EMPLOYMENT) == [1]
+    with pytest.raises(ValueError):
+        vectorstore_snapshots.activate_snapshot(RAGType.EMPLOYMENT, 7)
+
+
+def test_reload_swaps_snapshot_while_in_flight_search_finishes(store_root, new_snapshot):
+    """교체 후 새 검색은 새 스냅샷을, 진행 중이던 검색은 이전 스냅샷을 쓰는지 테스트"""
+    service = RAGService(domains=[RAGType.EMPLOYMENT])
+    old = service.snapshots[RAGType.EMPLOYMENT]
+
+    with old.use():
+        new_snapshot(["visa extension steps", "visa renewal documents"])
+        report = vectorstore_snapshots.reload_domain(service, RAGType.EMPLOYMENT)
+        assert report["reloaded"] and report["version"] == 1 and report["warmup"]["queries"] == 1
+        # 교체 전에 시작한 검색은 이전 스냅샷으로 끝남
+        assert "minimum wage guide" in [result["document"] for result in service._retrieve(old, "minimum wage")]
+
+    assert service.snapshots[RAGType.EMPLOYMENT].version == 1
+    assert service.retrieve(RAGType.EMPLOYMENT, "visa extension")[0]["document"] == "visa extension steps"
+    assert not vectorstore_snapshots.reload_domain(service, RAGType.EMPLOYMENT)["reloaded"]
+
+
+def test_failed_reload_keeps_serving_previous_snapshot(store_root, new_snapshot):
+    """새 스냅샷이 비어 있으면 교체하지 않고, 감시 스레드도 같은 버전을 반복해서 시도하지 않는지 테스트"""
+    service = RAGService(domains=[RAGType.EMPLOYMENT])
+    old = service.snapshots[RAGType.EMPLOYMENT]
+    watcher = SnapshotWatcher(lambda: service)
+
+    new_snapshot([])
+    assert watcher.check() == []
+    assert service.snapshots[RAGType.EMPLOYMENT] is old
+    assert watcher._failed == {RAGType.EMPLOYMENT: 1}
+
+    new_snapshot(["visa extension steps"])
+    reports = watcher.check()
+    assert [report["version"] for report in reports] == [2]
+    assert watcher.check() == []
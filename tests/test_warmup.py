@@ -0,0 +1,84 @@
+import asyncio
+import httpx
+import pytest
+from fastapi import FastAPI
+from app.services.chatbot.chatbot_classifier import RAGType  # noqa: F401 (순환 임포트 회피)
+from app.config.warmup_config import WarmupConfig
+from app.core import http_client
+from app.core.llm_client import OllamaClient
+from app.core.startup import get_readiness
+from app.services.common.warmup_service import warm_up
+from app.api import health
+
+
+@pytest.fixture(autouse=True)
+def fresh_readiness():
+    get_readiness.cache_clear()
+    yield
+    get_readiness.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_warm_up_gates_readiness_on_critical_steps(monkeypatch):
+    """선택 단계 실패/시간 초과는 경고로 남기고, 필수 단계가 실패하면 준비 상태가 되지 않는지 테스트"""
+    monkeypatch.setattr(WarmupConfig, "ENABLED", True)
+    monkeypatch.setattr(WarmupConfig, "STEP_TIMEOUT_SECONDS", 0.05)
+
+    async def ok():
+        return {"domains": 2}
+
+    async def unreachable():
+        raise ConnectionError("lightweight LLM(groq) 연결 확인 실패")
+
+    async def slow():
+        await asyncio.sleep(1)
+
+    assert await warm_up([("retrieval", ok, True), ("llm", unreachable, False), ("pipeline", slow, False)])
+    checks = get_readiness().to_dict()["checks"]
+    assert checks["retrieval"]["status"] == "ok" and checks["retrieval"]["detail"] == {"domains": 2}
+    assert checks["llm"]["status"] == "failed" and "ConnectionError" in checks["llm"]["detail"]
+    assert checks["pipeline"]["status"] == "failed" and "TimeoutError" in checks["pipeline"]["detail"]
+
+    get_readiness.cache_clear()
+    assert not await warm_up([("embeddings", unreachable, True), ("retrieval", ok, True)])
+    readiness = get_readiness().to_dict()
+    assert readiness["ready"] is False and readiness["checks"]["retrieval"]["status"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_liveness_and_readiness_endpoints():
+    """예열 중에는 생존 200/준비 503, 준비 후에는 둘 다 200을 반환하는지 테스트"""
+    app = FastAPI()
+    app.include_router(health.router)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://health") as client:
+        assert (await client.get("/health/live")).status_code == 200
+        response = await client.get("/health/ready")
+        assert response.status_code == 503 and response.json()["ready"] is False
+
+        get_readiness().record("retrieval", "ok", 0.1, True, {"visa_law": 5})
+        get_readiness().set_ready(True)
+        response = await client.get("/health/ready")
+        assert response.status_code == 200 and response.json()["checks"]["retrieval"]["status"] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_llm_warmup_and_requests_share_pooled_client(event_loop):
+    """LLM 연결 확인(예열)과 이후 생성 요청이 루프별 공유 클라이언트를 거치고, 요청마다 모델별 타임아웃을 쓰는지 테스트"""
+    requests = []
+
+    def handler(request):
+        requests.append((request.url.path, request.extensions["timeout"]["read"]))
+        if request.url.path.endswith("/api/tags"):
+            return httpx.Response(200, json={"models": []})
+        return httpx.Response(200, json={"response": "ok", "prompt_eval_count": 3, "eval_count": 1})
+
+    shared = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    http_client._llm_clients[event_loop] = shared
+    lightweight, high_performance = OllamaClient(is_lightweight=True), OllamaClient(is_lightweight=False)
+    assert await lightweight.check_connection()
+    assert await high_performance.generate("hello") == "ok"
+    assert requests == [("/api/tags", lightweight.timeout), ("/api/generate", high_performance.timeout)]
+    assert http_client.get_llm_http_client() is shared
+
+    await http_client.close_http_client()
+    assert shared.is_closed and event_loop not in http_client._llm_clients
@@ -0,0 +1,167 @@
+import asyncio
+import httpcore
+import httpx
+import pytest
+from app.config.web_search_config import WebSearchConfig
+from app.core import http_client
+from app.services.common.web_page_fetcher import WebPageFetcher, get_page_fetcher, is_fetchable_url, select_passages
+from app.services.common.web_search_cache import get_quota_tracker, get_web_search_cache
+from app.services.common.web_search_service import WebSearchService
+
+
+@pytest.fixture
+def pages(event_loop):
+    """URL(없으면 호스트)별 가짜 응답을 돌려주는 공유 HTTP 클라이언트 (테스트용)"""
+    calls = []
+    responses = {}
+
+    async def handler(request):
+        calls.append(str(request.url))
+        response = responses.get(str(request.url)) or responses[request.url.host]
+        if isinstance(response, tuple):
+            delay, response = response
+            await asyncio.sleep(delay)
+        return response
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    http_client._clients[event_loop] = client
+    http_client._page_clients[event_loop] = client
+    get_page_fetcher.cache_clear()
+    get_web_search_cache.cache_clear()
+    get_quota_tracker.cache_clear()
+    yield calls, responses
+    get_page_fetcher.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_fetch_extracts_text_within_caps_and_caches(pages):
+    """본문만 추출하고(스크립트/내비게이션 제외, meta charset), 바이트/시간 상한을 지키며 캐시하는지 테스트"""
+    calls, responses = pages
+    html = (
+        "<html><head><meta charset='euc-kr'><title>체류 안내</title><script>var x = 1;</script></head>"
+        "<body><nav>메뉴 홈 로그인</nav><article><h1>체류기간 연장</h1><p>만료 4개월 전부터 신청할 수 있습니다.</p>"
+        "<p>수수료는 6만원입니다.</p></article><footer>저작권</footer></body></html>"
+    )
+    responses["https://example.com/stay"] = httpx.Response(
+        200, content=html.encode("euc-kr"), headers={"Content-Type": "text/html"}
+    )
+    responses["https://example.com/big"] = httpx.Response(
+        200, content=b"<p>" + b"a " * 5000 + b"</p><p>tail</p>", headers={"Content-Type": "text/html; charset=utf-8"}
+    )
+    responses["https://example.com/slow"] = (5.0, httpx.Response(200, text="<p>late</p>", headers={"Content-Type": "text/html"}))
+    responses["https://example.com/file.pdf"] = httpx.Response(200, content=b"%PDF", headers={"Content-Type": "application/pdf"})
+
+    fetcher = WebPageFetcher(timeout=0.2, max_bytes=1000)
+    page, big, slow, pdf, private = await fetcher.fetch_many([
+        "https://example.com/stay", "https://example.com/big", "https://example.com/slow",
+        "https://example.com/file.pdf", "http://127.0.0.1:8000/admin"
+    ])
+    assert page["title"] == "체류 안내"
+    assert page["text"] == "체류기간 연장\n만료 4개월 전부터 신청할 수 있습니다.\n수수료는 6만원입니다."
+    assert "tail" not in big["text"] and len(big["text"]) <= 1000
+    assert slow is None and pdf is None and private is None
+    assert len(calls) == 4
+
+    # 본문과 본문 없는 응답은 캐시, 시간 초과는 다시 시도
+    await fetcher.fetch_many(["https://example.com/stay", "https://example.com/file.pdf"])
+    assert len(calls) == 4
+    assert fetcher.cache.stats()["fresh_hits"] == 2
+    assert not is_fetchable_url("file:///etc/passwd") and not is_fetchable_url("http://10.0.0.5/")
+
+
+@pytest.mark.asyncio
+async def test_fetch_rechecks_every_redirect_hop(pages):
+    """리디렉션을 단계마다 다시 확인해 내부망 주소(메타데이터 IP)로는 따라가지 않고, 무한 리디렉션은 끊는지 테스트"""
+    calls, responses = pages
+    responses["https://example.com/moved"] = httpx.Response(301, headers={"Location": "/guide"})
+    responses["https://example.com/guide"] = httpx.Response(200, text="<p>guide</p>", headers={"Content-Type": "text/html"})
+    responses["https://example.com/metadata"] = httpx.Response(302, headers={"Location": "http://169.254.169.254/latest/meta-data/"})
+    responses["https://example.com/loop"] = httpx.Response(302, headers={"Location": "https://example.com/loop"})
+
+    fetcher = WebPageFetcher()
+    moved, metadata, loop = await fetcher.fetch_many([
+        "https://example.com/moved", "https://example.com/metadata", "https://example.com/loop"
+    ])
+    assert moved == {"url": "https://example.com/moved", "title": "", "text": "guide"}
+    assert metadata is None and loop is None
+    assert "169.254.169.254" not in " ".join(calls)
+    assert calls.count("https://example.com/loop") == WebSearchConfig.PAGE_MAX_REDIRECTS + 1
+
+
+@pytest.mark.asyncio
+async def test_page_client_dials_only_vetted_public_address(event_loop):
+    """호스트를 연결할 때 한 번만 풀어 확인한 공인 IP로 연결하고, 내부망 주소가 섞여 풀리는 호스트에는 연결하지 않는지 테스트"""
+    answers = {"example.com": ["93.184.216.34"], "internal.example.com": ["10.0.0.7"], "mixed.example.com": ["93.184.216.34", "127.0.0.1"]}
+    lookups, dialed = [], []
+
+    async def resolver(host):
+        lookups.append(host)
+        return answers[host]
+
+    class RecordingBackend(httpcore.AsyncMockBackend):
+        async def connect_tcp(self, host, port, *args, **kwargs):
+            dialed.append((host, port))
+            return await super().connect_tcp(host, port, *args, **kwargs)
+
+    body = b"<p>public page</p>"
+    backend = RecordingBackend([b"HTTP/1.1 200 OK\r\nContent-Type: text/html\r\nContent-Length: %d\r\n\r\n%s" % (len(body), body)])
+    transport = http_client.PublicAddressTransport(httpx.Limits(), backend=http_client.PublicAddressBackend(resolver, backend))
+    http_client._page_clients[event_loop] = httpx.AsyncClient(transport=transport, follow_redirects=False)
+    get_page_fetcher.cache_clear()
+
+    public, internal, mixed = await WebPageFetcher().fetch_many(
+        ["http://example.com/", "http://internal.example.com/", "http://mixed.example.com/"], concurrency=1
+    )
+    assert public["text"] == "public page" and internal is None and mixed is None
+    # 확인한 주소로 연결 (다시 풀지 않음)
+    assert lookups == ["example.com", "internal.example.com", "mixed.example.com"]
+    assert dialed == [("93.184.216.34", 80)]
+    await http_client.close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_select_passages_prefers_query_relevant_text(word_encoder):
+    """질의와 가까운 구간을 페이지당 상한 안에서 고르고, 본문 순서대로 돌려주는지 테스트"""
+    filler = " ".join(f"word{i}" for i in range(50))
+    text = "\n".join([
+        f"{filler} weather forecast sunny.",
+        "visa extension requires passport and fee payment at immigration office.",
+        f"{filler} football match results.",
+        "visa extension can be applied online before expiry.",
+    ])
+    selected = await select_passages(
+        "visa extension online", [{"text": text}, None, {"text": filler}], word_encoder,
+        top_k=3, per_page=2, min_score=0.3
+    )
+    assert len(selected) == 3
+    assert selected[0] == [
+        "visa extension requires passport and fee payment at immigration office.",
+        "visa extension can be applied online before expiry.",
+    ]
+    assert selected[1] == [] and selected[2] == []
+
+
+@pytest.mark.asyncio
+async def test_get_context_adds_page_passages(pages, word_encoder, monkeypatch):
+    """페이지 발췌를 켜면 웹 검색 컨텍스트에 상위 결과의 본문 발췌가 들어가는지 테스트"""
+    calls, responses = pages
+    monkeypatch.setenv("WEB_SEARCH_PROVIDER", "google")
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("GOOGLE_CSE_ID", "test-cx")
+    monkeypatch.setattr(WebSearchConfig, "PAGE_FETCH_ENABLED", True)
+    monkeypatch.setattr(WebSearchConfig, "PASSAGE_MIN_SCORE", 0.3)
+    monkeypatch.setattr(WebSearchService, "_page_encoder", lambda self: word_encoder)
+    service = WebSearchService()
+
+    responses["www.googleapis.com"] = httpx.Response(200, json={"items": [
+        {"title": "Visa", "link": "https://example.com/visa", "snippet": "visa guide"}
+    ]})
+    notes = " ".join(f"note{i}" for i in range(50))
+    responses["https://example.com/visa"] = httpx.Response(200, headers={"Content-Type": "text/html"}, text=(
+        f"<p>Office hours are nine to six. {notes}</p><p>Visa extension can be applied online before expiry.</p>"
+    ))
+
+    context = await service.get_context("visa extension online")
+    assert "본문 발췌:\nVisa extension can be applied online before expiry." in context
+    assert "Office hours" not in context
+    assert len(calls) == 2
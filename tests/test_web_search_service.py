@@ -0,0 +1,259 @@
+import asyncio
+import httpx
+import pytest
+from prometheus_client import REGISTRY
+from app.config.web_search_config import WebSearchConfig
+from app.core import http_client
+from app.core.http_client import close_http_client, get_http_client
+from app.services.common.web_search_cache import (
+    QuotaTracker, WebSearchCache, get_quota_tracker, get_web_search_cache, normalize_query
+)
+from app.services.common.web_search_fanout import get_provider_stats, merge_results
+from app.services.common.web_search_service import WebSearchService
+
+
+@pytest.fixture
+def transport(event_loop):
+    """공유 HTTP 클라이언트를 가짜 응답을 돌려주는 전송 계층으로 바꿈 (테스트용)"""
+    calls = []
+    responses = {}
+
+    async def handler(request):
+        calls.append(request)
+        response = responses[request.url.host]
+        if isinstance(response, tuple):
+            # (지연 시간, 응답): 느린 제공자 흉내
+            delay, response = response
+            await asyncio.sleep(delay)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+    http_client._clients[event_loop] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    # 프로세스 전역 캐시/할당량이 테스트 사이에 공유되지 않도록 초기화
+    get_web_search_cache.cache_clear()
+    get_quota_tracker.cache_clear()
+    get_provider_stats.cache_clear()
+    yield calls, responses
+    get_web_search_cache.cache_clear()
+    get_quota_tracker.cache_clear()
+    get_provider_stats.cache_clear()
+
+
+@pytest.mark.asyncio
+async def test_google_search_uses_shared_client(monkeypatch, transport):
+    """Google 검색이 REST 엔드포인트를 공유 클라이언트로 호출하고 결과/오류를 처리하는지 테스트"""
+    calls, responses = transport
+    monkeypatch.setenv("WEB_SEARCH_PROVIDER", "google")
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("GOOGLE_CSE_ID", "test-cx")
+    service = WebSearchService()
+
+    responses["www.googleapis.com"] = httpx.Response(200, json={
+        "items": [{"title": "비자 연장", "link": "https://example.com/visa", "snippet": "체류기간 연장 안내"}]
+    })
+    results = await service.search_web("비자 연장", max_results=20)
+    assert results == [{"title": "비자 연장", "url": "https://example.com/visa", "snippet": "체류기간 연장 안내"}]
+    params = calls[0].url.params
+    assert (params["cx"], params["q"], params["num"]) == ("test-cx", "비자 연장", "10")
+    # API 키는 URL(요청 로그)이 아닌 헤더로 전달
+    assert calls[0].headers["X-goog-api-key"] == "test-key" and "test-key" not in str(calls[0].url)
+
+    responses["www.googleapis.com"] = httpx.Response(429, json={"error": {"code": 429, "message": "Quota exceeded"}})
+    assert await service.search_web("비자 연장") == []
+    responses["www.googleapis.com"] = httpx.ConnectTimeout("timed out")
+    assert await service.search_web("비자 연장") == []
+
+    # 요청마다 새 클라이언트를 만들지 않음
+    assert get_http_client() is get_http_client()
+    await close_http_client()
+    assert get_http_client() is not None
+
+
+@pytest.mark.asyncio
+async def test_duckduckgo_search_parses_javascript_content_type(monkeypatch, transport):
+    """DuckDuckGo 응답이 application/x-javascript여도 JSON으로 읽는지 테스트"""
+    calls, responses = transport
+    monkeypatch.setenv("WEB_SEARCH_PROVIDER", "duckduckgo")
+    monkeypatch.setenv("DUCKDUCKGO_API_KEY", "test-key")
+    service = WebSearchService()
+
+    responses["api.duckduckgo.com"] = httpx.Response(
+        200,
+        content='{"RelatedTopics": [{"Text": "Seoul subway", "FirstURL": "https://duckduckgo.com/Seoul"}, {"Name": "group"}]}',
+        headers={"Content-Type": "application/x-javascript"}
+    )
+    results = await service.search_web("seoul subway")
+    assert results == [{"title": "Seoul subway", "url": "https://duckduckgo.com/Seoul", "snippet": "Seoul subway"}]
+    assert calls[0].url.params["format"] == "json"
+
+
+@pytest.fixture
+def google_service(monkeypatch):
+    monkeypatch.setenv("WEB_SEARCH_PROVIDER", "google")
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("GOOGLE_CSE_ID", "test-cx")
+    now = [1_700_000_000.0]
+    service = WebSearchService()
+    service.cache = WebSearchCache(ttl=10, stale_ttl=100, fallback_max_age=1000, clock=lambda: now[0])
+    service.quota = QuotaTracker(daily_quotas={"google": 3}, cooldown=60, clock=lambda: now[0])
+    return service, now
+
+
+def _google_response(title):
+    return httpx.Response(200, json={"items": [{"title": title, "link": "https://example.com", "snippet": title}]})
+
+
+@pytest.mark.asyncio
+async def test_cache_serves_fresh_then_stale_with_background_refresh(transport, google_service):
+    """TTL 안에서는 API를 다시 호출하지 않고, TTL이 지나면 이전 결과를 주면서 백그라운드에서 갱신하는지 테스트"""
+    calls, responses = transport
+    service, now = google_service
+    assert normalize_query("  비자   연장 방법?? ") == normalize_query("비자 연장 방법") == "비자 연장 방법"
+
+    responses["www.googleapis.com"] = _google_response("v1")
+    assert (await service.search_web("비자 연장 방법"))[0]["title"] == "v1"
+    assert (await service.search_web("  비자 연장   방법? "))[0]["title"] == "v1"
+    assert len(calls) == 1
+
+    now[0] += 30
+    responses["www.googleapis.com"] = _google_response("v2")
+    assert (await service.search_web("비자 연장 방법"))[0]["title"] == "v1"
+    await asyncio.gather(*service.cache._inflight.values())
+    assert len(calls) == 2
+    assert (await service.search_web("비자 연장 방법"))[0]["title"] == "v2"
+
+    stats = service.cache.stats()
+    assert (stats["fresh_hits"], stats["stale_hits"], stats["misses"], stats["refreshes"]) == (2, 1, 1, 1)
+
+    # stale_ttl도 지나면 기다렸다가 새로 조회
+    now[0] += 200
+    responses["www.googleapis.com"] = _google_response("v3")
+    assert (await service.search_web("비자 연장 방법"))[0]["title"] == "v3"
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_call_api_once(transport, google_service):
+    """같은 질의가 동시에 들어와도 API는 한 번만 호출하는지 테스트"""
+    calls, responses = transport
+    service, _ = google_service
+    responses["www.googleapis.com"] = _google_response("v1")
+
+    results = await asyncio.gather(*(service.search_web("외국인 등록증 발급") for _ in range(5)))
+    assert all(result[0]["title"] == "v1" for result in results)
+    assert len(calls) == 1
+    assert service.cache.stats()["refreshing"] == 0
+
+
+@pytest.mark.asyncio
+async def test_quota_errors_fall_back_to_cached_results(transport, google_service):
+    """429를 받거나 일일 할당량을 다 쓰면 API 대신 오래된 캐시 결과로 응답하는지 테스트"""
+    calls, responses = transport
+    service, now = google_service
+    quota_labels = {"stage": "web_search", "reason": "quota", "provider": "google"}
+    fallbacks_before = REGISTRY.get_sample_value("eum_fallbacks_total", quota_labels) or 0.0
+    responses["www.googleapis.com"] = _google_response("v1")
+    await service.search_web("건강보험 가입")
+
+    now[0] += 500
+    responses["www.googleapis.com"] = httpx.Response(429, json={"error": {"code": 429}})
+    assert (await service.search_web("건강보험 가입"))[0]["title"] == "v1"
+    # 쿨다운 중에는 API를 호출하지 않음
+    assert (await service.search_web("건강보험 가입"))[0]["title"] == "v1"
+    assert len(calls) == 2
+    usage = service.quota.stats()["google"]
+    assert (usage["used"], usage["remaining"], usage["errors"]) == (2, 1, {"429": 1})
+    assert usage["blocked_until"] is not None
+
+    now[0] += 61
+    responses["www.googleapis.com"] = _google_response("v2")
+    assert (await service.search_web("건강보험 가입"))[0]["title"] == "v2"
+    # 일일 할당량(3회)을 다 쓴 뒤 캐시에 없는 질의는 빈 결과
+    assert await service.search_web("산재 보험") == []
+    assert len(calls) == 3
+    assert service.quota.stats()["google"]["remaining"] == 0
+    # 429, 쿨다운, 할당량 소진 모두 제공자별로 집계
+    assert REGISTRY.get_sample_value("eum_fallbacks_total", quota_labels) == fallbacks_before + 3
+
+
+@pytest.fixture
+def fanout_service(monkeypatch):
+    monkeypatch.setenv("WEB_SEARCH_PROVIDERS", "google, duckduckgo")
+    monkeypatch.setenv("GOOGLE_API_KEY", "test-key")
+    monkeypatch.setenv("GOOGLE_CSE_ID", "test-cx")
+    monkeypatch.setenv("DUCKDUCKGO_API_KEY", "test-key")
+    return WebSearchService()
+
+
+def _duckduckgo_response(*urls):
+    topics = [{"Text": f"ddg {url}", "FirstURL": url} for url in urls]
+    return httpx.Response(200, json={"RelatedTopics": topics})
+
+
+def test_merge_results_dedups_urls_and_fuses_ranks():
+    """같은 문서의 URL 변형을 하나로 합치고, 여러 제공자가 준 결과를 위로 올리는지 테스트"""
+    merged = merge_results({
+        "google": [
+            {"title": "A", "url": "https://a.com/x", "snippet": "a"},
+            {"title": "B", "url": "https://www.b.com/y/?utm_source=news#top", "snippet": "b"},
+        ],
+        "duckduckgo": [
+            {"title": "B2", "url": "http://b.com/y", "snippet": "b longer snippet"},
+            {"title": "C", "url": "https://c.com", "snippet": "c"},
+        ],
+    }, max_results=5)
+    assert [result["title"] for result in merged] == ["B", "A", "C"]
+    assert merged[0]["providers"] == ["google", "duckduckgo"]
+    assert merged[0]["snippet"] == "b longer snippet"
+    assert len(merge_results({"google": [{"url": f"https://a.com/{i}"} for i in range(5)]}, max_results=2)) == 2
+
+
+@pytest.mark.asyncio
+async def test_fanout_merges_providers_and_records_stats(transport, fanout_service):
+    """두 제공자를 동시에 검색해 합치고, 제공자별 지연 시간과 기여도를 기록하는지 테스트"""
+    calls, responses = transport
+    responses["www.googleapis.com"] = httpx.Response(200, json={"items": [
+        {"title": "visa", "link": "https://hikorea.go.kr/visa", "snippet": "visa"},
+        {"title": "stay", "link": "https://example.com/stay", "snippet": "stay"},
+    ]})
+    responses["api.duckduckgo.com"] = _duckduckgo_response("https://www.hikorea.go.kr/visa/", "https://ddg.com/only")
+
+    results = await fanout_service.search_web("비자 연장", max_results=5)
+    assert [result["url"] for result in results] == [
+        "https://hikorea.go.kr/visa", "https://example.com/stay", "https://ddg.com/only"
+    ]
+    assert len(calls) == 2
+
+    stats = get_provider_stats().stats()
+    assert stats["google"]["calls"] == stats["duckduckgo"]["calls"] == 1
+    assert (stats["google"]["contributed"], stats["google"]["top_results"]) == (2, 1)
+    assert (stats["duckduckgo"]["contributed"], stats["duckduckgo"]["cancelled"]) == (2, 0)
+
+
+@pytest.mark.asyncio
+async def test_fanout_stops_waiting_for_stragglers(transport, fanout_service, monkeypatch):
+    """충분한 결과가 모이면 느린 제공자를 기다리지 않고, 마감 시간이 지나면 도착한 결과만 쓰는지 테스트"""
+    calls, responses = transport
+    responses["www.googleapis.com"] = httpx.Response(200, json={"items": [
+        {"title": "visa", "link": "https://hikorea.go.kr/visa", "snippet": "visa"}
+    ]})
+    responses["api.duckduckgo.com"] = (5.0, _duckduckgo_response("https://ddg.com/slow"))
+
+    # 결과 1개면 충분: 구글이 답하는 즉시 반환
+    results = await asyncio.wait_for(fanout_service.search_web("비자", max_results=1), timeout=1)
+    assert [result["url"] for result in results] == ["https://hikorea.go.kr/visa"]
+    assert get_provider_stats().stats()["duckduckgo"]["cancelled"] == 1
+
+    # 결과가 모자라면 마감 시간까지만 기다림
+    monkeypatch.setattr(WebSearchConfig, "FANOUT_DEADLINE", 0.2)
+    results = await asyncio.wait_for(fanout_service.search_web("체류", max_results=5), timeout=1)
+    assert [result["url"] for result in results] == ["https://hikorea.go.kr/visa"]
+    assert get_provider_stats().stats()["duckduckgo"]["cancelled"] == 2
+
+    # 기다리지 않은 API 호출은 캐시를 채우기 위해 계속 진행 중
+    inflight = list(fanout_service.cache._inflight.values())
+    assert len(inflight) == 2
+    for task in inflight:
+        task.cancel()
+    await asyncio.gather(*inflight, return_exceptions=True)